@@ -0,0 +1,241 @@
+# app/api/connection_queue.py
+"""
+Per-connection outbound queues for WebSocket viewers
+Bounded by message count and bytes, coalesces superseded state frames
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from fastapi import WebSocket
+
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Only the latest frame of these types matters to a viewer
+COALESCED_MESSAGE_TYPES = {
+    "session_status",
+    "session_update",
+    "enhanced_ecosystem_status"
+}
+
+class OverflowPolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"
+    DROP_AUDIO = "drop_audio"
+    DISCONNECT = "disconnect"
+
+    @classmethod
+    def from_setting(cls, value: str) -> "OverflowPolicy":
+        try:
+            return cls(value)
+        except ValueError:
+            logger.warning(f"Unknown overflow policy '{value}', using drop_oldest")
+            return cls.DROP_OLDEST
+
+@dataclass
+class OutboundFrame:
+    """Serialized message shared by every connection of a broadcast"""
+    message_type: str
+    payload: str
+    message: Dict[str, Any]
+    size: int
+    audio_stripped: bool = False
+    _stripped: Optional["OutboundFrame"] = field(default=None, repr=False)
+
+    @classmethod
+    def from_message(cls, message: Dict[str, Any]) -> "OutboundFrame":
+        payload = json.dumps(message)
+        return cls(
+            message_type=message.get("type", "unknown"),
+            payload=payload,
+            message=message,
+            size=len(payload)
+        )
+
+    @property
+    def has_audio(self) -> bool:
+        return bool(_get_chat_message(self.message).get("audioBase64"))
+
+    def without_audio(self) -> "OutboundFrame":
+        """Text-only copy of this frame (cached, built once per broadcast)"""
+        if self._stripped is None:
+            stripped_message = dict(self.message)
+            stripped_data = dict(stripped_message.get("data", {}))
+            chat_message = dict(_get_chat_message(self.message))
+            chat_message["audioBase64"] = None
+            chat_message["audioDropped"] = True
+            stripped_data["message"] = chat_message
+            stripped_message["data"] = stripped_data
+
+            self._stripped = OutboundFrame.from_message(stripped_message)
+            self._stripped.audio_stripped = True
+        return self._stripped
+
+def _get_chat_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    data = message.get("data")
+    if isinstance(data, dict) and isinstance(data.get("message"), dict):
+        return data["message"]
+    return {}
+
+class ConnectionSendQueue:
+    """Bounded send queue with a single writer task per connection"""
+
+    def __init__(self,
+                 websocket: WebSocket,
+                 max_messages: int,
+                 max_bytes: int,
+                 policy: OverflowPolicy,
+                 send_timeout: float,
+                 on_failure: Callable[[WebSocket], Awaitable[None]]):
+        self.websocket = websocket
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self._on_failure = on_failure
+
+        self._frames: Deque[OutboundFrame] = deque()
+        self._bytes = 0
+        self._wakeup = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self._closed = False
+
+        # Queue metrics
+        self.sent_messages = 0
+        self.sent_bytes = 0
+        self.dropped_messages = 0
+        self.dropped_bytes = 0
+        self.coalesced_messages = 0
+        self.audio_stripped = 0
+        self.max_depth_seen = 0
+        self.max_bytes_seen = 0
+
+    def start(self):
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._run_writer())
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def queued_bytes(self) -> int:
+        return self._bytes
+
+    def put(self, frame: OutboundFrame) -> bool:
+        """Queue a frame; returns False when the connection must be dropped"""
+        if self._closed:
+            return False
+
+        if frame.message_type in COALESCED_MESSAGE_TYPES:
+            self._coalesce(frame.message_type)
+
+        self._frames.append(frame)
+        self._bytes += frame.size
+
+        if not self._enforce_limits():
+            return False
+
+        self.max_depth_seen = max(self.max_depth_seen, len(self._frames))
+        self.max_bytes_seen = max(self.max_bytes_seen, self._bytes)
+        self._wakeup.set()
+        return True
+
+    def _over_limits(self) -> bool:
+        return len(self._frames) > self.max_messages or self._bytes > self.max_bytes
+
+    def _coalesce(self, message_type: str):
+        for queued in self._frames:
+            if queued.message_type == message_type:
+                self._frames.remove(queued)
+                self._bytes -= queued.size
+                self.coalesced_messages += 1
+                return
+
+    def _enforce_limits(self) -> bool:
+        if not self._over_limits():
+            return True
+
+        if self.policy == OverflowPolicy.DISCONNECT:
+            logger.warning(f"Send queue overflow ({len(self._frames)} msgs, {self._bytes} bytes), disconnecting viewer")
+            self._closed = True
+            self._frames.clear()
+            self._bytes = 0
+            return False
+
+        if self.policy == OverflowPolicy.DROP_AUDIO:
+            for index, queued in enumerate(self._frames):
+                if not self._over_limits():
+                    break
+                if queued.has_audio and not queued.audio_stripped:
+                    stripped = queued.without_audio()
+                    self._frames[index] = stripped
+                    self._bytes -= queued.size - stripped.size
+                    self.audio_stripped += 1
+
+        # Drop oldest frames, always keeping the newest one
+        while self._over_limits() and len(self._frames) > 1:
+            dropped = self._frames.popleft()
+            self._bytes -= dropped.size
+            self.dropped_messages += 1
+            self.dropped_bytes += dropped.size
+            metrics.WS_DROPPED_BYTES.inc(dropped.size)
+
+        return True
+
+    async def _run_writer(self):
+        try:
+            while not self._closed:
+                if not self._frames:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                frame = self._frames.popleft()
+                self._bytes -= frame.size
+
+                await asyncio.wait_for(
+                    self.websocket.send_text(frame.payload),
+                    timeout=self.send_timeout
+                )
+                self.sent_messages += 1
+                self.sent_bytes += frame.size
+                metrics.WS_SENT_BYTES.inc(frame.size)
+
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            if not self._closed:
+                logger.warning(f"Viewer send failed, dropping connection: {e}")
+                self._closed = True
+                await self._on_failure(self.websocket)
+
+    async def close(self):
+        """Stop the writer and release queued frames"""
+        self._closed = True
+        self._frames.clear()
+        self._bytes = 0
+        self._wakeup.set()
+
+        if self._writer and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queued_messages": len(self._frames),
+            "queued_bytes": self._bytes,
+            "max_depth_seen": self.max_depth_seen,
+            "max_bytes_seen": self.max_bytes_seen,
+            "sent_messages": self.sent_messages,
+            "sent_bytes": self.sent_bytes,
+            "dropped_messages": self.dropped_messages,
+            "dropped_bytes": self.dropped_bytes,
+            "coalesced_messages": self.coalesced_messages,
+            "audio_stripped": self.audio_stripped
+        }
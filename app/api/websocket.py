@@ -6,9 +6,11 @@ Frontend can connect without knowing session ID!
 
 import uuid
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import json
 import asyncio
+import functools
+import heapq
 import logging
 import time
 import os
@@ -17,6 +19,11 @@ import random
 # UPDATED IMPORTS - Enhanced Memory
 from app.core.ai.characters import get_character
 from app.core.database.service import db_service
+from app.config.settings import settings
+from app.api.connection_queue import ConnectionSendQueue, OutboundFrame, OverflowPolicy
+from app.core.sessions.session_bus import session_bus, session_events_channel, session_control_channel
+from app.utils import metrics
+from app.utils.tracing import tracer
 
 # Logger setup
 logger = logging.getLogger(__name__)
@@ -24,20 +31,77 @@ logger = logging.getLogger(__name__)
 # WebSocket router
 websocket_router = APIRouter()
 
+class SessionOccupancyIndex:
+    """Max-heap of viewers per session with lazy invalidation"""
+    
+    def __init__(self):
+        self._counts: Dict[str, int] = {}
+        self._heap: List[Tuple[int, int, str]] = []
+        self._sequence = 0
+    
+    def update(self, session_id: str, count: int):
+        if count <= 0:
+            self._counts.pop(session_id, None)
+        else:
+            self._counts[session_id] = count
+            self._sequence += 1
+            heapq.heappush(self._heap, (-count, self._sequence, session_id))
+        
+        # Compact stale entries once they dominate the heap
+        if len(self._heap) > 4 * len(self._counts) + 64:
+            self._heap = [(-count, seq, sid) for seq, (sid, count) in enumerate(self._counts.items())]
+            heapq.heapify(self._heap)
+    
+    def best(self) -> Optional[str]:
+        while self._heap:
+            negative_count, _, session_id = self._heap[0]
+            if self._counts.get(session_id) == -negative_count:
+                return session_id
+            heapq.heappop(self._heap)
+        return None
+
 # Connection manager - ENHANCED with auto-discovery
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        self.sessions: Dict[str, List[WebSocket]] = {}
+        # Connections indexed by connection ID for O(1) connect/disconnect
+        self.active_connections: Dict[str, WebSocket] = {}
+        self.sessions: Dict[str, Dict[str, WebSocket]] = {}
+        self.connection_sessions: Dict[str, str] = {}
         self.session_metadata: Dict[str, Dict] = {}  # Store session info
         self.session_topics: Dict[str, str] = {}
+        self.occupancy = SessionOccupancyIndex()
+        
+        # Bounded outbound queue per viewer
+        self.send_queues: Dict[str, ConnectionSendQueue] = {}
+        self.overflow_policy = OverflowPolicy.from_setting(settings.WS_OVERFLOW_POLICY)
+        self.overflow_disconnects = 0
+        metrics.track_queued_bytes(lambda: sum(queue.queued_bytes for queue in list(self.send_queues.values())))
+
+    @staticmethod
+    def get_connection_id(websocket: WebSocket) -> Optional[str]:
+        return getattr(websocket.state, "connection_id", None)
 
-    async def connect(self, websocket: WebSocket, session_id: str, topic: Optional[str] = None):
+    async def connect(self, websocket: WebSocket, session_id: str, topic: Optional[str] = None) -> str:
         await websocket.accept()
-        self.active_connections.append(websocket)
+        
+        connection_id = str(uuid.uuid4())
+        websocket.state.connection_id = connection_id
+        self.active_connections[connection_id] = websocket
+        self.connection_sessions[connection_id] = session_id
+        
+        send_queue = ConnectionSendQueue(
+            websocket,
+            max_messages=settings.WS_SEND_QUEUE_MAX_MESSAGES,
+            max_bytes=settings.WS_SEND_QUEUE_MAX_BYTES,
+            policy=self.overflow_policy,
+            send_timeout=settings.WS_SEND_TIMEOUT,
+            on_failure=lambda ws: self.disconnect(ws, session_id)
+        )
+        self.send_queues[connection_id] = send_queue
+        send_queue.start()
         
         if session_id not in self.sessions:
-            self.sessions[session_id] = []
+            self.sessions[session_id] = {}
             # Initialize session metadata
             self.session_metadata[session_id] = {
                 "created_at": time.time(),
@@ -45,12 +109,20 @@ class ConnectionManager:
                 "status": "active",
                 "topic": topic
             }
+            # Receive this session's broadcasts from whichever worker produces them
+            await session_bus.subscribe(
+                session_events_channel(session_id),
+                functools.partial(self.deliver_to_session, session_id)
+            )
         
-        self.sessions[session_id].append(websocket)
-        self.session_metadata[session_id]["participant_count"] += 1
+        self.sessions[session_id][connection_id] = websocket
+        self.session_metadata[session_id]["participant_count"] = len(self.sessions[session_id])
+        metrics.set_session_connections(session_id, len(self.sessions[session_id]))
+        self.occupancy.update(session_id, len(self.sessions[session_id]))
         
-        logger.info(f"Client connected to session: {session_id}")
+        logger.info(f"Client {connection_id} connected to session: {session_id}")
         logger.info(f"Total connections: {len(self.sessions[session_id])}")
+        return connection_id
 
 
     async def get_session_topic(self, session_id: str) -> str:
@@ -96,33 +168,92 @@ class ConnectionManager:
                 self.session_metadata[session_id]["topic"] = topic
 
     async def disconnect(self, websocket: WebSocket, session_id: str):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        if session_id in self.sessions and websocket in self.sessions[session_id]:
-            self.sessions[session_id].remove(websocket)
-            self.session_metadata[session_id]["participant_count"] -= 1
-            
-            if not self.sessions[session_id]:
-                del self.sessions[session_id]
-                if session_id in self.session_metadata:
-                    del self.session_metadata[session_id]
+        connection_id = self.get_connection_id(websocket)
+        if connection_id is not None:
+            await self.disconnect_connection(connection_id)
         
         logger.info(f"Client disconnected from session: {session_id}")
+    
+    async def disconnect_connection(self, connection_id: str):
+        """Remove a connection by ID (idempotent)"""
+        send_queue = self.send_queues.pop(connection_id, None)
+        if send_queue:
+            await send_queue.close()
+        
+        self.active_connections.pop(connection_id, None)
+        session_id = self.connection_sessions.pop(connection_id, None)
+        
+        session_connections = self.sessions.get(session_id)
+        if session_connections is not None and session_connections.pop(connection_id, None) is not None:
+            self.session_metadata[session_id]["participant_count"] = len(session_connections)
+            metrics.set_session_connections(session_id, len(session_connections))
+            self.occupancy.update(session_id, len(session_connections))
+            
+            if not session_connections:
+                del self.sessions[session_id]
+                self.session_metadata.pop(session_id, None)
+                await session_bus.unsubscribe(session_events_channel(session_id))
 
     async def send_to_session(self, session_id: str, message: dict):
-        """Send message to all clients in a session"""
+        """Broadcast message to every viewer of a session on any worker"""
+        await session_bus.publish(session_events_channel(session_id), message)
+    
+    async def deliver_to_session(self, session_id: str, message: dict):
+        """Queue message for this worker's clients in a session (serialized once)"""
         if session_id in self.sessions:
-            dead_connections = []
-            for connection in self.sessions[session_id]:
-                try:
-                    await connection.send_json(message)
-                    logger.info(f"📤 Sent {message['type']} to session {session_id}")
-                except Exception as e:
-                    logger.error(f"Failed to send message: {e}")
-                    dead_connections.append(connection)
+            with tracer.span("ws.fanout", viewers=len(self.sessions[session_id])):
+                frame = OutboundFrame.from_message(message)
+                overflowed = []
+                for connection_id, connection in self.sessions[session_id].items():
+                    send_queue = self.send_queues.get(connection_id)
+                    if send_queue is None or not send_queue.put(frame):
+                        overflowed.append(connection)
             
-            for connection in dead_connections:
-                await self.disconnect(connection, session_id)
+            logger.info(f"📤 Queued {message['type']} for {len(self.sessions[session_id])} viewers in session {session_id}")
+            
+            for connection in overflowed:
+                await self._drop_laggard(connection, session_id)
+    
+    async def send_to_connection(self, websocket: WebSocket, session_id: str, message: dict):
+        """Queue message for a single client"""
+        send_queue = self.send_queues.get(self.get_connection_id(websocket))
+        if send_queue is None:
+            return
+        
+        if not send_queue.put(OutboundFrame.from_message(message)):
+            await self._drop_laggard(websocket, session_id)
+    
+    async def _drop_laggard(self, websocket: WebSocket, session_id: str):
+        """Disconnect a viewer whose queue overflowed"""
+        self.overflow_disconnects += 1
+        metrics.WS_OVERFLOW_DISCONNECTS.inc()
+        await self.disconnect(websocket, session_id)
+        try:
+            await websocket.close(code=1013)
+        except Exception:
+            pass
+    
+    def get_session_queue_metrics(self, session_id: str) -> Dict:
+        """Outbound queue depth metrics for a session"""
+        connection_stats = [
+            self.send_queues[connection_id].get_stats()
+            for connection_id in self.sessions.get(session_id, {})
+            if connection_id in self.send_queues
+        ]
+        
+        return {
+            "session_id": session_id,
+            "connections": len(connection_stats),
+            "overflow_policy": self.overflow_policy.value,
+            "queued_messages": sum(s["queued_messages"] for s in connection_stats),
+            "queued_bytes": sum(s["queued_bytes"] for s in connection_stats),
+            "max_queued_messages": max((s["queued_messages"] for s in connection_stats), default=0),
+            "max_queued_bytes": max((s["queued_bytes"] for s in connection_stats), default=0),
+            "dropped_messages": sum(s["dropped_messages"] for s in connection_stats),
+            "coalesced_messages": sum(s["coalesced_messages"] for s in connection_stats),
+            "audio_stripped": sum(s["audio_stripped"] for s in connection_stats),
+            "overflow_disconnects": self.overflow_disconnects
+        }
     
     def get_active_sessions(self) -> List[str]:
         """Get list of active session IDs"""
@@ -130,27 +261,21 @@ class ConnectionManager:
     
     def get_best_session_for_connection(self) -> str:
         """Get the best session for a new connection to join"""
-        active_sessions = self.get_active_sessions()
-        
-        if not active_sessions:
+        if not self.sessions:
             return None
             
         # Priority 1: Sessions with autonomous manager
         try:
             from app.core.sessions.autonomous_manager import autonomous_session_manager
-            autonomous_sessions = list(autonomous_session_manager.active_sessions.keys())
             
-            for session_id in autonomous_sessions:
-                if session_id in active_sessions:
+            for session_id in autonomous_session_manager.active_sessions:
+                if session_id in self.sessions:
                     return session_id
         except Exception:
             pass
         
-        # Priority 2: Most active session
-        if active_sessions:
-            return max(active_sessions, key=lambda sid: len(self.sessions.get(sid, [])))
-        
-        return None
+        # Priority 2: Most active session (heap lookup, no full scan)
+        return self.occupancy.best()
 
 # Global connection manager
 manager = ConnectionManager()
@@ -179,7 +304,17 @@ async def get_or_create_session_for_frontend() -> str:
     except Exception as e:
         logger.debug(f"No autonomous manager available: {e}")
     
-    # Step 2: Check active WebSocket sessions
+    # Step 2: Autonomous sessions owned by other workers
+    try:
+        remote_sessions = await session_bus.list_session_snapshots()
+        if remote_sessions:
+            session_id = remote_sessions[0]["session_id"]
+            logger.info(f"Using autonomous session owned by worker {remote_sessions[0].get('owner')}: {session_id}")
+            return session_id
+    except Exception as e:
+        logger.debug(f"Session bus lookup failed: {e}")
+    
+    # Step 3: Check active WebSocket sessions
     active_sessions = manager.get_active_sessions()
     if active_sessions:
         best_session = manager.get_best_session_for_connection()
@@ -191,7 +326,7 @@ async def get_or_create_session_for_frontend() -> str:
     logger.info(f"No active sessions, created waiting session: {fallback_id}")
     return fallback_id
     
-    # Step 3: Create new autonomous session with fixed topic
+    # Step 4: Create new autonomous session with fixed topic
     # session_id = f"auto-{int(time.time())}-{random.randint(1000, 9999)}"
     
     # try:
@@ -526,233 +661,385 @@ async def generate_enhanced_ai_response(session_id: str,
     active_requests.add(request_key)
 
     try:
-        trigger_type = "peer-triggered" if peer_triggered else "manual"
-        logger.info(f"🤖 Generating ENHANCED response for {character_id} ({trigger_type})")
-        
-        # Get enhanced character instance
-        character = enhanced_response_tracker.get_or_create_character(character_id)
-        await character.initialize_memory()
-        
-        # Start session tracking
-        character.start_session(session_id)
+        prepared = await prepare_enhanced_ai_response(
+            session_id, character_id, peer_triggered, trigger_reaction, context
+        )
+        await release_enhanced_ai_response(session_id, prepared)
         
-        session_topic = await manager.get_session_topic(session_id)
-        topic = session_topic
+    except Exception as e:
+        await _send_generation_error(session_id, character_id, e)
+    
+    finally:
+        active_requests.discard(request_key)
 
-        # ENHANCED: Build context with database + memory
-        other_participants = [
-            cid for cid in ["claude", "gpt", "grok"] 
-            if cid != character_id
-        ]
-        
-        enhanced_context = {
-            "other_participants": other_participants,
-            "session_id": session_id,
-            "session_type": "autonomous_debate",
-            "peer_triggered": peer_triggered,
-            "trigger_reaction": trigger_reaction.__dict__ if trigger_reaction else None
-        }
-        
-        if context:
-            enhanced_context.update(context)
+async def deliver_speculative_response(session_id: str, character_id: str, pending: asyncio.Task):
+    """Release a pre-generated response at its slot, regenerating if the draft failed"""
+    try:
+        prepared = await pending
+    except Exception as e:
+        logger.warning(f"Speculative response for {character_id} unusable, regenerating: {e}")
+        await generate_enhanced_ai_response(session_id, character_id, peer_triggered=False)
+        return
+    
+    request_key = f"{session_id}:{character_id}"
+    if request_key in active_requests:
+        logger.info(f"Duplicate request ignored for {character_id}")
+        discard_prepared_response(prepared, "duplicate request")
+        return
+    
+    active_requests.add(request_key)
+    
+    try:
+        logger.info(f"⚡ Releasing pre-generated response for {character_id}")
+        await release_enhanced_ai_response(session_id, prepared)
+    except Exception as e:
+        await _send_generation_error(session_id, character_id, e)
+    finally:
+        active_requests.discard(request_key)
+
+async def prepare_enhanced_ai_response(session_id: str, 
+                                     character_id: str, 
+                                     peer_triggered: bool = False,
+                                     trigger_reaction = None,
+                                     context: Dict = None,
+                                     persist: bool = True) -> Dict:
+    """Run LLM, TTS and lip-sync for a response without publishing it"""
+    turn = tracer.start_turn("turn", session_id=session_id, character_id=character_id,
+                             peer_triggered=peer_triggered)
+    try:
+        with tracer.activate(turn):
+            prepared = await _prepare_response(
+                session_id, character_id, peer_triggered, trigger_reaction, context, persist
+            )
+    except BaseException as e:
+        tracer.finish_turn(turn, e)
+        raise
+    
+    prepared["trace"] = turn
+    return prepared
+
+async def _prepare_response(session_id: str,
+                            character_id: str,
+                            peer_triggered: bool,
+                            trigger_reaction,
+                            context: Optional[Dict],
+                            persist: bool) -> Dict:
+    trigger_type = "peer-triggered" if peer_triggered else "manual"
+    logger.info(f"🤖 Generating ENHANCED response for {character_id} ({trigger_type})")
+    
+    # Get enhanced character instance
+    character = enhanced_response_tracker.get_or_create_character(character_id)
+    await character.initialize_memory()
+    
+    # Start session tracking
+    character.start_session(session_id)
+    
+    session_topic = await manager.get_session_topic(session_id)
+    topic = session_topic
+
+    # ENHANCED: Build context with database + memory
+    other_participants = [
+        cid for cid in ["claude", "gpt", "grok"] 
+        if cid != character_id
+    ]
+    
+    enhanced_context = {
+        "other_participants": other_participants,
+        "session_id": session_id,
+        "session_type": "autonomous_debate",
+        "peer_triggered": peer_triggered,
+        "trigger_reaction": trigger_reaction.__dict__ if trigger_reaction else None
+    }
+    
+    if context:
+        enhanced_context.update(context)
+    
+    # Generate enhanced character response
+    response_data = await character.generate_response(topic, enhanced_context, persist=persist)
+    
+    print(f"{character_id} ({trigger_type}): {response_data['text'][:100]}...")
+    print(f"Enhanced metadata: {response_data.get('enhanced_metadata', {})}")
+    
+    # TTS + Lip-sync generation
+    try:
+        from app.core.media.artifacts import artifact_manager
+        from app.core.media.tts import tts_router
+        from app.core.media.tts.chunking import ChunkedSynthesisError, ChunkingSkipped, synthesize_chunked
+        from app.core.media.tts.lip_sync import lip_sync_generator
         
-        # Generate enhanced character response
-        response_data = await character.generate_response(topic, enhanced_context)
+        tts_result = None
+        if settings.TTS_CHUNKING:
+            try:
+                with tracer.span("tts", character_id=character_id, chunked=True):
+                    tts_result = await synthesize_chunked(
+                        tts_router, lip_sync_generator,
+                        text=response_data["text"],
+                        character_id=character_id,
+                        emotion=response_data.get("facialExpression", "neutral"),
+                        adaptive_metadata=enhanced_context.get("adaptive", {})
+                    )
+            except ChunkingSkipped as e:
+                logger.debug(f"Chunked TTS not used for {character_id}: {e}")
+            except ChunkedSynthesisError as e:
+                logger.warning(f"Chunked TTS fell back to whole-text synthesis for {character_id}: {e}")
+        
+        if tts_result is None:
+            # Generate TTS (router handles provider failover and racing)
+            with tracer.span("tts", character_id=character_id, chunked=False):
+                tts_result = await tts_router.synthesize(
+                    text=response_data["text"],
+                    character_id=character_id,
+                    emotion=response_data.get("facialExpression", "neutral"),
+                    adaptive_metadata=enhanced_context.get("adaptive", {})
+                )
         
-        print(f"{character_id} ({trigger_type}): {response_data['text'][:100]}...")
-        print(f"Enhanced metadata: {response_data.get('enhanced_metadata', {})}")
+        final_duration = tts_result.get("duration", response_data.get("duration", 3.0))
+        final_audio_base64 = tts_result["audioBase64"]
+        audio_degraded = bool(tts_result.get("degraded"))
         
-        # TTS + Lip-sync generation
-        try:
-            from app.core.media.tts import tts_service
-            from app.core.media.tts.lip_sync import lip_sync_generator
-            
-            # Generate TTS
-            tts_result = await tts_service.generate_autonomous_speech_with_file(
-                text=response_data["text"],
-                character_id=character_id,
-                emotion=response_data.get("facialExpression", "neutral"),
-                adaptive_metadata=enhanced_context.get("adaptive", {})
-            )
-            
-            if tts_result["success"] and "audioFilePath" in tts_result:
+        if "lipSync" in tts_result:
+            lip_sync_result = tts_result["lipSync"]
+        elif "audioFilePath" in tts_result:
+            with artifact_manager.claim(tts_result["audioFilePath"]) as audio_file_path, \
+                    tracer.span("lipsync", character_id=character_id, source="audio"):
                 lip_sync_result = await lip_sync_generator.generate_lip_sync_from_audio(
-                    audio_file_path=tts_result["audioFilePath"],
+                    audio_file_path=audio_file_path,
                     text=response_data["text"]
                 )
-                tts_service.cleanup_temp_file(tts_result["audioFilePath"])
-                final_duration = tts_result.get("duration", response_data.get("duration", 3.0))
-                final_audio_base64 = tts_result["audioBase64"]
-            else:
-                # Fallback
-                tts_result_fallback = await tts_service.generate_speech(
-                    text=response_data["text"],
-                    character_id=character_id,
-                    emotion=response_data.get("facialExpression", "neutral")
-                )
-                
+        else:
+            with tracer.span("lipsync", character_id=character_id, source="text"):
                 lip_sync_result = await lip_sync_generator.generate_lip_sync(
                     text=response_data["text"],
-                    duration=tts_result_fallback.get("duration", 3.0)
+                    duration=final_duration
                 )
-                
-                final_duration = tts_result_fallback.get("duration", 3.0)
-                final_audio_base64 = tts_result_fallback["audioBase64"]
-                
-        except Exception as tts_error:
-            logger.error(f"TTS/Lip-sync failed for {character_id}: {tts_error}")
-            final_duration = response_data.get("duration", 3.0)
-            final_audio_base64 = "mock_audio_fallback"
-            lip_sync_result = {
-                "metadata": {"duration": final_duration}, 
-                "mouthCues": [{"start": 0.0, "end": final_duration, "value": "A"}]
-            }
-        
-        # ENHANCED: Complete message with database metadata
-        complete_message = {
-            "id": str(uuid.uuid4()),
-            "sessionId": session_id,
-            "characterId": character_id,
-            "text": response_data["text"],
-            "facialExpression": response_data.get("facialExpression", "neutral"),
-            "animation": "Talking_1",
-            "duration": final_duration,
-            "timestamp": int(time.time() * 1000),
             
-            # Audio/TTS fields
-            "audioBase64": final_audio_base64,
-            "lipSync": lip_sync_result,
-            "audioUrl": None,
-            
-            # ENHANCED: Database-backed metadata
-            "enhancedMetadata": response_data.get("enhanced_metadata", {}),
-            "adaptiveMetadata": response_data.get("adaptive_metadata", {}),
-            "aiToAiMetadata": {
-                "triggerType": trigger_type,
-                "peerTriggered": peer_triggered,
-                "evolutionStage": response_data.get("enhanced_metadata", {}).get("evolution_stage", "initial_learning"),
-                "lifeEnergy": response_data.get("enhanced_metadata", {}).get("life_energy", 100.0),
-                "maturityLevel": response_data.get("enhanced_metadata", {}).get("maturity_level", 1),
-                "memorySystem": "enhanced_hybrid"
-            },
-            
-            # Existing fields
-            "personality_influence": response_data.get("personality_influence", {}),
-            "energy_level": response_data.get("energy_level", 100.0),
-            "resetExpressionAfter": True,
+    except Exception as tts_error:
+        logger.error(f"TTS/Lip-sync failed for {character_id}: {tts_error}")
+        final_duration = response_data.get("duration", 3.0)
+        final_audio_base64 = "mock_audio_fallback"
+        audio_degraded = True
+        lip_sync_result = {
+            "metadata": {"duration": final_duration}, 
+            "mouthCues": [{"start": 0.0, "end": final_duration, "value": "A"}]
         }
+    
+    # ENHANCED: Complete message with database metadata
+    complete_message = {
+        "id": str(uuid.uuid4()),
+        "sessionId": session_id,
+        "characterId": character_id,
+        "text": response_data["text"],
+        "facialExpression": response_data.get("facialExpression", "neutral"),
+        "animation": "Talking_1",
+        "duration": final_duration,
+        "timestamp": int(time.time() * 1000),
+        
+        # Audio/TTS fields
+        "audioBase64": final_audio_base64,
+        "audioDegraded": audio_degraded,
+        "lipSync": lip_sync_result,
+        "audioUrl": None,
+        
+        # ENHANCED: Database-backed metadata
+        "enhancedMetadata": response_data.get("enhanced_metadata", {}),
+        "adaptiveMetadata": response_data.get("adaptive_metadata", {}),
+        "aiToAiMetadata": {
+            "triggerType": trigger_type,
+            "peerTriggered": peer_triggered,
+            "evolutionStage": response_data.get("enhanced_metadata", {}).get("evolution_stage", "initial_learning"),
+            "lifeEnergy": response_data.get("enhanced_metadata", {}).get("life_energy", 100.0),
+            "maturityLevel": response_data.get("enhanced_metadata", {}).get("maturity_level", 1),
+            "memorySystem": "enhanced_hybrid"
+        },
+        
+        # Existing fields
+        "personality_influence": response_data.get("personality_influence", {}),
+        "energy_level": response_data.get("energy_level", 100.0),
+        "resetExpressionAfter": True,
+    }
+    
+    return {
+        "character": character,
+        "topic": topic,
+        "other_participants": other_participants,
+        "enhanced_context": enhanced_context,
+        "response_data": response_data,
+        "complete_message": complete_message,
+        "final_duration": final_duration,
+        "persisted": persist
+    }
+
+def discard_prepared_response(prepared: Dict, reason: str):
+    """Close the trace of a prepared response that will never be released"""
+    tracer.finish_turn(prepared.get("trace"), discarded=reason)
+
+async def release_enhanced_ai_response(session_id: str, prepared: Dict):
+    """Persist, register and broadcast a prepared response"""
+    turn = prepared.get("trace")
+    error = None
+    try:
+        with tracer.activate(turn):
+            await _release_response(session_id, prepared)
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        tracer.finish_turn(turn, error)
+
+async def _release_response(session_id: str, prepared: Dict):
+    character = prepared["character"]
+    character_id = character.character_id
+    topic = prepared["topic"]
+    other_participants = prepared["other_participants"]
+    response_data = prepared["response_data"]
+    complete_message = prepared["complete_message"]
+    final_duration = prepared["final_duration"]
+    
+    if not prepared["persisted"]:
+        await character.store_generated_response(response_data, topic, prepared["enhanced_context"])
+    complete_message["timestamp"] = int(time.time() * 1000)
 
-        # ENHANCED: Add to response tracking with persistence
+    # ENHANCED: Add to response tracking with persistence
+    with tracer.span("persist.response", character_id=character_id):
         await enhanced_response_tracker.add_response_with_persistence(
             session_id, character_id, complete_message
         )
-        
-        # ENHANCED: Process peer feedback with database
-        asyncio.create_task(
-            enhanced_response_tracker.process_enhanced_peer_feedback(session_id, {
-                "character_id": character_id,
-                "response_data": complete_message
-            })
-        )
-        
-        # ENHANCED: End session with database persistence
+    
+    # ENHANCED: Process peer feedback with database
+    asyncio.create_task(
+        enhanced_response_tracker.process_enhanced_peer_feedback(session_id, {
+            "character_id": character_id,
+            "response_data": complete_message
+        })
+    )
+    
+    # ENHANCED: End session with database persistence
+    with tracer.span("persist.end_session", character_id=character_id):
         await character.end_session_with_database_persistence(
             session_id=session_id,
             other_participants=other_participants,
             topic=topic,
             response_text=response_data["text"]
         )
-        
-        # Register with autonomous session manager
-        try:
-            from app.core.sessions.autonomous_manager import autonomous_session_manager
-            session = autonomous_session_manager.get_session(session_id)
-            if session:
-                session.register_speech_start(
-                    character_id=character_id,
-                    text=response_data["text"],
-                    duration=final_duration
-                )
-        except Exception as session_error:
-            logger.debug(f"No autonomous session found: {session_error}")
-        
-        # ENHANCED: Print ecosystem status
-        print(f" ENHANCED AI-TO-AI ECOSYSTEM STATUS:")
-        print(f"   Character: {complete_message['characterId']}")
-        print(f"   Evolution: {complete_message['aiToAiMetadata']['evolutionStage']}")
-        print(f"   Life Energy: {complete_message['aiToAiMetadata']['lifeEnergy']}")
-        print(f"   Memory: {complete_message['aiToAiMetadata']['memorySystem']}")
-        
-        # Send response message
-        response_message = {
-            "type": "new_message",
-            "sessionId": session_id,
-            "data": {
-                "message": complete_message 
-            },
-            "timestamp": int(time.time() * 1000)
-        }
-        
+    
+    # Register with autonomous session manager
+    try:
+        from app.core.sessions.autonomous_manager import autonomous_session_manager
+        session = autonomous_session_manager.get_session(session_id)
+        if session:
+            session.register_speech_start(
+                character_id=character_id,
+                text=response_data["text"],
+                duration=final_duration
+            )
+    except Exception as session_error:
+        logger.debug(f"No autonomous session found: {session_error}")
+    
+    # ENHANCED: Print ecosystem status
+    print(f" ENHANCED AI-TO-AI ECOSYSTEM STATUS:")
+    print(f"   Character: {complete_message['characterId']}")
+    print(f"   Evolution: {complete_message['aiToAiMetadata']['evolutionStage']}")
+    print(f"   Life Energy: {complete_message['aiToAiMetadata']['lifeEnergy']}")
+    print(f"   Memory: {complete_message['aiToAiMetadata']['memorySystem']}")
+    
+    # Stage timings so far (fan-out happens after this snapshot)
+    turn = tracer.current_turn()
+    if turn is not None:
+        complete_message["timings"] = turn.timings()
+    
+    # Send response message
+    response_message = {
+        "type": "new_message",
+        "sessionId": session_id,
+        "data": {
+            "message": complete_message 
+        },
+        "timestamp": int(time.time() * 1000)
+    }
+    
+    with tracer.span("ws.publish", character_id=character_id):
         await manager.send_to_session(session_id, response_message)
-        
-        logger.info(f"✅ Enhanced AI response sent for {character_id}")
-        print(f"🚀 {character_id} finished speaking in ENHANCED AI ecosystem!")
-        
-    except Exception as e:
-        logger.error(f"Enhanced AI response generation error for {character_id}: {e}")
-        import traceback
-        traceback.print_exc()
-        
-        # Send error message
-        error_message = {
-            "type": "error",
-            "sessionId": session_id,
-            "data": {
-                "error": f"Failed to generate enhanced response for {character_id}: {str(e)}"
-            },
-            "timestamp": int(time.time() * 1000)
-        }
-        
-        try:
-            await manager.send_to_session(session_id, error_message)
-        except Exception as send_error:
-            logger.error(f"Failed to send error message: {send_error}")
     
-    finally:
-        active_requests.discard(request_key)
+    logger.info(f"✅ Enhanced AI response sent for {character_id}")
+    print(f"🚀 {character_id} finished speaking in ENHANCED AI ecosystem!")
+
+async def _send_generation_error(session_id: str, character_id: str, error: Exception):
+    logger.error(f"Enhanced AI response generation error for {character_id}: {error}")
+    import traceback
+    traceback.print_exc()
+    
+    # Send error message
+    error_message = {
+        "type": "error",
+        "sessionId": session_id,
+        "data": {
+            "error": f"Failed to generate enhanced response for {character_id}: {str(error)}"
+        },
+        "timestamp": int(time.time() * 1000)
+    }
+    
+    try:
+        await manager.send_to_session(session_id, error_message)
+    except Exception as send_error:
+        logger.error(f"Failed to send error message: {send_error}")
 
-# Character-specific rate limiting
+# Character-specific rate limiting (only consulted on the worker that owns the session)
 last_request_time = {}
 active_requests = set()
 
+async def get_session_snapshot(session_id: str) -> Optional[Dict]:
+    """Session state from the local autonomous loop, or from the owning worker's snapshot"""
+    from app.core.sessions.autonomous_manager import autonomous_session_manager
+    session = autonomous_session_manager.get_session(session_id)
+    
+    if session:
+        return session.get_snapshot()
+    return await session_bus.get_session_snapshot(session_id)
+
+def dispatch_response_request(session_id: str, character_id: str):
+    """Start a viewer-requested response on the owning worker"""
+    # Rate limiting check
+    now = time.time()
+    last_time = last_request_time.get(character_id, 0)
+
+    if now - last_time < 1.0:
+        logger.info(f"Rate limited request for {character_id}")
+        return
+    
+    last_request_time[character_id] = now
+
+    # Create background task for ENHANCED AI response
+    asyncio.create_task(
+        generate_enhanced_ai_response(session_id, character_id, peer_triggered=False)
+    )
+
 # ENHANCED WebSocket message handling
 async def handle_enhanced_websocket_message(websocket: WebSocket, session_id: str, data: dict):
     """Handle incoming WebSocket messages with enhanced functionality"""
     message_type = data.get("type")
     
     if message_type == "join_session":
-        from app.core.sessions.autonomous_manager import autonomous_session_manager
-        session = autonomous_session_manager.get_session(session_id)
+        snapshot = await get_session_snapshot(session_id)
         
-        if session:
+        if snapshot:
             session_info = {
                 "session_id": session_id,
                 "session_active": True,
                 "autonomous_running": True,
-                "topic": session.current_topic,
-                "topic_locked": session.topic_locked,
-                "participants": session.participants,
-                "conversation_rounds": session.conversation_rounds,
-                "current_speaker": session.current_speaker,
-                "state": session.state.value,
+                "topic": snapshot["topic"],
+                "topic_locked": snapshot["topic_locked"],
+                "participants": snapshot["participants"],
+                "conversation_rounds": snapshot["conversation_rounds"],
+                "current_speaker": snapshot["current_speaker"],
+                "state": snapshot["state"],
                 "participant_count": manager.session_metadata.get(session_id, {}).get("participant_count", 0)
             }
             
-            await websocket.send_json({
+            await manager.send_to_connection(websocket, session_id, {
                 "type": "session_joined",
                 "sessionId": session_id,
                 "data": {
-                    "message": f"✅ Joined active debate: {session.current_topic}",
+                    "message": f"✅ Joined active debate: {snapshot['topic']}",
                     "session_info": session_info
                 },
                 "timestamp": time.time()
@@ -767,7 +1054,7 @@ async def handle_enhanced_websocket_message(websocket: WebSocket, session_id: st
                 "participant_count": manager.session_metadata.get(session_id, {}).get("participant_count", 0)
             }
             
-            await websocket.send_json({
+            await manager.send_to_connection(websocket, session_id, {
                 "type": "session_waiting",
                 "sessionId": session_id,
                 "data": {
@@ -780,9 +1067,10 @@ async def handle_enhanced_websocket_message(websocket: WebSocket, session_id: st
     elif message_type == "request_response":
         from app.core.sessions.autonomous_manager import autonomous_session_manager
         session = autonomous_session_manager.get_session(session_id)
+        owner = None if session else await session_bus.get_lease_owner(session_id)
         
-        if not session:
-            await websocket.send_json({
+        if not session and not owner:
+            await manager.send_to_connection(websocket, session_id, {
                 "type": "session_not_active",
                 "sessionId": session_id,
                 "data": {
@@ -800,20 +1088,14 @@ async def handle_enhanced_websocket_message(websocket: WebSocket, session_id: st
             "claude"
         )
         
-        # Rate limiting check
-        now = time.time()
-        last_time = last_request_time.get(character_id, 0)
-
-        if now - last_time < 1.0:
-            logger.info(f"Rate limited request for {character_id}")
-            return
-        
-        last_request_time[character_id] = now
-
-        # Create background task for ENHANCED AI response
-        asyncio.create_task(
-            generate_enhanced_ai_response(session_id, character_id, peer_triggered=False)
-        )
+        if session:
+            dispatch_response_request(session_id, character_id)
+        else:
+            # Session loop runs on another worker - forward to its owner
+            await session_bus.publish(session_control_channel(session_id), {
+                "type": "request_response",
+                "characterId": character_id
+            })
     
     elif message_type == "get_enhanced_ecosystem_status":
         # Get enhanced AI-to-AI ecosystem status
@@ -837,7 +1119,7 @@ async def handle_enhanced_websocket_message(websocket: WebSocket, session_id: st
                     "database_backed": True
                 }
             
-            await websocket.send_json({
+            await manager.send_to_connection(websocket, session_id, {
                 "type": "enhanced_ecosystem_status",
                 "sessionId": session_id,
                 "data": ecosystem_status,
@@ -845,24 +1127,23 @@ async def handle_enhanced_websocket_message(websocket: WebSocket, session_id: st
             })
             
         except Exception as e:
-            await websocket.send_json({
+            await manager.send_to_connection(websocket, session_id, {
                 "type": "error",
                 "error": f"Failed to get enhanced ecosystem status: {str(e)}",
                 "timestamp": time.time()
             })
     
     elif message_type == "get_session_status":
-        from app.core.sessions.autonomous_manager import autonomous_session_manager
-        session = autonomous_session_manager.get_session(session_id)
+        snapshot = await get_session_snapshot(session_id)
         
-        if session:
+        if snapshot:
             status_info = {
                 "session_active": True,
-                "topic": session.current_topic,
-                "participants": session.participants,
-                "current_speaker": session.current_speaker,
-                "conversation_rounds": session.conversation_rounds,
-                "state": session.state.value
+                "topic": snapshot["topic"],
+                "participants": snapshot["participants"],
+                "current_speaker": snapshot["current_speaker"],
+                "conversation_rounds": snapshot["conversation_rounds"],
+                "state": snapshot["state"]
             }
         else:
             status_info = {
@@ -870,7 +1151,7 @@ async def handle_enhanced_websocket_message(websocket: WebSocket, session_id: st
                 "waiting_for_start": True
             }
         
-        await websocket.send_json({
+        await manager.send_to_connection(websocket, session_id, {
             "type": "session_status",
             "sessionId": session_id,
             "data": status_info,
@@ -878,7 +1159,7 @@ async def handle_enhanced_websocket_message(websocket: WebSocket, session_id: st
         })
     
     elif message_type == "ping":
-        await websocket.send_json({
+        await manager.send_to_connection(websocket, session_id, {
             "type": "pong",
             "timestamp": time.time()
         })
@@ -913,7 +1194,7 @@ async def enhanced_websocket_endpoint(websocket: WebSocket, session_id: str):
     await manager.connect(websocket, session_id)
     
     # Send enhanced welcome message
-    await websocket.send_json({
+    await manager.send_to_connection(websocket, session_id, {
         "type": "session_update",
         "data": {
             "message": f"Connected to ENHANCED AI-to-AI Ecosystem: {session_id}",
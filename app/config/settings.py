@@ -14,13 +14,71 @@ class Settings(BaseSettings):
     
     # Media
     GOOGLE_TTS_API_KEY: str = ""
+    GOOGLE_TTS_HTTP2: bool = True
+    GOOGLE_TTS_TIMEOUT: float = 30.0
+    GOOGLE_TTS_MAX_RETRIES: int = 2
+    GOOGLE_TTS_MAX_CONNECTIONS: int = 20
     REPLICATE_API_TOKEN: str = ""
-    TTS_PROVIDER: str = "chatterbox"
+    TTS_PROVIDER: str = "chatterbox"  # preferred provider for the TTS router
+    TTS_ROUTER_PROVIDERS: str = "chatterbox,google,local"
+    TTS_LATENCY_BUDGET: float = 8.0  # seconds before racing the next provider
+    TTS_RACING: bool = False
+    TTS_CHUNKING: bool = False  # synthesize multi-sentence responses per sentence, in parallel
+    TTS_CHUNK_CONCURRENCY: int = 4
+    TTS_CHUNK_MIN_CHARS: int = 40
+    TTS_CHUNK_MAX_CHARS: int = 300
     VOICE_REFERENCES_PATH: str = "data/voices/"
+    LIP_SYNC_ENGINE: str = "energy"  # energy (fast, live) | rhubarb (phonetic, slow)
+    RHUBARB_MAX_WORKERS: int = 0  # 0 = one per CPU
+    RHUBARB_TIMEOUT: float = 30.0
+    ARTIFACT_DIR: str = ""  # "" = <tmp>/a2ais-artifacts, "tmpfs" = /dev/shm, or a path
+    ARTIFACT_MAX_BYTES: int = 256 * 1024 * 1024
+    ARTIFACT_MAX_AGE: float = 600.0  # seconds before the sweeper removes a leaked file
+    ARTIFACT_SWEEP_INTERVAL: float = 60.0
+    VOICE_OPTIMIZER: str = "legacy"  # legacy (random strategy mix) | gp | tpe (need record_experiment_outcome fed)
 
     # Frontend
     FRONTEND_URL: str = "http://localhost:3000"
+
+    # WebSocket viewers
+    WS_SEND_QUEUE_MAX_MESSAGES: int = 64
+    WS_SEND_QUEUE_MAX_BYTES: int = 8 * 1024 * 1024  # 8 MB per viewer
+    WS_OVERFLOW_POLICY: str = "drop_audio"  # drop_oldest | drop_audio | disconnect
+    WS_SEND_TIMEOUT: float = 30.0
+    
+    # Multi-worker sessions
+    SESSION_BUS: str = "memory"  # memory | redis (uses REDIS_URL)
+    SESSION_LEASE_TTL: float = 15.0
     
+    # Autonomous sessions
+    SPECULATIVE_GENERATION: bool = False  # pre-generate the predicted next speaker during playback
+    WARMUP_ON_STARTUP: bool = True  # warm all characters, memory and connections when the app starts
+    WARMUP_STEP_TIMEOUT: float = 20.0
+
+    # Tracing
+    TRACING_EXPORTER: str = "none"  # none (histograms only), json, otlp
+    TRACING_JSON_PATH: str = "data/traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4317"  # local collector (needs opentelemetry-sdk + OTLP exporter)
+    TRACING_SERVICE_NAME: str = "a2ais-core"
+    TRACING_HISTOGRAM_SAMPLES: int = 2048  # recent spans per stage kept for p50/p99
+    EVENT_LOOP_LAG_INTERVAL: float = 0.25  # seconds between event-loop lag probes (0 disables)
+
+    # Topic selection
+    TOPIC_ANALYSIS_CONCURRENCY: int = 6  # max in-flight analysis LLM calls across characters
+    TOPIC_ANALYSIS_BATCHED: bool = True  # one prompt per character scoring every candidate topic
+    TOPIC_ANALYSIS_TIMEOUT: float = 30.0  # per-call timeout before the fallback analysis is used
+    TOPIC_FEED_REFRESH_INTERVAL: float = 900.0  # seconds before the feed is revalidated in the background
+    TOPIC_FEED_PATH: str = "data/topic_feed.json"  # last good feed for cold starts ("" disables)
+    REDDIT_REQUESTS_PER_SECOND: float = 1.0  # unauthenticated Reddit limit
+    TOPIC_KEYWORDS_PATH: str = ""  # JSON keyword sets, "" = app/config/topic_keywords.json
+    TOPIC_DUPLICATE_THRESHOLD: float = 0.7  # MinHash similarity at which two titles count as the same topic
+    TOPIC_HISTORY_PATH: str = "data/topic_history.json"  # used topics, for near-duplicate filtering ("" disables)
+    TOPIC_HISTORY_MAX: int = 5000
+    TOPIC_INTELLIGENCE: bool = True  # embed, cluster and novelty-score candidates before LLM analysis
+    TOPIC_CANDIDATES: int = 5  # max distinct candidates sent to character analysis
+    TOPIC_CLUSTER_THRESHOLD: float = 0.82  # cosine similarity at which titles share a cluster
+    TOPIC_NOVELTY_WEIGHT: float = 0.3  # share of the ranking given to novelty vs past session topics
+
     # AI APIs 
     OPENAI_API_KEY: str = ""
     ANTHROPIC_API_KEY: str = ""
@@ -31,6 +89,7 @@ class Settings(BaseSettings):
     QDRANT_HOST: str = "localhost"
     QDRANT_PORT: int = 6333
     QDRANT_COLLECTION_NAME: str = "a2ais_memories"
+    QDRANT_TOPIC_COLLECTION: str = "a2ais_topics"
     
     # Embeddings
     EMBEDDING_MODEL: str = "text-embedding-3-small"  # OpenAI model
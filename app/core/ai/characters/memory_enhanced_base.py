@@ -18,6 +18,7 @@ from .adaptive_traits import AdaptiveTraits, SessionFeedback
 from .ai_response_analyzer import AIResponseAnalyzer, AIReaction
 from app.core.ai.memory.enhanced_character_memory import EnhancedCharacterMemory
 from app.core.database.service import db_service
+from app.utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -261,8 +262,12 @@ class MemoryEnhancedBaseCharacter(BaseCharacter):
         
         return final_score
     
-    async def generate_response(self, topic: str, context: Dict = None) -> Dict:
-        """Enhanced response generation with memory initialization"""
+    async def generate_response(self, topic: str, context: Dict = None, persist: bool = True) -> Dict:
+        """Enhanced response generation with memory initialization
+        
+        persist=False skips storing the conversation (speculative drafts),
+        call store_generated_response once the response is actually used.
+        """
         
         # Try to initialize memory, but don't block if it fails
         memory_ready = await self.initialize_memory()
@@ -277,23 +282,42 @@ class MemoryEnhancedBaseCharacter(BaseCharacter):
             context["memory_available"] = True
         
         # Build enhanced context (with fallback if memory not ready)
-        if memory_ready:
-            enhanced_context = await self._build_enhanced_context(topic, context)
-        else:
-            enhanced_context = await self._build_fallback_context(topic, context)
+        with tracer.span("context.build", character_id=self.character_id, memory_ready=memory_ready):
+            if memory_ready:
+                enhanced_context = await self._build_enhanced_context(topic, context)
+            else:
+                enhanced_context = await self._build_fallback_context(topic, context)
         
         # Generate response with all influences
         response = await self._generate_database_backed_response(topic, enhanced_context)
         
         # Store conversation in memory (only if memory is ready)
-        if memory_ready:
+        if memory_ready and persist:
             try:
-                await self._store_conversation_with_persistence(response, topic, enhanced_context)
+                with tracer.span("persist.memory", character_id=self.character_id):
+                    await self._store_conversation_with_persistence(response, topic, enhanced_context)
             except Exception as e:
                 logger.warning(f"Failed to store conversation in memory: {e}")
         
         return response
     
+    async def store_generated_response(self, response: Dict, topic: str, context: Dict = None):
+        """Store a response generated with persist=False"""
+        if not self.memory_ready:
+            return
+        try:
+            with tracer.span("persist.memory", character_id=self.character_id):
+                await self._store_conversation_with_persistence(response, topic, context or {})
+        except Exception as e:
+            logger.warning(f"Failed to store conversation in memory: {e}")
+
+    async def generate_analysis(self, prompt: str, max_tokens: int = 150) -> str:
+        """Raw model call for internal analysis (no context build, no memory writes)"""
+        api_client = getattr(self, "api_client", None)
+        if api_client is None:
+            raise RuntimeError(f"{self.character_id} has no API client")
+        return await api_client.generate_response(prompt, max_tokens=max_tokens)
+
     async def _build_fallback_context(self, topic: str, context: Dict) -> Dict:
         """Build basic context when memory is not available"""
         
@@ -337,7 +361,8 @@ class MemoryEnhancedBaseCharacter(BaseCharacter):
             session_id = enhanced_context.get("session_id")
             if session_id:
                 # Get last 5 conversations
-                recent_conversation = await self._get_recent_conversation_context(session_id)
+                with tracer.span("context.recent_conversation"):
+                    recent_conversation = await self._get_recent_conversation_context(session_id)
                 enhanced_context["recent_conversation"] = recent_conversation
                 
                 # If peer-triggered, mark who triggered it
@@ -351,27 +376,31 @@ class MemoryEnhancedBaseCharacter(BaseCharacter):
                             "specific_reaction": getattr(trigger_reaction, 'specific_reaction', '')
                         }
             # 1. Similar conversations from hybrid memory
-            similar_memories = await self.enhanced_memory.find_similar_conversations(
-                current_text=topic,
-                limit=3
-            )
+            with tracer.span("context.similar_memories"):
+                similar_memories = await self.enhanced_memory.find_similar_conversations(
+                    current_text=topic,
+                    limit=3
+                )
             
             # 2. Relationship patterns from database
             other_participants = enhanced_context.get("other_participants", [])
             relationship_patterns = {}
             
-            for participant in other_participants:
-                relationship_patterns[participant] = await self.enhanced_memory.get_relationship_patterns(participant)
+            with tracer.span("context.relationships", participants=len(other_participants)):
+                for participant in other_participants:
+                    relationship_patterns[participant] = await self.enhanced_memory.get_relationship_patterns(participant)
             
             # 3. Character evolution data from database
-            evolution_data = await self.enhanced_memory.get_character_evolution_data()
+            with tracer.span("context.evolution"):
+                evolution_data = await self.enhanced_memory.get_character_evolution_data()
             
             # 4. Learning history from database
-            learning_history = await db_service.get_character_learning_history(
-                character_id=self.character_id,
-                limit=5,
-                event_types=["breakthrough", "success", "failure"]
-            )
+            with tracer.span("context.learning_history"):
+                learning_history = await db_service.get_character_learning_history(
+                    character_id=self.character_id,
+                    limit=5,
+                    event_types=["breakthrough", "success", "failure"]
+                )
             
             # ADAPTIVE TRAITS DATA
             adaptive_summary = self.adaptive_traits.get_adaptation_summary()
@@ -411,12 +440,15 @@ class MemoryEnhancedBaseCharacter(BaseCharacter):
                 # Get historical peer feedback summary
                 peer_feedback_context = await self._get_historical_peer_feedback_summary()
             
+            with tracer.span("context.memory_stats"):
+                memory_stats = await self.enhanced_memory.get_memory_stats()
+            
             enhanced_context.update({
                 "similar_memories": similar_memories,
                 "relationship_patterns": relationship_patterns,
                 "evolution_data": evolution_data,
                 "learning_history": learning_history,
-                "memory_stats": await self.enhanced_memory.get_memory_stats(),
+                "memory_stats": memory_stats,
                 "adaptive": adaptive_context,
                 "peer_feedback": peer_feedback_context
             })
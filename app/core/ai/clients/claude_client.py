@@ -2,8 +2,9 @@
 import logging
 import asyncio
 from typing import Dict, Optional
-from anthropic import AsyncAnthropic
 from app.config.settings import settings
+from app.utils import metrics
+from app.utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -14,17 +15,29 @@ class ClaudeAPIClient:
         self.api_key = settings.ANTHROPIC_API_KEY
         self.client = None
         self._initialized = False
+        self._init_lock: Optional[asyncio.Lock] = None
         
     async def initialize(self):
-        """Initialize the Anthropic client"""
+        """Initialize the Anthropic client (single-flight: concurrent callers share one probe)"""
         if self._initialized:
             return True
-            
+        
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        
+        async with self._init_lock:
+            if self._initialized:
+                return True
+            return await self._connect()
+    
+    async def _connect(self) -> bool:
         if not self.api_key:
             logger.error("❌ Anthropic API key not configured")
             return False
             
         try:
+            from anthropic import AsyncAnthropic  # SDK import deferred to keep startup fast
+
             self.client = AsyncAnthropic(api_key=self.api_key)
             
             # Test connection
@@ -42,19 +55,22 @@ class ClaudeAPIClient:
             logger.error(f"❌ Failed to initialize Claude API: {e}")
             return False
     
-    async def generate_response(self, prompt: str) -> str:
+    async def generate_response(self, prompt: str, max_tokens: int = 50) -> str:
         """Generate Claude response"""
         
         if not await self.initialize():
             raise Exception("Claude API not available")
         
         try:
-            response = await self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=50,
-                temperature=0.8,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            with tracer.span("llm", provider="anthropic", max_tokens=max_tokens) as span:
+                response = await self.client.messages.create(
+                    model="claude-sonnet-4-20250514",
+                    max_tokens=max_tokens,
+                    temperature=0.8,
+                    messages=[{"role": "user", "content": prompt}]
+                )
+            metrics.observe_llm("anthropic", span.duration_ms / 1000,
+                                response.usage.input_tokens, response.usage.output_tokens)
             
             raw_text = response.content[0].text.strip()
             logger.info(f"✅ Claude API response: {raw_text[:50]}...")
@@ -62,6 +78,7 @@ class ClaudeAPIClient:
             return raw_text
             
         except Exception as e:
+            metrics.LLM_ERRORS["anthropic"].inc()
             logger.error(f"❌ Claude API call failed: {e}")
             raise
 
@@ -2,8 +2,9 @@
 import logging
 import asyncio
 from typing import Dict, Optional
-from openai import AsyncOpenAI
 from app.config.settings import settings
+from app.utils import metrics
+from app.utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -14,17 +15,29 @@ class GPTAPIClient:
         self.api_key = settings.OPENAI_API_KEY
         self.client = None
         self._initialized = False
+        self._init_lock: Optional[asyncio.Lock] = None
         
     async def initialize(self):
-        """Initialize the OpenAI client"""
+        """Initialize the OpenAI client (single-flight: concurrent callers share one probe)"""
         if self._initialized:
             return True
-            
+        
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        
+        async with self._init_lock:
+            if self._initialized:
+                return True
+            return await self._connect()
+    
+    async def _connect(self) -> bool:
         if not self.api_key:
             logger.error("❌ OpenAI API key not configured")
             return False
             
         try:
+            from openai import AsyncOpenAI  # SDK import deferred to keep startup fast
+
             self.client = AsyncOpenAI(api_key=self.api_key)
             
             # Test connection
@@ -42,19 +55,23 @@ class GPTAPIClient:
             logger.error(f"❌ Failed to initialize GPT API: {e}")
             return False
     
-    async def generate_response(self, prompt: str) -> str:
+    async def generate_response(self, prompt: str, max_tokens: int = 50) -> str:
         """Generate GPT response"""
         
         if not await self.initialize():
             raise Exception("GPT API not available")
         
         try:
-            response = await self.client.chat.completions.create(
-                model="gpt-4o",
-                max_tokens=50,
-                temperature=0.8,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            with tracer.span("llm", provider="openai", max_tokens=max_tokens) as span:
+                response = await self.client.chat.completions.create(
+                    model="gpt-4o",
+                    max_tokens=max_tokens,
+                    temperature=0.8,
+                    messages=[{"role": "user", "content": prompt}]
+                )
+            usage = response.usage
+            metrics.observe_llm("openai", span.duration_ms / 1000,
+                                usage.prompt_tokens if usage else None, usage.completion_tokens if usage else None)
             
             raw_text = response.choices[0].message.content.strip()
             logger.info(f"✅ GPT API response: {raw_text[:50]}...")
@@ -62,6 +79,7 @@ class GPTAPIClient:
             return raw_text
             
         except Exception as e:
+            metrics.LLM_ERRORS["openai"].inc()
             logger.error(f"❌ GPT API call failed: {e}")
             raise
 
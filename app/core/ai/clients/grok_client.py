@@ -2,9 +2,9 @@
 import logging
 import asyncio
 from typing import Dict, Optional
-from xai_sdk import Client
-from xai_sdk.chat import user
 from app.config.settings import settings
+from app.utils import metrics
+from app.utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -15,17 +15,30 @@ class GrokAPIClient:
         self.api_key = settings.XAI_API_KEY
         self.client = None
         self._initialized = False
+        self._init_lock: Optional[asyncio.Lock] = None
         
     async def initialize(self):
-        """Initialize the xAI client"""
+        """Initialize the xAI client (single-flight: concurrent callers share one probe)"""
         if self._initialized:
             return True
-            
+        
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        
+        async with self._init_lock:
+            if self._initialized:
+                return True
+            return await self._connect()
+    
+    async def _connect(self) -> bool:
         if not self.api_key:
             logger.error("xAI API key not configured")
             return False
             
         try:
+            from xai_sdk import Client  # SDK import deferred to keep startup fast
+            from xai_sdk.chat import user
+
             self.client = Client(api_key=self.api_key)
             
             # Test connection
@@ -34,7 +47,8 @@ class GrokAPIClient:
                 messages=[user("Hi")],
                 temperature=0.7,
             )
-            test_response = test_chat.sample()
+            # Sync SDK: keep the probe off the event loop
+            test_response = await asyncio.to_thread(test_chat.sample)
             
             self._initialized = True
             logger.info("Grok API client initialized")
@@ -44,22 +58,30 @@ class GrokAPIClient:
             logger.error(f"Failed to initialize Grok API: {e}")
             return False
     
-    async def generate_response(self, prompt: str) -> str:
+    async def generate_response(self, prompt: str, max_tokens: Optional[int] = None) -> str:
         """Generate Grok response"""
         
         if not await self.initialize():
             raise Exception("Grok API not available")
         
         try:
+            from xai_sdk.chat import user
+
             # Create chat with user prompt
+            options = {"max_tokens": max_tokens} if max_tokens else {}
             chat = self.client.chat.create(
                 model="grok-3-mini",
                 messages=[user(prompt)],
                 temperature=0.8,
+                **options,
             )
             
-            # Sample response
-            response = chat.sample()
+            # Sample response (sync SDK, keep it off the event loop)
+            with tracer.span("llm", provider="xai", max_tokens=max_tokens or 0) as span:
+                response = await asyncio.to_thread(chat.sample)
+            usage = getattr(response, "usage", None)
+            metrics.observe_llm("xai", span.duration_ms / 1000,
+                                getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None))
             
             # Extract content
             raw_text = response.content.strip()
@@ -68,6 +90,7 @@ class GrokAPIClient:
             return raw_text
             
         except Exception as e:
+            metrics.LLM_ERRORS["xai"].inc()
             logger.error(f"Grok API call failed: {e}")
             raise
 
@@ -3,8 +3,11 @@ import asyncio
 import logging
 from typing import List, Dict, Optional
 import hashlib
+import time
 import uuid
 
+from app.utils import metrics
+
 logger = logging.getLogger(__name__)
 
 class EmbeddingService:
@@ -50,6 +53,7 @@ class EmbeddingService:
         await self._ensure_client()
         
         if not self.client:
+            metrics.EMBEDDING_MOCK.inc()
             return self._generate_mock_embedding(text)
         
         # Create cache key
@@ -57,13 +61,18 @@ class EmbeddingService:
         
         # Check cache
         if cache_key in self._embedding_cache:
+            metrics.EMBEDDING_CACHE_HITS.inc()
             return self._embedding_cache[cache_key]
+        metrics.EMBEDDING_CACHE_MISSES.inc()
         
         try:
+            started = time.perf_counter()
             response = await self.client.embeddings.create(
                 model=self.model,
                 input=text
             )
+            metrics.EMBEDDING_LATENCY.observe(time.perf_counter() - started)
+            metrics.EMBEDDING_TEXTS.inc()
             
             embedding = response.data[0].embedding
             self._embedding_cache[cache_key] = embedding
@@ -81,7 +90,52 @@ class EmbeddingService:
             logger.error(f"Embedding failed: {e}")
             return self._generate_mock_embedding(text)
     
-    async def embed_conversation(self, 
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Embed many texts with one API request (cache hits are skipped)"""
+        await self._ensure_client()
+
+        if not self.client:
+            metrics.EMBEDDING_MOCK.inc(len(texts))
+            return [self._generate_mock_embedding(text) for text in texts]
+
+        keys = [hashlib.md5(f"{self.model}:{text}".encode()).hexdigest() for text in texts]
+        missing = list({key: text for key, text in zip(keys, texts) if key not in self._embedding_cache}.items())
+
+        metrics.EMBEDDING_CACHE_HITS.inc(len(texts) - len(missing))
+        metrics.EMBEDDING_CACHE_MISSES.inc(len(missing))
+
+        if missing:
+            try:
+                started = time.perf_counter()
+                response = await self.client.embeddings.create(
+                    model=self.model,
+                    input=[text for _, text in missing]
+                )
+                metrics.EMBEDDING_LATENCY.observe(time.perf_counter() - started)
+                metrics.EMBEDDING_TEXTS.inc(len(missing))
+                for (key, _), item in zip(missing, sorted(response.data, key=lambda d: d.index)):
+                    self._embedding_cache[key] = item.embedding
+                logger.info(f"Real embeddings generated: {len(missing)} texts in one request")
+            except Exception as e:
+                logger.error(f"Batch embedding failed: {e}")
+                return [self._embedding_cache.get(key) or self._generate_mock_embedding(text)
+                        for key, text in zip(keys, texts)]
+
+        embeddings = [self._embedding_cache[key] for key in keys]
+
+        # Manage cache size
+        if len(self._embedding_cache) > 1000:
+            for key in list(self._embedding_cache.keys())[:len(self._embedding_cache) - 900]:
+                del self._embedding_cache[key]
+
+        return embeddings
+
+    async def is_available(self) -> bool:
+        """True when real (not mock) embeddings are produced"""
+        await self._ensure_client()
+        return self.client is not None
+
+    async def embed_conversation(self,
                                character_id: str,
                                text: str, 
                                emotion: str,
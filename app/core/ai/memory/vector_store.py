@@ -1,14 +1,15 @@
 # app/core/ai/memory/vector_store.py
 import asyncio
 import logging
-from typing import List, Dict, Optional, Any
-from qdrant_client import QdrantClient
-from qdrant_client.models import VectorParams, Distance, Filter, FieldCondition, MatchValue
-from qdrant_client.http.exceptions import UnexpectedResponse
+from typing import TYPE_CHECKING, List, Dict, Optional, Any
 import time
 import uuid
 
 from app.config.settings import settings
+from app.utils import metrics
+
+if TYPE_CHECKING:
+    from qdrant_client import QdrantClient
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +24,9 @@ class MemoryVectorStore:
         self.collection_name = settings.QDRANT_COLLECTION_NAME
         self.dimension = settings.EMBEDDING_DIMENSION
         
-        self.client: Optional[QdrantClient] = None
+        self.client: Optional["QdrantClient"] = None
         self._connection_verified = False
+        self._topic_collection_ready = False
         
     async def _ensure_connection(self):
         """Ensure Qdrant connection is established"""
@@ -32,6 +34,9 @@ class MemoryVectorStore:
             return True
             
         try:
+            # qdrant_client is heavy; import it on first connection, not at startup
+            from qdrant_client import QdrantClient
+
             self.client = QdrantClient(host=self.host, port=self.port)
             
             # Test connection
@@ -104,10 +109,12 @@ class MemoryVectorStore:
                 payload=metadata
             )
             
+            started = time.perf_counter()
             operation_result = self.client.upsert(
                 collection_name=self.collection_name,
                 points=[point]
             )
+            metrics.QDRANT_UPSERT.observe(time.perf_counter() - started)
             
             logger.info(f"Memory stored successfully: {memory_id}")
             return True
@@ -115,6 +122,7 @@ class MemoryVectorStore:
         except VectorStoreError:
             raise  # Re-raise our custom errors
         except Exception as e:
+            metrics.QDRANT_ERRORS.labels("upsert").inc()
             logger.error(f"Failed to store memory {memory_data.get('id', 'unknown')}: {e}")
             raise VectorStoreError(f"Failed to store memory: {e}")
     
@@ -131,6 +139,8 @@ class MemoryVectorStore:
             raise VectorStoreError("Qdrant unavailable - cannot search memories")
         
         try:
+            from qdrant_client.models import Filter, FieldCondition, MatchValue
+
             # Build filter conditions
             must_conditions = []
             
@@ -160,6 +170,7 @@ class MemoryVectorStore:
             
             search_filter = Filter(must=must_conditions) if must_conditions else None
             
+            started = time.perf_counter()
             results = self.client.search(
                 collection_name=self.collection_name,
                 query_vector=query_vector,
@@ -168,6 +179,7 @@ class MemoryVectorStore:
                 with_payload=True,
                 with_vectors=False
             )
+            metrics.QDRANT_SEARCH.observe(time.perf_counter() - started)
             
             formatted_results = []
             for result in results:
@@ -181,6 +193,7 @@ class MemoryVectorStore:
             return formatted_results
             
         except Exception as e:
+            metrics.QDRANT_ERRORS.labels("search").inc()
             logger.error(f"Memory search failed: {e}")
             raise VectorStoreError(f"Failed to search memories: {e}")
     
@@ -198,6 +211,83 @@ class MemoryVectorStore:
             logger.error(f"Failed to count memories: {e}")
             raise VectorStoreError(f"Failed to count memories: {e}")
     
+    async def _ensure_topic_collection(self) -> bool:
+        """Separate collection for past session topics"""
+        if not await self._ensure_connection():
+            return False
+
+        if self._topic_collection_ready:
+            return True
+
+        try:
+            self.client.get_collection(settings.QDRANT_TOPIC_COLLECTION)
+        except Exception:
+            try:
+                from qdrant_client.models import VectorParams, Distance
+
+                self.client.create_collection(
+                    collection_name=settings.QDRANT_TOPIC_COLLECTION,
+                    vectors_config=VectorParams(size=self.dimension, distance=Distance.COSINE)
+                )
+                logger.info(f"✅ Created collection '{settings.QDRANT_TOPIC_COLLECTION}'")
+            except Exception as e:
+                logger.error(f"Topic collection creation failed: {e}")
+                raise VectorStoreError(f"Failed to create topic collection: {e}")
+
+        self._topic_collection_ready = True
+        return True
+
+    async def store_topic(self, vector: List[float], payload: Dict) -> str:
+        """Store the embedding of a topic used in a session"""
+
+        if not await self._ensure_topic_collection():
+            raise VectorStoreError("Qdrant unavailable - cannot store topic")
+
+        try:
+            from qdrant_client.models import PointStruct
+
+            topic_id = str(uuid.uuid4())
+            started = time.perf_counter()
+            self.client.upsert(
+                collection_name=settings.QDRANT_TOPIC_COLLECTION,
+                points=[PointStruct(id=topic_id, vector=[float(x) for x in vector], payload=payload)]
+            )
+            metrics.QDRANT_UPSERT.observe(time.perf_counter() - started)
+            return topic_id
+
+        except Exception as e:
+            metrics.QDRANT_ERRORS.labels("upsert").inc()
+            logger.error(f"Failed to store topic: {e}")
+            raise VectorStoreError(f"Failed to store topic: {e}")
+
+    async def search_topics_batch(self, vectors: List[List[float]], limit: int = 1) -> List[List[Dict]]:
+        """Nearest past topics for every query vector, in one request"""
+
+        if not await self._ensure_topic_collection():
+            raise VectorStoreError("Qdrant unavailable - cannot search topics")
+
+        try:
+            from qdrant_client.models import SearchRequest
+
+            started = time.perf_counter()
+            batches = self.client.search_batch(
+                collection_name=settings.QDRANT_TOPIC_COLLECTION,
+                requests=[
+                    SearchRequest(vector=[float(x) for x in vector], limit=limit, with_payload=True)
+                    for vector in vectors
+                ]
+            )
+            metrics.QDRANT_SEARCH_BATCH.observe(time.perf_counter() - started)
+            return [
+                [{"score": result.score, "topic": result.payload, "id": result.id} for result in results]
+                for results in batches
+            ]
+
+        except Exception as e:
+            metrics.QDRANT_ERRORS.labels("search_batch").inc()
+            logger.error(f"Topic search failed: {e}")
+            raise VectorStoreError(f"Failed to search topics: {e}")
+
     async def test_connection(self) -> bool:
         """Test vector store connection"""
         try:
@@ -1,12 +1,19 @@
 # app/core/content/autonomous_topic_selector.py
 import asyncio
+import json
 import logging
 import random
+import re
 import time
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 
+from app.config.settings import settings
 from app.core.ai.characters import get_character
+from app.core.content.near_duplicates import NearDuplicateIndex
+from app.core.content.text_scoring import get_keyword_scorer
+from app.core.content.topic_feed import topic_feed
+from app.core.content.topic_intelligence import topic_intelligence
 from app.core.content.topic_sources import TopicDetector, TopicSource
 
 logger = logging.getLogger(__name__)
@@ -21,6 +28,8 @@ class AITopicAnalysis:
     expected_emotion: str      # What emotion they'd have
     confidence: float          # 0-1, how confident they are about this topic
 
+ANALYSIS_EMOTIONS = {"neutral", "thinking", "excited", "skeptical", "happy", "concerned", "curious"}
+
 class AutonomousTopicSelector:
     """Let AI characters autonomously choose and evaluate topics"""
     
@@ -29,6 +38,19 @@ class AutonomousTopicSelector:
         self.characters = {}
         self.topic_history = []  # Track what topics were already used
         
+        # Every topic ever used, for near-duplicate filtering across restarts
+        self.topic_index = NearDuplicateIndex(persist_path=settings.TOPIC_HISTORY_PATH)
+        self.topic_index.load()
+        self._analysis_semaphore: Optional[asyncio.Semaphore] = None
+        self.keyword_scorer = get_keyword_scorer()
+        
+    @property
+    def analysis_semaphore(self) -> asyncio.Semaphore:
+        """Shared limit on in-flight analysis calls (created inside the running loop)"""
+        if self._analysis_semaphore is None:
+            self._analysis_semaphore = asyncio.Semaphore(max(1, settings.TOPIC_ANALYSIS_CONCURRENCY))
+        return self._analysis_semaphore
+        
     async def initialize_characters(self):
         """Initialize AI characters for topic selection"""
         for char_id in ["claude", "gpt", "grok"]:
@@ -42,9 +64,9 @@ class AutonomousTopicSelector:
         
         logger.info("Starting AI autonomous topic selection...")
         
-        # 1. Get candidate topics if not provided
+        # 1. Get candidate topics if not provided (served from the feed, never waits on Reddit)
         if not candidate_topics:
-            candidate_topics = await self.topic_detector.get_trending_topics(count=10, force_refresh=True)
+            candidate_topics = await topic_feed.get_topics(count=10)
         
         # Filter out recently used topics
         fresh_topics = self._filter_recent_topics(candidate_topics)
@@ -55,24 +77,34 @@ class AutonomousTopicSelector:
         
         logger.info(f"valuating {len(fresh_topics)} candidate topics with AI characters")
         
-        # 2. Each AI character analyzes each topic
-        ai_analyses = {}
+        # 2. Keep one representative per semantic cluster, favouring novel topics
+        candidates = await topic_intelligence.select_candidates(fresh_topics, settings.TOPIC_CANDIDATES)
         
-        for char_id in ["claude", "gpt", "grok"]:
-            logger.info(f"{char_id} analyzing topics...")
-            char_analyses = await self._ai_analyze_topics(char_id, fresh_topics[:5])
-            ai_analyses[char_id] = char_analyses
+        # 3. Each AI character analyzes each topic (concurrently, bounded by the semaphore)
+        character_ids = ["claude", "gpt", "grok"]
+        analysis_start = time.perf_counter()
+        
+        results = await asyncio.gather(*(
+            self._ai_analyze_topics(char_id, candidates) for char_id in character_ids
+        ))
+        ai_analyses = dict(zip(character_ids, results))
         
-        # 3. AI characters vote/discuss which topic to choose
-        selected_topic_data = await self._ai_consensus_selection(ai_analyses, fresh_topics[:5])
+        logger.info(f"⚡ Topic analysis for {len(character_ids)} characters x {len(candidates)} topics "
+                    f"took {time.perf_counter() - analysis_start:.2f}s")
         
-        # 4. Store in history to avoid repetition
+        # 4. AI characters vote/discuss which topic to choose
+        selected_topic_data = await self._ai_consensus_selection(ai_analyses, candidates)
+        
+        # 5. Store in history to avoid repetition
         self.topic_history.append({
             "topic": selected_topic_data["topic"],
             "timestamp": time.time(),
             "selected_by": selected_topic_data["primary_selector"],
             "consensus_score": selected_topic_data["consensus_score"]
         })
+        self.topic_index.add(selected_topic_data["topic"].title)
+        self.topic_index.save()
+        await topic_intelligence.remember(selected_topic_data["topic"])
         
         logger.info(f"AI selected topic: {selected_topic_data['topic'].title[:50]}...")
         
@@ -81,52 +113,129 @@ class AutonomousTopicSelector:
     async def _ai_analyze_topics(self, character_id: str, topics: List[TopicSource]) -> List[AITopicAnalysis]:
         """Have a specific AI character analyze topics"""
         
-        character = self.characters[character_id]
-        analyses = []
+        logger.info(f"{character_id} analyzing topics...")
+        analyses: Dict[int, AITopicAnalysis] = {}
         
-        for topic in topics:
+        if settings.TOPIC_ANALYSIS_BATCHED and len(topics) > 1:
+            analyses = await self._ai_analyze_topics_batched(character_id, topics)
+        
+        # Anything the batch didn't cover gets its own call, all in parallel
+        missing = [index for index in range(len(topics)) if index not in analyses]
+        if missing:
+            singles = await asyncio.gather(*(
+                self._ai_analyze_topic(character_id, topics[index]) for index in missing
+            ))
+            analyses.update(zip(missing, singles))
+        
+        return [analyses[index] for index in range(len(topics))]
+
+    async def _call_analysis(self, character_id: str, prompt: str, max_tokens: int) -> str:
+        """Analysis-only model call under the shared concurrency limit"""
+        character = self.characters.get(character_id) or get_character(character_id)
+        async with self.analysis_semaphore:
+            return await asyncio.wait_for(
+                character.generate_analysis(prompt, max_tokens=max_tokens),
+                timeout=settings.TOPIC_ANALYSIS_TIMEOUT
+            )
+
+    async def _ai_analyze_topic(self, character_id: str, topic: TopicSource) -> AITopicAnalysis:
+        """Analyze one topic with a single lightweight call"""
+        
+        analysis_prompt = f"""
+        Topic: "{topic.title}"
+        Source: {topic.source}
+        Keywords: {', '.join(topic.keywords[:5])}
+        
+        Analyze this topic from your perspective as {character_id}:
+        1. How interested are you in this topic? (0-1)
+        2. How much debate potential does it have? (0-1)  
+        3. What angle would you take in discussing this?
+        4. What emotion would you feel about this topic?
+        5. How confident are you about this subject? (0-1)
+        
+        Respond as {character_id} would respond.
+        """
+        
+        try:
+            text = await self._call_analysis(character_id, analysis_prompt, max_tokens=150)
+            analysis = self._parse_ai_topic_analysis(character_id, topic, text, "neutral")
+            logger.debug(f"   {character_id} topic analysis: interest={analysis.interest_level:.2f}, debate={analysis.debate_potential:.2f}")
+            return analysis
+            
+        except Exception as e:
+            logger.error(f"{character_id} failed to analyze topic '{topic.title}': {e}")
+            return self._generate_fallback_analysis(character_id, topic)
+
+    async def _ai_analyze_topics_batched(self, character_id: str, 
+                                         topics: List[TopicSource]) -> Dict[int, AITopicAnalysis]:
+        """Score every topic in one call; returns analyses keyed by topic index"""
+        
+        topic_lines = "\n".join(
+            f"{number}. \"{topic.title}\" (source: {topic.source}; keywords: {', '.join(topic.keywords[:5])})"
+            for number, topic in enumerate(topics, 1)
+        )
+        analysis_prompt = f"""
+        You are {character_id}. Rate each of these candidate debate topics from your own perspective.
+        
+        {topic_lines}
+        
+        Reply with only a JSON array, one object per topic:
+        [{{"topic": 1, "interest": 0.0-1.0, "debate": 0.0-1.0, "confidence": 0.0-1.0, "angle": "a few words", "emotion": "one word"}}]
+        """
+        
+        try:
+            text = await self._call_analysis(character_id, analysis_prompt, max_tokens=80 * len(topics) + 40)
+        except Exception as e:
+            logger.warning(f"⚠️ {character_id} batched topic analysis failed, analyzing topics individually: {e}")
+            return {}
+        
+        analyses = self._parse_batched_analysis(character_id, topics, text)
+        logger.debug(f"   {character_id} batched analysis covered {len(analyses)}/{len(topics)} topics")
+        return analyses
+
+    def _parse_batched_analysis(self, character_id: str, topics: List[TopicSource], 
+                                ai_response: str) -> Dict[int, AITopicAnalysis]:
+        """Parse the JSON score list from a batched analysis"""
+        
+        match = re.search(r"\[.*\]", ai_response, re.DOTALL)
+        if not match:
+            return {}
+        try:
+            entries = json.loads(match.group(0))
+        except ValueError:
+            return {}
+        
+        def score(entry: Dict, key: str) -> float:
             try:
-                # Generate AI's analysis of this topic
-                analysis_prompt = f"""
-                Topic: "{topic.title}"
-                Source: {topic.source}
-                Keywords: {', '.join(topic.keywords[:5])}
-                
-                Analyze this topic from your perspective as {character_id}:
-                1. How interested are you in this topic? (0-1)
-                2. How much debate potential does it have? (0-1)  
-                3. What angle would you take in discussing this?
-                4. What emotion would you feel about this topic?
-                5. How confident are you about this subject? (0-1)
-                
-                Respond as {character_id} would respond.
-                """
-                
-                # Generate character's response
-                response = await character.generate_response(
-                    topic=analysis_prompt,
-                    context={
-                        "analysis_mode": True,
-                        "topic_evaluation": True,
-                        "character_perspective": character_id
-                    }
-                )
-                
-                # Parse AI's response to extract metrics
-                analysis = self._parse_ai_topic_analysis(
-                    character_id, topic, response["text"], response["facialExpression"]
-                )
-                
-                analyses.append(analysis)
-                
-                logger.debug(f"   {character_id} topic analysis: interest={analysis.interest_level:.2f}, debate={analysis.debate_potential:.2f}")
-                
-            except Exception as e:
-                logger.error(f"{character_id} failed to analyze topic '{topic.title}': {e}")
-                
-                # Fallback analysis
-                fallback_analysis = self._generate_fallback_analysis(character_id, topic)
-                analyses.append(fallback_analysis)
+                return min(1.0, max(0.0, float(entry.get(key, 0.5))))
+            except (TypeError, ValueError):
+                return 0.5
+        
+        analyses = {}
+        for position, entry in enumerate(entries if isinstance(entries, list) else []):
+            if not isinstance(entry, dict):
+                continue
+            try:
+                index = int(entry.get("topic", position + 1)) - 1
+            except (TypeError, ValueError):
+                index = position
+            if not 0 <= index < len(topics) or index in analyses:
+                continue
+            
+            interest_level, debate_potential, confidence = self._apply_character_bias(
+                character_id, score(entry, "interest"), score(entry, "debate"), score(entry, "confidence")
+            )
+            emotion = str(entry.get("emotion", "")).strip().lower()
+            
+            analyses[index] = AITopicAnalysis(
+                character_id=character_id,
+                topic=topics[index],
+                interest_level=interest_level,
+                debate_potential=debate_potential,
+                personal_angle=self._extract_personal_angle(character_id, str(entry.get("angle", ""))),
+                expected_emotion=emotion if emotion in ANALYSIS_EMOTIONS else "neutral",
+                confidence=confidence
+            )
         
         return analyses
 
@@ -134,41 +243,58 @@ class AutonomousTopicSelector:
                                 ai_response: str, ai_emotion: str) -> AITopicAnalysis:
         """Parse AI's natural language response into structured analysis"""
         
-        response_lower = ai_response.lower()
+        hits = self.keyword_scorer.match(ai_response)
         
         # Extract interest level from AI's language
         interest_level = 0.5  # default
         
         # High interest indicators
-        if any(word in response_lower for word in ["fascinating", "incredibly", "really interested", "love this", "excited"]):
+        if "interest_high" in hits:
             interest_level = 0.8 + random.random() * 0.2
-        elif any(word in response_lower for word in ["interesting", "intriguing", "curious", "compelling"]):
+        elif "interest_mid" in hits:
             interest_level = 0.6 + random.random() * 0.3
-        elif any(word in response_lower for word in ["boring", "uninteresting", "not relevant", "don't care"]):
+        elif "interest_low" in hits:
             interest_level = 0.1 + random.random() * 0.3
         
         # Extract debate potential from AI's analysis
         debate_potential = 0.5  # default
         
-        if any(phrase in response_lower for phrase in ["highly controversial", "debate potential", "strongly disagree", "contentious"]):
+        if "debate_high" in hits:
             debate_potential = 0.8 + random.random() * 0.2
-        elif any(word in response_lower for word in ["controversial", "disagreement", "debate", "argue"]):
+        elif "debate_mid" in hits:
             debate_potential = 0.6 + random.random() * 0.3
-        elif any(word in response_lower for word in ["consensus", "everyone agrees", "obvious", "settled"]):
+        elif "debate_low" in hits:
             debate_potential = 0.2 + random.random() * 0.3
         
         # Extract personal angle from response
-        personal_angle = self._extract_personal_angle(character_id, ai_response)
+        personal_angle = self._extract_personal_angle(character_id, ai_response, hits)
         
         # Extract confidence level
         confidence = 0.5  # default
         
-        if any(word in response_lower for word in ["confident", "certain", "definitely", "clearly"]):
+        if "confidence_high" in hits:
             confidence = 0.7 + random.random() * 0.3
-        elif any(word in response_lower for word in ["uncertain", "maybe", "not sure", "unclear"]):
+        elif "confidence_low" in hits:
             confidence = 0.2 + random.random() * 0.4
         
-        # Character-specific adjustments
+        interest_level, debate_potential, confidence = self._apply_character_bias(
+            character_id, interest_level, debate_potential, confidence
+        )
+        
+        return AITopicAnalysis(
+            character_id=character_id,
+            topic=topic,
+            interest_level=interest_level,
+            debate_potential=debate_potential,
+            personal_angle=personal_angle,
+            expected_emotion=ai_emotion,
+            confidence=confidence
+        )
+
+    def _apply_character_bias(self, character_id: str, interest_level: float,
+                              debate_potential: float, confidence: float) -> tuple:
+        """Character-specific adjustments, clipped to 1.0"""
+        
         if character_id == "claude":
             # Claude tends to be more measured
             interest_level *= 0.9
@@ -183,42 +309,36 @@ class AutonomousTopicSelector:
                 interest_level *= 1.2
             confidence *= 1.1
         
-        return AITopicAnalysis(
-            character_id=character_id,
-            topic=topic,
-            interest_level=min(1.0, interest_level),
-            debate_potential=min(1.0, debate_potential),
-            personal_angle=personal_angle,
-            expected_emotion=ai_emotion,
-            confidence=min(1.0, confidence)
-        )
+        return min(1.0, interest_level), min(1.0, debate_potential), min(1.0, confidence)
 
-    def _extract_personal_angle(self, character_id: str, ai_response: str) -> str:
+    def _extract_personal_angle(self, character_id: str, ai_response: str,
+                                hits: Optional[Dict[str, set]] = None) -> str:
         """Extract what angle the AI would take on this topic"""
         
-        response_lower = ai_response.lower()
+        if hits is None:
+            hits = self.keyword_scorer.match(ai_response)
         
         # Character-specific angle detection
         if character_id == "claude":
-            if "ethical" in response_lower or "implications" in response_lower:
+            if "angle_ethical" in hits:
                 return "ethical_implications"
-            elif "careful" in response_lower or "cautious" in response_lower:
+            elif "angle_cautious" in hits:
                 return "cautious_analysis"
             else:
                 return "thoughtful_examination"
         
         elif character_id == "gpt":
-            if "creative" in response_lower or "possibilities" in response_lower:
+            if "angle_creative" in hits:
                 return "creative_exploration"
-            elif "exciting" in response_lower or "innovative" in response_lower:
+            elif "angle_optimistic" in hits:
                 return "optimistic_expansion"
             else:
                 return "enthusiastic_support"
         
         elif character_id == "grok":
-            if "problem" in response_lower or "issues" in response_lower:
+            if "angle_problem" in hits:
                 return "problem_identification"
-            elif "realistic" in response_lower or "practical" in response_lower:
+            elif "angle_realistic" in hits:
                 return "reality_check"
             else:
                 return "skeptical_analysis"
@@ -350,51 +470,16 @@ class AutonomousTopicSelector:
         }
 
     def _filter_recent_topics(self, topics: List[TopicSource]) -> List[TopicSource]:
-        """Filter out topics that were recently used"""
+        """Filter out topics that were already used (including reposts and rephrasings)"""
         
-        if not self.topic_history:
+        if not len(self.topic_index):
             return topics
         
-        # Get titles of recently used topics (last 10)
-        recent_titles = {
-            entry["topic"].title.lower().strip() 
-            for entry in self.topic_history[-10:]
-        }
-        
-        # Filter out similar topics
-        fresh_topics = []
-        for topic in topics:
-            topic_title = topic.title.lower().strip()
-            
-            # Check for exact matches or very similar topics
-            is_recent = any(
-                topic_title == recent_title or 
-                self._topics_similar(topic_title, recent_title)
-                for recent_title in recent_titles
-            )
-            
-            if not is_recent:
-                fresh_topics.append(topic)
+        fresh_topics = [topic for topic in topics if not self.topic_index.is_duplicate(topic.title)]
         
         logger.info(f"🔄 Filtered {len(topics) - len(fresh_topics)} recent topics")
         return fresh_topics
 
-    def _topics_similar(self, title1: str, title2: str) -> bool:
-        """Check if two topics are too similar"""
-        
-        # Simple similarity check based on common words
-        words1 = set(title1.split())
-        words2 = set(title2.split())
-        
-        # If they share more than 50% of words, consider them similar
-        if len(words1) == 0 or len(words2) == 0:
-            return False
-        
-        intersection = words1.intersection(words2)
-        similarity = len(intersection) / min(len(words1), len(words2))
-        
-        return similarity > 0.5
-
     async def get_ai_selected_topic(self) -> Optional[Dict]:
         """Main method: Let AI autonomously select a topic"""
         
@@ -0,0 +1,212 @@
+# app/core/content/near_duplicates.py
+"""
+Near-duplicate topic index
+Titles are reduced to stemmed word shingles, summarized as MinHash signatures
+and bucketed with LSH, so a lookup only compares against the few titles that
+share a band instead of the whole history. Persisted to JSON for restarts.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+# Words that carry no topic identity; dropping them makes rephrasings collide
+_FILLER_WORDS = {
+    "a", "an", "the", "is", "are", "was", "be", "to", "of", "in", "on", "for", "and", "or",
+    "it", "its", "this", "that", "will", "can", "do", "does", "just", "about", "with", "by"
+}
+
+def _stem(word: str) -> str:
+    """Crude suffix stripping so "releases"/"released"/"release" collide"""
+    for suffix in ("ing", "ed", "es", "s", "e"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+def normalize_title(title: str) -> str:
+    words = _NON_WORD.sub(" ", title.lower()).split()
+    kept = [_stem(word) for word in words if word not in _FILLER_WORDS]
+    return " ".join(kept or words)
+
+def shingles(title: str, size: int = 2) -> Set[str]:
+    """Word 1..size-gram shingles of the normalized title; the n-grams keep
+    word order, so titles sharing a subject but not the claim stay apart"""
+    words = normalize_title(title).split()
+    return {" ".join(words[i:i + n]) for n in range(1, size + 1) for i in range(len(words) - n + 1)}
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """(bands, rows) whose LSH S-curve midpoint sits just below the threshold"""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        # Candidate probability passes 50% at roughly (1/b)^(1/r); favour recall
+        if (1.0 / bands) ** (1.0 / rows) <= threshold * 0.9:
+            best = (bands, rows)
+    return best
+
+class NearDuplicateIndex:
+    """MinHash + LSH index over topic titles"""
+
+    def __init__(self,
+                 threshold: Optional[float] = None,
+                 num_perm: int = 128,
+                 shingle_size: int = 2,
+                 max_entries: Optional[int] = None,
+                 persist_path: Optional[str] = None,
+                 seed: int = 1):
+        self.threshold = settings.TOPIC_DUPLICATE_THRESHOLD if threshold is None else threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.max_entries = settings.TOPIC_HISTORY_MAX if max_entries is None else max_entries
+        self.persist_path = persist_path
+        self.seed = seed
+        self.bands, self.rows = choose_bands(num_perm, self.threshold)
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()  # normalized title -> entry
+        self._buckets: Dict[Tuple[int, bytes], Set[str]] = {}
+
+        self.lookups = 0
+        self.candidates_checked = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Signatures
+
+    def signature(self, title: str) -> np.ndarray:
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode()) % _MERSENNE_PRIME for shingle in shingles(title, self.shingle_size)),
+            dtype=np.uint64
+        )
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MERSENNE_PRIME, dtype=np.uint64)
+        # (a*x + b) mod p for every permutation x shingle, min over shingles
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    # Index
+
+    def add(self, title: str, timestamp: Optional[float] = None, signature: Optional[np.ndarray] = None):
+        key = normalize_title(title)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self._entries[key]["timestamp"] = timestamp or time.time()
+            return
+
+        signature = self.signature(title) if signature is None else signature
+        self._entries[key] = {"title": title, "timestamp": timestamp or time.time(), "signature": signature}
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            self._evict_oldest()
+
+    def _evict_oldest(self):
+        key, entry = self._entries.popitem(last=False)
+        for band_key in self._band_keys(entry["signature"]):
+            bucket = self._buckets.get(band_key)
+            if bucket:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def query(self, title: str, threshold: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Indexed titles estimated at or above the similarity threshold, most similar first"""
+        threshold = self.threshold if threshold is None else threshold
+        signature = self.signature(title)
+        self.lookups += 1
+
+        candidates: Set[str] = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        self.candidates_checked += len(candidates)
+
+        matches = []
+        for key in candidates:
+            entry = self._entries[key]
+            similarity = float(np.mean(entry["signature"] == signature))
+            if similarity >= threshold:
+                matches.append((entry["title"], similarity))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def is_duplicate(self, title: str) -> bool:
+        return normalize_title(title) in self._entries or bool(self.query(title))
+
+    # Persistence
+
+    def save(self):
+        if not self.persist_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.persist_path) or ".", exist_ok=True)
+            temp_path = f"{self.persist_path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump({
+                    "num_perm": self.num_perm,
+                    "shingle_size": self.shingle_size,
+                    "seed": self.seed,
+                    "entries": [
+                        {"title": e["title"], "timestamp": e["timestamp"], "signature": e["signature"].tolist()}
+                        for e in self._entries.values()
+                    ]
+                }, f)
+            os.replace(temp_path, self.persist_path)
+        except OSError as e:
+            logger.warning(f"Failed to persist topic history: {e}")
+
+    def load(self) -> int:
+        """Restore persisted titles; signatures are recomputed if the hashing setup changed"""
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return 0
+        try:
+            with open(self.persist_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable topic history {self.persist_path}: {e}")
+            return 0
+
+        compatible = (data.get("num_perm"), data.get("shingle_size"), data.get("seed")) == \
+            (self.num_perm, self.shingle_size, self.seed)
+        for entry in data.get("entries", []):
+            signature = np.array(entry["signature"], dtype=np.uint64) if compatible else None
+            self.add(entry["title"], entry.get("timestamp"), signature)
+
+        logger.info(f"📚 Loaded {len(self)} topics into the near-duplicate index")
+        return len(self)
+
+    def get_stats(self) -> Dict:
+        return {
+            "entries": len(self),
+            "buckets": len(self._buckets),
+            "bands": self.bands,
+            "rows": self.rows,
+            "threshold": self.threshold,
+            "lookups": self.lookups,
+            "avg_candidates": round(self.candidates_checked / self.lookups, 2) if self.lookups else 0.0
+        }
@@ -0,0 +1,147 @@
+# app/core/content/text_scoring.py
+"""
+Shared keyword scoring engine
+Every keyword set is compiled once into a single word-boundary-aware regex
+alternation, so one scan of a text (or a whole batch of texts) finds the hits
+for all sets at once. "ai" no longer matches inside "said" or "detail".
+"""
+
+import bisect
+import json
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEYWORDS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                                     "config", "topic_keywords.json")
+
+def _normalize(keyword: str) -> str:
+    return " ".join(keyword.lower().split())
+
+def _inflections(keyword: str) -> Tuple[str, ...]:
+    """Surface forms that count for a keyword: plural and -ing/-ed on the last word"""
+    if keyword.endswith("e"):
+        # replace -> replaces, replacing, replaced
+        return (keyword, keyword + "s", keyword[:-1] + "ing", keyword + "d")
+    return (keyword, keyword + "s", keyword + "es", keyword + "ing", keyword + "ed")
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex alternation for the keywords, factored by common prefix"""
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node: Dict) -> str:
+        branches = [
+            (r"[^\S\n]+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A keyword ends here: the longer continuations are optional (greedy, so longest wins)
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+class KeywordScorer:
+    """Finds which keywords of which named sets occur in a text, in one pass
+
+    Keywords should start and end with a word character (they are matched
+    on word boundaries).
+    """
+
+    def __init__(self, keyword_sets: Dict[str, Iterable[str]]):
+        self.sets: Dict[str, Tuple[str, ...]] = {
+            name: tuple(dict.fromkeys(_normalize(k) for k in keywords if k.strip()))
+            for name, keywords in keyword_sets.items()
+        }
+
+        # matched text -> every (set, keyword) it counts for; inflected forms
+        # count for the stem too, so "debated" hits "debate" and "problems"
+        # hits both "problems" and "problem"
+        self._lookup: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+        for name, keywords in self.sets.items():
+            for keyword in keywords:
+                for surface in _inflections(keyword):
+                    if (name, keyword) not in self._lookup.get(surface, ()):
+                        self._lookup[surface] = self._lookup.get(surface, ()) + ((name, keyword),)
+
+        # One alternation of every surface form factored into a character trie:
+        # the regex engine then walks shared prefixes once instead of retrying
+        # every keyword at every position. Texts are lowercased up front and
+        # spaces inside phrases match any run of spaces or tabs.
+        alternation = _trie_pattern(self._lookup)
+        self._pattern = re.compile(rf"\b({alternation})\b") if alternation else None
+
+    def keywords(self, set_name: str) -> Tuple[str, ...]:
+        return self.sets.get(set_name, ())
+
+    def match(self, text: str) -> Dict[str, Set[str]]:
+        """Distinct keywords found per set (sets with no hits are omitted)"""
+        hits: Dict[str, Set[str]] = {}
+        if self._pattern is None or not text:
+            return hits
+        for keyword in self._pattern.findall(text.lower()):
+            self._add_hit(hits, keyword)
+        return hits
+
+    def _add_hit(self, hits: Dict[str, Set[str]], matched: str):
+        entries = self._lookup.get(matched)
+        if entries is None:
+            # Phrase matched with unusual whitespace
+            entries = self._lookup.get(_normalize(matched), ())
+        for name, keyword in entries:
+            if name in hits:
+                hits[name].add(keyword)
+            else:
+                hits[name] = {keyword}
+
+    def match_batch(self, texts: List[str]) -> List[Dict[str, Set[str]]]:
+        """match() for many texts with a single regex scan over all of them"""
+        results: List[Dict[str, Set[str]]] = [{} for _ in texts]
+        if self._pattern is None or not texts:
+            return results
+
+        # Newlines can never be part of a keyword match, so they separate texts safely
+        cleaned = [text.lower().replace("\n", " ") for text in texts]
+        starts = []
+        offset = 0
+        for text in cleaned:
+            starts.append(offset)
+            offset += len(text) + 1
+
+        for found in self._pattern.finditer("\n".join(cleaned)):
+            self._add_hit(results[bisect.bisect_right(starts, found.start()) - 1], found.group(1))
+        return results
+
+    def count(self, text: str, set_name: str) -> int:
+        return len(self.match(text).get(set_name, ()))
+
+    def contains(self, text: str, set_name: str) -> bool:
+        return set_name in self.match(text)
+
+def load_keyword_sets(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """Keyword sets from a JSON file of {set_name: [keywords]}"""
+    path = path or settings.TOPIC_KEYWORDS_PATH or DEFAULT_KEYWORDS_PATH
+    with open(path) as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not all(isinstance(v, list) for v in data.values()):
+        raise ValueError(f"{path} must map set names to keyword lists")
+    return data
+
+@lru_cache(maxsize=None)
+def get_keyword_scorer(path: Optional[str] = None) -> KeywordScorer:
+    """Shared scorer, compiled once per keyword file"""
+    keyword_sets = load_keyword_sets(path)
+    logger.info(f"Compiled {len(keyword_sets)} keyword sets for topic scoring")
+    return KeywordScorer(keyword_sets)
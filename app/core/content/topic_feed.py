@@ -0,0 +1,235 @@
+# app/core/content/topic_feed.py
+"""
+Background topic feed
+Refreshes trending topics on a schedule behind a token-bucket rate limit,
+serves the last feed immediately (stale-while-revalidate) and persists the
+last good feed to disk so a cold start never waits on Reddit
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import asdict
+from typing import Dict, List, Optional
+
+from app.config.settings import settings
+from app.utils import metrics
+from app.core.content.topic_sources import TopicDetector, TopicSource, topic_detector
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        """Created inside the running loop (Python 3.9 binds locks to the loop at construction)"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+class TopicFeed:
+    """Always-available trending topics, revalidated in the background"""
+
+    RETRY_DELAY = 120.0
+
+    def __init__(self,
+                 detector: Optional[TopicDetector] = None,
+                 refresh_interval: Optional[float] = None,
+                 persist_path: Optional[str] = None,
+                 feed_size: int = 20):
+        self.detector = detector or topic_detector
+        self.refresh_interval = settings.TOPIC_FEED_REFRESH_INTERVAL if refresh_interval is None else refresh_interval
+        self.persist_path = settings.TOPIC_FEED_PATH if persist_path is None else persist_path
+        self.feed_size = feed_size
+        self.rate_limiter = TokenBucket(settings.REDDIT_REQUESTS_PER_SECOND)
+
+        self.topics: List[TopicSource] = []
+        self.fetched_at = 0.0
+        self.source = "empty"  # empty | disk | live | curated
+
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.stale_serves = 0
+        self.last_refresh_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    # Reads
+
+    @property
+    def age(self) -> Optional[float]:
+        return time.time() - self.fetched_at if self.fetched_at else None
+
+    @property
+    def is_stale(self) -> bool:
+        # A curated stand-in always counts as stale so Reddit keeps being retried
+        return self.age is None or self.age > self.refresh_interval or self.source == "curated"
+
+    async def get_topics(self, count: int = 10) -> List[TopicSource]:
+        """Current feed right away; kicks off a background refresh when stale"""
+        if not self.topics:
+            self.load()
+
+        if self.is_stale:
+            self.stale_serves += 1
+            self.revalidate()
+
+        if not self.topics:
+            # Nothing cached anywhere yet: curated topics until the first refresh lands
+            logger.info("📋 Topic feed empty, serving curated topics while Reddit refreshes")
+            return await self.detector.curated_provider.get_curated_topics(count)
+
+        return self.topics[:count]
+
+    # Refreshing
+
+    def revalidate(self) -> Optional[asyncio.Task]:
+        """Start a refresh unless one is already running"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh())
+        return self._refresh_task
+
+    async def refresh(self) -> bool:
+        """Fetch a new feed; keeps the previous one if the fetch fails"""
+        started = time.perf_counter()
+        try:
+            reddit_topics = await self.detector.reddit_fetcher.fetch_reddit_topics(
+                max_per_sub=5, rate_limiter=self.rate_limiter
+            )
+        except Exception as e:
+            reddit_topics = []
+            self.last_error = str(e)
+            logger.error(f"❌ Topic feed refresh failed: {e}")
+
+        self.last_refresh_seconds = time.perf_counter() - started
+
+        if not reddit_topics:
+            self.refresh_failures += 1
+            metrics.TOPIC_FEED_REFRESH_FAILURES.inc()
+            if not self.topics:
+                self._publish(await self.detector.curated_provider.get_curated_topics(self.feed_size), "curated")
+            return False
+
+        self.refreshes += 1
+        self.last_error = None
+        self._publish(self.detector.rank_topics(reddit_topics)[:self.feed_size], "live")
+        self.save()
+        logger.info(f"🔄 Topic feed refreshed: {len(self.topics)} topics in {self.last_refresh_seconds:.1f}s")
+        return True
+
+    def _publish(self, topics: List[TopicSource], source: str):
+        self.topics = topics
+        self.fetched_at = time.time()
+        self.source = source
+
+        # Keep the detector's own cache in step for direct callers
+        self.detector.cached_topics = topics
+        self.detector.last_fetch_time = self.fetched_at
+
+    async def _refresh_loop(self):
+        while True:
+            if self.is_stale:
+                await self.revalidate()
+            if self.is_stale:
+                # Refresh failed: retry sooner than a full interval, but don't hammer Reddit
+                await asyncio.sleep(min(self.refresh_interval, self.RETRY_DELAY))
+            else:
+                await asyncio.sleep(max(1.0, self.refresh_interval - self.age))
+
+    # Persistence
+
+    def save(self):
+        """Write the feed atomically so a crash never leaves a torn file"""
+        if not self.persist_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.persist_path) or ".", exist_ok=True)
+            temp_path = f"{self.persist_path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump({"fetched_at": self.fetched_at, "topics": [asdict(t) for t in self.topics]}, f)
+            os.replace(temp_path, self.persist_path)
+        except OSError as e:
+            logger.warning(f"Failed to persist topic feed: {e}")
+
+    def load(self) -> bool:
+        """Restore the last good feed from disk (kept with its original age)"""
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return False
+        try:
+            with open(self.persist_path) as f:
+                data = json.load(f)
+            topics = [TopicSource(**topic) for topic in data.get("topics", [])]
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable topic feed {self.persist_path}: {e}")
+            return False
+
+        if not topics:
+            return False
+        self._publish(topics, "disk")
+        self.fetched_at = float(data.get("fetched_at", 0.0))
+        logger.info(f"📋 Loaded {len(topics)} topics from {self.persist_path} (age {self.age:.0f}s)")
+        return True
+
+    # Lifecycle
+
+    async def start(self):
+        """Load the persisted feed and start the background refresher"""
+        self.load()
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._refresh_loop())
+
+    async def close(self):
+        for task in (self._loop_task, self._refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._loop_task = None
+        self._refresh_task = None
+
+    # Metrics
+
+    def get_stats(self) -> Dict:
+        age = self.age
+        return {
+            "topics": len(self.topics),
+            "source": self.source,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "stale": self.is_stale,
+            "refresh_interval_s": self.refresh_interval,
+            "refreshing": self._refresh_task is not None and not self._refresh_task.done(),
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "stale_serves": self.stale_serves,
+            "last_refresh_seconds": round(self.last_refresh_seconds, 2) if self.last_refresh_seconds is not None else None,
+            "last_error": self.last_error
+        }
+
+# Global topic feed
+topic_feed = TopicFeed()
+metrics.track_topic_feed_age(lambda: topic_feed.age or 0.0)
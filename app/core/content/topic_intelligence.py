@@ -0,0 +1,166 @@
+# app/core/content/topic_intelligence.py
+"""
+Topic intelligence stage
+Batch-embeds candidate titles, clusters them by cosine similarity, scores
+each one's novelty against past session topics in Qdrant and keeps one
+representative per cluster, so character analysis (paid LLM calls) only
+sees genuinely distinct candidates
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config.settings import settings
+from app.core.ai.memory.embeddings import embedding_service
+from app.core.ai.memory.vector_store import VectorStoreError, vector_store
+from app.core.content.topic_sources import TopicSource, topic_rank_score
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class TopicInsight:
+    topic: TopicSource
+    cluster: int
+    novelty: float               # 0-1, 1 = nothing like it was discussed before
+    nearest_past: Optional[str]  # Most similar past session topic
+    score: float                 # Combined ranking score
+
+class TopicIntelligence:
+    """Embedding-based clustering and novelty scoring for candidate topics"""
+
+    def __init__(self,
+                 embeddings=None,
+                 store=None,
+                 cluster_threshold: Optional[float] = None,
+                 novelty_weight: Optional[float] = None):
+        self.embeddings = embeddings or embedding_service
+        self.store = store or vector_store
+        self.cluster_threshold = settings.TOPIC_CLUSTER_THRESHOLD if cluster_threshold is None else cluster_threshold
+        self.novelty_weight = settings.TOPIC_NOVELTY_WEIGHT if novelty_weight is None else novelty_weight
+
+        self.selections = 0
+        self.candidates_in = 0
+        self.candidates_out = 0
+        self.last_clusters = 0
+
+    async def _embed(self, titles: List[str]) -> np.ndarray:
+        """Unit-length embedding matrix, one row per title"""
+        vectors = np.asarray(await self.embeddings.embed_texts(titles), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def cluster(self, vectors: np.ndarray) -> np.ndarray:
+        """Leader clustering in input order: each row joins the most similar earlier leader
+        above the threshold, otherwise it leads a new cluster"""
+        similarity = vectors @ vectors.T
+        labels = np.full(len(vectors), -1, dtype=np.int64)
+        leaders: List[int] = []
+
+        for index in range(len(vectors)):
+            if leaders:
+                scores = similarity[index, leaders]
+                best = int(np.argmax(scores))
+                if scores[best] >= self.cluster_threshold:
+                    labels[index] = labels[leaders[best]]
+                    continue
+            labels[index] = len(leaders)
+            leaders.append(index)
+
+        return labels
+
+    async def novelty(self, vectors: np.ndarray) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """1 - similarity to the nearest past session topic (1.0 when history is unavailable)"""
+        try:
+            results = await self.store.search_topics_batch(vectors.tolist(), limit=1)
+        except VectorStoreError as e:
+            logger.warning(f"⚠️ Topic novelty unavailable, treating all candidates as new: {e}")
+            return np.ones(len(vectors)), [None] * len(vectors)
+
+        novelty = np.array([1.0 - max(0.0, hits[0]["score"]) if hits else 1.0 for hits in results])
+        nearest = [hits[0]["topic"].get("title") if hits else None for hits in results]
+        return np.clip(novelty, 0.0, 1.0), nearest
+
+    async def analyze(self, topics: List[TopicSource]) -> List[TopicInsight]:
+        """Cluster and novelty-score topics (expects them in base-rank order)"""
+        vectors = await self._embed([topic.title for topic in topics])
+        labels = self.cluster(vectors)
+        novelty, nearest = await self.novelty(vectors)
+
+        base = np.array([topic_rank_score(topic) for topic in topics], dtype=np.float64)
+        spread = base.max() - base.min()
+        base = (base - base.min()) / spread if spread > 0 else np.ones_like(base)
+        combined = (1.0 - self.novelty_weight) * base + self.novelty_weight * novelty
+
+        return [
+            TopicInsight(topic, int(labels[i]), float(novelty[i]), nearest[i], float(combined[i]))
+            for i, topic in enumerate(topics)
+        ]
+
+    async def select_candidates(self, topics: List[TopicSource], k: int) -> List[TopicSource]:
+        """Up to k distinct, novel candidates (one per cluster), best first"""
+        if not settings.TOPIC_INTELLIGENCE or len(topics) <= 1:
+            return topics[:k]
+
+        # Mock embeddings carry no meaning; clustering on them would be noise
+        if not await self.embeddings.is_available():
+            return topics[:k]
+
+        started = time.perf_counter()
+        try:
+            insights = await self.analyze(topics)
+        except Exception as e:
+            logger.error(f"Topic intelligence failed, using base ranking: {e}")
+            return topics[:k]
+
+        selected: List[TopicInsight] = []
+        used_clusters = set()
+        for insight in sorted(insights, key=lambda item: item.score, reverse=True):
+            if insight.cluster in used_clusters:
+                continue
+            used_clusters.add(insight.cluster)
+            selected.append(insight)
+            if len(selected) == k:
+                break
+
+        self.selections += 1
+        self.candidates_in += len(topics)
+        self.candidates_out += len(selected)
+        self.last_clusters = len({insight.cluster for insight in insights})
+
+        logger.info(f"🧭 Topic intelligence: {len(topics)} candidates, {self.last_clusters} clusters, "
+                    f"{len(selected)} sent to analysis ({time.perf_counter() - started:.2f}s)")
+        for insight in selected:
+            logger.debug(f"   {insight.topic.title[:60]} novelty={insight.novelty:.2f} score={insight.score:.2f}")
+
+        return [insight.topic for insight in selected]
+
+    async def remember(self, topic: TopicSource):
+        """Store a topic used in a session so later candidates score as less novel"""
+        if not settings.TOPIC_INTELLIGENCE or not await self.embeddings.is_available():
+            return
+        try:
+            vector = (await self.embeddings.embed_texts([topic.title]))[0]
+            await self.store.store_topic(vector, {
+                "title": topic.title,
+                "source": topic.source,
+                "url": topic.url,
+                "timestamp": time.time()
+            })
+        except Exception as e:
+            logger.warning(f"Failed to remember topic for novelty scoring: {e}")
+
+    def get_stats(self) -> Dict:
+        return {
+            "enabled": settings.TOPIC_INTELLIGENCE,
+            "selections": self.selections,
+            "candidates_in": self.candidates_in,
+            "candidates_out": self.candidates_out,
+            "last_clusters": self.last_clusters
+        }
+
+# Global instance
+topic_intelligence = TopicIntelligence()
@@ -8,6 +8,9 @@ from typing import List, Dict, Optional
 from dataclasses import dataclass
 import re
 
+from app.core.content.near_duplicates import NearDuplicateIndex
+from app.core.content.text_scoring import get_keyword_scorer
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -22,6 +25,14 @@ class TopicSource:
     ai_relevance: float
     controversy_score: float
 
+def topic_rank_score(topic: TopicSource) -> float:
+    """Combined score (engagement + AI relevance + controversy)"""
+    return (
+        (topic.score + topic.comments * 2) * 0.4 +  # Engagement
+        topic.ai_relevance * 1000 * 0.4 +           # AI relevance
+        topic.controversy_score * 500 * 0.2         # Controversy
+    )
+
 class RedditTopicFetcher:
     """Fetch trending topics from Reddit (no API key needed for public data)"""
     
@@ -37,36 +48,50 @@ class RedditTopicFetcher:
             "artificial_intel" # Alternative AI sub
         ]
         
-        self.ai_keywords = [
-            "ai", "artificial intelligence", "machine learning", "gpt", "chatgpt",
-            "claude", "consciousness", "sentient", "robot", "automation", "agi",
-            "neural", "deep learning", "llm", "large language model"
-        ]
-        
-        self.controversy_keywords = [
-            "dangerous", "scary", "concerns", "risks", "problems", "threat",
-            "controversial", "debate", "disagree", "wrong", "terrible",
-            "replace", "job loss", "unemployment", "dystopia"
-        ]
+        # Keyword sets come from the shared, precompiled scorer (app/config/topic_keywords.json)
+        self.scorer = get_keyword_scorer()
+        self.ai_keywords = list(self.scorer.keywords("ai"))
+        self.controversy_keywords = list(self.scorer.keywords("controversy"))
+        self._ai_keyword_set = set(self.ai_keywords)
 
-    async def fetch_reddit_topics(self, max_per_sub: int = 10) -> List[TopicSource]:
-        """Fetch topics from Reddit using public JSON API"""
+    async def fetch_reddit_topics(self, max_per_sub: int = 10, rate_limiter=None) -> List[TopicSource]:
+        """Fetch topics from Reddit using public JSON API
+        
+        With a rate_limiter (anything with an async acquire()), subreddits are
+        fetched concurrently and the limiter paces the requests; without one
+        they are fetched one by one with a fixed delay.
+        """
         
         all_topics = []
         
         async with aiohttp.ClientSession() as session:
-            for subreddit in self.subreddits:
-                try:
-                    topics = await self._fetch_subreddit_topics(session, subreddit, max_per_sub)
+            if rate_limiter is not None:
+                async def fetch_paced(subreddit: str) -> List[TopicSource]:
+                    await rate_limiter.acquire()
+                    return await self._fetch_subreddit_topics(session, subreddit, max_per_sub)
+                
+                results = await asyncio.gather(
+                    *(fetch_paced(subreddit) for subreddit in self.subreddits), return_exceptions=True
+                )
+                for subreddit, topics in zip(self.subreddits, results):
+                    if isinstance(topics, Exception):
+                        logger.warning(f"Failed to fetch r/{subreddit}: {topics}")
+                        continue
                     all_topics.extend(topics)
                     logger.info(f"✅ Fetched {len(topics)} topics from r/{subreddit}")
-                    
-                    # Rate limiting - Reddit allows 1 request per second for unauthenticated
-                    await asyncio.sleep(1.2)
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to fetch r/{subreddit}: {e}")
-                    continue
+            else:
+                for subreddit in self.subreddits:
+                    try:
+                        topics = await self._fetch_subreddit_topics(session, subreddit, max_per_sub)
+                        all_topics.extend(topics)
+                        logger.info(f"✅ Fetched {len(topics)} topics from r/{subreddit}")
+                        
+                        # Rate limiting - Reddit allows 1 request per second for unauthenticated
+                        await asyncio.sleep(1.2)
+                        
+                    except Exception as e:
+                        logger.warning(f"Failed to fetch r/{subreddit}: {e}")
+                        continue
         
         # Filter for AI relevance
         ai_relevant_topics = [t for t in all_topics if t.ai_relevance > 0.3]
@@ -97,7 +122,7 @@ class RedditTopicFetcher:
                 
                 data = await response.json()
                 
-                topics = []
+                candidates = []
                 
                 for post in data.get('data', {}).get('children', []):
                     post_data = post.get('data', {})
@@ -106,30 +131,26 @@ class RedditTopicFetcher:
                     if not title or len(title) < 10:  # Skip very short titles
                         continue
                     
-                    score = post_data.get('score', 0)
-                    num_comments = post_data.get('num_comments', 0)
-                    
                     # Skip low-engagement posts
-                    if score < 5 and num_comments < 2:
+                    if post_data.get('score', 0) < 5 and post_data.get('num_comments', 0) < 2:
                         continue
                     
-                    # Calculate AI relevance
-                    ai_relevance = self._calculate_ai_relevance(title)
-                    
-                    # Calculate controversy score
-                    controversy_score = self._calculate_controversy(title)
-                    
-                    # Extract keywords
-                    keywords = self._extract_keywords(title)
-                    
+                    candidates.append((title, post_data))
+                
+                # AI relevance and controversy for every title in one scan
+                scores = self.score_titles([title for title, _ in candidates])
+                
+                topics = []
+                
+                for (title, post_data), (ai_relevance, controversy_score) in zip(candidates, scores):
                     topic = TopicSource(
                         title=title,
                         url=f"https://reddit.com{post_data.get('permalink', '')}",
-                        score=score,
-                        comments=num_comments,
+                        score=post_data.get('score', 0),
+                        comments=post_data.get('num_comments', 0),
                         source=f"reddit_r_{subreddit}",
                         timestamp=time.time(),
-                        keywords=keywords,
+                        keywords=self._extract_keywords(title),
                         ai_relevance=ai_relevance,
                         controversy_score=controversy_score
                     )
@@ -145,27 +166,34 @@ class RedditTopicFetcher:
             logger.error(f"Error fetching r/{subreddit}: {e}")
             return []
 
+    def score_titles(self, titles: List[str]) -> List[tuple]:
+        """(ai_relevance, controversy) per title, all titles scored in one pass"""
+        return [
+            (self._relevance_from_hits(hits), self._controversy_from_hits(title, hits))
+            for title, hits in zip(titles, self.scorer.match_batch(titles))
+        ]
+
     def _calculate_ai_relevance(self, text: str) -> float:
         """Calculate how AI-relevant the text is (0.0 - 1.0)"""
-        
-        text_lower = text.lower()
-        
+        return self._relevance_from_hits(self.scorer.match(text))
+
+    def _relevance_from_hits(self, hits: Dict[str, set]) -> float:
         # Direct AI mentions
-        ai_mentions = sum(1 for keyword in self.ai_keywords if keyword in text_lower)
+        ai_mentions = len(hits.get("ai", ()))
         
         # Weighted scoring
         score = 0.0
         
         # High-value keywords
-        if any(keyword in text_lower for keyword in ["ai", "artificial intelligence", "gpt", "chatgpt"]):
+        if "ai_high" in hits:
             score += 0.4
         
         # Medium-value keywords  
-        if any(keyword in text_lower for keyword in ["machine learning", "robot", "automation"]):
+        if "ai_medium" in hits:
             score += 0.3
         
         # Tech keywords
-        if any(keyword in text_lower for keyword in ["technology", "algorithm", "neural"]):
+        if "ai_tech" in hits:
             score += 0.2
         
         # Additional mentions
@@ -175,11 +203,10 @@ class RedditTopicFetcher:
 
     def _calculate_controversy(self, text: str) -> float:
         """Calculate controversy level (0.0 - 1.0)"""
-        
-        text_lower = text.lower()
-        
-        controversy_count = sum(1 for keyword in self.controversy_keywords 
-                              if keyword in text_lower)
+        return self._controversy_from_hits(text, self.scorer.match(text))
+
+    def _controversy_from_hits(self, text: str, hits: Dict[str, set]) -> float:
+        controversy_count = len(hits.get("controversy", ()))
         
         # Question marks indicate debate potential
         if "?" in text:
@@ -190,9 +217,7 @@ class RedditTopicFetcher:
             controversy_count += 0.3
         
         # Strong language indicators
-        strong_words = ["never", "always", "definitely", "impossible", "revolution"]
-        strong_count = sum(1 for word in strong_words if word in text_lower)
-        controversy_count += strong_count * 0.2
+        controversy_count += len(hits.get("strong", ())) * 0.2
         
         return min(1.0, controversy_count / 3)
 
@@ -216,8 +241,8 @@ class RedditTopicFetcher:
                    if len(word) > 3 and word not in stop_words]
         
         # Prioritize AI-related keywords
-        ai_keywords_found = [word for word in keywords if word in self.ai_keywords]
-        other_keywords = [word for word in keywords if word not in self.ai_keywords]
+        ai_keywords_found = [word for word in keywords if word in self._ai_keyword_set]
+        other_keywords = [word for word in keywords if word not in self._ai_keyword_set]
         
         # Return AI keywords first, then others
         return (ai_keywords_found + other_keywords)[:8]
@@ -340,22 +365,7 @@ class TopicDetector:
             all_topics.extend(curated_topics)
             logger.info(f"✅ Added {len(curated_topics)} curated topics")
         
-        # Remove duplicates and sort by relevance
-        seen_titles = set()
-        unique_topics = []
-        
-        for topic in all_topics:
-            title_key = topic.title.lower().strip()
-            if title_key not in seen_titles:
-                seen_titles.add(title_key)
-                unique_topics.append(topic)
-        
-        # Sort by combined score (engagement + AI relevance + controversy)
-        unique_topics.sort(key=lambda t: (
-            (t.score + t.comments * 2) * 0.4 +  # Engagement
-            t.ai_relevance * 1000 * 0.4 +       # AI relevance
-            t.controversy_score * 500 * 0.2     # Controversy
-        ), reverse=True)
+        unique_topics = self.rank_topics(all_topics)
         
         # Cache results
         self.cached_topics = unique_topics
@@ -364,6 +374,25 @@ class TopicDetector:
         logger.info(f"🎯 Returning {min(count, len(unique_topics))} top topics")
         return unique_topics[:count]
 
+    def rank_topics(self, topics: List[TopicSource]) -> List[TopicSource]:
+        """Sort by combined score and drop duplicates, keeping the best-scoring copy
+        
+        Duplicates include near-duplicates: reposts and rephrasings of the same
+        story from different subreddits.
+        """
+        
+        ranked = sorted(topics, key=topic_rank_score, reverse=True)
+        
+        seen = NearDuplicateIndex(max_entries=len(ranked) + 1)
+        unique_topics = []
+        
+        for topic in ranked:
+            if not seen.is_duplicate(topic.title):
+                seen.add(topic.title)
+                unique_topics.append(topic)
+        
+        return unique_topics
+
     async def test_topic_detection(self):
         """Test the topic detection system"""
         
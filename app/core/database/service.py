@@ -16,6 +16,7 @@ from contextlib import asynccontextmanager
 from enum import Enum
 
 from app.config.settings import settings
+from app.utils import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -99,6 +100,7 @@ class DatabaseService:
                         'timezone': 'UTC',
                         'statement_timeout': '30s'
                     },
+                    init=self._init_connection,
                     setup=self._setup_connection
                 )
                 
@@ -118,6 +120,10 @@ class DatabaseService:
                 await self._cleanup_failed_initialization()
                 raise ConnectionError(f"Database initialization failed: {e}")
     
+    async def _init_connection(self, conn: asyncpg.Connection):
+        """Once per new pooled connection: per-statement latency metrics"""
+        conn.add_query_logger(metrics.observe_db_query)
+    
     async def _setup_connection(self, conn: asyncpg.Connection):
         """Setup individual connection"""
         await conn.execute("SET timezone = 'UTC'")
@@ -161,10 +167,12 @@ class DatabaseService:
         connection = None
         try:
             # Acquire connection with timeout
+            acquire_started = time.perf_counter()
             connection = await asyncio.wait_for(
                 self.pool.acquire(), 
                 timeout=5.0
             )
+            metrics.DB_POOL_ACQUIRE.observe(time.perf_counter() - acquire_started)
             
             # Verify connection is healthy
             await connection.fetchval("SELECT 1")
@@ -173,6 +181,7 @@ class DatabaseService:
             
         except asyncio.TimeoutError:
             logger.error("Connection acquisition timeout")
+            metrics.DB_POOL_TIMEOUTS.inc()
             self._error_count += 1
             raise ConnectionError("Connection acquisition timeout")
             
@@ -468,7 +477,89 @@ class DatabaseService:
             logger.error(f"Unexpected error incrementing stats: {e}")
             self._error_count += 1
             raise
-    
+
+    async def update_character_voice_evolution(self,
+                                             character_id: str,
+                                             experiments_count: int,
+                                             exaggeration: float,
+                                             cfg_weight: float,
+                                             breakthrough_score: float,
+                                             voice_history: Dict) -> bool:
+        """Persist voice evolution state and the experiment ring buffer"""
+
+        if not self._validate_character_id(character_id):
+            raise ValidationError(f"Invalid character_id: {character_id}")
+
+        if not isinstance(experiments_count, int) or experiments_count < 0:
+            raise ValidationError("experiments_count must be a non-negative integer")
+
+        try:
+            async with self.get_connection() as conn:
+                result = await conn.execute("""
+                    UPDATE character_evolution
+                    SET
+                        voice_experiments_count = $1,
+                        current_exaggeration = $2,
+                        current_cfg_weight = $3,
+                        voice_breakthrough_score = $4,
+                        voice_history = $5,
+                        updated_at = $6
+                    WHERE character_id = $7
+                """, experiments_count, float(exaggeration), float(cfg_weight),
+                    float(breakthrough_score), json.dumps(voice_history), datetime.now(), character_id)
+
+                self._query_count += 1
+                rows_affected = self._parse_update_result(result)
+
+                if rows_affected == 0:
+                    logger.warning(f"Character {character_id} not found for voice evolution update")
+
+                return rows_affected > 0
+
+        except asyncpg.exceptions.PostgresError as e:
+            logger.error(f" Database error updating voice evolution: {e}")
+            self._error_count += 1
+            raise DatabaseError(f"Failed to update voice evolution: {e}")
+
+        except Exception as e:
+            logger.error(f"Unexpected error updating voice evolution: {e}")
+            self._error_count += 1
+            raise
+
+    async def get_character_voice_evolution(self, character_id: str) -> Optional[Dict]:
+        """Get persisted voice evolution state, None if the character is unknown"""
+
+        if not self._validate_character_id(character_id):
+            raise ValidationError(f"Invalid character_id: {character_id}")
+
+        try:
+            async with self.get_connection() as conn:
+                row = await conn.fetchrow("""
+                    SELECT voice_experiments_count, current_exaggeration, current_cfg_weight,
+                           voice_breakthrough_score, voice_history
+                    FROM character_evolution WHERE character_id = $1
+                """, character_id)
+
+                self._query_count += 1
+
+                if not row:
+                    return None
+
+                result = dict(row)
+                if isinstance(result["voice_history"], str):
+                    result["voice_history"] = json.loads(result["voice_history"])
+                return result
+
+        except asyncpg.exceptions.PostgresError as e:
+            logger.error(f"Database error getting voice evolution for {character_id}: {e}")
+            self._error_count += 1
+            raise DatabaseError(f"Failed to get voice evolution: {e}")
+
+        except Exception as e:
+            logger.error(f"Unexpected error getting voice evolution for {character_id}: {e}")
+            self._error_count += 1
+            raise
+
     # ==========================================
     # SURVIVAL MECHANICS - ROBUST
     # ==========================================
@@ -0,0 +1,232 @@
+# app/core/media/artifacts.py
+"""
+Temp-file lifecycle for TTS and lip-sync artifacts
+One dedicated directory (optionally tmpfs), collision-free names,
+context-managed lifetimes, a byte quota with oldest-first eviction and
+a periodic sweeper for anything that leaked
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Set
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+class ArtifactQuotaError(OSError):
+    """Artifact directory is full and nothing can be evicted"""
+    pass
+
+def _default_directory() -> str:
+    configured = settings.ARTIFACT_DIR
+    if configured == "tmpfs":
+        base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        return os.path.join(base, "a2ais-artifacts")
+    return configured or os.path.join(tempfile.gettempdir(), "a2ais-artifacts")
+
+class ArtifactManager:
+    """Owns every audio/lip-sync temp file the process writes"""
+
+    # Files this young are assumed to be in flight and are never evicted
+    MIN_EVICT_AGE = 5.0
+
+    def __init__(self,
+                 directory: Optional[str] = None,
+                 max_bytes: Optional[int] = None,
+                 max_age: Optional[float] = None,
+                 sweep_interval: Optional[float] = None):
+        self.directory = directory or _default_directory()
+        self.max_bytes = settings.ARTIFACT_MAX_BYTES if max_bytes is None else max_bytes
+        self.max_age = settings.ARTIFACT_MAX_AGE if max_age is None else max_age
+        self.sweep_interval = settings.ARTIFACT_SWEEP_INTERVAL if sweep_interval is None else sweep_interval
+
+        self._files: Dict[str, tuple] = {}  # path -> (size, created)
+        self._claimed: Set[str] = set()
+        self._bytes = 0
+        self._sweeper: Optional[asyncio.Task] = None
+
+        self.written = 0
+        self.released = 0
+        self.evicted = 0
+        self.swept = 0
+        self.quota_rejections = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    # Writing
+
+    def new_path(self, prefix: str, suffix: str = ".wav") -> str:
+        """Unique path inside the artifact directory (nothing is created)"""
+        return os.path.join(self.directory, f"{prefix}_{uuid.uuid4().hex}{suffix}")
+
+    def write(self, data: bytes, prefix: str, suffix: str = ".wav") -> str:
+        """Write bytes to a new artifact, evicting old ones if over quota"""
+        self._reserve(len(data))
+        path = self.new_path(prefix, suffix)
+        with open(path, "wb") as f:
+            f.write(data)
+        self.register(path, len(data))
+        return path
+
+    def register(self, path: str, size: Optional[int] = None):
+        """Track a file something else wrote into the artifact directory"""
+        if size is None:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                return
+        previous = self._files.get(path)
+        if previous:
+            self._bytes -= previous[0]
+        self._files[path] = (size, time.time())
+        self._bytes += size
+        self.written += 1
+
+    def _reserve(self, size: int):
+        if self._bytes + size <= self.max_bytes:
+            return
+
+        now = time.time()
+        for path, (_, created) in sorted(self._files.items(), key=lambda item: item[1][1]):
+            if self._bytes + size <= self.max_bytes:
+                break
+            if path in self._claimed or now - created < self.MIN_EVICT_AGE:
+                continue
+            self._remove(path)
+            self.evicted += 1
+
+        if self._bytes + size > self.max_bytes:
+            self.quota_rejections += 1
+            raise ArtifactQuotaError(
+                f"Artifact quota exceeded: {self._bytes + size} > {self.max_bytes} bytes in {self.directory}"
+            )
+
+    # Lifetimes
+
+    def release(self, path: Optional[str]):
+        """Delete an artifact now"""
+        if path:
+            self._remove(path)
+            self.released += 1
+
+    @contextmanager
+    def claim(self, path: Optional[str]) -> Iterator[Optional[str]]:
+        """Protect an artifact from eviction while in use, delete it afterwards"""
+        if path:
+            self._claimed.add(path)
+        try:
+            yield path
+        finally:
+            if path:
+                self._claimed.discard(path)
+                self.release(path)
+
+    @contextmanager
+    def scratch(self, prefix: str, suffix: str = ".wav") -> Iterator[str]:
+        """Fresh path for a tool to write into, deleted on exit"""
+        path = self.new_path(prefix, suffix)
+        with self.claim(path):
+            yield path
+
+    def _remove(self, path: str):
+        entry = self._files.pop(path, None)
+        if entry:
+            self._bytes -= entry[0]
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove artifact {path}: {e}")
+
+    # Sweeping
+
+    def sweep(self) -> int:
+        """Remove artifacts older than max_age (including other runs' leftovers)"""
+        cutoff = time.time() - self.max_age
+        removed = 0
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            os.makedirs(self.directory, exist_ok=True)
+            return 0
+
+        for entry in entries:
+            if not entry.is_file(follow_symlinks=False) or entry.path in self._claimed:
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    self._remove(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+
+        self.swept += removed
+        if removed:
+            logger.info(f"🧹 Swept {removed} stale artifacts from {self.directory}")
+        return removed
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Artifact sweep failed: {e}")
+
+    async def start(self):
+        """Sweep leftovers once and start the periodic sweeper"""
+        self.sweep()
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+        logger.info(f"Artifact manager ready ({self.directory}, quota {self.max_bytes // (1024 * 1024)} MB)")
+
+    async def close(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+        for path in list(self._files):
+            if path not in self._claimed:
+                self._remove(path)
+
+    # Metrics
+
+    def disk_usage(self) -> Dict[str, int]:
+        """Actual directory usage, including files this process doesn't track"""
+        files = size = 0
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.is_file(follow_symlinks=False):
+                    files += 1
+                    size += entry.stat().st_size
+        except OSError:
+            pass
+        return {"files": files, "bytes": size}
+
+    def get_stats(self) -> Dict:
+        return {
+            "directory": self.directory,
+            "tracked_files": len(self._files),
+            "tracked_bytes": self._bytes,
+            "claimed_files": len(self._claimed),
+            "quota_bytes": self.max_bytes,
+            "disk": self.disk_usage(),
+            "written": self.written,
+            "released": self.released,
+            "evicted": self.evicted,
+            "swept": self.swept,
+            "quota_rejections": self.quota_rejections
+        }
+
+# Global artifact manager
+artifact_manager = ArtifactManager()
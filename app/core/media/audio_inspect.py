@@ -0,0 +1,251 @@
+# app/core/media/audio_inspect.py
+"""
+Audio header inspection
+Exact duration and sample rate for WAV and MP3 from headers (Xing/VBRI
+for VBR MP3, frame counting otherwise) without decoding audio. Files are
+never read whole: WAV chunk headers are seeked to, MP3 is parsed from a
+bounded prefix and the size comes from the file descriptor.
+"""
+
+import logging
+import os
+import struct
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# MP3 bytes read past the ID3 tag: the frame sync search window plus a frame
+MP3_PREFIX_BYTES = 128 * 1024
+
+# read(offset, length) -> up to length bytes
+Reader = Callable[[int, int], bytes]
+
+@dataclass
+class AudioInfo:
+    format: str
+    duration: float
+    sample_rate: int
+    channels: int
+    bits_per_sample: Optional[int] = None
+    bitrate: Optional[int] = None
+    frame_count: Optional[int] = None
+    exact: bool = True  # False when estimated from bitrate
+
+def inspect_audio_bytes(data: bytes) -> Optional[AudioInfo]:
+    """Inspect in-memory audio, None if the format isn't recognised"""
+    # Already in memory, so MP3 frames are walked to the end
+    return _inspect(lambda offset, length: data[offset:offset + length], len(data), len(data))
+
+def inspect_audio_file(file_path: str) -> Optional[AudioInfo]:
+    """Inspect an audio file on disk, reading only its headers"""
+    try:
+        with open(file_path, "rb") as f:
+            def read(offset: int, length: int) -> bytes:
+                f.seek(offset)
+                return f.read(length)
+
+            return _inspect(read, os.fstat(f.fileno()).st_size, MP3_PREFIX_BYTES)
+    except OSError as e:
+        logger.warning(f"Cannot read audio file {file_path}: {e}")
+        return None
+
+def _inspect(read: Reader, size: int, mp3_prefix: int) -> Optional[AudioInfo]:
+    try:
+        head = read(0, 12)
+        if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+            return _inspect_wav(read, size)
+        return _inspect_mp3(read, size, mp3_prefix)
+    except (struct.error, ValueError, IndexError) as e:
+        logger.debug(f"Audio inspection failed: {e}")
+        return None
+
+def measure_duration(data: bytes, estimate: float) -> float:
+    """Real audio duration, or the caller's estimate if the audio can't be parsed"""
+    info = inspect_audio_bytes(data)
+    if info is None or info.duration <= 0:
+        logger.warning(f"Could not measure audio duration, using estimate {estimate:.2f}s")
+        return estimate
+    return info.duration
+
+# WAV
+
+def _inspect_wav(read: Reader, size: int) -> Optional[AudioInfo]:
+    offset = 12
+    fmt = None
+
+    while offset + 8 <= size:
+        chunk_id, chunk_size = struct.unpack("<4sI", read(offset, 8))
+        body = offset + 8
+
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack("<HHIIHH", read(body, 16))
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("data chunk before fmt chunk")
+
+            # Streamed WAVs leave the size as 0 or 0xFFFFFFFF
+            available = size - body
+            if chunk_size == 0 or chunk_size > available:
+                chunk_size = available
+
+            _, channels, sample_rate, byte_rate, block_align, bits_per_sample = fmt
+            byte_rate = byte_rate or sample_rate * block_align
+            if not byte_rate:
+                raise ValueError("WAV byte rate is zero")
+
+            return AudioInfo(
+                format="wav",
+                duration=chunk_size / byte_rate,
+                sample_rate=sample_rate,
+                channels=channels,
+                bits_per_sample=bits_per_sample,
+                bitrate=byte_rate * 8,
+                frame_count=chunk_size // block_align if block_align else None
+            )
+
+        # Chunks are word aligned
+        offset = body + chunk_size + (chunk_size & 1)
+
+    raise ValueError("WAV has no data chunk")
+
+# MP3
+
+_MP3_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+
+_MP3_SAMPLE_RATES = {
+    1: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    2.5: [11025, 12000, 8000],
+}
+
+@dataclass
+class _FrameHeader:
+    version: float
+    layer: int
+    bitrate: int
+    sample_rate: int
+    channels: int
+    length: int
+    samples: int
+
+def _parse_frame_header(data: bytes, offset: int) -> Optional[_FrameHeader]:
+    if offset + 4 > len(data):
+        return None
+    b0, b1, b2, b3 = data[offset:offset + 4]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version = {0: 2.5, 2: 2, 3: 1}.get((b1 >> 3) & 0x03)
+    layer = {1: 3, 2: 2, 3: 1}.get((b1 >> 1) & 0x03)
+    bitrate_index = (b2 >> 4) & 0x0F
+    rate_index = (b2 >> 2) & 0x03
+    if version is None or layer is None or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    bitrate = _MP3_BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x01
+    channels = 1 if (b3 >> 6) == 3 else 2
+
+    if layer == 1:
+        length = (12 * bitrate // sample_rate + padding) * 4
+        samples = 384
+    elif layer == 2 or version == 1:
+        length = 144 * bitrate // sample_rate + padding
+        samples = 1152
+    else:
+        length = 72 * bitrate // sample_rate + padding
+        samples = 576
+
+    return _FrameHeader(version, layer, bitrate, sample_rate, channels, length, samples)
+
+def _skip_id3v2(data: bytes) -> int:
+    if data[:3] != b"ID3" or len(data) < 10:
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+def _find_first_frame(data: bytes, offset: int) -> Optional[int]:
+    # Require two consecutive valid headers to avoid false syncs
+    limit = min(len(data), offset + 64 * 1024)
+    while offset < limit:
+        offset = data.find(b"\xFF", offset, limit)
+        if offset < 0:
+            return None
+        header = _parse_frame_header(data, offset)
+        if header and _parse_frame_header(data, offset + header.length):
+            return offset
+        if header and offset + header.length >= len(data):
+            return offset
+        offset += 1
+    return None
+
+def _vbr_frame_count(data: bytes, offset: int, header: _FrameHeader) -> Optional[int]:
+    """Frame count from a Xing/Info or VBRI header in the first frame"""
+    if header.version == 1:
+        side_info = 17 if header.channels == 1 else 32
+    else:
+        side_info = 9 if header.channels == 1 else 17
+
+    xing = offset + 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack_from(">I", data, xing + 4)[0]
+        if flags & 0x01:
+            return struct.unpack_from(">I", data, xing + 8)[0]
+
+    vbri = offset + 4 + 32
+    if data[vbri:vbri + 4] == b"VBRI":
+        return struct.unpack_from(">I", data, vbri + 14)[0]
+
+    return None
+
+def _inspect_mp3(read: Reader, size: int, prefix_bytes: int) -> Optional[AudioInfo]:
+    # Offsets below are relative to the prefix, which starts after any ID3v2 tag
+    base = _skip_id3v2(read(0, 10))
+    data = read(base, prefix_bytes)
+    start = _find_first_frame(data, 0)
+    if start is None:
+        return None
+
+    first = _parse_frame_header(data, start)
+    frame_count = _vbr_frame_count(data, start, first)
+    exact = True
+
+    if frame_count is None:
+        # No VBR header: walk the frame headers within the prefix
+        frame_count = 0
+        offset = start
+        while True:
+            header = _parse_frame_header(data, offset)
+            if header is None or header.length <= 0:
+                break
+            frame_count += 1
+            offset += header.length
+
+        audio_end = size - (128 if size >= 128 and read(size - 128, 3) == b"TAG" else 0)
+        if base + offset < audio_end - 4:
+            # Past the prefix (or a corrupt stream): estimate the remainder from the average frame
+            average = (offset - start) / frame_count if frame_count else first.length
+            frame_count += int((audio_end - base - offset) / average) if average else 0
+            exact = False
+
+    duration = frame_count * first.samples / first.sample_rate
+
+    return AudioInfo(
+        format="mp3",
+        duration=duration,
+        sample_rate=first.sample_rate,
+        channels=first.channels,
+        bitrate=int((size - base - start) * 8 / duration) if duration else first.bitrate,
+        frame_count=frame_count,
+        exact=exact
+    )
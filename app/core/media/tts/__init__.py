@@ -7,8 +7,15 @@ def get_tts_service():
         from .chatterbox_tts import autonomous_chatterbox_service
         return autonomous_chatterbox_service
     else:
-        from .google_tts import tts_service  
+        from .google_tts import tts_service
         return tts_service
 
-# Global service instance
-tts_service = get_tts_service()
\ No newline at end of file
+def __getattr__(name: str):
+    """Resolve `tts_service` / `tts_router` on first access so importing the
+    package does not load (or validate) a provider"""
+    if name == "tts_service":
+        return get_tts_service()
+    if name == "tts_router":
+        from .router import tts_router
+        return tts_router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
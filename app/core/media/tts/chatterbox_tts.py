@@ -7,36 +7,27 @@ Final Autonomous Chatterbox TTS Service
 - No mock audio fallbacks (production ready)
 """
 
-import replicate # type: ignore
+import asyncio
 import requests # type: ignore
 import base64
-import tempfile
 import os
 import time
 import logging
 import random
 import hashlib
-import statistics
 from typing import Dict, Any, Optional, List
-from collections import defaultdict, deque
+from collections import OrderedDict
 from dataclasses import dataclass
 
 from app.config.settings import settings
+from app.core.database.service import db_service
+from app.core.media.artifacts import artifact_manager
+from app.core.media.audio_inspect import inspect_audio_bytes
+from app.core.media.tts.voice_history import VoiceExperimentHistory
+from app.core.media.tts.voice_optimizer import adaptive_exploration_rate, create_voice_optimizer
 
 logger = logging.getLogger(__name__)
 
-@dataclass
-class VoiceExperiment:
-    """Single voice experiment record"""
-    exaggeration: float
-    cfg_weight: float
-    text_content: str
-    emotion_attempted: str
-    success_score: float
-    peer_reactions: List[float]
-    timestamp: float
-    discovery_method: str
-
 @dataclass
 class ThresholdAnalysis:
     """Statistical analysis of what constitutes success"""
@@ -50,11 +41,7 @@ class AutonomousChatterboxService:
     
     def __init__(self):
         self.api_token = getattr(settings, 'REPLICATE_API_TOKEN', None)
-
-        os.environ['REPLICATE_API_TOKEN'] = self.api_token
-        self.client = replicate.Client(api_token=self.api_token)
-        if not self.api_token:
-            raise ValueError("REPLICATE_API_TOKEN is required for autonomous voice system")
+        self._client = None  # Created on first prediction, see `client`
         
         # Voice reference files for voice cloning
         self.voice_references = {
@@ -64,28 +51,93 @@ class AutonomousChatterboxService:
         }
         
         # NO PREDEFINED CONFIGS! Characters start completely neutral
-        self.character_voice_history = defaultdict(list)  # All voice experiments
+        self.character_voice_history: Dict[str, VoiceExperimentHistory] = {}  # Recent experiments per character
         self.character_current_best = {}  # Current best discovered configs
+        self._loaded_voice_history = set()  # Characters restored from the database
+        self._utterance_configs = OrderedDict()  # utterance_id -> config shared by its chunks
         
         # Adaptive threshold system
-        self.character_outcomes = {}  # All outcomes for statistical analysis
         self.character_thresholds = {}  # Learned success thresholds
         self.threshold_history = {}  # Evolution of thresholds over time
         
         # Evolutionary parameters (these evolve too!)
+        self.history_capacity = 100
         self.base_exploration_rate = 0.3
         self.mutation_strength = 0.15
         self.min_sample_size = 15  # Minimum data points for reliable thresholds
+        self.voice_optimizer = create_voice_optimizer(settings.VOICE_OPTIMIZER, self.mutation_strength)
         
         logger.info("🧬 Autonomous Chatterbox Service initialized")
         logger.info("   ✅ No predefined personalities")
         logger.info("   ✅ Adaptive threshold learning")
         logger.info("   ✅ Evolutionary voice discovery")
+        logger.info(f"   ✅ Voice optimizer: {self.voice_optimizer.name}")
     
     def _get_character_seed(self, character_id: str) -> int:
         """Generate consistent but unique seed for each character"""
         return int(hashlib.md5(character_id.encode()).hexdigest()[:8], 16)
     
+    def _get_history(self, character_id: str) -> VoiceExperimentHistory:
+        """Experiment ring buffer for a character, created on first use"""
+        history = self.character_voice_history.get(character_id)
+        if history is None:
+            history = VoiceExperimentHistory(self.history_capacity)
+            self.character_voice_history[character_id] = history
+        return history
+    
+    async def _load_voice_history(self, character_id: str):
+        """Restore persisted voice evolution once per character"""
+        
+        if character_id in self._loaded_voice_history:
+            return
+        self._loaded_voice_history.add(character_id)
+        
+        try:
+            stored = await db_service.get_character_voice_evolution(character_id)
+        except Exception as e:
+            logger.warning(f"Could not load voice history for {character_id}: {e}")
+            return
+        
+        if not stored or not stored.get("voice_history"):
+            return
+        
+        history = VoiceExperimentHistory.from_dict(stored["voice_history"], self.history_capacity)
+        # Experiments recorded before the load still count
+        if character_id in self.character_voice_history:
+            history.extend(self.character_voice_history[character_id])
+        self.character_voice_history[character_id] = history
+        
+        if stored.get("voice_breakthrough_score", 0.0) > 0 and character_id not in self.character_current_best:
+            self.character_current_best[character_id] = {
+                "exaggeration": stored["current_exaggeration"],
+                "cfg_weight": stored["current_cfg_weight"],
+                "discovery_method": "restored",
+                "generation": stored.get("voice_experiments_count", 0),
+                "best_success_score": stored["voice_breakthrough_score"],
+                "breakthrough_timestamp": time.time()
+            }
+        
+        self._update_adaptive_thresholds(character_id)
+        logger.info(f"📥 Restored {len(history)} voice experiments for {character_id}")
+    
+    async def _persist_voice_history(self, character_id: str):
+        """Write the ring buffer and current best config to character_evolution"""
+        
+        history = self._get_history(character_id)
+        current_best = self.character_current_best.get(character_id, {})
+        
+        try:
+            await db_service.update_character_voice_evolution(
+                character_id,
+                experiments_count=history.total_recorded,
+                exaggeration=current_best.get("exaggeration", 0.5),
+                cfg_weight=current_best.get("cfg_weight", 0.5),
+                breakthrough_score=current_best.get("best_success_score", 0.0),
+                voice_history=history.to_dict()
+            )
+        except Exception as e:
+            logger.warning(f"Could not persist voice history for {character_id}: {e}")
+    
     def _initialize_character_voice(self, character_id: str) -> Dict:
         """Initialize character with completely random voice parameters"""
         
@@ -118,183 +170,40 @@ class AutonomousChatterboxService:
     
     def _calculate_adaptive_exploration_rate(self, character_id: str) -> float:
         """Calculate exploration rate based on recent performance patterns"""
-        
-        if character_id not in self.character_outcomes:
-            return self.base_exploration_rate
-        
-        outcomes = self.character_outcomes[character_id]
-        
-        if len(outcomes) < 10:
-            return 0.4  # High exploration when learning
-        
-        # Analyze recent performance trend
-        recent_scores = [outcome["score"] for outcome in list(outcomes)[-10:]]
-        earlier_scores = [outcome["score"] for outcome in list(outcomes)[-20:-10]] if len(outcomes) >= 20 else []
-        
-        recent_avg = statistics.mean(recent_scores)
-        
-        if earlier_scores:
-            earlier_avg = statistics.mean(earlier_scores)
-            improvement_trend = recent_avg - earlier_avg
-        else:
-            improvement_trend = 0
-        
-        # Calculate exploration rate adaptively
-        base_exploration = self.base_exploration_rate
-        
-        # If improving, explore less (exploit what works)
-        if improvement_trend > 0.1:
-            exploration_rate = base_exploration * 0.7
-        # If declining, explore more (find new approaches)
-        elif improvement_trend < -0.1:
-            exploration_rate = base_exploration * 1.5
-        # If stagnant, moderate exploration
-        else:
-            exploration_rate = base_exploration * 1.2
-        
-        # Adjust based on variance in recent performance
-        recent_variance = statistics.variance(recent_scores) if len(recent_scores) > 1 else 0
-        
-        # High variance = inconsistent results = need more exploration
-        variance_adjustment = min(0.2, recent_variance * 2)
-        exploration_rate += variance_adjustment
-        
-        # Clamp to reasonable range
-        exploration_rate = max(0.05, min(0.6, exploration_rate))
-        
-        return exploration_rate
+        return adaptive_exploration_rate(self.character_voice_history.get(character_id), self.base_exploration_rate)
     
     def _generate_experimental_config(self, character_id: str, adaptive_metadata: Dict) -> Dict:
-        """Generate experimental voice config using evolutionary strategies"""
+        """Generate experimental voice config from the configured optimizer"""
         
         current_best = self._initialize_character_voice(character_id)
-        history = self.character_voice_history[character_id]
+        history = self._get_history(character_id)
         
         # Calculate adaptive exploration rate
         exploration_rate = self._calculate_adaptive_exploration_rate(character_id)
-        should_explore = random.random() < exploration_rate
         
-        if should_explore or len(history) < 5:
-            # EXPLORATION: Try something new
-            config = self._explore_voice_space(character_id, current_best, adaptive_metadata)
-        else:
-            # EXPLOITATION: Improve what works
-            config = self._exploit_successful_patterns(character_id, current_best, history)
+        config = self.voice_optimizer.suggest(history, current_best, {
+            "exploration_rate": exploration_rate,
+            "success_threshold": self._get_adaptive_success_threshold(character_id),
+            "metadata": adaptive_metadata
+        })
         
+        config["generation"] = current_best.get("generation", 0) + 1
         config["exploration_rate"] = exploration_rate
         return config
     
-    def _explore_voice_space(self, character_id: str, current_best: Dict, metadata: Dict) -> Dict:
-        """Explore new voice parameter space using various strategies"""
-        
-        exploration_strategies = [
-            "random_mutation",
-            "opposite_direction", 
-            "emotional_hypothesis",
-            "peer_feedback_inspired",
-            "pure_random",
-            "gaussian_walk"
-        ]
-        
-        strategy = random.choice(exploration_strategies)
-        
-        if strategy == "random_mutation":
-            # Mutate current best config
-            exaggeration = current_best["exaggeration"] + (random.random() - 0.5) * self.mutation_strength
-            cfg_weight = current_best["cfg_weight"] + (random.random() - 0.5) * self.mutation_strength
-            
-        elif strategy == "opposite_direction":
-            # Try the opposite of current approach
-            exaggeration = 1.0 - current_best["exaggeration"]
-            cfg_weight = 1.0 - current_best["cfg_weight"]
-            
-        elif strategy == "emotional_hypothesis":
-            # Hypothesize based on emotional content
-            emotion = metadata.get("current_emotion", "neutral")
-            if emotion in ["excited", "enthusiastic", "happy"]:
-                exaggeration = 0.6 + random.random() * 0.4  # High energy
-                cfg_weight = 0.2 + random.random() * 0.4    # Less rigid
-            elif emotion in ["thinking", "concerned", "diplomatic"]:
-                exaggeration = 0.2 + random.random() * 0.4  # More measured
-                cfg_weight = 0.4 + random.random() * 0.4    # More controlled
-            elif emotion in ["skeptical", "sarcastic", "mischievous"]:
-                exaggeration = 0.3 + random.random() * 0.4  # Moderate expression
-                cfg_weight = 0.5 + random.random() * 0.3    # Confident delivery
-            else:
-                exaggeration = 0.3 + random.random() * 0.4
-                cfg_weight = 0.3 + random.random() * 0.4
-                
-        elif strategy == "peer_feedback_inspired":
-            # React to peer feedback patterns
-            peer_feedback = metadata.get("peer_feedback", {})
-            avg_engagement = peer_feedback.get("avg_engagement", 0.5)
-            
-            if avg_engagement < 0.4:
-                # Peers are bored, try being more expressive
-                exaggeration = 0.6 + random.random() * 0.4
-                cfg_weight = 0.2 + random.random() * 0.4
-            elif avg_engagement > 0.8:
-                # Peers love it, try a variation
-                exaggeration = current_best["exaggeration"] * (0.9 + random.random() * 0.2)
-                cfg_weight = current_best["cfg_weight"] * (0.9 + random.random() * 0.2)
-            else:
-                exaggeration = 0.3 + random.random() * 0.5
-                cfg_weight = 0.3 + random.random() * 0.5
-                
-        elif strategy == "gaussian_walk":
-            # Gaussian random walk from current position
-            exaggeration = current_best["exaggeration"] + random.gauss(0, self.mutation_strength)
-            cfg_weight = current_best["cfg_weight"] + random.gauss(0, self.mutation_strength)
-            
-        else:  # pure_random
-            exaggeration = 0.1 + random.random() * 0.9
-            cfg_weight = 0.2 + random.random() * 0.6
-        
-        # Clamp to valid ranges
-        exaggeration = max(0.1, min(1.0, exaggeration))
-        cfg_weight = max(0.2, min(0.8, cfg_weight))
-        
-        return {
-            "exaggeration": round(exaggeration, 3),
-            "cfg_weight": round(cfg_weight, 3),
-            "discovery_method": f"exploration_{strategy}",
-            "generation": current_best.get("generation", 0) + 1,
-            "strategy_used": strategy
-        }
-    
-    def _exploit_successful_patterns(self, character_id: str, current_best: Dict, history: List) -> Dict:
-        """Improve upon successful voice patterns"""
-        
-        # Find most successful experiments using adaptive thresholds
-        success_threshold = self._get_adaptive_success_threshold(character_id)
-        successful_experiments = [exp for exp in history if exp.success_score > success_threshold]
-        
-        if not successful_experiments:
-            # No clear successes yet, explore more
-            return self._explore_voice_space(character_id, current_best, {})
-        
-        # Analyze patterns in successful experiments
-        avg_successful_exag = sum(exp.exaggeration for exp in successful_experiments) / len(successful_experiments)
-        avg_successful_cfg = sum(exp.cfg_weight for exp in successful_experiments) / len(successful_experiments)
-        
-        # Create improved version with small variations
-        improvement_factor = self.mutation_strength * 0.5  # Smaller changes when exploiting
-        
-        exaggeration = avg_successful_exag + (random.random() - 0.5) * improvement_factor
-        cfg_weight = avg_successful_cfg + (random.random() - 0.5) * improvement_factor
-        
-        # Clamp values
-        exaggeration = max(0.1, min(1.0, exaggeration))
-        cfg_weight = max(0.2, min(0.8, cfg_weight))
-        
-        return {
-            "exaggeration": round(exaggeration, 3),
-            "cfg_weight": round(cfg_weight, 3),
-            "discovery_method": "exploit_successful_patterns",
-            "generation": current_best.get("generation", 0) + 1,
-            "successful_experiments_analyzed": len(successful_experiments),
-            "based_on_threshold": success_threshold
-        }
+    def _get_utterance_config(self, character_id: str, adaptive_metadata: Dict) -> Dict:
+        """One experimental config per utterance, so chunked speech keeps a single voice"""
+        
+        utterance_id = adaptive_metadata.get("utterance_id")
+        if not utterance_id:
+            return self._generate_experimental_config(character_id, adaptive_metadata)
+        
+        key = (character_id, utterance_id)
+        if key not in self._utterance_configs:
+            self._utterance_configs[key] = self._generate_experimental_config(character_id, adaptive_metadata)
+            while len(self._utterance_configs) > 256:
+                self._utterance_configs.popitem(last=False)
+        return self._utterance_configs[key]
     
     def _get_adaptive_success_threshold(self, character_id: str) -> float:
         """Get adaptive success threshold for this character"""
@@ -313,30 +222,27 @@ class AutonomousChatterboxService:
     def _update_adaptive_thresholds(self, character_id: str):
         """Update success thresholds based on statistical analysis"""
         
-        outcomes = self.character_outcomes[character_id]
+        history = self._get_history(character_id)
+        sample_size = len(history)
         
-        if len(outcomes) < self.min_sample_size:
+        if sample_size < self.min_sample_size:
             # Not enough data yet, use conservative defaults
             self._set_initial_threshold(character_id)
             return
         
-        # Analyze the distribution of scores
-        scores = [outcome["score"] for outcome in outcomes]
-        
-        # Statistical analysis
-        mean_score = statistics.mean(scores)
-        median_score = statistics.median(scores)
-        stdev_score = statistics.stdev(scores) if len(scores) > 1 else 0.1
+        # Statistical analysis (mean from running sums)
+        mean_score = history.mean()
+        median_score = history.median()
         
         # Percentile analysis for breakthrough detection
-        percentile_75 = self._calculate_percentile(scores, 0.75)
-        percentile_90 = self._calculate_percentile(scores, 0.90)
+        percentile_75 = history.percentile(0.75)
+        percentile_90 = history.percentile(0.90)
         
         # Use 75th percentile as breakthrough threshold
         breakthrough_threshold = percentile_75
         
         # Calculate confidence based on sample size and stability
-        confidence = min(1.0, len(scores) / 50.0)  # More samples = higher confidence
+        confidence = min(1.0, sample_size / 50.0)  # More samples = higher confidence
         
         # Check threshold stability (don't change too frequently)
         if character_id in self.character_thresholds:
@@ -351,7 +257,7 @@ class AutonomousChatterboxService:
         self.character_thresholds[character_id] = ThresholdAnalysis(
             current_success_threshold=breakthrough_threshold,
             confidence_level=confidence,
-            sample_size=len(scores),
+            sample_size=sample_size,
             last_update=time.time()
         )
         
@@ -367,13 +273,13 @@ class AutonomousChatterboxService:
             "percentile_75": percentile_75,
             "percentile_90": percentile_90,
             "confidence": confidence,
-            "sample_size": len(scores)
+            "sample_size": sample_size
         })
         
         logger.info(f"📊 Updated adaptive thresholds for {character_id}:")
         logger.info(f"   Breakthrough: {breakthrough_threshold:.3f}")
         logger.info(f"   Confidence: {confidence:.3f}")
-        logger.info(f"   Sample size: {len(scores)}")
+        logger.info(f"   Sample size: {sample_size}")
     
     def _set_initial_threshold(self, character_id: str):
         """Set conservative initial threshold when learning"""
@@ -381,17 +287,10 @@ class AutonomousChatterboxService:
         self.character_thresholds[character_id] = ThresholdAnalysis(
             current_success_threshold=0.6,  # Conservative initial
             confidence_level=0.1,  # Low confidence
-            sample_size=len(self.character_outcomes.get(character_id, [])),
+            sample_size=len(self.character_voice_history.get(character_id, ())),
             last_update=time.time()
         )
     
-    def _calculate_percentile(self, scores: List[float], percentile: float) -> float:
-        """Calculate percentile of scores"""
-        sorted_scores = sorted(scores)
-        index = int(len(sorted_scores) * percentile)
-        index = max(0, min(index, len(sorted_scores) - 1))
-        return sorted_scores[index]
-    
     async def generate_autonomous_speech(self,
                                        text: str,
                                        character_id: str,
@@ -402,9 +301,11 @@ class AutonomousChatterboxService:
         adaptive_metadata = adaptive_metadata or {}
         adaptive_metadata["current_emotion"] = emotion
         
+        await self._load_voice_history(character_id)
+        
         try:
             # Generate experimental voice config
-            voice_config = self._generate_experimental_config(character_id, adaptive_metadata)
+            voice_config = self._get_utterance_config(character_id, adaptive_metadata)
             
             logger.info(f"🧬 Autonomous Voice Experiment: {character_id}")
             logger.info(f"   Method: {voice_config['discovery_method']}")
@@ -420,25 +321,26 @@ class AutonomousChatterboxService:
                 "cfg_weight": voice_config["cfg_weight"]
             }
             
-            # Use voice reference if available
-            reference_path = self.voice_references.get(character_id)
-            if reference_path and os.path.exists(reference_path):
-                logger.debug(f"   🎭 Using voice cloning: {os.path.basename(reference_path)}")
-                with open(reference_path, 'rb') as audio_file:
-                    input_params["audio_prompt"] = audio_file
-                    output = self.client.run("resemble-ai/chatterbox", input=input_params)
-            else:
-                logger.debug(f"   🤖 Using built-in voice")
-                output = self.client.run("resemble-ai/chatterbox", input=input_params)
+            # Replicate and requests are blocking clients, keep them off the event loop
+            output = await asyncio.to_thread(self._run_chatterbox, character_id, input_params)
             
             if not output:
                 raise Exception("Chatterbox returned no output")
             
             # Download and process audio
-            audio_response = requests.get(output, timeout=30)
+            audio_response = await asyncio.to_thread(requests.get, output, timeout=30)
             audio_response.raise_for_status()
             audio_base64 = base64.b64encode(audio_response.content).decode('utf-8')
-            duration = len(text) * 0.05 + 1.0
+            
+            # Real duration from the audio header, estimate only if unparseable
+            audio_info = inspect_audio_bytes(audio_response.content)
+            if audio_info:
+                duration = audio_info.duration
+                audio_format = audio_info.format
+            else:
+                logger.warning(f"Could not inspect Chatterbox audio for {character_id}, estimating duration")
+                duration = len(text) * 0.05 + 1.0
+                audio_format = "wav"
             
             logger.info(f"✅ Autonomous voice experiment completed for {character_id}")
             
@@ -446,6 +348,7 @@ class AutonomousChatterboxService:
                 "success": True,
                 "audioBase64": audio_base64,
                 "duration": round(duration, 2),
+                "audioFormat": audio_format,
                 "provider": "autonomous_chatterbox",
                 "character_id": character_id,
                 "emotion": emotion,
@@ -462,6 +365,31 @@ class AutonomousChatterboxService:
             logger.error(f"Autonomous voice experiment failed for {character_id}: {e}")
             raise  # Re-raise exception - no fallbacks in production
     
+    @property
+    def client(self):
+        """Replicate client, imported and validated on first use rather than at startup"""
+        if self._client is None:
+            if not self.api_token:
+                raise ValueError("REPLICATE_API_TOKEN is required for autonomous voice system")
+            import replicate  # type: ignore
+
+            os.environ['REPLICATE_API_TOKEN'] = self.api_token
+            self._client = replicate.Client(api_token=self.api_token)
+        return self._client
+
+    def _run_chatterbox(self, character_id: str, input_params: Dict) -> Any:
+        """Blocking Replicate prediction (runs in a worker thread)"""
+        
+        # Use voice reference if available
+        reference_path = self.voice_references.get(character_id)
+        if reference_path and os.path.exists(reference_path):
+            logger.debug(f"   🎭 Using voice cloning: {os.path.basename(reference_path)}")
+            with open(reference_path, 'rb') as audio_file:
+                return self.client.run("resemble-ai/chatterbox", input={**input_params, "audio_prompt": audio_file})
+        
+        logger.debug(f"   🤖 Using built-in voice")
+        return self.client.run("resemble-ai/chatterbox", input=input_params)
+    
     async def generate_autonomous_speech_with_file(self,
                                                  text: str,
                                                  character_id: str,
@@ -476,16 +404,11 @@ class AutonomousChatterboxService:
             if not result["success"]:
                 raise Exception("Base speech generation failed")
             
-            # Save audio to temp file for Rhubarb
-            temp_dir = tempfile.gettempdir()
-            timestamp = int(time.time())
-            audio_filename = f"autonomous_{character_id}_{timestamp}.wav"
-            audio_file_path = os.path.join(temp_dir, audio_filename)
-            
-            # Decode base64 and save
+            # Save audio to an artifact file for lip-sync
             audio_data = base64.b64decode(result["audioBase64"])
-            with open(audio_file_path, 'wb') as f:
-                f.write(audio_data)
+            audio_file_path = artifact_manager.write(
+                audio_data, f"autonomous_{character_id}", f".{result.get('audioFormat', 'wav')}"
+            )
             
             # Add file path to result
             result["audioFilePath"] = audio_file_path
@@ -511,35 +434,16 @@ class AutonomousChatterboxService:
         else:
             success_score = engagement_score
         
-        # Create experiment record
-        experiment = VoiceExperiment(
-            exaggeration=voice_config["exaggeration"],
-            cfg_weight=voice_config["cfg_weight"],
-            text_content=text_content,
-            emotion_attempted=emotion,
-            success_score=success_score,
-            peer_reactions=peer_scores if peer_reactions else [],
-            timestamp=time.time(),
-            discovery_method=voice_config.get("discovery_method", "unknown")
-        )
-        
-        # Add to character's experiment history
-        self.character_voice_history[character_id].append(experiment)
-        
-        # Keep only recent experiments (last 100)
-        if len(self.character_voice_history[character_id]) > 100:
-            self.character_voice_history[character_id] = self.character_voice_history[character_id][-100:]
-        
-        # Record outcome for threshold analysis
-        if character_id not in self.character_outcomes:
-            self.character_outcomes[character_id] = deque(maxlen=100)
+        await self._load_voice_history(character_id)
         
-        self.character_outcomes[character_id].append({
-            "score": success_score,
-            "peer_count": len(peer_reactions),
-            "timestamp": time.time(),
-            "voice_config": voice_config
-        })
+        # Add to character's experiment ring buffer (keeps the last 100)
+        self._get_history(character_id).append(
+            voice_config["exaggeration"],
+            voice_config["cfg_weight"],
+            success_score,
+            time.time(),
+            method=voice_config.get("discovery_method", "unknown")
+        )
         
         # Update adaptive thresholds
         self._update_adaptive_thresholds(character_id)
@@ -569,25 +473,31 @@ class AutonomousChatterboxService:
                 logger.info(f"   Generation: {voice_config.get('generation', 0)}")
         
         logger.info(f"📊 Experiment recorded for {character_id}: score={success_score:.3f}, breakthrough={is_breakthrough}")
+        
+        await self._persist_voice_history(character_id)
     
     def _is_adaptive_breakthrough(self, character_id: str, success_score: float) -> bool:
         """Determine if this is a breakthrough using adaptive thresholds"""
+        return success_score > self._get_breakthrough_threshold(character_id)
+    
+    def _get_breakthrough_threshold(self, character_id: str) -> float:
+        """Score a result must beat to count as a breakthrough"""
         
         if character_id not in self.character_thresholds:
-            return success_score > 0.7  # Conservative fallback
+            return 0.7  # Conservative fallback
         
         threshold_analysis = self.character_thresholds[character_id]
         
         # Require reasonable confidence for breakthrough detection
         if threshold_analysis.confidence_level < 0.3:
-            return success_score > 0.7  # Conservative fallback
+            return 0.7  # Conservative fallback
         
-        return success_score > threshold_analysis.current_success_threshold
+        return threshold_analysis.current_success_threshold
     
     def get_character_evolution_summary(self, character_id: str) -> Dict:
         """Get comprehensive evolution summary for character"""
         
-        history = self.character_voice_history[character_id]
+        history = self.character_voice_history.get(character_id)
         current_best = self.character_current_best.get(character_id, {})
         threshold_analysis = self.character_thresholds.get(character_id)
         
@@ -599,24 +509,15 @@ class AutonomousChatterboxService:
             }
         
         # Performance analysis
-        recent_scores = [exp.success_score for exp in history[-20:]]
-        all_scores = [exp.success_score for exp in history]
-        
-        avg_recent = sum(recent_scores) / len(recent_scores) if recent_scores else 0
-        avg_all_time = sum(all_scores) / len(all_scores) if all_scores else 0
+        avg_recent = float(history.recent_scores(20).mean())
+        avg_all_time = history.mean()
         
         # Discovery method effectiveness
-        method_success = defaultdict(list)
-        for exp in history:
-            method_success[exp.discovery_method].append(exp.success_score)
-        
-        best_method = max(method_success.items(), 
-                         key=lambda x: sum(x[1])/len(x[1]) if x[1] else 0, 
-                         default=("none", []))[0]
+        method_means = history.method_means()
+        best_method = max(method_means, key=method_means.get, default="none")
         
         # Breakthrough count using adaptive thresholds
-        breakthrough_count = sum(1 for exp in history 
-                               if self._is_adaptive_breakthrough(character_id, exp.success_score))
+        breakthrough_count = history.count_above(self._get_breakthrough_threshold(character_id))
         
         return {
             "character_id": character_id,
@@ -646,7 +547,7 @@ class AutonomousChatterboxService:
             "voice_maturity": "high" if len(history) > 50 and breakthrough_count > 5 else "developing"
         }
     
-    def _determine_evolution_stage(self, history: List) -> str:
+    def _determine_evolution_stage(self, history: VoiceExperimentHistory) -> str:
         """Determine evolution stage based on experiment history"""
         
         if len(history) < 10:
@@ -660,12 +561,8 @@ class AutonomousChatterboxService:
     
     def cleanup_temp_file(self, file_path: str):
         """Clean up temporary files"""
-        try:
-            if os.path.exists(file_path):
-                os.unlink(file_path)
-                logger.debug(f"🧹 Cleaned up: {os.path.basename(file_path)}")
-        except Exception as e:
-            logger.warning(f"Failed to cleanup {file_path}: {e}")
+        artifact_manager.release(file_path)
+        logger.debug(f"🧹 Cleaned up: {os.path.basename(file_path)}")
 
 # Global autonomous service instance
 autonomous_chatterbox_service = AutonomousChatterboxService()
\ No newline at end of file
@@ -0,0 +1,262 @@
+# app/core/media/tts/chunking.py
+"""
+Sentence-level chunked synthesis
+Splits a response at sentence boundaries, synthesizes and lip-syncs the
+chunks concurrently on one provider, then joins the PCM gaplessly and
+rebases each chunk's mouth cues onto a single continuous timeline.
+A failed chunk fails over on its own; audio that can't be joined stops
+the batch at the first chunk that shows it.
+"""
+
+import asyncio
+import base64
+import io
+import logging
+import re
+import time
+import uuid
+import wave
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.config.settings import settings
+from app.core.media.artifacts import artifact_manager
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_END = re.compile(r'(?<=[.!?…])["\')\]]*\s+')
+_CLAUSE_END = re.compile(r'(?<=[,;:—])\s+')
+
+# Keep at most this much edge silence at each join
+JOIN_SILENCE_SECONDS = 0.08
+SILENCE_LEVEL = 0.01  # fraction of full scale
+
+# Providers seen returning audio other than PCM WAV; never chunked again
+_non_pcm_providers: Set[str] = set()
+
+def split_sentences(text: str, min_chars: int = 40, max_chars: int = 300) -> List[str]:
+    """Sentence chunks; short sentences merge forward, long ones split at clauses"""
+    sentences = [part.strip() for part in _SENTENCE_END.split(text.strip()) if part.strip()]
+
+    pieces: List[str] = []
+    for sentence in sentences:
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        current = ""
+        for clause in _CLAUSE_END.split(sentence):
+            if current and len(current) + len(clause) + 1 > max_chars:
+                pieces.append(current)
+                current = clause
+            else:
+                current = f"{current} {clause}".strip()
+        if current:
+            pieces.append(current)
+
+    chunks: List[str] = []
+    for piece in pieces:
+        if chunks and len(chunks[-1]) < min_chars:
+            chunks[-1] = f"{chunks[-1]} {piece}"
+        else:
+            chunks.append(piece)
+
+    # A short tail joins the previous chunk
+    if len(chunks) > 1 and len(chunks[-1]) < min_chars:
+        tail = chunks.pop()
+        chunks[-1] = f"{chunks[-1]} {tail}"
+    return chunks
+
+@dataclass
+class _PCMChunk:
+    params: Tuple[int, int, int]  # channels, sample width, sample rate
+    frames: bytes
+
+    @property
+    def frame_size(self) -> int:
+        return self.params[0] * self.params[1]
+
+    @property
+    def duration(self) -> float:
+        return len(self.frames) / self.frame_size / self.params[2]
+
+def _read_pcm(audio_bytes: bytes) -> Optional[_PCMChunk]:
+    """PCM frames from WAV bytes, None for anything else (e.g. MP3)"""
+    if audio_bytes[:4] != b"RIFF":
+        return None
+    try:
+        with wave.open(io.BytesIO(audio_bytes), "rb") as wav_file:
+            params = (wav_file.getnchannels(), wav_file.getsampwidth(), wav_file.getframerate())
+            return _PCMChunk(params, wav_file.readframes(wav_file.getnframes()))
+    except (wave.Error, EOFError) as e:
+        logger.debug(f"Chunk is not readable PCM WAV: {e}")
+        return None
+
+def _edge_silence(chunk: _PCMChunk) -> Tuple[int, int]:
+    """Frames of leading/trailing silence beyond the join allowance (16-bit only)"""
+    channels, width, rate = chunk.params
+    if width != 2 or not chunk.frames:
+        return 0, 0
+
+    samples = np.abs(np.frombuffer(chunk.frames, dtype="<i2").reshape(-1, channels)).max(axis=1)
+    voiced = np.flatnonzero(samples > SILENCE_LEVEL * 32768)
+    if voiced.size == 0:
+        return 0, 0
+
+    keep = int(JOIN_SILENCE_SECONDS * rate)
+    lead = max(0, int(voiced[0]) - keep)
+    trail = max(0, len(samples) - 1 - int(voiced[-1]) - keep)
+    return lead, trail
+
+def _rebase_cues(cues: List[Dict], shift: float, offset: float, length: float) -> List[Dict]:
+    """Move chunk-local cues by -shift, clip to the chunk, place at offset"""
+    rebased = []
+    for cue in cues:
+        start = max(0.0, cue["start"] - shift)
+        end = min(length, cue["end"] - shift)
+        if end > start:
+            rebased.append({"start": offset + start, "end": offset + end, "value": cue["value"]})
+    return rebased
+
+def _merge_cues(cues: List[Dict], duration: float) -> List[Dict]:
+    merged: List[Dict] = []
+    for cue in cues:
+        if merged and merged[-1]["value"] == cue["value"]:
+            merged[-1]["end"] = cue["end"]
+        elif merged:
+            # Close any sub-frame gap so the timeline stays continuous
+            cue = {**cue, "start": merged[-1]["end"]}
+            merged.append(cue)
+        else:
+            merged.append({**cue, "start": 0.0})
+    if merged:
+        merged[-1]["end"] = duration
+    return [
+        {"start": round(cue["start"], 2), "end": round(cue["end"], 2), "value": cue["value"]}
+        for cue in merged
+    ]
+
+def _to_wav(params: Tuple[int, int, int], frames: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(params[0])
+        wav_file.setsampwidth(params[1])
+        wav_file.setframerate(params[2])
+        wav_file.writeframes(frames)
+    return buffer.getvalue()
+
+class ChunkedSynthesisError(Exception):
+    """Chunks could not be synthesized or joined; caller should synthesize whole text"""
+    pass
+
+class ChunkingSkipped(ChunkedSynthesisError):
+    """Chunking not attempted (nothing was synthesized)"""
+    pass
+
+async def synthesize_chunked(router,
+                             lip_sync,
+                             text: str,
+                             character_id: str,
+                             emotion: str = "neutral",
+                             adaptive_metadata: Dict = None,
+                             max_concurrency: Optional[int] = None) -> Dict:
+    """Synthesize sentence chunks concurrently and join them into one response"""
+
+    chunks = split_sentences(text, settings.TTS_CHUNK_MIN_CHARS, settings.TTS_CHUNK_MAX_CHARS)
+    if len(chunks) < 2:
+        raise ChunkingSkipped("single sentence")
+
+    # One provider and one voice config for every chunk
+    provider = router.ranked_providers()[0]
+    if provider in _non_pcm_providers:
+        raise ChunkingSkipped(f"{provider} does not return PCM WAV")
+    metadata = {**(adaptive_metadata or {}), "utterance_id": uuid.uuid4().hex}
+    semaphore = asyncio.Semaphore(max_concurrency or settings.TTS_CHUNK_CONCURRENCY)
+    started = time.perf_counter()
+    formats: List[Tuple[int, int, int]] = []  # PCM params of the first finished chunk
+    abandoned: List[str] = []
+
+    async def synthesize_one(chunk_text: str) -> Tuple[Dict, _PCMChunk, Dict]:
+        async with semaphore:
+            if abandoned:
+                # Another chunk already sank the batch: don't pay for this one
+                raise ChunkedSynthesisError(abandoned[0])
+            try:
+                result = await router.synthesize_with(provider, chunk_text, character_id, emotion, metadata)
+            except Exception as e:
+                # Fail over this chunk alone so the finished ones are kept
+                logger.warning(f"TTS chunk on {provider} failed for {character_id} ({e}), retrying with failover")
+                result = await router.synthesize(chunk_text, character_id, emotion, metadata)
+
+            # Check the format before lip-syncing or releasing the slot, so a batch
+            # that can't be joined stops at the first chunk that shows it
+            chunk_provider = result.get("routedProvider", provider)
+            pcm = _read_pcm(base64.b64decode(result["audioBase64"]))
+            if pcm is None or (formats and pcm.params != formats[0]):
+                router.cleanup_temp_file(result.get("audioFilePath"))
+                if pcm is None:
+                    _non_pcm_providers.add(chunk_provider)
+                abandoned.append(f"{chunk_provider} chunks are not uniform PCM WAV")
+                raise ChunkedSynthesisError(abandoned[0])
+            if not formats:
+                formats.append(pcm.params)
+
+        with artifact_manager.claim(result.get("audioFilePath")) as audio_file_path:
+            cues = await lip_sync.generate_lip_sync_from_audio(audio_file_path=audio_file_path, text=chunk_text)
+        return result, pcm, cues
+
+    tasks = [asyncio.create_task(synthesize_one(chunk)) for chunk in chunks]
+    try:
+        outputs = await asyncio.gather(*tasks)
+    except Exception as e:
+        for task in tasks:
+            task.cancel()
+        if isinstance(e, ChunkedSynthesisError):
+            raise
+        raise ChunkedSynthesisError(f"chunk synthesis failed on {provider}: {e}") from e
+
+    pcm_chunks = [pcm for _, pcm, _ in outputs]
+    params = pcm_chunks[0].params
+    frame_size = pcm_chunks[0].frame_size
+    frames: List[bytes] = []
+    cues: List[Dict] = []
+    offset = 0.0
+
+    for index, (_, chunk, lip_sync_data) in enumerate(outputs):
+        lead, trail = _edge_silence(chunk)
+        if index == 0:
+            lead = 0
+        if index == len(pcm_chunks) - 1:
+            trail = 0
+
+        total_frames = len(chunk.frames) // frame_size
+        kept = chunk.frames[lead * frame_size:(total_frames - trail) * frame_size]
+        length = len(kept) / frame_size / params[2]
+
+        frames.append(kept)
+        cues.extend(_rebase_cues(lip_sync_data.get("mouthCues", []), lead / params[2], offset, length))
+        offset += length
+
+    wav_data = _to_wav(params, b"".join(frames))
+    elapsed = time.perf_counter() - started
+    logger.info(f"🧩 Chunked TTS for {character_id}: {len(chunks)} chunks on {provider}, "
+                f"{offset:.2f}s audio in {elapsed:.2f}s")
+
+    first = outputs[0][0]
+    return {
+        "success": True,
+        "degraded": any(result.get("degraded") for result, _, _ in outputs),
+        "audioBase64": base64.b64encode(wav_data).decode("utf-8"),
+        "duration": round(offset, 2),
+        "provider": first.get("provider", provider),
+        "routedProvider": provider,
+        "voice_config": first.get("voice_config"),
+        "character_id": character_id,
+        "emotion": emotion,
+        "chunks": len(chunks),
+        "lipSync": {
+            "metadata": {"duration": round(offset, 2)},
+            "mouthCues": _merge_cues(cues, offset)
+        }
+    }
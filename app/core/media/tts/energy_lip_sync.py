@@ -0,0 +1,207 @@
+# app/core/media/tts/energy_lip_sync.py
+"""
+Fast lip-sync from audio energy
+Frame RMS, zero-crossing rate and three spectral bands mapped to
+Rhubarb's A-H/X mouth shapes with vectorized NumPy, in milliseconds
+"""
+
+import logging
+import time
+import wave
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FRAME_SECONDS = 0.04
+HOP_SECONDS = 0.02
+MIN_CUE_SECONDS = 0.06
+
+# Band edges in Hz: low (voicing / open vowels), mid (formants), high (fricatives)
+LOW_BAND = (80.0, 1000.0)
+MID_BAND = (1000.0, 3000.0)
+HIGH_BAND = (3000.0, 8000.0)
+
+def _read_wav_mono(audio_file_path: str) -> Tuple[np.ndarray, int]:
+    """PCM WAV -> float32 mono samples in [-1, 1]"""
+    with wave.open(audio_file_path, "rb") as wav_file:
+        sample_rate = wav_file.getframerate()
+        channels = wav_file.getnchannels()
+        sample_width = wav_file.getsampwidth()
+        raw = wav_file.readframes(wav_file.getnframes())
+
+    if sample_width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sample_width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif sample_width == 3:
+        packed = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = packed[:, 0] | (packed[:, 1] << 8) | (packed[:, 2] << 16)
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        samples = values.astype(np.float32) / 8388608.0
+    elif sample_width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported sample width: {sample_width}")
+
+    if channels > 1:
+        samples = samples[: len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1)
+    return samples, sample_rate
+
+def _frame_features(samples: np.ndarray, sample_rate: int) -> Dict[str, np.ndarray]:
+    """Per-frame RMS, zero-crossing rate and band energy ratios"""
+    frame_length = max(1, int(FRAME_SECONDS * sample_rate))
+    hop_length = max(1, int(HOP_SECONDS * sample_rate))
+
+    if len(samples) < frame_length:
+        samples = np.pad(samples, (0, frame_length - len(samples)))
+
+    frames = np.lib.stride_tricks.sliding_window_view(samples, frame_length)[::hop_length]
+
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    signs = np.signbit(frames)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(frame_length), axis=1)) ** 2
+    frequencies = np.fft.rfftfreq(frame_length, d=1.0 / sample_rate)
+
+    def band(edges: Tuple[float, float]) -> np.ndarray:
+        mask = (frequencies >= edges[0]) & (frequencies < edges[1])
+        return spectrum[:, mask].sum(axis=1)
+
+    low, mid, high = band(LOW_BAND), band(MID_BAND), band(HIGH_BAND)
+    total = low + mid + high + 1e-12
+
+    return {
+        "rms": rms,
+        "zcr": zcr,
+        "low": low / total,
+        "mid": mid / total,
+        "high": high / total
+    }
+
+def _classify_frames(features: Dict[str, np.ndarray]) -> np.ndarray:
+    """Map frame features to mouth shapes (Rhubarb letters)"""
+    rms = features["rms"]
+    reference = np.percentile(rms, 95) if rms.size else 0.0
+    level = rms / reference if reference > 0 else np.zeros_like(rms)
+
+    zcr, low, mid, high = features["zcr"], features["low"], features["mid"], features["high"]
+
+    # Evaluated in priority order, first match wins
+    conditions = [
+        level < 0.08,                                   # X: silence / rest
+        (high > 0.45) & (zcr > 0.25),                   # B: sibilants (S, T, EE)
+        (high > 0.3) & (level < 0.35),                  # G: F / V
+        level < 0.22,                                   # A: closed (M, B, P)
+        (level >= 0.7) & (low > 0.6),                   # D: wide open (AA)
+        (level >= 0.45) & (mid > 0.35),                 # C: open (EH, AE)
+        (low > 0.75) & (mid < 0.15),                    # F: puckered (OO, W)
+        (mid > 0.45) & (zcr < 0.08),                    # H: tongue up (L)
+        level >= 0.45,                                  # C
+    ]
+    choices = ["X", "B", "G", "A", "D", "C", "F", "H", "C"]
+
+    return np.select(conditions, choices, default="E")  # E: slightly rounded
+
+def _build_cues(visemes: np.ndarray, duration: float) -> List[Dict]:
+    """Run-length encode frame visemes and absorb too-short cues"""
+    if visemes.size == 0:
+        return [{"start": 0.0, "end": round(duration, 2), "value": "X"}]
+
+    change_points = np.flatnonzero(visemes[1:] != visemes[:-1]) + 1
+    starts = np.concatenate(([0], change_points))
+    ends = np.concatenate((change_points, [visemes.size]))
+
+    cues: List[Dict] = []
+    for start_index, end_index in zip(starts, ends):
+        start = start_index * HOP_SECONDS
+        end = min(duration, end_index * HOP_SECONDS)
+        value = str(visemes[start_index])
+
+        if cues and (end - start < MIN_CUE_SECONDS or cues[-1]["value"] == value):
+            cues[-1]["end"] = end
+        else:
+            cues.append({"start": start, "end": end, "value": value})
+
+    cues[-1]["end"] = duration
+    return [
+        {"start": round(cue["start"], 2), "end": round(cue["end"], 2), "value": cue["value"]}
+        for cue in cues
+    ]
+
+def _text_timeline(text: str, duration: float) -> Dict:
+    """Open/closed mouth per word spread over the clip, for text-only requests"""
+    words = text.split()
+    if not words or duration <= 0:
+        return {"metadata": {"duration": round(max(duration, 0.0), 2)},
+                "mouthCues": [{"start": 0.0, "end": round(max(duration, 0.0), 2), "value": "X"}]}
+
+    word_duration = duration / len(words)
+    cues: List[Dict] = []
+    for index in range(len(words)):
+        start = index * word_duration
+        cues.append({"start": round(start, 2), "end": round(start + word_duration * 0.7, 2), "value": "C"})
+        cues.append({"start": round(start + word_duration * 0.7, 2), "end": round(start + word_duration, 2), "value": "A"})
+    return {"metadata": {"duration": round(duration, 2)}, "mouthCues": cues}
+
+class EnergyLipSyncService:
+    """Low-latency lip-sync engine, same output format as Rhubarb's converter"""
+
+    def __init__(self, fallback=None):
+        # Used for non-WAV audio and text-only requests
+        self.fallback = fallback
+        self.completed_jobs = 0
+        self.fallback_jobs = 0
+        self.total_time = 0.0
+
+    async def generate_lip_sync_from_audio(self, audio_file_path: str, text: str) -> Dict:
+        """Generate lip-sync from a PCM WAV file"""
+        started = time.perf_counter()
+        try:
+            lip_sync_data = self.analyze_file(audio_file_path)
+        except (wave.Error, ValueError, EOFError, OSError) as e:
+            logger.warning(f"Energy lip-sync cannot read {audio_file_path} ({e}), using fallback")
+            self.fallback_jobs += 1
+            if self.fallback is None:
+                raise
+            return await self.fallback.generate_lip_sync_from_audio(audio_file_path, text)
+
+        elapsed = time.perf_counter() - started
+        self.completed_jobs += 1
+        self.total_time += elapsed
+
+        logger.info(f"✅ Energy lip-sync generated: {len(lip_sync_data['mouthCues'])} cues in {elapsed * 1000:.1f}ms")
+        return lip_sync_data
+
+    async def generate_lip_sync(self, text: str, duration: float) -> Dict:
+        """Text-only lip-sync when there is no audio file"""
+        if self.fallback is None:
+            return _text_timeline(text, duration)
+        return await self.fallback.generate_lip_sync(text, duration)
+
+    def analyze_file(self, audio_file_path: str) -> Dict:
+        samples, sample_rate = _read_wav_mono(audio_file_path)
+        return self.analyze_samples(samples, sample_rate)
+
+    def analyze_samples(self, samples: np.ndarray, sample_rate: int) -> Dict:
+        duration = len(samples) / sample_rate if sample_rate else 0.0
+        if duration <= 0:
+            return {"metadata": {"duration": 0.0}, "mouthCues": []}
+
+        visemes = _classify_frames(_frame_features(samples, sample_rate))
+        return {
+            "metadata": {
+                "duration": round(duration, 2)
+            },
+            "mouthCues": _build_cues(visemes, duration)
+        }
+
+    def get_stats(self) -> Dict:
+        return {
+            "engine": "energy",
+            "completed_jobs": self.completed_jobs,
+            "fallback_jobs": self.fallback_jobs,
+            "avg_ms": round(self.total_time / self.completed_jobs * 1000, 2) if self.completed_jobs else 0.0
+        }
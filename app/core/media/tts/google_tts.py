@@ -3,22 +3,124 @@ import base64
 import json
 import asyncio
 import httpx
+import importlib.util
 import logging
+import random
 from typing import Optional, Dict, Any
-import tempfile
 import os
 import struct
-import time
 
 from app.config.settings import settings
+from app.core.media.artifacts import artifact_manager
+from app.core.media.audio_inspect import inspect_audio_file, measure_duration
 from .voice_profiles import get_voice_config
 
 logger = logging.getLogger(__name__)
 
 class GoogleTTSService:
-    def __init__(self):
+    def __init__(self, base_url: Optional[str] = None):
         self.api_key = settings.GOOGLE_TTS_API_KEY
-        self.base_url = "https://texttospeech.googleapis.com/v1/text:synthesize"
+        self.base_url = base_url or "https://texttospeech.googleapis.com/v1/text:synthesize"
+        
+        # Long-lived pooled client, created on start() or first use
+        self._client: Optional[httpx.AsyncClient] = None
+        self.max_retries = settings.GOOGLE_TTS_MAX_RETRIES
+        self.request_count = 0
+        self.retry_count = 0
+    
+    async def start(self):
+        """Open the pooled HTTP client (called from app startup)"""
+        if self._client is not None:
+            return
+        
+        http2 = settings.GOOGLE_TTS_HTTP2 and importlib.util.find_spec("h2") is not None
+        if settings.GOOGLE_TTS_HTTP2 and not http2:
+            logger.warning("h2 package not installed, Google TTS client falls back to HTTP/1.1")
+        
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(settings.GOOGLE_TTS_TIMEOUT, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=settings.GOOGLE_TTS_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GOOGLE_TTS_MAX_CONNECTIONS,
+                keepalive_expiry=60.0
+            ),
+            headers={"Content-Type": "application/json"}
+        )
+        logger.info(f"Google TTS client ready (http2={http2})")
+    
+    async def close(self):
+        """Close the pooled HTTP client (called from app shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            await self.start()
+        return self._client
+    
+    def _build_request_body(self, text: str, character_id: str, emotion: str) -> Dict[str, Any]:
+        voice_config = get_voice_config(character_id)
+        
+        # Emotion-based modifications
+        speaking_rate = voice_config["config"]["speakingRate"]
+        pitch = voice_config["config"]["pitch"]
+        
+        if emotion == "excited":
+            speaking_rate *= 1.2
+            pitch += 3.0
+        elif emotion == "concerned":
+            speaking_rate *= 0.8
+            pitch -= 2.0
+        elif emotion == "confident":
+            speaking_rate *= 1.1
+            pitch += 1.0
+            
+        return {
+            "input": {"text": text},
+            "voice": {
+                "languageCode": voice_config["config"]["languageCode"],
+                "name": voice_config["config"]["name"],
+                "ssmlGender": voice_config["config"]["ssmlGender"]
+            },
+            "audioConfig": {
+                "audioEncoding": "LINEAR16",
+                "sampleRateHertz": 22050,
+                "speakingRate": min(4.0, max(0.25, speaking_rate)),
+                "pitch": min(20.0, max(-20.0, pitch)),
+                "volumeGainDb": 0.0
+            }
+        }
+    
+    async def _synthesize(self, request_body: Dict[str, Any]) -> Optional[str]:
+        """POST to Google TTS with retries; returns base64 audioContent or None"""
+        client = await self._get_client()
+        
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.retry_count += 1
+                await asyncio.sleep(min(4.0, 0.25 * 2 ** (attempt - 1)) * (0.5 + random.random()))
+            
+            try:
+                self.request_count += 1
+                response = await client.post(f"{self.base_url}?key={self.api_key}", json=request_body)
+            except (httpx.TransportError, httpx.TimeoutException) as e:
+                logger.warning(f"Google TTS request failed (attempt {attempt + 1}): {e}")
+                continue
+            
+            if response.status_code == 200:
+                audio_content = response.json().get("audioContent")
+                if not audio_content:
+                    logger.error("No audio content received from Google TTS")
+                return audio_content
+            
+            logger.error(f"Google TTS API error: {response.status_code} - {response.text}")
+            # Only rate limits and server errors are worth retrying
+            if response.status_code != 429 and response.status_code < 500:
+                return None
+        
+        return None
         
     async def generate_speech(
         self, 
@@ -33,71 +135,23 @@ class GoogleTTSService:
             return await self._generate_mock_audio(text, character_id)
         
         try:
-            voice_config = get_voice_config(character_id)
+            audio_content = await self._synthesize(self._build_request_body(text, character_id, emotion))
+            if not audio_content:
+                return await self._generate_mock_audio(text, character_id)
             
-            # Emotion-based modifications
-            speaking_rate = voice_config["config"]["speakingRate"]
-            pitch = voice_config["config"]["pitch"]
+            # Measure duration from the audio header (estimate only if unparseable)
+            duration = measure_duration(base64.b64decode(audio_content), len(text) * 0.05 + 1.0)
             
-            if emotion == "excited":
-                speaking_rate *= 1.2
-                pitch += 3.0
-            elif emotion == "concerned":
-                speaking_rate *= 0.8
-                pitch -= 2.0
-            elif emotion == "confident":
-                speaking_rate *= 1.1
-                pitch += 1.0
-                
-            # Prepare request
-            request_body = {
-                "input": {"text": text},
-                "voice": {
-                    "languageCode": voice_config["config"]["languageCode"],
-                    "name": voice_config["config"]["name"],
-                    "ssmlGender": voice_config["config"]["ssmlGender"]
-                },
-                "audioConfig": {
-                    "audioEncoding": "LINEAR16",
-                    "sampleRateHertz": 22050,
-                    "speakingRate": min(4.0, max(0.25, speaking_rate)),
-                    "pitch": min(20.0, max(-20.0, pitch)),
-                    "volumeGainDb": 0.0
-                }
-            }
+            logger.info(f"✅ Google TTS generated for {character_id}: {len(text)} chars")
             
-            # Make API request
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}?key={self.api_key}",
-                    json=request_body,
-                    headers={"Content-Type": "application/json"}
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Google TTS API error: {response.status_code} - {response.text}")
-                    return await self._generate_mock_audio(text, character_id)
-                
-                data = response.json()
-                audio_content = data.get("audioContent")
-                
-                if not audio_content:
-                    logger.error("No audio content received from Google TTS")
-                    return await self._generate_mock_audio(text, character_id)
-                
-                # Calculate duration (rough estimate)
-                duration = len(text) * 0.05 + 1.0
-                
-                logger.info(f"✅ Google TTS generated for {character_id}: {len(text)} chars")
-                
-                return {
-                    "success": True,
-                    "audioBase64": audio_content,
-                    "duration": round(duration, 2),
-                    "provider": "google_tts",
-                    "character_id": character_id,
-                    "emotion": emotion
-                }
+            return {
+                "success": True,
+                "audioBase64": audio_content,
+                "duration": round(duration, 2),
+                "provider": "google_tts",
+                "character_id": character_id,
+                "emotion": emotion
+            }
                 
         except Exception as e:
             logger.error(f"TTS generation failed for {character_id}: {e}")
@@ -117,75 +171,28 @@ class GoogleTTSService:
             return await self._generate_mock_audio_with_file(text, character_id)
         
         try:
-            voice_config = get_voice_config(character_id)
+            audio_content = await self._synthesize(self._build_request_body(text, character_id, emotion))
+            if not audio_content:
+                return await self._generate_mock_audio_with_file(text, character_id)
             
-            # Emotion-based modifications
-            speaking_rate = voice_config["config"]["speakingRate"]
-            pitch = voice_config["config"]["pitch"]
+            # ✅ SAVE TO FILE FOR RHUBARB
+            audio_file_path = await self._save_audio_to_file(audio_content, character_id)
             
-            if emotion == "excited":
-                speaking_rate *= 1.2
-                pitch += 3.0
-            elif emotion == "concerned":
-                speaking_rate *= 0.8
-                pitch -= 2.0
-            elif emotion == "confident":
-                speaking_rate *= 1.1
-                pitch += 1.0
-                
-            # Prepare request
-            request_body = {
-                "input": {"text": text},
-                "voice": {
-                    "languageCode": voice_config["config"]["languageCode"],
-                    "name": voice_config["config"]["name"],
-                    "ssmlGender": voice_config["config"]["ssmlGender"]
-                },
-                "audioConfig": {
-                    "audioEncoding": "LINEAR16",
-                    "sampleRateHertz": 22050,
-                    "speakingRate": min(4.0, max(0.25, speaking_rate)),
-                    "pitch": min(20.0, max(-20.0, pitch)),
-                    "volumeGainDb": 0.0
-                }
-            }
+            # Measure duration from the saved file
+            audio_info = inspect_audio_file(audio_file_path)
+            duration = audio_info.duration if audio_info else len(text) * 0.05 + 1.0
             
-            # Make API request
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}?key={self.api_key}",
-                    json=request_body,
-                    headers={"Content-Type": "application/json"}
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Google TTS API error: {response.status_code} - {response.text}")
-                    return await self._generate_mock_audio_with_file(text, character_id)
-                
-                data = response.json()
-                audio_content = data.get("audioContent")
-                
-                if not audio_content:
-                    logger.error("No audio content received from Google TTS")
-                    return await self._generate_mock_audio_with_file(text, character_id)
-                
-                # ✅ SAVE TO FILE FOR RHUBARB
-                audio_file_path = await self._save_audio_to_file(audio_content, character_id)
-                
-                # Calculate duration
-                duration = len(text) * 0.05 + 1.0
-                
-                logger.info(f"✅ Google TTS with file generated for {character_id}: {os.path.basename(audio_file_path)}")
-                
-                return {
-                    "success": True,
-                    "audioBase64": audio_content,
-                    "audioFilePath": audio_file_path,  # ← NEW: For Rhubarb
-                    "duration": round(duration, 2),
-                    "provider": "google_tts",
-                    "character_id": character_id,
-                    "emotion": emotion
-                }
+            logger.info(f"✅ Google TTS with file generated for {character_id}: {os.path.basename(audio_file_path)}")
+            
+            return {
+                "success": True,
+                "audioBase64": audio_content,
+                "audioFilePath": audio_file_path,  # ← NEW: For Rhubarb
+                "duration": round(duration, 2),
+                "provider": "google_tts",
+                "character_id": character_id,
+                "emotion": emotion
+            }
                 
         except Exception as e:
             logger.error(f"TTS with file generation failed for {character_id}: {e}")
@@ -195,15 +202,15 @@ class GoogleTTSService:
         """Save Google TTS audio to WAV file for Rhubarb"""
         
         try:
-            # Create temporary file path
-            temp_dir = tempfile.gettempdir()
-            timestamp = int(time.time())
-            audio_filename = f"tts_{character_id}_{timestamp}.wav"
-            audio_file_path = os.path.join(temp_dir, audio_filename)
-            
             # Decode base64 audio (raw LINEAR16 from Google)
             audio_bytes = base64.b64decode(audio_base64)
             
+            # LINEAR16 responses usually carry their own WAV header already
+            if audio_bytes[:4] == b'RIFF':
+                audio_file_path = artifact_manager.write(audio_bytes, f"tts_{character_id}")
+                logger.info(f"💾 Audio saved to: {audio_file_path} ({len(audio_bytes)} bytes)")
+                return audio_file_path
+            
             # Create proper WAV file with header
             sample_rate = 22050
             num_channels = 1
@@ -228,8 +235,7 @@ class GoogleTTSService:
             )
             
             # Write WAV file
-            with open(audio_file_path, 'wb') as f:
-                f.write(wav_header + audio_bytes)
+            audio_file_path = artifact_manager.write(wav_header + audio_bytes, f"tts_{character_id}")
             
             logger.info(f"💾 Audio saved to: {audio_file_path} ({len(audio_bytes)} bytes)")
             return audio_file_path
@@ -340,13 +346,7 @@ class GoogleTTSService:
         wav_data = wav_header + bytearray(data_size)
         
         # SAVE TO FILE
-        temp_dir = tempfile.gettempdir()
-        timestamp = int(time.time())
-        audio_filename = f"mock_{character_id}_{timestamp}.wav"
-        audio_file_path = os.path.join(temp_dir, audio_filename)
-        
-        with open(audio_file_path, 'wb') as f:
-            f.write(wav_data)
+        audio_file_path = artifact_manager.write(bytes(wav_data), f"mock_{character_id}")
         
         # Convert to base64
         audio_base64 = base64.b64encode(wav_data).decode('utf-8')
@@ -366,12 +366,8 @@ class GoogleTTSService:
     # UTILITY: Clean up temporary files
     def cleanup_temp_file(self, file_path: str):
         """Clean up temporary audio file"""
-        try:
-            if os.path.exists(file_path):
-                os.unlink(file_path)
-                logger.debug(f"🧹 Cleaned up temp file: {os.path.basename(file_path)}")
-        except Exception as e:
-            logger.warning(f"Failed to cleanup temp file {file_path}: {e}")
+        artifact_manager.release(file_path)
+        logger.debug(f"🧹 Cleaned up temp file: {os.path.basename(file_path)}")
 
 # Singleton instance
 tts_service = GoogleTTSService()
\ No newline at end of file
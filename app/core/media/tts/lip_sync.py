@@ -1,44 +1,90 @@
 # app/core/media/tts/lip_sync.py
 import asyncio
-import subprocess
 import json
-import tempfile
 import os
+import shutil
 import logging
-from pathlib import Path
+import time
 from typing import Dict, List, Optional
 
+from app.config.settings import settings
+from app.core.media.audio_inspect import inspect_audio_file
+from app.utils import metrics
+
 logger = logging.getLogger(__name__)
 
 class RhubarbLipSyncService:
-    def __init__(self, rhubarb_path: Optional[str] = None):
-        self.rhubarb_path = rhubarb_path or self._find_rhubarb()
-        self.temp_dir = tempfile.gettempdir()
+    def __init__(self, 
+                 rhubarb_path: Optional[str] = None,
+                 max_workers: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        self._configured_path = rhubarb_path
+        self.rhubarb_path: Optional[str] = rhubarb_path
+        self.max_workers = max_workers or settings.RHUBARB_MAX_WORKERS or os.cpu_count() or 2
+        self.timeout = timeout or settings.RHUBARB_TIMEOUT
         
-    def _find_rhubarb(self) -> str:
-        """Find Rhubarb executable"""
-        possible_paths = [
+        # Availability is probed once, lazily, off the event loop
+        self._available: Optional[bool] = None
+        self._probe_lock: Optional[asyncio.Lock] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        
+        # Pool/queue metrics
+        self.queued_jobs = 0
+        self.running_jobs = 0
+        self.max_queue_depth = 0
+        self.completed_jobs = 0
+        self.failed_jobs = 0
+        self.timed_out_jobs = 0
+        self.fallback_jobs = 0
+        self.total_wait_time = 0.0
+        self.total_run_time = 0.0
+    
+    def _candidate_paths(self) -> List[str]:
+        if self._configured_path:
+            return [self._configured_path]
+        return [
             "./bin/rhubarb",
             "/usr/local/bin/rhubarb", 
             "/opt/homebrew/bin/rhubarb",
             "rhubarb"  # In PATH
         ]
+    
+    async def is_available(self) -> bool:
+        """Probe for Rhubarb once and cache the result"""
+        if self._available is not None:
+            return self._available
+        
+        if self._probe_lock is None:
+            self._probe_lock = asyncio.Lock()
         
-        for path in possible_paths:
-            if self._check_rhubarb_available(path):
+        async with self._probe_lock:
+            if self._available is None:
+                self.rhubarb_path = await self._find_rhubarb()
+                self._available = self.rhubarb_path is not None
+        return self._available
+    
+    async def _find_rhubarb(self) -> Optional[str]:
+        """Find Rhubarb executable"""
+        for path in self._candidate_paths():
+            if await self._check_rhubarb_available(path):
                 logger.info(f"Found Rhubarb at: {path}")
                 return path
                 
         logger.warning("Rhubarb not found, will use fallback")
-        return "rhubarb"  # Fallback
+        return None
     
-    def _check_rhubarb_available(self, path: str) -> bool:
+    async def _check_rhubarb_available(self, path: str) -> bool:
         """Check if Rhubarb is available"""
+        if os.sep not in path and shutil.which(path) is None:
+            return False
         try:
-            result = subprocess.run([path, "--version"], 
-                                  capture_output=True, timeout=5)
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+            process = await asyncio.create_subprocess_exec(
+                path, "--version",
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            return await asyncio.wait_for(process.wait(), timeout=5) == 0
+        except (asyncio.TimeoutError, FileNotFoundError, PermissionError):
             return False
     
     async def generate_lip_sync_from_audio(self, 
@@ -46,65 +92,113 @@ class RhubarbLipSyncService:
                                          text: str) -> Dict:
         """Generate lip-sync from audio file using Rhubarb"""
         
+        if not await self.is_available():
+            self.fallback_jobs += 1
+            return await self._generate_fallback_lip_sync(text, self._audio_duration(audio_file_path))
+        
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        
+        # Wait for a free worker slot
+        queued_at = time.perf_counter()
+        self.queued_jobs += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queued_jobs)
+        metrics.RHUBARB_QUEUED.inc()
         try:
-            # Check if Rhubarb is available
-            if not self._check_rhubarb_available(self.rhubarb_path):
-                logger.warning("Rhubarb not available, using fallback")
-                return await self._generate_fallback_lip_sync(text, 3.0)
-            
-            # Create temporary output file
-            output_file = os.path.join(self.temp_dir, f"lipsync_{os.getpid()}.json")
-            
-            # Prepare Rhubarb command
-            cmd = [
-                self.rhubarb_path,
-                "-f", "json",           # Output format
-                "-r", "phonetic",       # Recognizer
-                "--machineReadable",    # Machine readable output
-                "-o", output_file,      # Output file
-                audio_file_path         # Input audio
-            ]
-            
-            logger.info(f"Running Rhubarb: {' '.join(cmd)}")
-            
-            # Run Rhubarb asynchronously
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(), timeout=30
-            )
+            await self._slots.acquire()
+        finally:
+            self.queued_jobs -= 1
+            metrics.RHUBARB_QUEUED.dec()
+        
+        started_at = time.perf_counter()
+        self.total_wait_time += started_at - queued_at
+        metrics.RHUBARB_WAIT.observe(started_at - queued_at)
+        self.running_jobs += 1
+        metrics.RHUBARB_RUNNING.inc()
+        
+        try:
+            rhubarb_data = await self._run_rhubarb(audio_file_path)
             
-            if process.returncode != 0:
-                logger.error(f"Rhubarb failed: {stderr.decode()}")
-                return await self._generate_fallback_lip_sync(text, 3.0)
+            # Convert to our format
+            lip_sync_data = self._convert_rhubarb_format(rhubarb_data)
+            self.completed_jobs += 1
             
-            # Read and parse output
-            if os.path.exists(output_file):
-                with open(output_file, 'r') as f:
-                    rhubarb_data = json.load(f)
-                
-                # Clean up temporary file
-                os.unlink(output_file)
-                
-                # Convert to our format
-                lip_sync_data = self._convert_rhubarb_format(rhubarb_data)
-                
-                logger.info(f"✅ Rhubarb lip-sync generated: {len(lip_sync_data['mouthCues'])} cues")
-                return lip_sync_data
-            else:
-                logger.error("Rhubarb output file not created")
-                return await self._generate_fallback_lip_sync(text, 3.0)
+            logger.info(f"✅ Rhubarb lip-sync generated: {len(lip_sync_data['mouthCues'])} cues")
+            return lip_sync_data
                 
         except asyncio.TimeoutError:
+            self.timed_out_jobs += 1
             logger.error("Rhubarb timed out")
-            return await self._generate_fallback_lip_sync(text, 3.0)
+            return await self._generate_fallback_lip_sync(text, self._audio_duration(audio_file_path))
         except Exception as e:
+            self.failed_jobs += 1
             logger.error(f"Rhubarb error: {e}")
-            return await self._generate_fallback_lip_sync(text, 3.0)
+            return await self._generate_fallback_lip_sync(text, self._audio_duration(audio_file_path))
+        finally:
+            self.running_jobs -= 1
+            metrics.RHUBARB_RUNNING.dec()
+            self.total_run_time += time.perf_counter() - started_at
+            self._slots.release()
+    
+    async def _run_rhubarb(self, audio_file_path: str) -> Dict:
+        """Run one Rhubarb job, reading JSON from stdout (no shared output file)"""
+        cmd = [
+            self.rhubarb_path,
+            "-f", "json",           # Output format
+            "-r", "phonetic",       # Recognizer
+            "--machineReadable",    # Machine readable output
+            audio_file_path         # Input audio
+        ]
+        
+        logger.info(f"Running Rhubarb: {' '.join(cmd)}")
+        
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(), timeout=self.timeout
+            )
+        finally:
+            # Timed out or cancelled: don't leave Rhubarb running past its pool slot
+            if process.returncode is None:
+                process.kill()
+                await asyncio.shield(process.wait())
+        
+        if process.returncode != 0:
+            raise RuntimeError(f"Rhubarb failed: {stderr.decode(errors='replace')}")
+        
+        return json.loads(stdout)
+    
+    def _audio_duration(self, audio_file_path: str, default: float = 3.0) -> float:
+        """Clip length for the text fallback timeline"""
+        audio_info = inspect_audio_file(audio_file_path)
+        return round(audio_info.duration, 2) if audio_info else default
+    
+    async def generate_lip_sync(self, text: str, duration: float) -> Dict:
+        """Text-only lip-sync when there is no audio file"""
+        return await self._generate_fallback_lip_sync(text, duration)
+    
+    def get_stats(self) -> Dict:
+        """Worker pool and queue metrics"""
+        finished = self.completed_jobs + self.failed_jobs + self.timed_out_jobs
+        return {
+            "available": self._available,
+            "rhubarb_path": self.rhubarb_path,
+            "max_workers": self.max_workers,
+            "queued_jobs": self.queued_jobs,
+            "running_jobs": self.running_jobs,
+            "max_queue_depth": self.max_queue_depth,
+            "completed_jobs": self.completed_jobs,
+            "failed_jobs": self.failed_jobs,
+            "timed_out_jobs": self.timed_out_jobs,
+            "fallback_jobs": self.fallback_jobs,
+            "avg_wait_ms": round(self.total_wait_time / finished * 1000, 1) if finished else 0.0,
+            "avg_run_ms": round(self.total_run_time / finished * 1000, 1) if finished else 0.0
+        }
     
     def _convert_rhubarb_format(self, rhubarb_data: Dict) -> Dict:
         """Convert Rhubarb output to our format"""
@@ -187,6 +281,17 @@ class RhubarbLipSyncService:
             "mouthCues": mouth_cues
         }
 
-# Global instance
+# Global instances
 rhubarb_service = RhubarbLipSyncService()
-lip_sync_generator = rhubarb_service
\ No newline at end of file
+
+def create_lip_sync_generator():
+    """Live-playback engine selected by LIP_SYNC_ENGINE (Rhubarb stays available for archival quality)"""
+    if settings.LIP_SYNC_ENGINE == "rhubarb":
+        return rhubarb_service
+    
+    from app.core.media.tts.energy_lip_sync import EnergyLipSyncService
+    if settings.LIP_SYNC_ENGINE != "energy":
+        logger.warning(f"Unknown LIP_SYNC_ENGINE '{settings.LIP_SYNC_ENGINE}', using energy")
+    return EnergyLipSyncService(fallback=rhubarb_service)
+
+lip_sync_generator = create_lip_sync_generator()
\ No newline at end of file
@@ -0,0 +1,319 @@
+# app/core/media/tts/router.py
+"""
+Multi-provider TTS router
+Holds Chatterbox, Google and a local silent fallback, tracks rolling
+p50/p95 latency and error rate per provider, routes each request to the
+best-scoring one and optionally races a second provider once the
+primary exceeds its latency budget
+"""
+
+import asyncio
+import base64
+import logging
+import struct
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.config.settings import settings
+from app.core.media.artifacts import artifact_manager
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+class ProviderStats:
+    """Rolling latency and outcome window for one provider"""
+
+    def __init__(self, window: int = 200):
+        self.latencies = deque(maxlen=window)  # Successful calls, seconds
+        self.outcomes = deque(maxlen=window)   # True = success
+        self.censored = deque(maxlen=window)   # Abandoned calls, elapsed seconds (lower bounds)
+        self.requests = 0
+        self.errors = 0
+        self.abandoned = 0
+        self.degraded = 0
+        self.race_wins = 0
+        self.race_losses = 0
+        self.consecutive_failures = 0
+        self.last_failure = 0.0
+
+    def record(self, success: bool, latency: float):
+        self.requests += 1
+        self.outcomes.append(success)
+        if success:
+            self.latencies.append(latency)
+            self.consecutive_failures = 0
+        else:
+            self.errors += 1
+            self.consecutive_failures += 1
+            self.last_failure = time.time()
+
+    def record_abandoned(self, latency: float):
+        """Cancelled before finishing: neither a success nor a failure, elapsed time is only a lower bound"""
+        self.requests += 1
+        self.abandoned += 1
+        self.censored.append(latency)
+
+    @property
+    def samples(self) -> int:
+        return len(self.outcomes) + len(self.censored)
+
+    @property
+    def error_rate(self) -> float:
+        return 1.0 - sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def percentile(self, q: float, include_censored: bool = False) -> Optional[float]:
+        """Latency percentile; censored samples count as finishing when they were abandoned"""
+        samples = list(self.latencies) + list(self.censored) if include_censored else self.latencies
+        return float(np.percentile(samples, q)) if samples else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(50), self.percentile(95)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "abandoned": self.abandoned,
+            "degraded": self.degraded,
+            "error_rate": round(self.error_rate, 3),
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "race_wins": self.race_wins,
+            "race_losses": self.race_losses,
+            "consecutive_failures": self.consecutive_failures
+        }
+
+class LocalFallbackTTS:
+    """Silent WAV of the estimated speech length, always available"""
+
+    sample_rate = 22050
+
+    async def generate_speech_with_file(self, text: str, character_id: str = "claude",
+                                        emotion: str = "neutral") -> Dict[str, Any]:
+        duration = len(text) * 0.05 + 1.0
+        data_size = int(duration * self.sample_rate) * 2
+        wav_data = struct.pack('<4sI4s4sIHHIIHH4sI',
+            b'RIFF', 36 + data_size, b'WAVE', b'fmt ', 16, 1, 1,
+            self.sample_rate, self.sample_rate * 2, 2, 16, b'data', data_size) + bytes(data_size)
+
+        audio_file_path = artifact_manager.write(wav_data, f"fallback_{character_id}")
+
+        return {
+            "success": True,
+            "degraded": True,  # Silence, not speech
+            "audioBase64": base64.b64encode(wav_data).decode('utf-8'),
+            "audioFilePath": audio_file_path,
+            "duration": round(duration, 2),
+            "provider": "local_fallback",
+            "character_id": character_id,
+            "emotion": emotion
+        }
+
+ProviderCall = Callable[[str, str, str, Dict], Awaitable[Dict[str, Any]]]
+
+class TTSRouter:
+    """Routes synthesis requests across providers by observed latency and errors"""
+
+    FALLBACK = "local"
+
+    def __init__(self,
+                 providers: Optional[Dict[str, ProviderCall]] = None,
+                 preferred: Optional[str] = None,
+                 latency_budget: Optional[float] = None,
+                 racing: Optional[bool] = None,
+                 min_samples: int = 5,
+                 failure_cooldown: float = 30.0):
+        self._providers: Optional[Dict[str, ProviderCall]] = providers
+        self.preferred = preferred or settings.TTS_PROVIDER
+        self.latency_budget = settings.TTS_LATENCY_BUDGET if latency_budget is None else latency_budget
+        self.racing = settings.TTS_RACING if racing is None else racing
+        self.min_samples = min_samples
+        self.failure_cooldown = failure_cooldown
+        self.stats: Dict[str, ProviderStats] = {}
+
+    # Providers
+
+    def _load_providers(self) -> Dict[str, ProviderCall]:
+        """Adapters for every configured provider that can be constructed"""
+        providers: Dict[str, ProviderCall] = {}
+        enabled = [name.strip() for name in settings.TTS_ROUTER_PROVIDERS.split(",") if name.strip()]
+
+        if "chatterbox" in enabled:
+            try:
+                from .chatterbox_tts import autonomous_chatterbox_service as chatterbox
+
+                async def call_chatterbox(text: str, character_id: str, emotion: str, metadata: Dict) -> Dict:
+                    return await chatterbox.generate_autonomous_speech_with_file(
+                        text=text, character_id=character_id, emotion=emotion, adaptive_metadata=metadata
+                    )
+                providers["chatterbox"] = call_chatterbox
+            except Exception as e:
+                logger.warning(f"⚠️ Chatterbox TTS unavailable for routing: {e}")
+
+        if "google" in enabled and settings.GOOGLE_TTS_API_KEY:
+            from .google_tts import tts_service as google
+
+            async def call_google(text: str, character_id: str, emotion: str, metadata: Dict) -> Dict:
+                result = await google.generate_speech_with_file(text, character_id, emotion)
+                if result.get("provider") == "mock":
+                    # Google degrades to mock audio internally; count that as a failure
+                    self.cleanup_temp_file(result.get("audioFilePath"))
+                    raise RuntimeError("Google TTS returned mock audio")
+                return result
+            providers["google"] = call_google
+
+        local = LocalFallbackTTS()
+
+        async def call_local(text: str, character_id: str, emotion: str, metadata: Dict) -> Dict:
+            return await local.generate_speech_with_file(text, character_id, emotion)
+        providers[self.FALLBACK] = call_local
+
+        logger.info(f"🔀 TTS router providers: {', '.join(providers)} (preferred {self.preferred})")
+        return providers
+
+    @property
+    def providers(self) -> Dict[str, ProviderCall]:
+        if self._providers is None:
+            self._providers = self._load_providers()
+        return self._providers
+
+    def _stats(self, name: str) -> ProviderStats:
+        if name not in self.stats:
+            self.stats[name] = ProviderStats()
+        return self.stats[name]
+
+    def _score(self, name: str) -> float:
+        """Expected cost: p95 latency inflated by error rate (lower is better)"""
+        stats = self._stats(name)
+        if stats.samples < self.min_samples:
+            # Not enough data: keep configured preference order
+            return 0.0 if name == self.preferred else self.latency_budget
+        # Abandoned calls keep a hung provider's p95 at least as high as the time it was given
+        p95 = stats.percentile(95, include_censored=True)
+        if p95 is None:
+            p95 = self.latency_budget * 2
+        return p95 * (1.0 + 4.0 * stats.error_rate)
+
+    def ranked_providers(self) -> List[str]:
+        """Real providers best first, failing ones last, local fallback at the end"""
+        now = time.time()
+        candidates = [name for name in self.providers if name != self.FALLBACK]
+
+        def tripped(name: str) -> bool:
+            stats = self._stats(name)
+            return stats.consecutive_failures >= 3 and now - stats.last_failure < self.failure_cooldown
+
+        candidates.sort(key=lambda name: (tripped(name), self._score(name), name != self.preferred))
+        return candidates + [self.FALLBACK]
+
+    # Synthesis
+
+    async def _call(self, name: str, text: str, character_id: str, emotion: str, metadata: Dict) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            result = await self.providers[name](text, character_id, emotion, metadata)
+            if not result or not result.get("success"):
+                raise RuntimeError(f"{name} returned no audio")
+        except asyncio.CancelledError:
+            self._stats(name).record_abandoned(time.perf_counter() - started)
+            metrics.observe_tts(name, "abandoned", time.perf_counter() - started)
+            raise
+        except Exception:
+            self._stats(name).record(False, time.perf_counter() - started)
+            metrics.observe_tts(name, "error", time.perf_counter() - started)
+            raise
+
+        self._stats(name).record(True, time.perf_counter() - started)
+        if result.get("degraded"):
+            self._stats(name).degraded += 1
+        metrics.observe_tts(name, "degraded" if result.get("degraded") else "success", time.perf_counter() - started)
+        result["routedProvider"] = name
+        return result
+
+    async def _race(self, primary: str, secondary: str, text: str, character_id: str,
+                    emotion: str, metadata: Dict, tried: set) -> Dict[str, Any]:
+        """Start the primary, add the secondary once the budget is spent, first success wins"""
+        tasks = {asyncio.create_task(self._call(primary, text, character_id, emotion, metadata)): primary}
+        done, _ = await asyncio.wait(tasks, timeout=self.latency_budget)
+
+        if not done:
+            logger.info(f"⏱️ {primary} over {self.latency_budget:.1f}s budget, racing {secondary}")
+            tried.add(secondary)
+            tasks[asyncio.create_task(self._call(secondary, text, character_id, emotion, metadata))] = secondary
+
+        pending = set(tasks)
+        winner: Optional[Dict[str, Any]] = None
+        last_error: Optional[BaseException] = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                    elif winner is None:
+                        winner = task.result()
+                        if len(tasks) > 1:
+                            self._stats(tasks[task]).race_wins += 1
+                    else:
+                        # Both finished together: drop the loser's audio
+                        self.cleanup_temp_file(task.result().get("audioFilePath"))
+                        self._stats(tasks[task]).race_losses += 1
+        finally:
+            for task in pending:
+                task.cancel()
+                if winner is not None:
+                    self._stats(tasks[task]).race_losses += 1
+
+        if winner is None:
+            raise last_error or RuntimeError("TTS race produced no result")
+        return winner
+
+    async def synthesize(self,
+                         text: str,
+                         character_id: str,
+                         emotion: str = "neutral",
+                         adaptive_metadata: Dict = None) -> Dict[str, Any]:
+        """Synthesize to a temp file via the best available provider"""
+        metadata = adaptive_metadata or {}
+        order = self.ranked_providers()
+        tried = set()
+
+        for index, name in enumerate(order):
+            if name in tried:
+                continue
+            tried.add(name)
+            secondary = next((other for other in order[index + 1:] if other not in tried), None)
+            try:
+                if self.racing and secondary and secondary != self.FALLBACK and self.latency_budget > 0:
+                    return await self._race(name, secondary, text, character_id, emotion, metadata, tried)
+                return await self._call(name, text, character_id, emotion, metadata)
+            except Exception as e:
+                logger.warning(f"TTS provider {name} failed for {character_id}: {e}")
+
+        raise RuntimeError("All TTS providers failed")
+
+    async def synthesize_with(self,
+                              provider: str,
+                              text: str,
+                              character_id: str,
+                              emotion: str = "neutral",
+                              adaptive_metadata: Dict = None) -> Dict[str, Any]:
+        """Synthesize on one named provider (no failover), still recording its timings"""
+        return await self._call(provider, text, character_id, emotion, adaptive_metadata or {})
+
+    def cleanup_temp_file(self, file_path: Optional[str]):
+        """Remove a provider's temp audio file"""
+        artifact_manager.release(file_path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "preferred": self.preferred,
+            "racing": self.racing,
+            "latency_budget_s": self.latency_budget,
+            "ranking": self.ranked_providers(),
+            "providers": {name: self._stats(name).to_dict() for name in self.providers}
+        }
+
+# Global router instance
+tts_router = TTSRouter()
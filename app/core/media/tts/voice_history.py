@@ -0,0 +1,155 @@
+# app/core/media/tts/voice_history.py
+"""
+Ring-buffer voice experiment history
+Fixed-size NumPy columns (exaggeration, cfg_weight, score, timestamp,
+method) with running sums, so per-synthesis statistics are vectorized
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+class VoiceExperimentHistory:
+    """Last `capacity` voice experiments for one character"""
+
+    COLUMNS = ("exaggeration", "cfg_weight", "score", "timestamp")
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self._data = np.zeros((len(self.COLUMNS), capacity), dtype=np.float64)
+        self._methods = np.zeros(capacity, dtype=np.int16)
+        self.method_names: List[str] = []
+        self._next = 0
+        self._size = 0
+        self.total_recorded = 0
+
+        # Running sums over the buffered scores
+        self._score_sum = 0.0
+        self._score_sq_sum = 0.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _method_code(self, method: str) -> int:
+        try:
+            return self.method_names.index(method)
+        except ValueError:
+            self.method_names.append(method)
+            return len(self.method_names) - 1
+
+    def append(self, exaggeration: float, cfg_weight: float, score: float,
+               timestamp: float, method: str = "unknown"):
+        if self._size == self.capacity:
+            evicted = self._data[2, self._next]
+            self._score_sum -= evicted
+            self._score_sq_sum -= evicted * evicted
+        else:
+            self._size += 1
+
+        self._data[:, self._next] = (exaggeration, cfg_weight, score, timestamp)
+        self._methods[self._next] = self._method_code(method)
+        self._next = (self._next + 1) % self.capacity
+        self.total_recorded += 1
+
+        self._score_sum += score
+        self._score_sq_sum += score * score
+
+    def extend(self, other: "VoiceExperimentHistory"):
+        """Append another history's experiments in chronological order"""
+        methods = other._ordered_methods()
+        for index, values in enumerate(zip(*(other.column(name) for name in self.COLUMNS))):
+            self.append(*values, method=other.method_names[methods[index]])
+
+    def column(self, name: str) -> np.ndarray:
+        """Chronological copy of one column (oldest first)"""
+        row = self._data[self.COLUMNS.index(name)]
+        if self._size < self.capacity:
+            return row[:self._size].copy()
+        return np.concatenate((row[self._next:], row[:self._next]))
+
+    def _ordered_methods(self) -> np.ndarray:
+        if self._size < self.capacity:
+            return self._methods[:self._size]
+        return np.concatenate((self._methods[self._next:], self._methods[:self._next]))
+
+    @property
+    def scores(self) -> np.ndarray:
+        return self.column("score")
+
+    def recent_scores(self, count: int, skip: int = 0) -> np.ndarray:
+        """`count` scores ending `skip` experiments before the newest"""
+        scores = self.scores
+        end = len(scores) - skip
+        return scores[max(0, end - count):max(0, end)]
+
+    def mean(self) -> float:
+        return self._score_sum / self._size if self._size else 0.0
+
+    def variance(self, sample: bool = True) -> float:
+        """Score variance from the running sums"""
+        denominator = self._size - 1 if sample else self._size
+        if denominator <= 0:
+            return 0.0
+        centered = self._score_sq_sum - self._score_sum * self._score_sum / self._size
+        return max(0.0, centered / denominator)
+
+    def median(self) -> float:
+        return float(np.median(self._data[2, :self._size])) if self._size else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Value at index int(n * fraction) of the sorted scores"""
+        if not self._size:
+            return 0.0
+        index = min(self._size - 1, max(0, int(self._size * fraction)))
+        return float(np.partition(self._data[2, :self._size], index)[index])
+
+    def count_above(self, threshold: float) -> int:
+        return int(np.count_nonzero(self._data[2, :self._size] > threshold))
+
+    def successful_centroid(self, threshold: float) -> Optional[Dict[str, float]]:
+        """Mean exaggeration/cfg_weight of experiments scoring above threshold"""
+        mask = self._data[2, :self._size] > threshold
+        count = int(np.count_nonzero(mask))
+        if not count:
+            return None
+        return {
+            "exaggeration": float(self._data[0, :self._size][mask].mean()),
+            "cfg_weight": float(self._data[1, :self._size][mask].mean()),
+            "count": count
+        }
+
+    def method_means(self) -> Dict[str, float]:
+        """Average score per discovery method"""
+        if not self._size:
+            return {}
+        codes = self._methods[:self._size]
+        totals = np.bincount(codes, weights=self._data[2, :self._size], minlength=len(self.method_names))
+        counts = np.bincount(codes, minlength=len(self.method_names))
+        return {
+            name: float(totals[code] / counts[code])
+            for code, name in enumerate(self.method_names)
+            if counts[code]
+        }
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable snapshot (chronological) for persistence"""
+        snapshot = {name: self.column(name).round(6).tolist() for name in self.COLUMNS}
+        snapshot["method"] = self._ordered_methods().tolist()
+        snapshot["method_names"] = list(self.method_names)
+        snapshot["total_recorded"] = self.total_recorded
+        snapshot["capacity"] = self.capacity
+        return snapshot
+
+    @classmethod
+    def from_dict(cls, snapshot: Dict, capacity: int = 100) -> "VoiceExperimentHistory":
+        history = cls(capacity)
+        method_names = snapshot.get("method_names", [])
+        methods = snapshot.get("method", [])
+
+        for index, values in enumerate(zip(*(snapshot.get(name, []) for name in cls.COLUMNS))):
+            code = methods[index] if index < len(methods) else None
+            method = method_names[code] if code is not None and code < len(method_names) else "unknown"
+            history.append(*values, method=method)
+
+        history.total_recorded = max(history.total_recorded, snapshot.get("total_recorded", 0))
+        return history
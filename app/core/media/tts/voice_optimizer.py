@@ -0,0 +1,322 @@
+# app/core/media/tts/voice_optimizer.py
+"""
+Voice parameter optimizers
+Pluggable search over (exaggeration, cfg_weight) fed by the experiment
+ring buffer: the legacy strategy mix, a Gaussian process with expected
+improvement, and a Tree-structured Parzen Estimator, all in NumPy
+"""
+
+import logging
+import math
+import random
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.core.media.tts.voice_history import VoiceExperimentHistory
+
+logger = logging.getLogger(__name__)
+
+# Valid parameter ranges (same clamps Chatterbox requests have always used)
+EXAGGERATION_RANGE = (0.1, 1.0)
+CFG_WEIGHT_RANGE = (0.2, 0.8)
+
+def clamp_config(exaggeration: float, cfg_weight: float) -> Dict[str, float]:
+    return {
+        "exaggeration": round(max(EXAGGERATION_RANGE[0], min(EXAGGERATION_RANGE[1], exaggeration)), 3),
+        "cfg_weight": round(max(CFG_WEIGHT_RANGE[0], min(CFG_WEIGHT_RANGE[1], cfg_weight)), 3)
+    }
+
+def adaptive_exploration_rate(history: Optional[VoiceExperimentHistory], base_rate: float) -> float:
+    """Exploration rate from the recent score trend and variance"""
+
+    if history is None or not len(history):
+        return base_rate
+
+    if len(history) < 10:
+        return 0.4  # High exploration when learning
+
+    # Analyze recent performance trend
+    recent_scores = history.recent_scores(10)
+    recent_avg = float(recent_scores.mean())
+
+    if len(history) >= 20:
+        improvement_trend = recent_avg - float(history.recent_scores(10, skip=10).mean())
+    else:
+        improvement_trend = 0
+
+    # If improving, explore less (exploit what works)
+    if improvement_trend > 0.1:
+        exploration_rate = base_rate * 0.7
+    # If declining, explore more (find new approaches)
+    elif improvement_trend < -0.1:
+        exploration_rate = base_rate * 1.5
+    # If stagnant, moderate exploration
+    else:
+        exploration_rate = base_rate * 1.2
+
+    # High variance = inconsistent results = need more exploration
+    exploration_rate += min(0.2, float(recent_scores.var(ddof=1)) * 2)
+
+    # Clamp to reasonable range
+    return max(0.05, min(0.6, exploration_rate))
+
+class VoiceOptimizer(ABC):
+    """Suggests the next voice config to try from a character's history"""
+
+    name = "base"
+
+    @abstractmethod
+    def suggest(self, history: VoiceExperimentHistory, current_best: Dict, context: Dict) -> Dict:
+        """
+        Return {"exaggeration", "cfg_weight", "discovery_method", "strategy_used"}
+        context carries exploration_rate, success_threshold and adaptive metadata
+        """
+
+class LegacyVoiceOptimizer(VoiceOptimizer):
+    """Original mix of six random exploration strategies plus exploitation"""
+
+    name = "legacy"
+
+    def __init__(self, mutation_strength: float = 0.15):
+        self.mutation_strength = mutation_strength
+
+    def suggest(self, history: VoiceExperimentHistory, current_best: Dict, context: Dict) -> Dict:
+        should_explore = random.random() < context.get("exploration_rate", 0.3)
+
+        if should_explore or len(history) < 5:
+            # EXPLORATION: Try something new
+            return self._explore(current_best, context.get("metadata", {}))
+
+        # EXPLOITATION: Improve what works
+        return self._exploit(history, current_best, context.get("success_threshold", 0.6))
+
+    def _explore(self, current_best: Dict, metadata: Dict) -> Dict:
+        strategy = random.choice([
+            "random_mutation",
+            "opposite_direction",
+            "emotional_hypothesis",
+            "peer_feedback_inspired",
+            "pure_random",
+            "gaussian_walk"
+        ])
+
+        if strategy == "random_mutation":
+            # Mutate current best config
+            exaggeration = current_best["exaggeration"] + (random.random() - 0.5) * self.mutation_strength
+            cfg_weight = current_best["cfg_weight"] + (random.random() - 0.5) * self.mutation_strength
+
+        elif strategy == "opposite_direction":
+            # Try the opposite of current approach
+            exaggeration = 1.0 - current_best["exaggeration"]
+            cfg_weight = 1.0 - current_best["cfg_weight"]
+
+        elif strategy == "emotional_hypothesis":
+            # Hypothesize based on emotional content
+            emotion = metadata.get("current_emotion", "neutral")
+            if emotion in ["excited", "enthusiastic", "happy"]:
+                exaggeration = 0.6 + random.random() * 0.4  # High energy
+                cfg_weight = 0.2 + random.random() * 0.4    # Less rigid
+            elif emotion in ["thinking", "concerned", "diplomatic"]:
+                exaggeration = 0.2 + random.random() * 0.4  # More measured
+                cfg_weight = 0.4 + random.random() * 0.4    # More controlled
+            elif emotion in ["skeptical", "sarcastic", "mischievous"]:
+                exaggeration = 0.3 + random.random() * 0.4  # Moderate expression
+                cfg_weight = 0.5 + random.random() * 0.3    # Confident delivery
+            else:
+                exaggeration = 0.3 + random.random() * 0.4
+                cfg_weight = 0.3 + random.random() * 0.4
+
+        elif strategy == "peer_feedback_inspired":
+            # React to peer feedback patterns
+            avg_engagement = metadata.get("peer_feedback", {}).get("avg_engagement", 0.5)
+
+            if avg_engagement < 0.4:
+                # Peers are bored, try being more expressive
+                exaggeration = 0.6 + random.random() * 0.4
+                cfg_weight = 0.2 + random.random() * 0.4
+            elif avg_engagement > 0.8:
+                # Peers love it, try a variation
+                exaggeration = current_best["exaggeration"] * (0.9 + random.random() * 0.2)
+                cfg_weight = current_best["cfg_weight"] * (0.9 + random.random() * 0.2)
+            else:
+                exaggeration = 0.3 + random.random() * 0.5
+                cfg_weight = 0.3 + random.random() * 0.5
+
+        elif strategy == "gaussian_walk":
+            # Gaussian random walk from current position
+            exaggeration = current_best["exaggeration"] + random.gauss(0, self.mutation_strength)
+            cfg_weight = current_best["cfg_weight"] + random.gauss(0, self.mutation_strength)
+
+        else:  # pure_random
+            exaggeration = 0.1 + random.random() * 0.9
+            cfg_weight = 0.2 + random.random() * 0.6
+
+        config = clamp_config(exaggeration, cfg_weight)
+        config.update(discovery_method=f"exploration_{strategy}", strategy_used=strategy)
+        return config
+
+    def _exploit(self, history: VoiceExperimentHistory, current_best: Dict, success_threshold: float) -> Dict:
+        successful = history.successful_centroid(success_threshold)
+
+        if successful is None:
+            # No clear successes yet, explore more
+            return self._explore(current_best, {})
+
+        # Small variations around the centroid of successful experiments
+        improvement_factor = self.mutation_strength * 0.5
+        config = clamp_config(
+            successful["exaggeration"] + (random.random() - 0.5) * improvement_factor,
+            successful["cfg_weight"] + (random.random() - 0.5) * improvement_factor
+        )
+        config.update(
+            discovery_method="exploit_successful_patterns",
+            strategy_used="exploit",
+            successful_experiments_analyzed=successful["count"],
+            based_on_threshold=success_threshold
+        )
+        return config
+
+class _ModelBasedOptimizer(VoiceOptimizer):
+    """Shared plumbing for optimizers that search the unit square"""
+
+    def __init__(self, initial_samples: int = 5, candidates: int = 512, seed: Optional[int] = None):
+        self.initial_samples = initial_samples
+        self.candidates = candidates
+        self.rng = np.random.default_rng(seed)
+        self._low = np.array([EXAGGERATION_RANGE[0], CFG_WEIGHT_RANGE[0]])
+        self._span = np.array([EXAGGERATION_RANGE[1] - EXAGGERATION_RANGE[0],
+                               CFG_WEIGHT_RANGE[1] - CFG_WEIGHT_RANGE[0]])
+
+    def _observations(self, history: VoiceExperimentHistory):
+        points = np.column_stack((history.column("exaggeration"), history.column("cfg_weight")))
+        return np.clip((points - self._low) / self._span, 0.0, 1.0), history.scores
+
+    def _to_config(self, point: np.ndarray, method: str) -> Dict:
+        exaggeration, cfg_weight = self._low + point * self._span
+        config = clamp_config(float(exaggeration), float(cfg_weight))
+        config.update(discovery_method=method, strategy_used=self.name)
+        return config
+
+    def _candidates(self, points: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        # Global uniform candidates plus local perturbations of the best observations
+        uniform = self.rng.random((self.candidates, 2))
+        top = points[np.argsort(scores)[-3:]]
+        local = top[self.rng.integers(len(top), size=self.candidates // 4)]
+        local = local + self.rng.normal(0.0, 0.05, size=local.shape)
+        return np.clip(np.vstack((uniform, local)), 0.0, 1.0)
+
+    def suggest(self, history: VoiceExperimentHistory, current_best: Dict, context: Dict) -> Dict:
+        if len(history) < self.initial_samples:
+            # Space-filling start: stratified along exaggeration, random cfg_weight
+            stratum = len(history)
+            point = np.array([(stratum + self.rng.random()) / self.initial_samples, self.rng.random()])
+            return self._to_config(point, f"{self.name}_initial_design")
+
+        points, scores = self._observations(history)
+        return self._to_config(self._select(points, scores), f"{self.name}_acquisition")
+
+    @abstractmethod
+    def _select(self, points: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """Next point on the unit square given the observations"""
+
+class GaussianProcessOptimizer(_ModelBasedOptimizer):
+    """GP regression (RBF kernel) with expected improvement acquisition"""
+
+    name = "gp"
+
+    LENGTH_SCALES = (0.1, 0.2, 0.35, 0.6)
+
+    def __init__(self, noise: float = 0.1, xi: float = 0.01, **kwargs):
+        super().__init__(**kwargs)
+        self.noise = noise  # Peer scores are noisy; relative to standardized scores
+        self.xi = xi
+
+    @staticmethod
+    def _kernel(a: np.ndarray, b: np.ndarray, length_scale: float) -> np.ndarray:
+        sq_dist = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2)
+        return np.exp(-0.5 * sq_dist / length_scale ** 2)
+
+    def _fit(self, points: np.ndarray, y: np.ndarray):
+        """Pick the length scale with the best log marginal likelihood"""
+        best = None
+        for length_scale in self.LENGTH_SCALES:
+            K = self._kernel(points, points, length_scale) + (self.noise ** 2 + 1e-8) * np.eye(len(points))
+            try:
+                L = np.linalg.cholesky(K)
+            except np.linalg.LinAlgError:
+                continue
+            alpha = np.linalg.solve(L.T, np.linalg.solve(L, y))
+            log_likelihood = -0.5 * y @ alpha - np.log(np.diag(L)).sum()
+            if best is None or log_likelihood > best[0]:
+                best = (log_likelihood, length_scale, L, alpha)
+        return best
+
+    def _select(self, points: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        mean, std = scores.mean(), scores.std() or 1.0
+        y = (scores - mean) / std
+
+        fit = self._fit(points, y)
+        candidates = self._candidates(points, scores)
+        if fit is None:
+            return candidates[0]
+        _, length_scale, L, alpha = fit
+
+        K_star = self._kernel(candidates, points, length_scale)
+        mu = K_star @ alpha
+        v = np.linalg.solve(L, K_star.T)
+        sigma = np.sqrt(np.maximum(1e-12, 1.0 - (v ** 2).sum(axis=0)))
+
+        # Expected improvement over the best observed (standardized) score
+        improvement = mu - y.max() - self.xi
+        z = improvement / sigma
+        cdf = 0.5 * (1.0 + np.vectorize(math.erf)(z / math.sqrt(2.0)))
+        pdf = np.exp(-0.5 * z ** 2) / math.sqrt(2.0 * math.pi)
+        expected_improvement = improvement * cdf + sigma * pdf
+
+        return candidates[int(np.argmax(expected_improvement))]
+
+class TPEOptimizer(_ModelBasedOptimizer):
+    """Tree-structured Parzen Estimator: maximize l(x) / g(x)"""
+
+    name = "tpe"
+
+    def __init__(self, gamma: float = 0.25, **kwargs):
+        super().__init__(**kwargs)
+        self.gamma = gamma
+
+    @staticmethod
+    def _density(x: np.ndarray, centers: np.ndarray, bandwidth: np.ndarray) -> np.ndarray:
+        """Gaussian Parzen mixture on the unit square with a uniform prior component"""
+        diff = (x[:, None, :] - centers[None, :, :]) / bandwidth
+        kernels = np.exp(-0.5 * (diff ** 2).sum(axis=2)) / (2.0 * math.pi * bandwidth.prod())
+        return (kernels.sum(axis=1) + 1.0) / (len(centers) + 1)
+
+    def _select(self, points: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        order = np.argsort(scores)[::-1]
+        n_good = max(1, int(math.ceil(self.gamma * len(scores))))
+        good, bad = points[order[:n_good]], points[order[n_good:]]
+
+        # One bandwidth from all observations, so l(x) can't collapse onto repeated good points
+        bandwidth = np.clip(points.std(axis=0) * len(points) ** (-1.0 / 6.0), 0.05, 0.3)
+
+        # Sample candidates from l(x): good observations plus the uniform prior component
+        n_samples = self.candidates // 4
+        centers = good[self.rng.integers(len(good), size=n_samples)]
+        candidates = np.clip(centers + self.rng.normal(0.0, 1.0, size=centers.shape) * bandwidth, 0.0, 1.0)
+        prior = self.rng.random((max(1, n_samples // (n_good + 1)), 2))
+        candidates = np.vstack((candidates, prior))
+
+        ratio = self._density(candidates, good, bandwidth) / self._density(candidates, bad if len(bad) else good, bandwidth)
+        return candidates[int(np.argmax(ratio))]
+
+def create_voice_optimizer(name: str, mutation_strength: float = 0.15, seed: Optional[int] = None) -> VoiceOptimizer:
+    """Optimizer by name: legacy | gp | tpe"""
+    if name == "gp":
+        return GaussianProcessOptimizer(seed=seed)
+    if name == "tpe":
+        return TPEOptimizer(seed=seed)
+    if name != "legacy":
+        logger.warning(f"Unknown VOICE_OPTIMIZER '{name}', using legacy strategies")
+    return LegacyVoiceOptimizer(mutation_strength)
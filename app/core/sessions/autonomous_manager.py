@@ -1,5 +1,6 @@
 # app/core/sessions/autonomous_manager.py
 import asyncio
+import functools
 import logging
 import time
 import random
@@ -8,6 +9,10 @@ from dataclasses import dataclass
 from enum import Enum
 
 from app.api.websocket import generate_enhanced_ai_response
+from app.config.settings import settings
+from app.core.sessions.scheduler import session_scheduler
+from app.core.sessions.session_bus import SessionBus, session_bus, session_control_channel
+from app.core.sessions.warmup import session_warmup
 
 logger = logging.getLogger(__name__)
 
@@ -28,22 +33,51 @@ class SpeechEvent:
     def end_time(self) -> float:
         return self.start_time + self.duration
 
+class SessionLeaseConflict(Exception):
+    """The session's loop is already running on another worker"""
+    
+    def __init__(self, session_id: str, owner: Optional[str]):
+        super().__init__(f"Session {session_id} is already running on worker {owner}")
+        self.session_id = session_id
+        self.owner = owner
+
+@dataclass
+class SpeculativeResponse:
+    """Next speaker's response being drafted during current playback"""
+    character_id: str
+    conversation_version: int
+    task: asyncio.Task
+
 class AutonomousSessionManager:
-    def __init__(self):
+    def __init__(self, bus: SessionBus = session_bus):
         self.active_sessions: Dict[str, 'AutonomousSession'] = {}
         self.cleanup_task: Optional[asyncio.Task] = None
+        self.bus = bus
         
     async def start_autonomous_session(self, session_id: str, participants: List[str], custom_topic: str = None) -> 'AutonomousSession':
         """Start a new autonomous debate session with optional custom topic"""
         if session_id in self.active_sessions:
             await self.stop_session(session_id)
         
+        # Exactly one worker runs each session's loop
+        if not await self.bus.acquire_lease(session_id, settings.SESSION_LEASE_TTL):
+            raise SessionLeaseConflict(session_id, await self.bus.get_lease_owner(session_id))
+        
         #custom topic to session
-        session = AutonomousSession(session_id, participants, custom_topic)
+        session = AutonomousSession(session_id, participants, custom_topic, bus=self.bus)
         self.active_sessions[session_id] = session
         
-        # Start the session loop
-        asyncio.create_task(session.run_autonomous_loop())
+        await self.bus.subscribe(
+            session_control_channel(session_id),
+            functools.partial(self._handle_control, session_id)
+        )
+        await session.publish_snapshot()
+        
+        # Warm characters and connections in the background; the first turn waits for it
+        session.begin_warmup()
+        
+        # Arm the session's timers on the shared scheduler
+        session.start()
         
         if custom_topic:
             logger.info(f"🎭 Started autonomous session: {session_id} with topic: {custom_topic}")
@@ -52,6 +86,11 @@ class AutonomousSessionManager:
         
         return session
     
+    async def lease_conflict(self, session_id: str) -> Optional[str]:
+        """Worker that owns this session's lease, if it isn't this one"""
+        owner = await self.bus.get_lease_owner(session_id)
+        return owner if owner not in (None, self.bus.worker_id) else None
+    
     async def stop_session(self, session_id: str):
         """Stop an autonomous session"""
         if session_id in self.active_sessions:
@@ -60,6 +99,23 @@ class AutonomousSessionManager:
             del self.active_sessions[session_id]
             logger.info(f"Stopped autonomous session: {session_id}")
     
+    async def shutdown(self):
+        """Stop every local session and hand back their leases"""
+        for session_id in list(self.active_sessions):
+            await self.stop_session(session_id)
+    
+    async def _handle_control(self, session_id: str, command: Dict):
+        """Commands forwarded by workers that don't own this session"""
+        from app.api.websocket import dispatch_response_request
+        
+        if session_id not in self.active_sessions:
+            return
+        
+        if command.get("type") == "request_response":
+            dispatch_response_request(session_id, command.get("characterId") or "claude")
+        else:
+            logger.warning(f"Unknown session control command: {command.get('type')}")
+    
     async def handle_manual_request(self, session_id: str, character_id: str):
         """Handle manual character request (from frontend)"""
         if session_id in self.active_sessions:
@@ -70,11 +126,16 @@ class AutonomousSessionManager:
         return self.active_sessions.get(session_id)
 
 class AutonomousSession:
-    def __init__(self, session_id: str, participants: List[str], custom_topic: str = None):
+    def __init__(self, session_id: str, participants: List[str], custom_topic: str = None, bus: SessionBus = session_bus):
         self.session_id = session_id
         self.participants = participants
         self.state = SessionState.IDLE
         
+        # Ownership lease shared with other workers
+        self.bus = bus
+        self.lease_ttl = settings.SESSION_LEASE_TTL
+        self._owns_lease = True
+        
         #custom topic and stick to it
         self.current_topic = custom_topic or "artificial consciousness and the future of AI"
         self.topic_locked = True  # Always lock the topic - no more evolution!
@@ -100,94 +161,197 @@ class AutonomousSession:
         self.last_peer_response_time = 0.0
         self.peer_cooldown = 30.0
         
+        # Event-driven timing: speech ends are real audio deadlines
+        self.scheduler = session_scheduler
+        self.start_delay = 5.0
+        self.speech_end_buffer = 0.5  # durations are measured from the audio, only cover client start-up
+        self.generation_timeout = 90.0  # give up on a speaker that never produced audio
+        self._silence_threshold = 0.0
+        
+        # Speculative pre-generation, valid only for the conversation version it was drafted at
+        self.speculative_enabled = settings.SPECULATIVE_GENERATION
+        self.conversation_version = 0
+        self._speculation: Optional[SpeculativeResponse] = None
+        self.speculation_stats = {"started": 0, "used": 0, "discarded": 0}
+        
+        # Warm-start: ready once characters, memory and connections are loaded
+        self.ready = False
+        self.warmup_report: Optional[Dict] = None
+        self._warmup_task: Optional[asyncio.Task] = None
+        
         # Control flags
         self._running = False
         self._stop_requested = False
+        self._turn_failures = 0
+        self._lease_failures = 0
         
         logger.info(f"🎯 Session topic locked: {self.current_topic}")
         
-    async def run_autonomous_loop(self):
-        """Main autonomous session loop"""
+    def start(self):
+        """Arm the session's timers on the shared scheduler"""
         self.state = SessionState.ACTIVE
         self._running = True
         
-        logger.info(f"Starting autonomous loop for session: {self.session_id}")
+        logger.info(f"Starting autonomous session timers: {self.session_id}")
         logger.info(f"Topic: {self.current_topic}")
         
-        await asyncio.sleep(5.0)
-        await self._trigger_next_speaker()
+        self.scheduler.schedule_in(self._turn_timer_key, self.start_delay, self._on_turn_timer)
+        self.scheduler.schedule_in(self._lease_timer_key, self.lease_ttl / 3, self._on_lease_timer)
+    
+    def begin_warmup(self):
+        """Start warming this session's characters (shared with other sessions)"""
+        if self._warmup_task is None:
+            self._warmup_task = asyncio.create_task(self._warm_up())
+    
+    async def _warm_up(self):
+        self.warmup_report = await session_warmup.ensure_warm(self.participants)
+        self.ready = True
+        logger.info(f"✅ Session {self.session_id} ready "
+                    f"(warm-up {self.warmup_report.get('total_seconds', 0):.2f}s)")
+        if self._owns_lease and not self._stop_requested:
+            await self.publish_snapshot()
+    
+    @property
+    def _turn_timer_key(self):
+        return (self.session_id, "turn")
+    
+    @property
+    def _lease_timer_key(self):
+        return (self.session_id, "lease")
+    
+    def _schedule_turn(self, deadline: float):
+        if self._running:
+            self.scheduler.schedule(self._turn_timer_key, deadline, self._on_turn_timer)
+    
+    @staticmethod
+    def _retry_delay(failures: int, base: float, cap: float) -> float:
+        """Exponential backoff for a timer whose callback failed"""
+        return min(cap, base * (2 ** (failures - 1)))
+    
+    async def _on_turn_timer(self):
+        """Woken at a speech deadline or when the silence window elapses"""
+        try:
+            await self._turn_tick()
+            self._turn_failures = 0
+        except Exception as e:
+            # A failed tick must not stall the session: try again after a backoff
+            self._turn_failures += 1
+            delay = self._retry_delay(self._turn_failures, 5.0, 60.0)
+            logger.error(f"Turn timer failed for session {self.session_id} "
+                         f"(attempt {self._turn_failures}), retrying in {delay:.0f}s: {e}")
+            if self._running and not self._stop_requested:
+                self.scheduler.schedule_in(self._turn_timer_key, delay, self._on_turn_timer)
+    
+    async def _turn_tick(self):
+        if not self._running or self._stop_requested:
+            return
         
-        while self._running and not self._stop_requested:
-            try:
-                await self._autonomous_tick()
-                await asyncio.sleep(2.0)
-                
-            except Exception as e:
-                logger.error(f"Error in autonomous loop: {e}")
-                await asyncio.sleep(5.0)
+        # The first turn never pays for cold connections
+        if not self.ready and self._warmup_task is not None:
+            await self._warmup_task
+            if not self._running or self._stop_requested:
+                return
         
-        self.state = SessionState.ENDED
-        logger.info(f"🏁 Autonomous loop ended for session: {self.session_id}")
-    
-    async def _autonomous_tick(self):
-        """Single tick of autonomous behavior"""
         current_time = time.time()
         
         # Check if someone is currently speaking
         if self.current_speaker:
-            if self._is_current_speech_finished():
-                logger.info(f"🔇 Speech finished for {self.current_speaker}")
-                self.current_speaker = None
-                self.last_speech_end = current_time
-                
+            if not self._is_current_speech_finished(current_time):
+                self._schedule_turn(self._current_speech_deadline())
+                return
+            
+            logger.info(f"🔇 Speech finished for {self.current_speaker}")
+            self.current_speaker = None
+            self.last_speech_end = current_time
+            silence_window = self.max_silence_duration - self.min_silence_duration
+            self._silence_threshold = self.min_silence_duration + (random.random() * silence_window)
+        
+        trigger_time = self._next_trigger_time()
+        if current_time < trigger_time:
+            self._schedule_turn(trigger_time)
+            return
         
-        elif self._should_trigger_next_speaker(current_time):
-            await self._trigger_next_speaker()
+        await self._trigger_next_speaker()
         
         # Check for session completion
         if self.conversation_rounds >= self.max_rounds:
             logger.info(f"Max rounds reached, ending session {self.session_id}")
             await self.stop()
     
-    def _is_current_speech_finished(self) -> bool:
-        """Check if current speech has finished based on timing"""
-        if not self.speech_history:
-            return True
-            
-        latest_speech = self.speech_history[-1]
-        is_finished = time.time() >= latest_speech.end_time
+    async def _on_lease_timer(self):
+        """Renew the ownership lease and refresh the shared snapshot"""
+        if not self._running or not self._owns_lease:
+            return
         
-        if is_finished:
-            buffer_time = 2.0
-            return time.time() >= (latest_speech.end_time + buffer_time)
+        try:
+            renewed = await self.bus.renew_lease(self.session_id, self.lease_ttl)
+            if renewed:
+                await self.publish_snapshot()
+        except Exception as e:
+            # Transient bus error: the lease is still ours until it expires, retry well before that
+            self._lease_failures += 1
+            delay = self._retry_delay(self._lease_failures, 0.5, self.lease_ttl / 6)
+            logger.warning(f"⚠️ Lease renewal failed for session {self.session_id} "
+                           f"(attempt {self._lease_failures}), retrying in {delay:.1f}s: {e}")
+            self.scheduler.schedule_in(self._lease_timer_key, delay, self._on_lease_timer)
+            return
         
-        return False
+        self._lease_failures = 0
+        if not renewed:
+            logger.warning(f"⚠️ Lost ownership lease for session {self.session_id}, stopping local timers")
+            self._owns_lease = False
+            await self.stop()
+            return
+        
+        self.scheduler.schedule_in(self._lease_timer_key, self.lease_ttl / 3, self._on_lease_timer)
     
-    def _should_trigger_next_speaker(self, current_time: float) -> bool:
-        """Determine if we should trigger the next speaker"""
-        if self.current_speaker:
-            return False
+    async def publish_snapshot(self):
+        await self.bus.save_session_snapshot(self.session_id, self.get_snapshot(), self.lease_ttl)
+    
+    async def release_ownership(self):
+        """Give up the lease so another worker may run this session"""
+        if not self._owns_lease:
+            return
+        self._owns_lease = False
+        
+        try:
+            await self.bus.unsubscribe(session_control_channel(self.session_id))
+            await self.bus.delete_session_snapshot(self.session_id)
+            await self.bus.release_lease(self.session_id)
+        except Exception as e:
+            logger.warning(f"Failed to release session {self.session_id}: {e}")
+    
+    def get_snapshot(self) -> Dict:
+        """Serializable session state for viewers on any worker"""
+        return {
+            "session_id": self.session_id,
+            "topic": self.current_topic,
+            "topic_locked": self.topic_locked,
+            "participants": self.participants,
+            "conversation_rounds": self.conversation_rounds,
+            "current_speaker": self.current_speaker,
+            "state": self.state.value,
+            "ready": self.ready,
+            "owner": self.bus.worker_id
+        }
+    
+    def _current_speech_deadline(self) -> float:
+        if not self.speech_history:
+            return time.time()
+        return self.speech_history[-1].end_time + self.speech_end_buffer
+    
+    def _is_current_speech_finished(self, current_time: float) -> bool:
+        """Check if current speech (plus buffer) has finished"""
+        return current_time >= self._current_speech_deadline()
+    
+    def _next_trigger_time(self) -> float:
+        """Earliest time the next autonomous speaker may start"""
+        trigger_time = self.last_speech_end + self._silence_threshold
         
         if self.peer_system_active:
-            time_since_peer = current_time - self.last_peer_response_time
-            if time_since_peer < self.peer_cooldown:
-                logger.debug(f"🤖 Waiting for peer system cooldown ({time_since_peer:.1f}s < {self.peer_cooldown}s)")
-                return False
-            
-        time_since_last = current_time - self.last_speech_end
-        
-        if time_since_last < self.min_silence_duration:
-            return False
-        
-        silence_window = self.max_silence_duration - self.min_silence_duration
-        trigger_threshold = self.min_silence_duration + (random.random() * silence_window)
-        
-        should_trigger = time_since_last >= trigger_threshold
-        
-        if should_trigger:
-            logger.info(f"Autonomous trigger: {time_since_last:.1f}s silence >= {trigger_threshold:.1f}s threshold")
+            trigger_time = max(trigger_time, self.last_peer_response_time + self.peer_cooldown)
         
-        return should_trigger
+        return trigger_time
     
     async def _trigger_next_speaker(self):
         """Trigger the next speaker intelligently"""
@@ -208,7 +372,23 @@ class AutonomousSession:
             logger.info(f"Using queued speaker: {speaker}")
             return speaker
         
-        available_speakers = [p for p in self.participants if p != self.current_speaker]
+        # Keep a still-valid speculative pick so its draft can be used
+        speculation = self._valid_speculation()
+        if speculation and speculation.character_id in self.participants:
+            logger.info(f"Using speculatively predicted speaker: {speculation.character_id}")
+            return speculation.character_id
+        
+        return self._select_speaker(self.current_speaker)
+    
+    def _peek_next_speaker(self) -> str:
+        """Predict the next speaker without consuming the queue"""
+        if self.speech_queue:
+            return self.speech_queue[0]
+        # At the slot nobody is speaking, so predict as if the floor were free
+        return self._select_speaker(None)
+    
+    def _select_speaker(self, current_speaker: Optional[str]) -> str:
+        available_speakers = [p for p in self.participants if p != current_speaker]
         
         if not available_speakers:
             available_speakers = self.participants
@@ -237,20 +417,86 @@ class AutonomousSession:
         self.current_speaker = character_id
         self.conversation_rounds += 1
 
-        estimated_duration = random.uniform(15.0, 25.0)
+        # Placeholder until register_speech_start reports the real audio duration
         speech_event = SpeechEvent(
             character_id=character_id,
             start_time=time.time(),
-            duration=estimated_duration,
+            duration=self.generation_timeout,
             text="generating..."
         )
         self.speech_history.append(speech_event)
+        self._schedule_turn(self._current_speech_deadline())
         
         logger.info(f"🎤 Autonomous request: {character_id} (Round {self.conversation_rounds})")
         logger.info(f"📝 Topic: {self.current_topic}")
         
+        speculation = self._valid_speculation()
+        self._speculation = None
+        
+        if speculation and speculation.character_id == character_id:
+            from app.api.websocket import deliver_speculative_response
+            self.speculation_stats["used"] += 1
+            asyncio.create_task(deliver_speculative_response(self.session_id, character_id, speculation.task))
+            return
+        
+        if speculation:
+            self._discard_speculation(speculation, "speaker changed")
         asyncio.create_task(generate_enhanced_ai_response(self.session_id, character_id, peer_triggered=False))
     
+    def _valid_speculation(self) -> Optional[SpeculativeResponse]:
+        speculation = self._speculation
+        if speculation is None:
+            return None
+        if speculation.conversation_version != self.conversation_version:
+            self._discard_speculation(speculation, "conversation changed")
+            return None
+        return speculation
+    
+    def _discard_speculation(self, speculation: SpeculativeResponse, reason: str):
+        if self._speculation is speculation:
+            self._speculation = None
+        speculation.task.cancel()
+        # A draft that already finished is not cancelled; close its trace here
+        speculation.task.add_done_callback(lambda task: self._drop_draft(task, reason))
+        self.speculation_stats["discarded"] += 1
+        logger.info(f"🗑️ Discarded speculative response for {speculation.character_id} ({reason})")
+    
+    @staticmethod
+    def _drop_draft(task: asyncio.Task, reason: str):
+        from app.api.websocket import discard_prepared_response
+        
+        if task.cancelled() or task.exception() is not None:
+            return  # prepare_enhanced_ai_response already finished the trace
+        discard_prepared_response(task.result(), reason)
+    
+    def _start_speculation(self):
+        """Draft the predicted next speaker's response while the current one plays"""
+        from app.api.websocket import prepare_enhanced_ai_response
+        
+        if not self.speculative_enabled or not self._running:
+            return
+        
+        if self._speculation:
+            self._discard_speculation(self._speculation, "superseded")
+        
+        character_id = self._peek_next_speaker()
+        task = asyncio.create_task(prepare_enhanced_ai_response(
+            self.session_id,
+            character_id,
+            peer_triggered=False,
+            context={"speculative": True},
+            persist=False
+        ))
+        # Failures surface when the draft is awaited at the slot
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        
+        self._speculation = SpeculativeResponse(character_id, self.conversation_version, task)
+        self.speculation_stats["started"] += 1
+        logger.info(f"🔮 Speculatively drafting {character_id} (version {self.conversation_version})")
+    
+    def _conversation_changed(self):
+        self.conversation_version += 1
+    
     def register_speech_start(self, character_id: str, text: str, duration: float):
         """Register when a character starts speaking"""
         if self.speech_history and self.speech_history[-1].character_id == character_id:
@@ -271,6 +517,13 @@ class AutonomousSession:
         
         self.current_speaker = character_id
         
+        # Wake exactly when the audio (plus buffer) ends
+        self._schedule_turn(self._current_speech_deadline())
+        
+        # New speech invalidates any earlier draft; draft the next one during playback
+        self._conversation_changed()
+        self._start_speculation()
+        
         logger.info(f"Speech registered: {character_id} for {duration}s")
         logger.info(f"Text: {text[:100]}...")
         logger.info(f"Topic: {self.current_topic}")
@@ -278,6 +531,7 @@ class AutonomousSession:
     def notify_peer_response(self, character_id: str):
         """Notify that peer system triggered a response"""
         self.last_peer_response_time = time.time()
+        self._conversation_changed()
         logger.info(f"🤖 Peer system response noted: {character_id}")
     
     async def queue_character_speech(self, character_id: str, priority: bool = False):
@@ -287,6 +541,12 @@ class AutonomousSession:
         else:
             self.speech_queue.append(character_id)
         
+        if self.speech_queue[0] == character_id:
+            # Prediction changed, redraft for the queued speaker
+            self._conversation_changed()
+            if self.current_speaker:
+                self._start_speculation()
+        
         logger.info(f"Queued {character_id} to speak (priority: {priority})")
     
     
@@ -295,6 +555,15 @@ class AutonomousSession:
         self._stop_requested = True
         self._running = False
         self.state = SessionState.ENDED
+        
+        self.scheduler.cancel(self._turn_timer_key)
+        self.scheduler.cancel(self._lease_timer_key)
+        if self._warmup_task and not self._warmup_task.done():
+            self._warmup_task.cancel()
+        if self._speculation:
+            self._discard_speculation(self._speculation, "session stopped")
+        await self.release_ownership()
+        
         logger.info(f"Stopping session {self.session_id}")
         logger.info(f"Final topic was: {self.current_topic}")
     
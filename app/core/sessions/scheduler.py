@@ -0,0 +1,110 @@
+# app/core/sessions/scheduler.py
+"""
+Shared deadline scheduler for autonomous sessions
+One task sleeps until the earliest deadline across all sessions
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TimerCallback = Callable[[], Awaitable[None]]
+
+class SessionScheduler:
+    """Min-heap of (deadline, timer) with one pending timer per key"""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._timers: Dict[Hashable, Tuple[int, TimerCallback]] = {}
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+        self.fired_timers = 0
+        self.max_lateness = 0.0
+
+    def schedule(self, key: Hashable, deadline: float, callback: TimerCallback):
+        """Run callback at deadline (time.time()), replacing any timer for key"""
+        sequence = next(self._sequence)
+        self._timers[key] = (sequence, callback)
+        heapq.heappush(self._heap, (deadline, sequence, key))
+
+        self._ensure_running()
+        # Only wake the runner if this became the earliest deadline
+        if self._heap[0][1] == sequence:
+            self._wakeup.set()
+
+    def schedule_in(self, key: Hashable, delay: float, callback: TimerCallback):
+        self.schedule(key, time.time() + delay, callback)
+
+    def cancel(self, key: Hashable):
+        # Heap entry is skipped lazily once its sequence no longer matches
+        self._timers.pop(key, None)
+
+    def is_scheduled(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def _ensure_running(self):
+        if self._runner is None or self._runner.done():
+            self._wakeup = asyncio.Event()
+            self._runner = asyncio.create_task(self._run())
+
+    def _pop_stale(self):
+        while self._heap:
+            _, sequence, key = self._heap[0]
+            timer = self._timers.get(key)
+            if timer is not None and timer[0] == sequence:
+                return
+            heapq.heappop(self._heap)
+
+    async def _run(self):
+        while True:
+            self._pop_stale()
+            self._wakeup.clear()
+
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            deadline, _, key = self._heap[0]
+            delay = deadline - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            _, callback = self._timers.pop(key)
+            self.fired_timers += 1
+            self.max_lateness = max(self.max_lateness, -delay)
+            asyncio.create_task(self._fire(key, callback))
+
+    async def _fire(self, key: Hashable, callback: TimerCallback):
+        try:
+            await callback()
+        except Exception as e:
+            logger.error(f"Session timer {key} failed: {e}")
+
+    async def close(self):
+        self._timers.clear()
+        self._heap.clear()
+        if self._runner:
+            self._runner.cancel()
+            self._runner = None
+
+    def get_stats(self) -> Dict:
+        return {
+            "pending_timers": len(self._timers),
+            "heap_size": len(self._heap),
+            "fired_timers": self.fired_timers,
+            "max_lateness_ms": round(self.max_lateness * 1000, 2)
+        }
+
+# Global scheduler shared by every autonomous session
+session_scheduler = SessionScheduler()
@@ -0,0 +1,322 @@
+# app/core/sessions/session_bus.py
+"""
+Session bus for running several app workers side by side
+Fans out viewer messages, forwards control commands to the worker that
+owns a session, and hands out per-session ownership leases
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+KEY_PREFIX = "a2ais:session"
+
+def session_events_channel(session_id: str) -> str:
+    """Messages for every viewer of a session"""
+    return f"{KEY_PREFIX}:{session_id}:events"
+
+def session_control_channel(session_id: str) -> str:
+    """Commands for the worker that owns a session"""
+    return f"{KEY_PREFIX}:{session_id}:control"
+
+def _lease_key(session_id: str) -> str:
+    return f"{KEY_PREFIX}:{session_id}:lease"
+
+def _snapshot_key(session_id: str) -> str:
+    return f"{KEY_PREFIX}:{session_id}:state"
+
+def _make_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+class SessionBus(ABC):
+    """Interface shared by the in-memory and Redis buses"""
+
+    def __init__(self, worker_id: Optional[str] = None):
+        self.worker_id = worker_id or _make_worker_id()
+        self._handlers: Dict[str, MessageHandler] = {}
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        self._handlers.clear()
+
+    @abstractmethod
+    async def publish(self, channel: str, message: Dict[str, Any]) -> int:
+        ...
+
+    @abstractmethod
+    async def subscribe(self, channel: str, handler: MessageHandler):
+        ...
+
+    @abstractmethod
+    async def unsubscribe(self, channel: str):
+        ...
+
+    @abstractmethod
+    async def acquire_lease(self, session_id: str, ttl: float) -> bool:
+        ...
+
+    @abstractmethod
+    async def renew_lease(self, session_id: str, ttl: float) -> bool:
+        ...
+
+    @abstractmethod
+    async def release_lease(self, session_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def get_lease_owner(self, session_id: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def save_session_snapshot(self, session_id: str, snapshot: Dict[str, Any], ttl: float):
+        ...
+
+    @abstractmethod
+    async def get_session_snapshot(self, session_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    async def delete_session_snapshot(self, session_id: str):
+        ...
+
+    @abstractmethod
+    async def list_session_snapshots(self) -> List[Dict[str, Any]]:
+        ...
+
+    async def _dispatch(self, channel: str, message: Dict[str, Any]):
+        handler = self._handlers.get(channel)
+        if handler is None:
+            return
+        try:
+            await handler(message)
+        except Exception as e:
+            logger.error(f"Session bus handler failed on {channel}: {e}")
+
+class InMemorySessionBus(SessionBus):
+    """Single-process bus (default)"""
+
+    def __init__(self, worker_id: Optional[str] = None):
+        super().__init__(worker_id)
+        self._leases: Dict[str, Tuple[str, float]] = {}
+        self._snapshots: Dict[str, Tuple[Dict[str, Any], float]] = {}
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> int:
+        if channel not in self._handlers:
+            return 0
+        await self._dispatch(channel, message)
+        return 1
+
+    async def subscribe(self, channel: str, handler: MessageHandler):
+        self._handlers[channel] = handler
+
+    async def unsubscribe(self, channel: str):
+        self._handlers.pop(channel, None)
+
+    def _live_lease(self, session_id: str) -> Optional[str]:
+        lease = self._leases.get(session_id)
+        if lease and lease[1] > time.monotonic():
+            return lease[0]
+        self._leases.pop(session_id, None)
+        return None
+
+    async def acquire_lease(self, session_id: str, ttl: float) -> bool:
+        owner = self._live_lease(session_id)
+        if owner not in (None, self.worker_id):
+            return False
+        self._leases[session_id] = (self.worker_id, time.monotonic() + ttl)
+        return True
+
+    async def renew_lease(self, session_id: str, ttl: float) -> bool:
+        if self._live_lease(session_id) != self.worker_id:
+            return False
+        self._leases[session_id] = (self.worker_id, time.monotonic() + ttl)
+        return True
+
+    async def release_lease(self, session_id: str) -> bool:
+        if self._live_lease(session_id) != self.worker_id:
+            return False
+        del self._leases[session_id]
+        return True
+
+    async def get_lease_owner(self, session_id: str) -> Optional[str]:
+        return self._live_lease(session_id)
+
+    async def save_session_snapshot(self, session_id: str, snapshot: Dict[str, Any], ttl: float):
+        self._snapshots[session_id] = (snapshot, time.monotonic() + ttl)
+
+    async def get_session_snapshot(self, session_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._snapshots.get(session_id)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+        self._snapshots.pop(session_id, None)
+        return None
+
+    async def delete_session_snapshot(self, session_id: str):
+        self._snapshots.pop(session_id, None)
+
+    async def list_session_snapshots(self) -> List[Dict[str, Any]]:
+        snapshots = []
+        for session_id in list(self._snapshots):
+            snapshot = await self.get_session_snapshot(session_id)
+            if snapshot:
+                snapshots.append(snapshot)
+        return snapshots
+
+# Only the current owner may extend or drop a lease
+_RENEW_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+class RedisSessionBus(SessionBus):
+    """Redis pub/sub fan-out with SET NX leases, shared by all workers"""
+
+    SESSION_INDEX_KEY = f"{KEY_PREFIX}s:index"
+
+    def __init__(self, redis_url: str, client=None, worker_id: Optional[str] = None):
+        super().__init__(worker_id)
+        self.redis_url = redis_url
+        self._client = client
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._client is None:
+            try:
+                import redis.asyncio as aioredis
+            except ImportError:
+                raise RuntimeError("redis package is required for SESSION_BUS=redis")
+            self._client = aioredis.from_url(self.redis_url, decode_responses=True)
+
+        await self._client.ping()
+        self._pubsub = self._client.pubsub()
+        self._listener = asyncio.create_task(self._listen())
+        logger.info(f"📡 Redis session bus connected as worker {self.worker_id}")
+
+    async def close(self):
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._client is not None:
+            await self._client.aclose()
+        await super().close()
+
+    async def _listen(self):
+        while True:
+            try:
+                if not self._handlers:
+                    await asyncio.sleep(0.1)
+                    continue
+
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None or message.get("type") != "message":
+                    continue
+
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                await self._dispatch(channel, json.loads(message["data"]))
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Redis session bus listener error: {e}")
+                await asyncio.sleep(1.0)
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> int:
+        return await self._client.publish(channel, json.dumps(message))
+
+    async def subscribe(self, channel: str, handler: MessageHandler):
+        self._handlers[channel] = handler
+        await self._pubsub.subscribe(channel)
+
+    async def unsubscribe(self, channel: str):
+        if self._handlers.pop(channel, None) is not None:
+            await self._pubsub.unsubscribe(channel)
+
+    async def acquire_lease(self, session_id: str, ttl: float) -> bool:
+        ttl_ms = int(ttl * 1000)
+        if await self._client.set(_lease_key(session_id), self.worker_id, nx=True, px=ttl_ms):
+            return True
+        # Re-acquiring our own lease just extends it
+        return await self.renew_lease(session_id, ttl)
+
+    async def renew_lease(self, session_id: str, ttl: float) -> bool:
+        result = await self._client.eval(
+            _RENEW_LEASE_SCRIPT, 1, _lease_key(session_id), self.worker_id, int(ttl * 1000)
+        )
+        return bool(result)
+
+    async def release_lease(self, session_id: str) -> bool:
+        result = await self._client.eval(_RELEASE_LEASE_SCRIPT, 1, _lease_key(session_id), self.worker_id)
+        return bool(result)
+
+    async def get_lease_owner(self, session_id: str) -> Optional[str]:
+        return await self._client.get(_lease_key(session_id))
+
+    async def save_session_snapshot(self, session_id: str, snapshot: Dict[str, Any], ttl: float):
+        await self._client.set(_snapshot_key(session_id), json.dumps(snapshot), px=int(ttl * 1000))
+        await self._client.sadd(self.SESSION_INDEX_KEY, session_id)
+
+    async def get_session_snapshot(self, session_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self._client.get(_snapshot_key(session_id))
+        return json.loads(raw) if raw else None
+
+    async def delete_session_snapshot(self, session_id: str):
+        await self._client.delete(_snapshot_key(session_id))
+        await self._client.srem(self.SESSION_INDEX_KEY, session_id)
+
+    async def list_session_snapshots(self) -> List[Dict[str, Any]]:
+        session_ids = sorted(await self._client.smembers(self.SESSION_INDEX_KEY))
+        if not session_ids:
+            return []
+
+        raw_snapshots = await self._client.mget([_snapshot_key(sid) for sid in session_ids])
+        snapshots = []
+        expired = []
+        for session_id, raw in zip(session_ids, raw_snapshots):
+            if raw:
+                snapshots.append(json.loads(raw))
+            else:
+                expired.append(session_id)
+
+        if expired:
+            await self._client.srem(self.SESSION_INDEX_KEY, *expired)
+        return snapshots
+
+def create_session_bus() -> SessionBus:
+    """Build the bus selected by SESSION_BUS"""
+    if settings.SESSION_BUS == "redis":
+        return RedisSessionBus(settings.REDIS_URL)
+    if settings.SESSION_BUS != "memory":
+        logger.warning(f"Unknown SESSION_BUS '{settings.SESSION_BUS}', using in-memory bus")
+    return InMemorySessionBus()
+
+# Global session bus
+session_bus = create_session_bus()
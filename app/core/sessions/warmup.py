@@ -0,0 +1,125 @@
+# app/core/sessions/warmup.py
+"""
+Session warm-start
+Runs the work a first turn would otherwise do lazily - DB pool, Qdrant
+connection and collection, embedding client, LLM client probes and each
+character's memory/personality load - concurrently and ahead of time
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHARACTERS = ("claude", "gpt", "grok")
+
+class SessionWarmup:
+    """Single-flight, timed warm-up of shared services and character instances"""
+
+    def __init__(self):
+        self._tasks: Dict[Tuple[str, ...], asyncio.Task] = {}
+        self.last_report: Optional[Dict] = None
+        self.warmed_characters: set = set()
+
+    async def _timed(self, name: str, step: Awaitable) -> Tuple[str, Dict]:
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(step, timeout=settings.WARMUP_STEP_TIMEOUT)
+            ok = result is not False
+            error = None if ok else "not available"
+        except Exception as e:
+            ok, error = False, str(e) or type(e).__name__
+        elapsed = time.perf_counter() - started
+        if not ok:
+            logger.warning(f"⚠️ Warm-up step {name} failed after {elapsed:.2f}s: {error}")
+        return name, {"ok": ok, "seconds": round(elapsed, 3), "error": error}
+
+    async def _warm_characters(self, character_ids: List[str]) -> List[Tuple[str, Dict]]:
+        """DB first (memory loads need it), then every character in parallel"""
+        from app.api.websocket import enhanced_response_tracker
+        from app.core.database.service import db_service
+
+        steps = [await self._timed("database", db_service.initialize())]
+
+        characters = {cid: enhanced_response_tracker.get_or_create_character(cid) for cid in character_ids}
+        steps += await asyncio.gather(*(
+            self._timed(f"memory:{cid}", character.initialize_memory())
+            for cid, character in characters.items()
+        ))
+        return steps
+
+    async def _run(self, character_ids: List[str]) -> Dict:
+        from app.api.websocket import enhanced_response_tracker
+        from app.core.ai.memory.embeddings import embedding_service
+        from app.core.ai.memory.vector_store import vector_store
+
+        started = time.perf_counter()
+        logger.info(f"🔥 Warming up {', '.join(character_ids)}...")
+
+        # LLM clients are shared per provider; probe each once
+        clients = {}
+        for cid in character_ids:
+            client = getattr(enhanced_response_tracker.get_or_create_character(cid), "api_client", None)
+            if client is not None:
+                clients.setdefault(id(client), (cid, client))
+
+        groups = await asyncio.gather(
+            self._warm_characters(character_ids),
+            asyncio.gather(
+                self._timed("qdrant", vector_store._ensure_connection()),
+                self._timed("embeddings", embedding_service._ensure_client()),
+                *(self._timed(f"llm:{cid}", client.initialize()) for cid, client in clients.values())
+            )
+        )
+
+        steps = dict(step for group in groups for step in group)
+        report = {
+            "characters": list(character_ids),
+            "ok": all(step["ok"] for step in steps.values()),
+            "total_seconds": round(time.perf_counter() - started, 3),
+            "serial_seconds": round(sum(step["seconds"] for step in steps.values()), 3),
+            "finished_at": time.time(),
+            "steps": steps
+        }
+        self.last_report = report
+        self.warmed_characters.update(character_ids)
+
+        failed = [name for name, step in steps.items() if not step["ok"]]
+        logger.info(f"🔥 Warm-up finished in {report['total_seconds']:.2f}s "
+                    f"({report['serial_seconds']:.2f}s of work)"
+                    + (f", degraded: {', '.join(failed)}" if failed else ""))
+        return report
+
+    def start(self, character_ids: Optional[List[str]] = None) -> asyncio.Task:
+        """Begin warming (or join the warm-up already running for these characters)"""
+        key = tuple(sorted(character_ids or DEFAULT_CHARACTERS))
+        task = self._tasks.get(key)
+        # A finished warm-up is reused; a failed or degraded one is retried
+        if task is None or (task.done() and (task.cancelled() or task.exception() is not None
+                                             or not task.result()["ok"])):
+            task = asyncio.create_task(self._run(list(key)))
+            self._tasks[key] = task
+        return task
+
+    async def ensure_warm(self, character_ids: Optional[List[str]] = None) -> Dict:
+        """Wait until the given characters are warm; never raises"""
+        try:
+            return await asyncio.shield(self.start(character_ids))
+        except Exception as e:
+            logger.error(f"Warm-up failed: {e}")
+            return {"ok": False, "error": str(e)}
+
+    def get_report(self) -> Dict:
+        running = [list(key) for key, task in self._tasks.items() if not task.done()]
+        return {
+            "warming": running,
+            "warmed_characters": sorted(self.warmed_characters),
+            "last": self.last_report
+        }
+
+# Global instance
+session_warmup = SessionWarmup()
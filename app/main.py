@@ -2,6 +2,7 @@
 import time
 from typing import Dict, Optional
 from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.params import Body
 import uvloop
@@ -11,6 +12,7 @@ import logging
 from app.config.settings import settings
 from app.api.websocket import websocket_router
 from app.core.database.service import db_service
+from app.core.sessions.session_bus import session_bus
 
 # Setup logging
 logging.basicConfig(
@@ -47,6 +49,25 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup_event():
    """Initialize services on startup"""
+   # Session bus is required for fan-out, fail loudly if Redis is unreachable
+   await session_bus.start()
+   logger.info(f"Session bus ready ({settings.SESSION_BUS}, worker {session_bus.worker_id})")
+   
+   # Temp audio directory with quota and sweeper
+   from app.core.media.artifacts import artifact_manager
+   await artifact_manager.start()
+   
+   # Trending topics refresh in the background; sessions read the cached feed
+   from app.core.content.topic_feed import topic_feed
+   await topic_feed.start()
+   
+   # Pooled HTTP client for Google TTS
+   try:
+       from app.core.media.tts.google_tts import tts_service as google_tts_service
+       await google_tts_service.start()
+   except Exception as e:
+       logger.warning(f"⚠️ Google TTS client not started: {e}")
+   
    try:
        await db_service.initialize()
        logger.info("Database service initialized")
@@ -55,10 +76,56 @@ async def startup_event():
        logger.error(f"Failed to initialize database: {e}")
        # Continue without database for development
        logger.warning("⚠️ Running without database persistence")
+   
+   # Event-loop lag probe for /metrics
+   from app.utils.metrics import loop_lag_monitor
+   loop_lag_monitor.start(settings.EVENT_LOOP_LAG_INTERVAL)
+   
+   # Warm characters, memory and connections in the background so the first session starts hot
+   if settings.WARMUP_ON_STARTUP:
+       from app.core.sessions.warmup import session_warmup
+       session_warmup.start()
 
 @app.on_event("shutdown") 
 async def shutdown_event():
    """Cleanup on shutdown"""
+   try:
+       from app.core.sessions.autonomous_manager import autonomous_session_manager
+       await autonomous_session_manager.shutdown()
+       await session_bus.close()
+   except Exception as e:
+       logger.error(f"Error releasing sessions: {e}")
+   
+   try:
+       from app.core.media.tts.google_tts import tts_service as google_tts_service
+       await google_tts_service.close()
+   except Exception as e:
+       logger.error(f"Error closing Google TTS client: {e}")
+   
+   try:
+       from app.core.media.artifacts import artifact_manager
+       await artifact_manager.close()
+   except Exception as e:
+       logger.error(f"Error closing artifact manager: {e}")
+   
+   try:
+       from app.core.content.topic_feed import topic_feed
+       await topic_feed.close()
+   except Exception as e:
+       logger.error(f"Error stopping topic feed: {e}")
+   
+   try:
+       from app.utils.metrics import loop_lag_monitor
+       await loop_lag_monitor.close()
+   except Exception as e:
+       logger.error(f"Error stopping event-loop lag probe: {e}")
+   
+   try:
+       from app.utils.tracing import tracer
+       tracer.close()
+   except Exception as e:
+       logger.error(f"Error flushing traces: {e}")
+   
    try:
        await db_service.close()
        logger.info("Database service closed")
@@ -84,6 +151,8 @@ async def root():
 
 @app.get("/health")
 async def health_check():
+   from app.core.sessions.warmup import session_warmup
+   
    # Check database connection
    db_status = "healthy"
    try:
@@ -105,7 +174,8 @@ async def health_check():
        "tts_service": "google" if settings.GOOGLE_TTS_API_KEY else "mock",
        "available_characters": ["claude", "gpt", "grok"],
        "database_status": db_status,
-       "database_url": settings.DATABASE_URL.split('@')[1] if '@' in settings.DATABASE_URL else "not_configured"
+       "database_url": settings.DATABASE_URL.split('@')[1] if '@' in settings.DATABASE_URL else "not_configured",
+       "warmup": session_warmup.get_report()
    }
 
 @app.get("/api/test-session")
@@ -122,9 +192,24 @@ async def create_test_session():
 @app.post('/api/sessions/{session_id}/start-autonomous')
 async def start_autonomous_session(session_id: str, request_data: Optional[Dict] = Body(default={})):
    """Start autonomous debate session"""
+   from app.core.sessions.autonomous_manager import SessionLeaseConflict, autonomous_session_manager
+   
+   def lease_conflict_response(owner: Optional[str]) -> JSONResponse:
+       # Running fine on its owner: tell only this caller, never the session's viewers
+       return JSONResponse(status_code=409, content={
+           "success": False,
+           "error": f"Session {session_id} is already running on worker {owner}",
+           "sessionId": session_id,
+           "owner": owner,
+           "websocket_notified": False
+       })
+   
+   owner = await autonomous_session_manager.lease_conflict(session_id)
+   if owner:
+       logger.info(f"Not starting {session_id}: already running on worker {owner}")
+       return lease_conflict_response(owner)
+   
    try:
-       from app.core.sessions.autonomous_manager import autonomous_session_manager
-       
        participants = ['claude', 'gpt', 'grok']
 
        custom_topic = None
@@ -198,10 +283,16 @@ async def start_autonomous_session(session_id: str, request_data: Optional[Dict]
                 "topic_locked": session.topic_locked,
                 "participants": participants,
                 "state": session.state.value,
+                "ready": session.ready,
                 "conversation_rounds": session.conversation_rounds
             }
         }
        
+   except SessionLeaseConflict as e:
+       # Another worker won the lease between the check and the start
+       logger.info(f"Not starting {session_id}: {e}")
+       return lease_conflict_response(e.owner)
+       
    except Exception as e:
        logger.error(f"Failed to start autonomous session: {e}")
        import traceback
@@ -273,7 +364,51 @@ async def get_character_dashboard(character_id: str):
    except Exception as e:
        logger.error(f"Failed to get character dashboard: {e}")
        return {"error": str(e), "character_id": character_id}
-   
+
+@app.get("/api/tts/stats")
+async def get_tts_stats():
+   """Per-provider TTS latency (p50/p95), error rate and routing order"""
+   from app.core.media.tts import tts_router
+   return tts_router.get_stats()
+
+@app.get("/api/artifacts/stats")
+async def get_artifact_stats():
+   """Temp audio artifact disk usage, quota and sweeper counters"""
+   from app.core.media.artifacts import artifact_manager
+   return artifact_manager.get_stats()
+
+@app.get("/metrics")
+async def get_metrics():
+   """Prometheus exposition of DB, vector store, LLM, TTS and websocket metrics"""
+   from fastapi.responses import Response
+   from app.utils.metrics import render_metrics
+   body, content_type = render_metrics()
+   return Response(content=body, media_type=content_type)
+
+@app.get("/api/tracing/stats")
+async def get_tracing_stats():
+   """Per-stage turn latency histograms (p50/p90/p99) and exporter counters"""
+   from app.utils.tracing import tracer
+   return tracer.get_stats()
+
+@app.get("/api/topics/feed/stats")
+async def get_topic_feed_stats():
+   """Topic feed age, source and background refresh counters"""
+   from app.core.content.topic_feed import topic_feed
+   return topic_feed.get_stats()
+
+@app.get("/api/topics/intelligence/stats")
+async def get_topic_intelligence_stats():
+   """Candidates clustered away before paid character analysis"""
+   from app.core.content.topic_intelligence import topic_intelligence
+   return topic_intelligence.get_stats()
+
+@app.get("/api/sessions/{session_id}/connections")
+async def get_session_connections(session_id: str):
+   """Outbound queue depth metrics for viewers of a session"""
+   from app.api.websocket import manager
+   return manager.get_session_queue_metrics(session_id)
+
 
 
 if __name__ == "__main__":
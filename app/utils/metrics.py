@@ -0,0 +1,195 @@
+# app/utils/metrics.py
+"""
+Prometheus metrics for the hot paths
+Metric families are module-level and every label combination known up front
+is bound once (LLM_LATENCY["openai"] etc.), so an update in a hot loop is
+a single observe()/inc() with no label lookup. Open-ended labels (SQL
+statements, session ids) go through small caches of bound children.
+"""
+
+import asyncio
+import os
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge,
+                               Histogram, generate_latest)
+
+# Latency buckets in seconds
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SLOW_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 30.0, 60.0)
+
+LLM_PROVIDERS = ("anthropic", "openai", "xai")
+TTS_PROVIDERS = ("chatterbox", "google", "local")
+
+# Database
+
+DB_POOL_ACQUIRE = Histogram(
+    "a2ais_db_pool_acquire_seconds", "Time waiting for a pooled PostgreSQL connection",
+    buckets=FAST_BUCKETS
+)
+DB_POOL_TIMEOUTS = Counter("a2ais_db_pool_acquire_timeouts_total", "Pool acquisitions that timed out")
+DB_QUERY_LATENCY = Histogram(
+    "a2ais_db_query_seconds", "PostgreSQL statement latency", ["statement"], buckets=FAST_BUCKETS
+)
+DB_QUERY_ERRORS = Counter("a2ais_db_query_errors_total", "Failed PostgreSQL statements", ["statement"])
+
+_SQL_VERB = re.compile(r"^\s*(\w+)", re.IGNORECASE)
+_SQL_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN)\s+([\w.]+)", re.IGNORECASE)
+
+@lru_cache(maxsize=256)
+def statement_label(query: str) -> str:
+    """Low-cardinality label for a SQL statement: verb plus first table"""
+    verb = _SQL_VERB.match(query)
+    table = _SQL_TABLE.search(query)
+    label = verb.group(1).upper() if verb else "UNKNOWN"
+    return f"{label} {table.group(1).lower()}" if table else label
+
+@lru_cache(maxsize=256)
+def _db_query_children(query: str) -> Tuple[Histogram, Counter]:
+    label = statement_label(query)
+    return DB_QUERY_LATENCY.labels(label), DB_QUERY_ERRORS.labels(label)
+
+def observe_db_query(record):
+    """asyncpg query logger callback (LoggedQuery: query, elapsed, exception, ...)"""
+    latency, errors = _db_query_children(record.query)
+    latency.observe(record.elapsed)
+    if record.exception is not None:
+        errors.inc()
+
+# Vector store
+
+QDRANT_LATENCY = Histogram(
+    "a2ais_qdrant_seconds", "Qdrant request latency", ["operation"], buckets=FAST_BUCKETS
+)
+QDRANT_SEARCH = QDRANT_LATENCY.labels("search")
+QDRANT_SEARCH_BATCH = QDRANT_LATENCY.labels("search_batch")
+QDRANT_UPSERT = QDRANT_LATENCY.labels("upsert")
+QDRANT_ERRORS = Counter("a2ais_qdrant_errors_total", "Failed Qdrant requests", ["operation"])
+
+# Embeddings
+
+EMBEDDING_LATENCY = Histogram(
+    "a2ais_embedding_request_seconds", "Embedding API request latency", buckets=FAST_BUCKETS + (5.0,)
+)
+EMBEDDING_TEXTS = Counter("a2ais_embedding_texts_total", "Texts sent to the embedding API")
+_embedding_lookups = Counter("a2ais_embedding_cache_lookups_total", "Embedding cache lookups", ["result"])
+EMBEDDING_CACHE_HITS = _embedding_lookups.labels("hit")
+EMBEDDING_CACHE_MISSES = _embedding_lookups.labels("miss")
+EMBEDDING_MOCK = Counter("a2ais_embedding_mock_total", "Embeddings served by the mock generator")
+
+# LLM
+
+_llm_latency = Histogram("a2ais_llm_request_seconds", "LLM request latency", ["provider"], buckets=SLOW_BUCKETS)
+_llm_tokens = Counter("a2ais_llm_tokens_total", "LLM tokens", ["provider", "direction"])
+_llm_errors = Counter("a2ais_llm_errors_total", "Failed LLM requests", ["provider"])
+LLM_LATENCY = {provider: _llm_latency.labels(provider) for provider in LLM_PROVIDERS}
+LLM_PROMPT_TOKENS = {provider: _llm_tokens.labels(provider, "prompt") for provider in LLM_PROVIDERS}
+LLM_COMPLETION_TOKENS = {provider: _llm_tokens.labels(provider, "completion") for provider in LLM_PROVIDERS}
+LLM_ERRORS = {provider: _llm_errors.labels(provider) for provider in LLM_PROVIDERS}
+
+def observe_llm(provider: str, seconds: float, prompt_tokens: Optional[int], completion_tokens: Optional[int]):
+    LLM_LATENCY[provider].observe(seconds)
+    if prompt_tokens:
+        LLM_PROMPT_TOKENS[provider].inc(prompt_tokens)
+    if completion_tokens:
+        LLM_COMPLETION_TOKENS[provider].inc(completion_tokens)
+
+# TTS and lip-sync
+
+_tts_latency = Histogram(
+    "a2ais_tts_request_seconds", "TTS provider latency", ["provider", "outcome"], buckets=SLOW_BUCKETS
+)
+TTS_LATENCY: Dict[Tuple[str, str], Histogram] = {
+    (provider, outcome): _tts_latency.labels(provider, outcome)
+    for provider in TTS_PROVIDERS for outcome in ("success", "degraded", "error", "abandoned")
+}
+
+def observe_tts(provider: str, outcome: str, seconds: float):
+    child = TTS_LATENCY.get((provider, outcome))
+    if child is None:
+        child = TTS_LATENCY[(provider, outcome)] = _tts_latency.labels(provider, outcome)
+    child.observe(seconds)
+
+RHUBARB_QUEUED = Gauge("a2ais_rhubarb_queued_jobs", "Lip-sync jobs waiting for a Rhubarb worker slot")
+RHUBARB_RUNNING = Gauge("a2ais_rhubarb_running_jobs", "Rhubarb processes currently running")
+RHUBARB_WAIT = Histogram("a2ais_rhubarb_wait_seconds", "Time lip-sync jobs waited for a slot", buckets=SLOW_BUCKETS)
+
+# Websockets
+
+WS_CONNECTIONS = Gauge("a2ais_ws_connections", "Connected viewers per session", ["session_id"])
+WS_SENT_BYTES = Counter("a2ais_ws_sent_bytes_total", "Bytes written to viewer websockets")
+WS_DROPPED_BYTES = Counter("a2ais_ws_dropped_bytes_total", "Outbound bytes dropped by queue overflow policy")
+WS_OVERFLOW_DISCONNECTS = Counter("a2ais_ws_overflow_disconnects_total", "Viewers disconnected for overflowing")
+WS_QUEUED_BYTES = Gauge("a2ais_ws_queued_bytes", "Bytes waiting in viewer outbound queues")
+
+def set_session_connections(session_id: str, count: int):
+    if count:
+        WS_CONNECTIONS.labels(session_id).set(count)
+    else:
+        try:
+            WS_CONNECTIONS.remove(session_id)
+        except KeyError:
+            pass
+
+def track_queued_bytes(read_total: Callable[[], float]):
+    """Compute queued bytes at scrape time instead of on every enqueue/dequeue"""
+    WS_QUEUED_BYTES.set_function(read_total)
+
+# Topic feed
+
+TOPIC_FEED_AGE = Gauge("a2ais_topic_feed_age_seconds", "Seconds since the served topic feed was fetched (0 = none yet)")
+TOPIC_FEED_REFRESH_FAILURES = Counter(
+    "a2ais_topic_feed_refresh_failures_total", "Topic feed refreshes that kept the previous feed"
+)
+
+def track_topic_feed_age(read_age: Callable[[], float]):
+    """Compute the feed age at scrape time"""
+    TOPIC_FEED_AGE.set_function(read_age)
+
+# Event loop
+
+EVENT_LOOP_LAG = Histogram(
+    "a2ais_event_loop_lag_seconds", "How late the event loop woke a periodic probe", buckets=FAST_BUCKETS
+)
+
+class EventLoopLagMonitor:
+    """Sleeps for a fixed interval and records how much later than asked the loop woke it"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    async def _probe(self, interval: float):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(interval)
+            EVENT_LOOP_LAG.observe(max(0.0, loop.time() - started - interval))
+
+    def start(self, interval: float):
+        if self._task is None and interval > 0:
+            self._task = asyncio.create_task(self._probe(interval))
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+loop_lag_monitor = EventLoopLagMonitor()
+
+# Exposition
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Text exposition of every metric (aggregated across workers in multiprocess mode)"""
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
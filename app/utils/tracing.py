@@ -0,0 +1,290 @@
+# app/utils/tracing.py
+"""
+Per-turn latency tracing
+Lightweight spans around each stage of a speech turn (context build, LLM,
+TTS, lip-sync, persistence, fan-out). Every span feeds a per-stage latency
+histogram; spans opened inside a turn are also summed into that turn's
+timings. Export is optional: JSON lines to a file, or OpenTelemetry (OTLP)
+when the opentelemetry SDK is installed. The default exporter is a no-op.
+"""
+
+import json
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds (last bucket is +Inf)
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+class Span:
+    """One timed stage"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes",
+                 "start_time", "_started", "duration_ms", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_time = time.time()
+        self._started = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def set(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def _end(self) -> float:
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+        return self.duration_ms
+
+    def to_dict(self) -> Dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start_time,
+            "duration_ms": round(self.duration_ms or 0.0, 3),
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+class TurnTrace(Span):
+    """Root span of a speech turn; collects the stage spans opened under it"""
+
+    __slots__ = ("spans", "otel_span")
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        super().__init__(name, uuid.uuid4().hex, None, attributes)
+        self.spans: List[Span] = []
+        self.otel_span = None
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    def timings(self) -> Dict:
+        """Stage durations so far (ms, summed per stage name) for the client message"""
+        stages: Dict[str, float] = {}
+        for span in self.spans:
+            if span.duration_ms is not None:
+                stages[span.name] = round(stages.get(span.name, 0.0) + span.duration_ms, 1)
+        return {"traceId": self.trace_id, "totalMs": round(self.elapsed_ms(), 1), "stages": stages}
+
+class LatencyHistogram:
+    """Per-bucket counts plus a bounded sample window for quantiles"""
+
+    def __init__(self, samples: int):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.errors = 0
+        self.recent = deque(maxlen=samples)
+
+    def observe(self, duration_ms: float, error: bool = False):
+        index = 0
+        while index < len(BUCKETS_MS) and duration_ms > BUCKETS_MS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.errors += error
+        self.recent.append(duration_ms)
+
+    def summary(self) -> Dict:
+        window = np.fromiter(self.recent, dtype=np.float64)
+        p50, p90, p99 = np.percentile(window, [50, 90, 99]) if window.size else (0.0, 0.0, 0.0)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(float(p50), 2),
+            "p90_ms": round(float(p90), 2),
+            "p99_ms": round(float(p99), 2),
+            "buckets": {
+                **{f"le_{bound}": count for bound, count in zip(BUCKETS_MS, self.counts)},
+                "le_inf": self.counts[-1]
+            }
+        }
+
+_current_turn: ContextVar[Optional[TurnTrace]] = ContextVar("current_turn", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+class Tracer:
+    """Span factory, histogram registry and exporter"""
+
+    def __init__(self,
+                 exporter: Optional[str] = None,
+                 json_path: Optional[str] = None,
+                 samples: Optional[int] = None):
+        self.exporter = (exporter or settings.TRACING_EXPORTER).lower()
+        self.json_path = json_path or settings.TRACING_JSON_PATH
+        self.samples = samples or settings.TRACING_HISTOGRAM_SAMPLES
+
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._buffer: List[Dict] = []
+        self._otel = None
+        self._otel_trace = None
+        self.exported = 0
+        self.export_errors = 0
+
+        if self.exporter == "otlp":
+            self._setup_otel()
+        elif self.exporter not in ("none", "json"):
+            logger.warning(f"⚠️ Unknown TRACING_EXPORTER '{self.exporter}', tracing export disabled")
+            self.exporter = "none"
+
+    def _setup_otel(self):
+        """Export through the OpenTelemetry SDK; fall back to no export if it is not installed"""
+        try:
+            from opentelemetry import trace
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except ImportError as e:
+            logger.warning(f"⚠️ OpenTelemetry SDK/OTLP exporter not installed ({e}), tracing export disabled")
+            self.exporter = "none"
+            return
+
+        provider = TracerProvider(resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}))
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)))
+        trace.set_tracer_provider(provider)
+        self._otel_trace = trace
+        self._otel = trace.get_tracer("a2ais.tracing")
+        logger.info(f"📡 Exporting traces to {settings.TRACING_OTLP_ENDPOINT}")
+
+    # Recording
+
+    def _record(self, span: Span):
+        histogram = self.histograms.get(span.name)
+        if histogram is None:
+            histogram = self.histograms[span.name] = LatencyHistogram(self.samples)
+        histogram.observe(span.duration_ms, span.error is not None)
+
+        if self.exporter == "json":
+            self._buffer.append(span.to_dict())
+            if len(self._buffer) >= 64:
+                self.flush()
+
+    @staticmethod
+    def _otel_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in attributes.items() if isinstance(value, (str, bool, int, float))}
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """Time a stage; nests under the current span and is collected by the current turn"""
+        parent = _current_span.get()
+        turn = _current_turn.get()
+        span = Span(name, turn.trace_id if turn else (parent.trace_id if parent else uuid.uuid4().hex),
+                    parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        otel_context = self._otel.start_as_current_span(name, attributes=self._otel_attributes(attributes)) \
+            if self._otel else None
+        if otel_context:
+            otel_context.__enter__()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span._end()
+            _current_span.reset(token)
+            if otel_context:
+                otel_context.__exit__(None, None, None)
+            if turn is not None:
+                turn.spans.append(span)
+            self._record(span)
+
+    def start_turn(self, name: str = "turn", **attributes) -> TurnTrace:
+        """Open a turn; activate() it around the work, finish_turn() it once delivered"""
+        turn = TurnTrace(name, attributes)
+        if self._otel:
+            turn.otel_span = self._otel.start_span(name, attributes=self._otel_attributes(attributes))
+        return turn
+
+    @contextmanager
+    def activate(self, turn: Optional[TurnTrace]) -> Iterator[Optional[TurnTrace]]:
+        """Make turn the parent of spans opened in this block (and tasks it spawns)"""
+        if turn is None:
+            yield None
+            return
+        turn_token = _current_turn.set(turn)
+        span_token = _current_span.set(turn)
+        otel_context = self._otel_trace.use_span(turn.otel_span, end_on_exit=False) \
+            if self._otel and turn.otel_span is not None else None
+        if otel_context:
+            otel_context.__enter__()
+        try:
+            yield turn
+        finally:
+            if otel_context:
+                otel_context.__exit__(None, None, None)
+            _current_span.reset(span_token)
+            _current_turn.reset(turn_token)
+
+    def finish_turn(self, turn: Optional[TurnTrace], error: Optional[BaseException] = None,
+                    discarded: Optional[str] = None):
+        """Close a turn once; discarded gives the reason a prepared turn was never delivered"""
+        if turn is None or turn.duration_ms is not None:
+            return
+        if error is not None:
+            turn.error = type(error).__name__
+        elif discarded is not None:
+            turn.error = "discarded"
+            turn.set("discard_reason", discarded)
+        turn._end()
+        if turn.otel_span is not None:
+            turn.otel_span.end()
+        self._record(turn)
+
+    @staticmethod
+    def current_turn() -> Optional[TurnTrace]:
+        return _current_turn.get()
+
+    # Export
+
+    def flush(self):
+        if not self._buffer:
+            return
+        records, self._buffer = self._buffer, []
+        try:
+            os.makedirs(os.path.dirname(self.json_path) or ".", exist_ok=True)
+            with open(self.json_path, "a") as f:
+                f.write("".join(json.dumps(record, default=str) + "\n" for record in records))
+            self.exported += len(records)
+        except OSError as e:
+            self.export_errors += 1
+            logger.warning(f"Failed to write traces to {self.json_path}: {e}")
+
+    def close(self):
+        self.flush()
+        if self._otel_trace is not None:
+            provider = self._otel_trace.get_tracer_provider()
+            if hasattr(provider, "shutdown"):
+                provider.shutdown()
+
+    def get_stats(self) -> Dict:
+        return {
+            "exporter": self.exporter,
+            "exported": self.exported,
+            "export_errors": self.export_errors,
+            "stages": {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+        }
+
+# Global instance
+tracer = Tracer()
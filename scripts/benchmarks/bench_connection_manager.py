@@ -0,0 +1,116 @@
+# scripts/benchmarks/bench_connection_manager.py
+"""
+Load test for the WebSocket ConnectionManager
+Connects thousands of simulated viewers across many sessions, runs a
+reconnect storm and auto-discovery lookups, and reports timings
+
+Usage: PYTHONPATH=. python scripts/benchmarks/bench_connection_manager.py --clients 5000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from types import SimpleNamespace
+
+from app.api.websocket import ConnectionManager
+
+class FakeWebSocket:
+    """Minimal stand-in for a Starlette WebSocket"""
+
+    def __init__(self):
+        self.state = SimpleNamespace()
+        self.sent_messages = 0
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload: str):
+        self.sent_messages += 1
+
+    async def close(self, code: int = 1000):
+        self.closed = True
+
+def _percentile(samples, percent: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent))]
+
+def _report(label: str, samples):
+    print(f"{label:<28} n={len(samples):<6} "
+          f"mean={statistics.mean(samples) * 1e6:8.1f}us "
+          f"p95={_percentile(samples, 0.95) * 1e6:8.1f}us "
+          f"max={max(samples) * 1e6:8.1f}us")
+
+async def run_benchmark(clients: int, sessions: int, storm_fraction: float):
+    manager = ConnectionManager()
+    session_ids = [f"bench-session-{i}" for i in range(sessions)]
+    connections = []
+
+    # Initial connect wave
+    connect_times = []
+    for _ in range(clients):
+        websocket = FakeWebSocket()
+        session_id = random.choice(session_ids)
+        started = time.perf_counter()
+        await manager.connect(websocket, session_id)
+        connect_times.append(time.perf_counter() - started)
+        connections.append((websocket, session_id))
+
+    # Auto-discovery lookups
+    lookup_times = []
+    for _ in range(clients):
+        started = time.perf_counter()
+        manager.get_best_session_for_connection()
+        lookup_times.append(time.perf_counter() - started)
+
+    # Broadcast one frame to every session
+    broadcast_started = time.perf_counter()
+    for session_id in session_ids:
+        await manager.send_to_session(session_id, {"type": "session_update", "data": {}})
+    broadcast_elapsed = time.perf_counter() - broadcast_started
+
+    # Reconnect storm: drop and rejoin a fraction of viewers
+    disconnect_times = []
+    reconnect_times = []
+    storm = random.sample(range(len(connections)), int(len(connections) * storm_fraction))
+    for index in storm:
+        websocket, session_id = connections[index]
+        started = time.perf_counter()
+        await manager.disconnect(websocket, session_id)
+        disconnect_times.append(time.perf_counter() - started)
+
+        websocket = FakeWebSocket()
+        started = time.perf_counter()
+        await manager.connect(websocket, session_id)
+        reconnect_times.append(time.perf_counter() - started)
+        connections[index] = (websocket, session_id)
+
+    # Let writer tasks drain
+    await asyncio.sleep(0)
+
+    print(f"Clients: {clients}  Sessions: {sessions}  Storm: {len(storm)} reconnects")
+    _report("connect", connect_times)
+    _report("best session lookup", lookup_times)
+    if disconnect_times:
+        _report("disconnect (storm)", disconnect_times)
+        _report("reconnect (storm)", reconnect_times)
+    print(f"{'broadcast all sessions':<28} {broadcast_elapsed * 1000:.1f}ms")
+    print(f"Active connections: {len(manager.active_connections)}  "
+          f"Best session: {manager.get_best_session_for_connection()}")
+
+    for websocket, session_id in connections:
+        await manager.disconnect(websocket, session_id)
+
+def main():
+    parser = argparse.ArgumentParser(description="ConnectionManager load test")
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--storm-fraction", type=float, default=0.5)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.clients, args.sessions, args.storm_fraction))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# scripts/benchmarks/bench_google_tts_client.py
+"""
+Requests/second for GoogleTTSService against a local stub server
+Compares a fresh httpx client per request (old behaviour) with the
+service's pooled client. The stub speaks plain HTTP/1.1, so this
+measures connection reuse; HTTP/2 multiplexing only applies over TLS.
+
+Usage: TTS_PROVIDER=google PYTHONPATH=. python scripts/benchmarks/bench_google_tts_client.py --requests 500
+"""
+
+import argparse
+import asyncio
+import base64
+import struct
+import time
+
+import httpx
+from aiohttp import web
+
+from app.core.media.tts.google_tts import GoogleTTSService
+
+def _silent_wav(seconds: float = 0.5, sample_rate: int = 22050) -> bytes:
+    data_size = int(seconds * sample_rate) * 2
+    header = struct.pack('<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_size, b'WAVE', b'fmt ', 16, 1, 1,
+        sample_rate, sample_rate * 2, 2, 16, b'data', data_size)
+    return header + bytes(data_size)
+
+async def start_stub_server(port: int, latency: float) -> web.AppRunner:
+    payload = {"audioContent": base64.b64encode(_silent_wav()).decode()}
+
+    async def synthesize(request: web.Request) -> web.Response:
+        await request.read()
+        if latency:
+            await asyncio.sleep(latency)
+        return web.json_response(payload)
+
+    app = web.Application()
+    app.router.add_post("/v1/text:synthesize", synthesize)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+async def _run_concurrently(total: int, concurrency: int, request_once) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index: int):
+        async with semaphore:
+            await request_once(index)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(total)])
+    return total / (time.perf_counter() - started)
+
+async def run_benchmark(total: int, concurrency: int, port: int, latency: float):
+    runner = await start_stub_server(port, latency)
+    base_url = f"http://127.0.0.1:{port}/v1/text:synthesize"
+
+    service = GoogleTTSService(base_url=base_url)
+    service.api_key = "benchmark"
+    body = service._build_request_body("Benchmark sentence for the stub server.", "claude", "neutral")
+
+    try:
+        async def fresh_client(index: int):
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                response = await client.post(f"{base_url}?key=benchmark", json=body)
+                response.json()
+
+        async def pooled_client(index: int):
+            await service._synthesize(body)
+
+        async def full_pipeline(index: int):
+            await service.generate_speech("Benchmark sentence for the stub server.", "claude")
+
+        await service.start()
+        print(f"Requests: {total}  Concurrency: {concurrency}  Stub latency: {latency * 1000:.0f}ms")
+        print(f"{'fresh client per request':<28} {await _run_concurrently(total, concurrency, fresh_client):8.1f} req/s")
+        print(f"{'pooled client':<28} {await _run_concurrently(total, concurrency, pooled_client):8.1f} req/s")
+        print(f"{'pooled generate_speech':<28} {await _run_concurrently(total, concurrency, full_pipeline):8.1f} req/s")
+        print(f"Service counters: requests={service.request_count} retries={service.retry_count}")
+    finally:
+        await service.close()
+        await runner.cleanup()
+
+def main():
+    parser = argparse.ArgumentParser(description="Google TTS client benchmark")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="stub server delay in seconds")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.requests, args.concurrency, args.port, args.latency))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# scripts/benchmarks/bench_import_time.py
+"""
+Cold import time of app.main
+Imports the module in fresh interpreters with `-X importtime`, reports the
+median cold import time and the slowest modules (by self time, and rolled up
+per top-level package), and optionally fails when the median exceeds a budget
+so CI catches provider SDKs creeping back into the startup path.
+
+Usage: python scripts/benchmarks/bench_import_time.py --runs 5 --top 15
+       python scripts/benchmarks/bench_import_time.py --runs 5 --budget 2.0   (exit 1 if over)
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def import_profile(module: str) -> List[Tuple[str, int, int, int]]:
+    """(module, self_us, cumulative_us, depth) for every import of one cold run"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_ROOT, env.get("PYTHONPATH")]))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        tail = "\n".join(result.stderr.strip().splitlines()[-5:])
+        raise SystemExit(f"❌ import {module} failed:\n{tail}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2))
+    return rows
+
+def cold_import_seconds(rows: List[Tuple[str, int, int, int]], module: str) -> float:
+    for name, _, cumulative, depth in rows:
+        if name == module and depth == 0:
+            return cumulative / 1e6
+    raise SystemExit(f"❌ {module} missing from the importtime output")
+
+def by_package(rows: List[Tuple[str, int, int, int]]) -> Dict[str, int]:
+    totals: Dict[str, int] = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        totals[name.split(".")[0]] += self_us
+    return totals
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules/packages to list (0 = none)")
+    parser.add_argument("--budget", type=float, default=None, help="Fail when the median exceeds this many seconds")
+    args = parser.parse_args()
+
+    # The first run also compiles bytecode; it is profiled but not timed
+    rows = import_profile(args.module)
+    timings = [cold_import_seconds(import_profile(args.module), args.module) for _ in range(args.runs)]
+    median = statistics.median(timings)
+
+    print(f"import {args.module}: median {median * 1000:.0f} ms over {args.runs} runs "
+          f"(min {min(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms), {len(rows)} modules")
+
+    if args.top:
+        print("\nSlowest modules (self time):")
+        for name, self_us, cumulative, _ in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+            print(f"  {self_us / 1000:8.1f} ms  (cumulative {cumulative / 1000:8.1f} ms)  {name}")
+
+        print("\nSlowest packages (self time summed):")
+        for package, total in sorted(by_package(rows).items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"  {total / 1000:8.1f} ms  {package}")
+
+    if args.budget is not None:
+        if median > args.budget:
+            print(f"\n❌ Cold import {median:.3f}s exceeds the {args.budget:.3f}s budget")
+            sys.exit(1)
+        print(f"\n✅ Cold import {median:.3f}s within the {args.budget:.3f}s budget")
+
+if __name__ == "__main__":
+    main()
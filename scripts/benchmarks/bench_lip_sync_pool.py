@@ -0,0 +1,87 @@
+# scripts/benchmarks/bench_lip_sync_pool.py
+"""
+Concurrency check for the Rhubarb lip-sync pool
+Fires parallel jobs at a stand-in rhubarb executable and verifies every
+job gets its own result back, then prints pool/queue metrics
+
+Usage: PYTHONPATH=. python scripts/benchmarks/bench_lip_sync_pool.py --jobs 64 --workers 4
+       (pass --rhubarb /path/to/rhubarb plus --audio file.wav to use the real binary)
+"""
+
+import argparse
+import asyncio
+import os
+import stat
+import sys
+import tempfile
+import time
+
+from app.core.media.tts.lip_sync import RhubarbLipSyncService
+
+# Echoes the job number from the input file name as the duration
+FAKE_RHUBARB = """#!{python}
+import json, os, sys, time
+if sys.argv[1:] == ["--version"]:
+    print("Rhubarb Lip Sync version 1.13.0 (stand-in)")
+    sys.exit(0)
+job = int(os.path.basename(sys.argv[-1]).split("_")[1].split(".")[0])
+time.sleep({delay})
+print(json.dumps({{
+    "metadata": {{"soundFile": sys.argv[-1], "duration": float(job)}},
+    "mouthCues": [{{"start": 0.0, "end": float(job), "value": "B"}}]
+}}))
+"""
+
+def _write_fake_rhubarb(directory: str, delay: float) -> str:
+    path = os.path.join(directory, "rhubarb")
+    with open(path, "w") as f:
+        f.write(FAKE_RHUBARB.format(python=sys.executable, delay=delay))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+async def run_check(jobs: int, workers: int, delay: float, rhubarb: str, audio: str) -> bool:
+    with tempfile.TemporaryDirectory() as directory:
+        using_fake = rhubarb is None
+        if using_fake:
+            rhubarb = _write_fake_rhubarb(directory, delay)
+
+        service = RhubarbLipSyncService(rhubarb_path=rhubarb, max_workers=workers)
+        if not await service.is_available():
+            print(f"Rhubarb not runnable at {rhubarb}")
+            return False
+
+        audio_files = [audio or os.path.join(directory, f"job_{i + 1}.wav") for i in range(jobs)]
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*[
+            service.generate_lip_sync_from_audio(path, "concurrency check") for path in audio_files
+        ])
+        elapsed = time.perf_counter() - started
+
+        mismatched = []
+        if using_fake:
+            mismatched = [
+                i for i, result in enumerate(results)
+                if result["metadata"]["duration"] != float(i + 1)
+            ]
+            status = "OK" if not mismatched else f"{len(mismatched)} jobs got another job's output"
+            print(f"Result isolation: {status}")
+
+        print(f"Jobs: {jobs}  Workers: {workers}  Elapsed: {elapsed:.2f}s")
+        print(f"Pool stats: {service.get_stats()}")
+        return not mismatched
+
+def main():
+    parser = argparse.ArgumentParser(description="Rhubarb pool concurrency check")
+    parser.add_argument("--jobs", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=0.2, help="stand-in job duration")
+    parser.add_argument("--rhubarb", default=None)
+    parser.add_argument("--audio", default=None)
+    args = parser.parse_args()
+
+    if not asyncio.run(run_check(args.jobs, args.workers, args.delay, args.rhubarb, args.audio)):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+# scripts/benchmarks/bench_pipeline.py
+"""
+Offline end-to-end benchmark of the debate pipeline
+Runs the real generate_enhanced_ai_response / AutonomousSession code on top of
+the fakes in pipeline_fakes.py (fake LLM and TTS latency, fake asyncpg pool or
+a throwaway PostgreSQL, in-process vector store, mock websocket viewers) and
+reports turns/sec, per-stage latency from the tracer and process memory at N
+concurrent sessions. With --baseline it fails when a relative result regresses
+by more than --tolerance: each stage's share of the turn, and the share of the
+turn not spent waiting on the fake providers. Absolute throughput and memory
+depend on the machine and Python version, so they are reported but not gated.
+
+Modes:
+  turns     every session fires --turns responses back to back (no pacing)
+  sessions  real AutonomousSessions with the silence/cool-down timers zeroed,
+            so rounds are paced only by audio playback
+
+Usage: PYTHONPATH=. python scripts/benchmarks/bench_pipeline.py --sessions 20 --turns 5
+       PYTHONPATH=. python scripts/benchmarks/bench_pipeline.py --baseline scripts/benchmarks/baseline.json
+       PYTHONPATH=. python scripts/benchmarks/bench_pipeline.py --update-baseline scripts/benchmarks/baseline.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import json
+import logging
+import os
+import resource
+import sys
+import time
+from typing import Dict, List, Set
+
+# Keep the run self-contained before any app module reads settings
+os.environ.setdefault("TTS_PROVIDER", "google")
+os.environ.setdefault("WARMUP_ON_STARTUP", "false")
+os.environ.setdefault("SESSION_BUS", "memory")
+os.environ.setdefault("TRACING_EXPORTER", "none")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from scripts.benchmarks.pipeline_fakes import FakeConfig, FakeWebSocket, install_fakes
+
+CHARACTERS = ["claude", "gpt", "grok"]
+
+# Stages whose latency is injected by the fakes rather than spent in the pipeline
+PROVIDER_STAGES = ("turn", "llm", "tts")
+
+# A share must also grow by this much of a turn to count, so tiny stages can't flap
+MIN_SHARE_INCREASE = 0.02
+
+def rss_mb() -> float:
+    """Current resident set size"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        return peak_rss_mb()
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak * 1024 / 1e6  # bytes on macOS, KiB on Linux
+
+async def connect_viewers(sessions: List[str], viewers: int) -> List[FakeWebSocket]:
+    from app.api.websocket import manager
+
+    sockets = []
+    for session_id in sessions:
+        for _ in range(viewers):
+            websocket = FakeWebSocket()
+            await manager.connect(websocket, session_id)
+            sockets.append(websocket)
+    return sockets
+
+async def disconnect_viewers(sockets: List[FakeWebSocket], sessions: List[str]):
+    from app.api.websocket import manager
+
+    for index, websocket in enumerate(sockets):
+        await manager.disconnect(websocket, sessions[index * len(sessions) // len(sockets)])
+
+async def drain_background(before: Set[asyncio.Task], timeout: float):
+    """Let peer feedback tasks spawned by the last turns finish; long-lived loops
+    (scheduler, queue writers) and delayed peer responses are cancelled at the timeout"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        pending = [task for task in asyncio.all_tasks() - before if not task.done()
+                   and task is not asyncio.current_task()]
+        if all(_is_idle_loop(task) for task in pending):
+            return
+        await asyncio.sleep(0.05)
+
+def _is_idle_loop(task: asyncio.Task) -> bool:
+    name = task.get_coro().__qualname__
+    return name.endswith(("._run", "._run_writer", "._listen", "._sweep_loop", "delayed_peer_response"))
+
+async def run_turns(sessions: List[str], turns: int):
+    """Back-to-back responses per session, rotating speakers"""
+    from app.api.websocket import generate_enhanced_ai_response
+
+    async def session_loop(index: int, session_id: str):
+        for turn in range(turns):
+            await generate_enhanced_ai_response(session_id, CHARACTERS[(index + turn) % len(CHARACTERS)])
+
+    await asyncio.gather(*(session_loop(index, session_id) for index, session_id in enumerate(sessions)))
+    return len(sessions) * turns
+
+async def run_sessions(sessions: List[str], turns: int, timeout: float):
+    """Autonomous sessions with every pacing timer except playback zeroed"""
+    from app.api.websocket import active_requests
+    from app.core.sessions.autonomous_manager import autonomous_session_manager
+
+    started = []
+    for session_id in sessions:
+        session = await autonomous_session_manager.start_autonomous_session(
+            session_id, list(CHARACTERS), "benchmarking the debate pipeline"
+        )
+        session.min_silence_duration = 0.0
+        session.max_silence_duration = 0.0
+        session.peer_system_active = False
+        session.peer_cooldown = 0.0
+        session.max_rounds = turns
+        session.scheduler.schedule_in(session._turn_timer_key, 0.0, session._on_turn_timer)
+        started.append(session)
+
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if all(not session._running for session in started) and not active_requests:
+            break
+        await asyncio.sleep(0.05)
+
+    for session_id in sessions:
+        await autonomous_session_manager.stop_session(session_id)
+    return sum(session.conversation_rounds for session in started)
+
+def stage_table(stages: Dict[str, Dict]) -> Dict[str, Dict]:
+    return {name: {key: summary[key] for key in ("count", "errors", "mean_ms", "p50_ms", "p99_ms")}
+            for name, summary in stages.items()}
+
+async def run_scenario(mode: str, args: argparse.Namespace, config: FakeConfig) -> Dict:
+    from app.utils.tracing import tracer
+
+    tracer.histograms.clear()
+    sessions = [f"bench-{mode}-{index}" for index in range(args.sessions)]
+    sockets = await connect_viewers(sessions, args.viewers)
+
+    rss_before = rss_mb()
+    before = asyncio.all_tasks()
+    started = time.perf_counter()
+    if mode == "turns":
+        completed = await run_turns(sessions, args.turns)
+    else:
+        completed = await run_sessions(sessions, args.turns, args.timeout)
+    elapsed = time.perf_counter() - started
+    await drain_background(before, args.drain)
+
+    await disconnect_viewers(sockets, sessions)
+    stages = tracer.get_stats()["stages"]
+    turn = stages.get("turn", {})
+    delivered = sum(len(websocket.new_messages) for websocket in sockets)
+    turn_p50 = turn.get("p50_ms") or 0.0
+    provider_ms = sum(stages.get(name, {}).get("p50_ms", 0.0) for name in PROVIDER_STAGES[1:])
+
+    return {
+        "turns": completed,
+        "turn_errors": turn.get("errors", 0),
+        "seconds": round(elapsed, 3),
+        "turns_per_second": round(turn.get("count", 0) / elapsed, 2) if elapsed else 0.0,
+        "turn_p50_ms": turn.get("p50_ms", 0.0),
+        "turn_p99_ms": turn.get("p99_ms", 0.0),
+        "messages_delivered": delivered,
+        "messages_expected": turn.get("count", 0) * args.viewers,
+        "rss_before_mb": round(rss_before, 1),
+        "rss_after_mb": round(rss_mb(), 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        # Medians, so one contended pool acquire can't move a share
+        "overhead_share": round(max(0.0, 1.0 - provider_ms / turn_p50), 4) if turn_p50 else 0.0,
+        "stage_shares": {name: round(summary["p50_ms"] / turn_p50, 4) for name, summary in stages.items()
+                         if name not in PROVIDER_STAGES and turn_p50},
+        "stages": stage_table(stages)
+    }
+
+async def run_benchmark(args: argparse.Namespace, config: FakeConfig) -> Dict:
+    from app.core.media.artifacts import artifact_manager
+
+    fakes = await install_fakes(config)
+    modes = ["turns", "sessions"] if args.mode == "both" else [args.mode]
+    results = {"vector_backend": fakes.vector_backend, "scenarios": {}}
+    try:
+        for mode in modes:
+            results["scenarios"][mode] = await run_scenario(mode, args, config)
+    finally:
+        if fakes.pool is None:
+            from app.core.database.service import db_service
+            await db_service.close()
+        await artifact_manager.close()
+    results["llm_calls"] = sum(fake.calls for fake in fakes.llms.values())
+    results["tts_calls"] = fakes.tts.calls
+    results["db_statements"] = fakes.pool.statements if fakes.pool else None
+    return results
+
+def scenario_config(args: argparse.Namespace, config: FakeConfig) -> Dict:
+    scenario = {key: value for key, value in dataclasses.asdict(config).items() if key != "database_url"}
+    scenario.update({"sessions": args.sessions, "turns": args.turns, "viewers": args.viewers,
+                     "real_database": bool(config.database_url)})
+    return scenario
+
+def print_report(results: Dict):
+    print(f"Vector store: {results['vector_backend']}  |  LLM calls: {results['llm_calls']}  "
+          f"TTS calls: {results['tts_calls']}  DB statements: {results['db_statements']}")
+    for mode, scenario in results["scenarios"].items():
+        print(f"\n[{mode}] {scenario['turns']} turns in {scenario['seconds']:.2f}s -> "
+              f"{scenario['turns_per_second']:.2f} turns/s, {scenario['turn_errors']} errors")
+        print(f"  turn p50 {scenario['turn_p50_ms']:.1f} ms  p99 {scenario['turn_p99_ms']:.1f} ms  |  "
+              f"delivered {scenario['messages_delivered']}/{scenario['messages_expected']} messages")
+        print(f"  RSS {scenario['rss_before_mb']:.1f} -> {scenario['rss_after_mb']:.1f} MB "
+              f"(peak {scenario['peak_rss_mb']:.1f} MB)  |  "
+              f"{scenario['overhead_share']:.1%} of a turn outside the providers")
+        print(f"  {'stage':<28}{'count':>7}{'mean':>10}{'p50':>10}{'p99':>10}")
+        for name, stage in scenario["stages"].items():
+            print(f"  {name:<28}{stage['count']:>7}{stage['mean_ms']:>10.1f}"
+                  f"{stage['p50_ms']:>10.1f}{stage['p99_ms']:>10.1f}")
+
+def gated_results(scenario: Dict) -> Dict:
+    """The machine-independent part of a scenario's results"""
+    return {
+        "overhead_share": scenario["overhead_share"],
+        "stage_shares": scenario["stage_shares"],
+        "turn_errors": scenario["turn_errors"],
+        "delivered_all": scenario["messages_delivered"] >= scenario["messages_expected"]
+    }
+
+def _share_regressed(actual: float, expected: float, tolerance: float) -> bool:
+    return actual > expected * (1 + tolerance) and actual - expected > MIN_SHARE_INCREASE
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Regressions beyond tolerance (relative) for every gated share in the baseline"""
+    regressions = []
+    for mode, expected in baseline["results"].items():
+        scenario = results["scenarios"].get(mode)
+        if scenario is None:
+            continue
+        actual = gated_results(scenario)
+
+        if _share_regressed(actual["overhead_share"], expected["overhead_share"], tolerance):
+            regressions.append(f"{mode}.overhead_share: {actual['overhead_share']:.1%} vs baseline "
+                               f"{expected['overhead_share']:.1%} (tolerance {tolerance:.0%})")
+        for stage, share in expected["stage_shares"].items():
+            current = actual["stage_shares"].get(stage)
+            if current is None:
+                regressions.append(f"{mode}.{stage}: stage no longer recorded")
+            elif _share_regressed(current, share, tolerance):
+                regressions.append(f"{mode}.{stage}: {current:.1%} of a turn vs baseline {share:.1%} "
+                                   f"(tolerance {tolerance:.0%})")
+        if actual["turn_errors"] > expected["turn_errors"]:
+            regressions.append(f"{mode}.turn_errors: {actual['turn_errors']} vs baseline {expected['turn_errors']}")
+        if expected["delivered_all"] and not actual["delivered_all"]:
+            regressions.append(f"{mode}: {scenario['messages_delivered']}/{scenario['messages_expected']} "
+                               f"messages delivered")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("turns", "sessions", "both"), default="both")
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent sessions")
+    parser.add_argument("--turns", type=int, default=6, help="Turns (rounds) per session")
+    parser.add_argument("--viewers", type=int, default=2, help="Mock websocket viewers per session")
+    parser.add_argument("--llm-latency", type=float, default=FakeConfig.llm_latency)
+    parser.add_argument("--tts-latency", type=float, default=FakeConfig.tts_latency)
+    parser.add_argument("--audio-seconds", type=float, default=FakeConfig.audio_seconds)
+    parser.add_argument("--db-latency", type=float, default=FakeConfig.db_latency)
+    parser.add_argument("--database-url", default=None,
+                        help="Throwaway PostgreSQL to migrate and use instead of the fake pool")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Max seconds for the sessions mode")
+    parser.add_argument("--drain", type=float, default=5.0, help="Seconds to wait for background tasks")
+    parser.add_argument("--baseline", default=None, help="Fail on regression against this JSON baseline")
+    parser.add_argument("--update-baseline", default=None, metavar="PATH", help="Write the results as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument("--json", action="store_true", help="Print the raw results as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Keep app logging and prints")
+    args = parser.parse_args()
+
+    config = FakeConfig(llm_latency=args.llm_latency, tts_latency=args.tts_latency,
+                        audio_seconds=args.audio_seconds, db_latency=args.db_latency,
+                        database_url=args.database_url)
+
+    # The pipeline prints a status block per turn; keep the report readable
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, "w"))
+    with quiet:
+        results = asyncio.run(run_benchmark(args, config))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+
+    scenario = scenario_config(args, config)
+    if args.update_baseline:
+        gated = {mode: gated_results(values) for mode, values in results["scenarios"].items()}
+        with open(args.update_baseline, "w") as f:
+            json.dump({"config": scenario, "results": gated}, f, indent=2)
+            f.write("\n")
+        print(f"\n📝 Baseline written to {args.update_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != scenario:
+            print(f"\n❌ Scenario differs from the baseline's config {baseline.get('config')}; "
+                  f"rerun with matching flags or --update-baseline")
+            sys.exit(2)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ Regressions against the baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\n✅ Within {args.tolerance:.0%} of the baseline")
+
+if __name__ == "__main__":
+    main()
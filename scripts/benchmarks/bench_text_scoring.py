@@ -0,0 +1,105 @@
+# scripts/benchmarks/bench_text_scoring.py
+"""
+Keyword scoring: per-keyword substring scans vs the compiled scorer
+Generates synthetic Reddit-style titles (some about AI, many merely
+containing "said", "detail", "maintain", "chatgpt"...), scores them with
+the old substring logic and with RedditTopicFetcher.score_titles, and
+reports throughput plus how many non-AI titles each approach marks as
+AI-relevant.
+
+Usage: PYTHONPATH=. python scripts/benchmarks/bench_text_scoring.py --titles 5000 --repeat 5
+"""
+
+import argparse
+import random
+import time
+
+from app.core.content.topic_sources import RedditTopicFetcher
+
+AI_PHRASES = ["AI", "ChatGPT", "machine learning", "robots", "an LLM", "neural networks", "AGI"]
+DECOY_WORDS = ["said", "detail", "maintain", "certain", "against", "explained", "trail", "raised",
+               "contains", "rainfall", "laid", "paid", "email", "failure", "campaign", "waiting"]
+FILLER = ["the city council", "new study", "my landlord", "this week", "local team", "scientists",
+          "the budget", "a court", "their fans", "the market", "our school", "the mayor"]
+CONTROVERSY = ["dangerous", "job loss", "terrible", "debate", "risks", "never"]
+
+def make_titles(count: int, seed: int) -> list:
+    """(title, is_ai) pairs, roughly a third genuinely about AI"""
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(count):
+        words = [rng.choice(FILLER), rng.choice(DECOY_WORDS), rng.choice(FILLER), rng.choice(DECOY_WORDS)]
+        is_ai = rng.random() < 0.33
+        if is_ai:
+            words.insert(rng.randrange(len(words)), rng.choice(AI_PHRASES))
+        if rng.random() < 0.4:
+            words.append(rng.choice(CONTROVERSY))
+        title = " ".join(words).capitalize() + rng.choice([".", "?", "!"])
+        titles.append((title, is_ai))
+    return titles
+
+def legacy_scores(fetcher: RedditTopicFetcher, title: str) -> tuple:
+    """The original substring implementation, kept here for comparison"""
+    text_lower = title.lower()
+
+    ai_mentions = sum(1 for keyword in fetcher.ai_keywords if keyword in text_lower)
+    relevance = 0.0
+    if any(keyword in text_lower for keyword in ["ai", "artificial intelligence", "gpt", "chatgpt"]):
+        relevance += 0.4
+    if any(keyword in text_lower for keyword in ["machine learning", "robot", "automation"]):
+        relevance += 0.3
+    if any(keyword in text_lower for keyword in ["technology", "algorithm", "neural"]):
+        relevance += 0.2
+    relevance = min(1.0, relevance + min(0.3, ai_mentions * 0.1))
+
+    controversy = sum(1 for keyword in fetcher.controversy_keywords if keyword in text_lower)
+    if "?" in title:
+        controversy += 0.5
+    if "!" in title:
+        controversy += 0.3
+    strong_words = ["never", "always", "definitely", "impossible", "revolution"]
+    controversy += sum(1 for word in strong_words if word in text_lower) * 0.2
+
+    return relevance, min(1.0, controversy / 3)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--titles", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    fetcher = RedditTopicFetcher()
+    data = make_titles(args.titles, args.seed)
+    titles = [title for title, _ in data]
+
+    def timed(fn):
+        best = float("inf")
+        result = None
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - started)
+        return best, result
+
+    legacy_time, legacy = timed(lambda: [legacy_scores(fetcher, title) for title in titles])
+    single_time, single = timed(lambda: [(fetcher._calculate_ai_relevance(t), fetcher._calculate_controversy(t))
+                                         for t in titles])
+    batch_time, batch = timed(lambda: fetcher.score_titles(titles))
+    assert single == batch
+
+    def report(name: str, seconds: float, scores: list):
+        false_positives = sum(1 for (_, is_ai), (relevance, _) in zip(data, scores) if not is_ai and relevance > 0)
+        missed = sum(1 for (_, is_ai), (relevance, _) in zip(data, scores) if is_ai and relevance == 0)
+        non_ai = sum(1 for _, is_ai in data if not is_ai)
+        print(f"{name:<22} {seconds * 1000:8.1f} ms  {len(titles) / seconds:10.0f} titles/s  "
+              f"false positives {false_positives:5d}/{non_ai}  missed {missed}")
+
+    print(f"{len(titles)} titles, best of {args.repeat}")
+    report("substring (legacy)", legacy_time, legacy)
+    report("compiled, per title", single_time, single)
+    report("compiled, batch", batch_time, batch)
+    print(f"batch speedup vs legacy: {legacy_time / batch_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# scripts/benchmarks/bench_voice_optimizer.py
+"""
+Offline simulator for voice parameter optimizers
+Each trial draws a hidden score landscape over (exaggeration, cfg_weight)
+with a main peak, a decoy peak and noisy peer feedback, then replays the
+record_experiment_outcome loop (adaptive thresholds, breakthroughs,
+current best) for every strategy. Reports how many syntheses each one
+needs before the current best voice is within 5% of the optimum.
+
+Usage: TTS_PROVIDER=google PYTHONPATH=. python scripts/benchmarks/bench_voice_optimizer.py --trials 50 --budget 60
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Dict
+
+import numpy as np
+
+from app.core.media.tts.voice_history import VoiceExperimentHistory
+from app.core.media.tts.voice_optimizer import (
+    CFG_WEIGHT_RANGE, EXAGGERATION_RANGE, adaptive_exploration_rate, create_voice_optimizer
+)
+
+class Landscape:
+    """Hidden success score for a simulated character"""
+
+    def __init__(self, rng: np.random.Generator, noise: float):
+        self.rng = rng
+        self.noise = noise
+        self.peak = (rng.uniform(*EXAGGERATION_RANGE), rng.uniform(*CFG_WEIGHT_RANGE))
+        self.decoy = (rng.uniform(*EXAGGERATION_RANGE), rng.uniform(*CFG_WEIGHT_RANGE))
+        self.width = (rng.uniform(0.12, 0.25), rng.uniform(0.08, 0.16))
+
+        grid = np.stack(np.meshgrid(np.linspace(*EXAGGERATION_RANGE, 181), np.linspace(*CFG_WEIGHT_RANGE, 121)), -1)
+        self.optimum = float(self.true_score(grid[..., 0], grid[..., 1]).max())
+
+    def true_score(self, exaggeration, cfg_weight):
+        def bump(center, height, scale):
+            return height * np.exp(-(((exaggeration - center[0]) / (self.width[0] * scale)) ** 2
+                                     + ((cfg_weight - center[1]) / (self.width[1] * scale)) ** 2))
+        return 0.3 + bump(self.peak, 0.6, 1.0) + bump(self.decoy, 0.35, 1.5)
+
+    def observe(self, exaggeration: float, cfg_weight: float) -> float:
+        score = self.true_score(exaggeration, cfg_weight) + self.rng.normal(0.0, self.noise)
+        return float(min(1.0, max(0.0, score)))
+
+def run_trial(strategy: str, seed: int, budget: int, noise: float) -> Dict:
+    random.seed(seed)
+    landscape = Landscape(np.random.default_rng(seed), noise)
+    optimizer = create_voice_optimizer(strategy, seed=seed)
+    history = VoiceExperimentHistory(100)
+
+    # Same random start as _initialize_character_voice
+    current_best = {
+        "exaggeration": 0.2 + random.random() * 0.6,
+        "cfg_weight": 0.3 + random.random() * 0.4,
+        "best_success_score": 0.0
+    }
+    target = 0.95 * landscape.optimum
+    converged_at = None
+    wasted = 0
+    suggest_time = 0.0
+
+    for synthesis in range(1, budget + 1):
+        # Mirrors _update_adaptive_thresholds / _is_adaptive_breakthrough
+        adaptive = len(history) >= 15
+        success_threshold = history.percentile(0.75) if adaptive else 0.6
+        breakthrough_threshold = success_threshold if adaptive else 0.7
+
+        started = time.perf_counter()
+        config = optimizer.suggest(history, current_best, {
+            "exploration_rate": adaptive_exploration_rate(history, 0.3),
+            "success_threshold": success_threshold,
+            "metadata": {}
+        })
+        suggest_time += time.perf_counter() - started
+
+        best_quality = landscape.true_score(current_best["exaggeration"], current_best["cfg_weight"])
+        if landscape.true_score(config["exaggeration"], config["cfg_weight"]) < best_quality:
+            wasted += 1
+
+        score = landscape.observe(config["exaggeration"], config["cfg_weight"])
+        history.append(config["exaggeration"], config["cfg_weight"], score, time.time(), config["discovery_method"])
+
+        if score > breakthrough_threshold and score > current_best["best_success_score"]:
+            current_best = {**config, "best_success_score": score}
+
+        quality = landscape.true_score(current_best["exaggeration"], current_best["cfg_weight"])
+        if converged_at is None and quality >= target:
+            converged_at = synthesis
+
+    final_quality = landscape.true_score(current_best["exaggeration"], current_best["cfg_weight"])
+    return {
+        "converged_at": converged_at,
+        "regret": landscape.optimum - final_quality,
+        "wasted": wasted / budget,
+        "suggest_ms": suggest_time / budget * 1000
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Voice optimizer convergence simulator")
+    parser.add_argument("--trials", type=int, default=50)
+    parser.add_argument("--budget", type=int, default=60, help="syntheses per trial")
+    parser.add_argument("--noise", type=float, default=0.05, help="peer feedback noise (stdev)")
+    parser.add_argument("--strategies", default="legacy,gp,tpe")
+    args = parser.parse_args()
+
+    print(f"Trials: {args.trials}  Budget: {args.budget} syntheses  Noise: {args.noise}")
+    print(f"{'strategy':<10} {'converged':>10} {'median n':>9} {'mean n*':>8} {'regret':>7} {'wasted':>7} {'ms/suggest':>11}")
+
+    for strategy in args.strategies.split(","):
+        results = [run_trial(strategy, seed, args.budget, args.noise) for seed in range(args.trials)]
+        converged = [r["converged_at"] for r in results if r["converged_at"] is not None]
+        # Unconverged trials count as the full budget
+        censored = [r["converged_at"] or args.budget for r in results]
+
+        print(f"{strategy:<10} {len(converged):>5}/{args.trials:<4} "
+              f"{statistics.median(converged) if converged else float('nan'):>9.1f} "
+              f"{statistics.mean(censored):>8.1f} "
+              f"{statistics.mean(r['regret'] for r in results):>7.3f} "
+              f"{statistics.mean(r['wasted'] for r in results):>7.1%} "
+              f"{statistics.mean(r['suggest_ms'] for r in results):>11.2f}")
+
+    print("n* = syntheses until the current best voice is within 5% of the optimum (budget if never)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+# scripts/benchmarks/pipeline_fakes.py
+"""
+Local stand-ins for the debate pipeline's external services
+Fake LLM clients with configurable latency, a fake TTS provider producing real
+PCM audio, an asyncpg-compatible fake pool (or a throwaway PostgreSQL), an
+in-process vector store (qdrant-client ":memory:" when installed), canned
+trending topics instead of Reddit and mock websockets. install_fakes() patches the app's global service instances so the
+real pipeline code runs unchanged on top of them.
+"""
+
+import asyncio
+import base64
+import io
+import itertools
+import json
+import math
+import random
+import time
+import uuid
+import wave
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+WORDS = ("consciousness", "models", "alignment", "agency", "reasoning", "language", "emergent",
+         "evidence", "memory", "debate", "intuition", "prediction", "ethics", "scale", "tools")
+
+@dataclass
+class FakeConfig:
+    llm_latency: float = 0.25       # mean seconds per completion
+    llm_jitter: float = 0.25        # +/- fraction of the mean
+    llm_words: int = 40             # words per debate turn
+    tts_latency: float = 0.15
+    audio_seconds: float = 0.5      # length of synthesized audio (also the playback time)
+    db_latency: float = 0.002       # seconds per statement
+    db_pool_size: int = 10
+    database_url: Optional[str] = None  # throwaway PostgreSQL instead of the fake pool
+    seed: int = 7
+
+class LatencyModel:
+    """Seeded jittered sleeps so runs are comparable"""
+
+    def __init__(self, mean: float, jitter: float, seed: int):
+        self.mean = mean
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+
+    async def sleep(self):
+        if self.mean > 0:
+            await asyncio.sleep(self.mean * (1.0 + self.jitter * (2.0 * self.rng.random() - 1.0)))
+
+# LLM
+
+class FakeLLM:
+    """Replaces a provider client's initialize/generate_response"""
+
+    def __init__(self, provider: str, config: FakeConfig, seed: int):
+        self.provider = provider
+        self.config = config
+        self.latency = LatencyModel(config.llm_latency, config.llm_jitter, seed)
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    async def initialize(self) -> bool:
+        return True
+
+    async def generate_response(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        from app.utils import metrics
+        from app.utils.tracing import tracer
+
+        self.calls += 1
+        with tracer.span("llm", provider=self.provider, max_tokens=max_tokens or 0) as span:
+            await self.latency.sleep()
+        words = self.config.llm_words
+        metrics.observe_llm(self.provider, span.duration_ms / 1000, len(prompt) // 4, words)
+
+        if "JSON" in prompt or "json" in prompt:
+            return json.dumps({
+                "engagement_level": round(self.rng.random(), 2),
+                "agreement_level": round(self.rng.random(), 2),
+                "intellectual_value": 0.5,
+                "originality": 0.5,
+                "should_respond": False,
+                "emotional_response": "neutral",
+                "specific_reaction": "interesting point"
+            })
+        text = " ".join(self.rng.choice(WORDS) for _ in range(words))
+        return text[0].upper() + text[1:] + "."
+
+def install_llms(config: FakeConfig) -> Dict[str, FakeLLM]:
+    from app.core.ai.clients.claude_client import claude_api_client
+    from app.core.ai.clients.gpt_client import gpt_api_client
+    from app.core.ai.clients.grok_client import grok_api_client
+
+    fakes = {}
+    for index, (provider, client) in enumerate((("anthropic", claude_api_client),
+                                                ("openai", gpt_api_client),
+                                                ("xai", grok_api_client))):
+        fake = FakeLLM(provider, config, config.seed + index)
+        client.initialize = fake.initialize
+        client.generate_response = fake.generate_response
+        fakes[provider] = fake
+    return fakes
+
+# TTS
+
+def make_wav(seconds: float, sample_rate: int = 16000, seed: int = 0) -> bytes:
+    """Speech-like amplitude-modulated tone, so lip-sync has real work to do"""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    envelope = 0.5 + 0.5 * np.sin(2 * math.pi * (3.0 + seed % 3) * t)
+    samples = (0.3 * envelope * np.sin(2 * math.pi * 180.0 * t) * 32767).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+class FakeTTS:
+    """TTS router provider: fixed-length audio after a jittered delay"""
+
+    def __init__(self, config: FakeConfig):
+        self.config = config
+        self.latency = LatencyModel(config.tts_latency, 0.25, config.seed + 10)
+        self.wav = make_wav(config.audio_seconds)
+        self.calls = 0
+
+    async def __call__(self, text: str, character_id: str, emotion: str, metadata: Dict) -> Dict[str, Any]:
+        from app.core.media.artifacts import artifact_manager
+
+        self.calls += 1
+        await self.latency.sleep()
+        return {
+            "success": True,
+            "audioBase64": base64.b64encode(self.wav).decode("utf-8"),
+            "audioFilePath": artifact_manager.write(self.wav, f"bench_{character_id}"),
+            "duration": self.config.audio_seconds,
+            "provider": "fake",
+            "character_id": character_id,
+            "emotion": emotion
+        }
+
+def install_tts(config: FakeConfig) -> FakeTTS:
+    from app.core.media.tts.router import tts_router
+
+    fake = FakeTTS(config)
+
+    async def call_local(text: str, character_id: str, emotion: str, metadata: Dict) -> Dict:
+        raise RuntimeError("benchmark fallback should not be needed")
+
+    tts_router._providers = {"fake": fake, tts_router.FALLBACK: call_local}
+    tts_router.preferred = "fake"
+    tts_router.racing = False
+    return fake
+
+# Database
+
+CHARACTER_DEFAULTS = {
+    "total_sessions": 0, "total_speeches": 0, "evolution_stage": "initial_learning", "maturity_level": 1,
+    "analytical_score": 0.5, "creative_score": 0.5, "assertive_score": 0.5, "empathetic_score": 0.5,
+    "skeptical_score": 0.5, "learning_rate": 0.1, "adaptation_speed": 0.3, "breakthrough_count": 0,
+    "last_breakthrough_at": None, "life_energy": 100.0, "survival_threshold": 10.0, "energy_decay_rate": 0.5,
+    "last_energy_update": None, "voice_experiments_count": 0, "current_exaggeration": 0.5,
+    "current_cfg_weight": 0.5, "voice_breakthrough_score": 0.0, "voice_history": None,
+    "total_memories": 0, "memory_importance_threshold": 0.7
+}
+
+class FakeConnection:
+    """The slice of asyncpg.Connection the app uses; every statement costs db_latency"""
+
+    def __init__(self, pool: "FakePool"):
+        self.pool = pool
+
+    async def _statement(self, query: str):
+        self.pool.statements += 1
+        if self.pool.latency > 0:
+            await asyncio.sleep(self.pool.latency)
+
+    async def execute(self, query: str, *args, **kwargs) -> str:
+        """Command tag like asyncpg's; every UPDATE/DELETE hits one row"""
+        await self._statement(query)
+        verb = query.split(None, 1)[0].upper() if query.strip() else ""
+        if verb == "INSERT":
+            return "INSERT 0 1"
+        if verb in ("UPDATE", "DELETE"):
+            return f"{verb} 1"
+        return verb
+
+    async def fetch(self, query: str, *args, **kwargs) -> List[Dict]:
+        await self._statement(query)
+        return []
+
+    async def fetchrow(self, query: str, *args, **kwargs) -> Optional[Dict]:
+        await self._statement(query)
+        if "FROM character_evolution" in query and args:
+            return {"character_id": args[0], **CHARACTER_DEFAULTS}
+        if "RETURNING" in query:
+            return {"id": next(self.pool.ids), "session_id": str(uuid.uuid4())}
+        return None
+
+    async def fetchval(self, query: str, *args, **kwargs) -> Any:
+        await self._statement(query)
+        if query.strip() == "SELECT 1":
+            return 1
+        if "RETURNING" in query:
+            return next(self.pool.ids)
+        return 0
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    def add_query_logger(self, callback):
+        pass
+
+class _Acquire:
+    """pool.acquire() result: awaitable and usable as an async context manager"""
+
+    def __init__(self, pool: "FakePool"):
+        self.pool = pool
+        self.connection: Optional[FakeConnection] = None
+
+    def __await__(self):
+        return self.pool._acquire().__await__()
+
+    async def __aenter__(self) -> FakeConnection:
+        self.connection = await self.pool._acquire()
+        return self.connection
+
+    async def __aexit__(self, *exc):
+        await self.pool.release(self.connection)
+
+class FakePool:
+    """Bounded like a real pool, so acquire waits show up under load"""
+
+    def __init__(self, size: int, latency: float):
+        self.latency = latency
+        self._slots = asyncio.Semaphore(size)
+        self._holders: List[FakeConnection] = []
+        self.ids = itertools.count(1)
+        self.statements = 0
+
+    async def _acquire(self) -> FakeConnection:
+        await self._slots.acquire()
+        return FakeConnection(self)
+
+    def acquire(self) -> _Acquire:
+        return _Acquire(self)
+
+    async def release(self, connection):
+        self._slots.release()
+
+    async def close(self):
+        pass
+
+async def install_database(config: FakeConfig) -> Optional[FakePool]:
+    """Fake pool by default; with database_url, migrate a throwaway PostgreSQL and use it for real"""
+    from app.core.database.service import ServiceState, db_service
+
+    if config.database_url:
+        from scripts.migrate_database import DatabaseMigrator
+
+        migrator = DatabaseMigrator()
+        migrator.db_url = config.database_url
+        await migrator.run_migration()
+        db_service.db_url = config.database_url
+        await db_service.initialize()
+        return None
+
+    pool = FakePool(config.db_pool_size, config.db_latency)
+    db_service.pool = pool
+    db_service.state = ServiceState.READY
+    return pool
+
+# Vector store
+
+class InProcessVectorStore:
+    """Numpy cosine search behind the MemoryVectorStore interface, used only when
+    qdrant-client is not installed"""
+
+    def __init__(self):
+        self.collections: Dict[str, Dict[str, Any]] = {"memories": {}, "topics": {}}
+
+    def _upsert(self, collection: str, point_id: str, vector: List[float], payload: Dict):
+        self.collections[collection][point_id] = (np.asarray(vector, dtype=np.float32), payload)
+
+    def _search(self, collection: str, vector: List[float], limit: int, match: Dict[str, Any]) -> List[Dict]:
+        points = [(pid, v, p) for pid, (v, p) in self.collections[collection].items()
+                  if all(p.get(key) == value for key, value in match.items())]
+        if not points:
+            return []
+        matrix = np.stack([v for _, v, _ in points])
+        query = np.asarray(vector, dtype=np.float32)
+        scores = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query) + 1e-12)
+        return [{"score": float(scores[i]), "payload": points[i][2], "id": points[i][0]}
+                for i in np.argsort(-scores)[:limit]]
+
+    async def _ensure_connection(self) -> bool:
+        return True
+
+    test_connection = _ensure_connection
+
+    async def store_memory(self, memory_data: Dict) -> bool:
+        self._upsert("memories", str(memory_data["id"]), memory_data["vector"], memory_data["metadata"])
+        return True
+
+    async def search_memories(self, query_vector: List[float], character_id: str = None, topic: str = None,
+                              emotion: str = None, limit: int = 5, score_threshold: float = None) -> List[Dict]:
+        match = {key: value for key, value in
+                 (("character_id", character_id), ("topic", topic), ("emotion", emotion)) if value}
+        return [{"score": hit["score"], "memory": hit["payload"], "id": hit["id"]}
+                for hit in self._search("memories", query_vector, limit, match)]
+
+    async def get_character_memory_count(self, character_id: str) -> int:
+        return len(self.collections["memories"])
+
+    async def store_topic(self, vector: List[float], payload: Dict) -> str:
+        topic_id = str(uuid.uuid4())
+        self._upsert("topics", topic_id, vector, payload)
+        return topic_id
+
+    async def search_topics_batch(self, vectors: List[List[float]], limit: int = 1) -> List[List[Dict]]:
+        return [[{"score": hit["score"], "topic": hit["payload"], "id": hit["id"]}
+                 for hit in self._search("topics", vector, limit, {})] for vector in vectors]
+
+async def install_vector_store() -> str:
+    """Point the global vector store at an in-process backend; returns which one"""
+    from app.core.ai.memory.embeddings import embedding_service
+    from app.core.ai.memory.vector_store import vector_store
+
+    # Deterministic local embeddings, never the OpenAI API
+    embedding_service.client = None
+    embedding_service._client_initialized = True
+
+    try:
+        from qdrant_client import QdrantClient
+    except ImportError:
+        fallback = InProcessVectorStore()
+        for name in ("_ensure_connection", "test_connection", "store_memory", "search_memories",
+                     "get_character_memory_count", "store_topic", "search_topics_batch"):
+            setattr(vector_store, name, getattr(fallback, name))
+        return "numpy (qdrant-client not installed)"
+
+    vector_store.client = QdrantClient(location=":memory:")
+    vector_store._connection_verified = True
+    await vector_store._ensure_collection()
+    return "qdrant :memory:"
+
+# Websockets
+
+class FakeWebSocket:
+    """Accepts everything, records when each frame arrives"""
+
+    def __init__(self, read_delay: float = 0.0):
+        self.state = SimpleNamespace()
+        self.read_delay = read_delay
+        self.frames = 0
+        self.bytes = 0
+        self.new_messages: List[float] = []
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload: str):
+        if self.read_delay:
+            await asyncio.sleep(self.read_delay)
+        self.frames += 1
+        self.bytes += len(payload)
+        if '"type": "new_message"' in payload[:64] or '"type":"new_message"' in payload[:64]:
+            self.new_messages.append(time.perf_counter())
+
+    async def send_json(self, data: Dict):
+        await self.send_text(json.dumps(data))
+
+    async def close(self, code: int = 1000):
+        self.closed = True
+
+# Topics
+
+TOPIC_TITLES = (
+    "Will AI replace doctors within a decade?",
+    "Should AI systems have legal rights?",
+    "Is machine consciousness even possible?",
+    "OpenAI releases a new reasoning model",
+    "Robots are automating warehouse jobs faster than expected",
+    "Governments debate banning autonomous weapons",
+)
+
+class FakeTopicFetcher:
+    """Replaces the Reddit fetch behind the topic feed with canned topics"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch_reddit_topics(self, max_per_sub: int = 10, rate_limiter=None) -> List:
+        from app.core.content.topic_sources import TopicSource
+
+        self.calls += 1
+        now = time.time()
+        return [
+            TopicSource(title=title, url=f"https://example.invalid/topics/{index}", score=1000 - index * 50,
+                        comments=200 - index * 10, source="r/fake", timestamp=now,
+                        keywords=["ai"], ai_relevance=0.8, controversy_score=0.6)
+            for index, title in enumerate(TOPIC_TITLES)
+        ]
+
+def install_topics() -> FakeTopicFetcher:
+    from app.core.content.topic_feed import topic_feed
+
+    fake = FakeTopicFetcher()
+    topic_feed.detector.reddit_fetcher.fetch_reddit_topics = fake.fetch_reddit_topics
+    # Neither read nor overwrite the real cached feed
+    topic_feed.persist_path = ""
+    return fake
+
+@dataclass
+class Fakes:
+    llms: Dict[str, FakeLLM]
+    tts: FakeTTS
+    pool: Optional[FakePool]
+    vector_backend: str
+    topics: FakeTopicFetcher
+
+async def install_fakes(config: FakeConfig) -> Fakes:
+    return Fakes(
+        llms=install_llms(config),
+        tts=install_tts(config),
+        pool=await install_database(config),
+        vector_backend=await install_vector_store(),
+        topics=install_topics()
+    )
@@ -0,0 +1,563 @@
+# scripts/benchmarks/ws_load.py
+"""
+Websocket load generator and soak test for viewer scale
+`serve` runs the real app (uvicorn, app.main) on top of the fake LLM/TTS/DB/vector
+backends from pipeline_fakes.py, with autonomous sessions paced by --silence and
+no round limit. `run` opens thousands of viewers against /ws/{session_id} and the
+/ws auto-discovery endpoint, sends scripted join_session / ping / request_response
+traffic, injects slow readers (small receive queue plus a delay per message, so
+backpressure reaches the server), and periodically reports:
+
+  fan-out    new_message envelope timestamp -> receipt on each viewer
+  pong RTT   ping -> pong round trip per viewer
+  server     RSS, event-loop lag (a2ais_event_loop_lag_seconds), overflow
+             disconnects and dropped bytes, scraped from /metrics
+  drops      viewers whose connection closed before the run ended
+  client     event-loop lag of the load generator itself (if it is high, the
+             latencies above are inflated by the client, not the server)
+
+Usage: PYTHONPATH=. python scripts/benchmarks/ws_load.py serve --port 3102
+       PYTHONPATH=. python scripts/benchmarks/ws_load.py run --url http://127.0.0.1:3102 --clients 2000 --duration 600
+       PYTHONPATH=. python scripts/benchmarks/ws_load.py run --spawn --clients 1000 --duration 120 --json soak.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import re
+import resource
+import signal
+import subprocess
+import sys
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Keep the server self-contained before any app module reads settings
+os.environ.setdefault("TTS_PROVIDER", "google")
+os.environ.setdefault("WARMUP_ON_STARTUP", "false")
+os.environ.setdefault("SESSION_BUS", "memory")
+os.environ.setdefault("TRACING_EXPORTER", "none")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, REPO_ROOT)
+
+from app.utils.tracing import LatencyHistogram
+from scripts.benchmarks.pipeline_fakes import FakeConfig, install_fakes
+
+CHARACTERS = ("claude", "gpt", "grok")
+_ENVELOPE_TIMESTAMP = re.compile(r'"timestamp":\s*([0-9.]+)\}\s*$')
+
+def raise_fd_limit() -> int:
+    """Every viewer is a socket on both ends; lift the soft open-file limit to the hard one"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = 65536 if hard == resource.RLIM_INFINITY else hard
+    if soft < target:
+        with contextlib.suppress(ValueError, OSError):
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+# Server
+
+def pace_sessions(silence: float):
+    """Autonomous sessions start at once, wait `silence` between turns and never run out of rounds"""
+    from app.core.sessions.autonomous_manager import autonomous_session_manager
+
+    start = autonomous_session_manager.start_autonomous_session
+
+    async def start_paced(session_id: str, participants: List[str], custom_topic: str = None):
+        session = await start(session_id, participants, custom_topic)
+        session.min_silence_duration = silence
+        session.max_silence_duration = silence
+        session.max_rounds = sys.maxsize
+        session.scheduler.schedule_in(session._turn_timer_key, 0.0, session._on_turn_timer)
+        return session
+
+    autonomous_session_manager.start_autonomous_session = start_paced
+
+async def serve(args: argparse.Namespace):
+    import uvicorn
+    from app.main import app
+
+    config = FakeConfig(llm_latency=args.llm_latency, tts_latency=args.tts_latency,
+                        audio_seconds=args.audio_seconds, db_latency=args.db_latency)
+    fakes = await install_fakes(config)
+    pace_sessions(args.silence)
+
+    server = uvicorn.Server(uvicorn.Config(
+        app, host=args.host, port=args.port, log_level="warning", backlog=args.backlog
+    ))
+    print(f"🚀 Serving app.main on http://{args.host}:{args.port} with fake backends "
+          f"(vector store: {fakes.vector_backend}, pid {os.getpid()})", file=sys.stderr)
+    await server.serve()
+
+def serve_main(args: argparse.Namespace):
+    raise_fd_limit()
+    import app.main  # noqa: F401  (installs the uvloop policy before the loop is created)
+
+    # The pipeline logs and prints per message and per turn; only warnings matter here
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, "w"))
+    with quiet, contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(args))
+
+# Load generator
+
+class Window:
+    """Latency samples for the current report interval and the whole run"""
+
+    def __init__(self):
+        self.window = LatencyHistogram(100_000)
+        self.total = LatencyHistogram(200_000)
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float):
+        self.window.observe(duration_ms)
+        self.total.observe(duration_ms)
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def roll(self) -> Dict:
+        summary = self.window.summary()
+        self.window = LatencyHistogram(100_000)
+        return summary
+
+@dataclass
+class LoadStats:
+    connected: int = 0
+    peak_connected: int = 0
+    opened: int = 0
+    connect_failures: Counter = field(default_factory=Counter)
+    dropped: Counter = field(default_factory=Counter)
+    messages: int = 0
+    bytes: int = 0
+    new_messages: int = 0
+    requests_sent: int = 0
+    fanout: Window = field(default_factory=Window)
+    slow_fanout: Window = field(default_factory=Window)
+    pong: Window = field(default_factory=Window)
+    client_lag: Window = field(default_factory=Window)
+
+    def on_open(self):
+        self.opened += 1
+        self.connected += 1
+        self.peak_connected = max(self.peak_connected, self.connected)
+
+@dataclass
+class ClientPlan:
+    url: str
+    slow: bool
+    driver: bool
+
+def plan_clients(args: argparse.Namespace, ws_base: str) -> List[ClientPlan]:
+    """Spread viewers over sessions; the first viewer of each session drives request_response"""
+    rng = random.Random(args.seed)
+    plans = []
+    for index in range(args.clients):
+        if rng.random() < args.auto_fraction:
+            url = f"{ws_base}/ws"
+        else:
+            url = f"{ws_base}/ws/{args.session_prefix}-{index % args.sessions}"
+        plans.append(ClientPlan(url=url, slow=rng.random() < args.slow_fraction,
+                                driver=index < args.sessions and args.request_interval > 0))
+    return plans
+
+def handle_frame(payload, stats: LoadStats, pings: deque, slow: bool):
+    """Count a frame; slow readers' fan-out is kept apart and their pong RTT is not sampled"""
+    now_ms = time.time() * 1000
+    stats.messages += 1
+    stats.bytes += len(payload)
+    head = payload[:48]
+    if '"new_message"' in head:
+        # Audio makes these large; read the envelope timestamp from the tail instead of parsing
+        stats.new_messages += 1
+        match = _ENVELOPE_TIMESTAMP.search(payload[-64:])
+        if match:
+            (stats.slow_fanout if slow else stats.fanout).observe(max(0.0, now_ms - float(match.group(1))))
+    elif '"pong"' in head and pings:
+        sent = pings.popleft()
+        if not slow:
+            stats.pong.observe((time.perf_counter() - sent) * 1000)
+
+async def run_client(plan: ClientPlan, args: argparse.Namespace, stats: LoadStats,
+                     stop: asyncio.Event, delay: float, seed: int):
+    import websockets
+    from websockets.exceptions import ConnectionClosed
+
+    await asyncio.sleep(delay)
+    if stop.is_set():
+        return
+    rng = random.Random(seed)
+    try:
+        websocket = await websockets.connect(
+            plan.url, open_timeout=args.connect_timeout, ping_interval=None,
+            max_queue=1 if plan.slow else 16, max_size=2 ** 24, compression=None
+        )
+    except Exception as e:
+        stats.connect_failures[type(e).__name__] += 1
+        return
+
+    stats.on_open()
+    pings: deque = deque()
+
+    async def reader():
+        async for payload in websocket:
+            handle_frame(payload, stats, pings, plan.slow)
+            if plan.slow:
+                await asyncio.sleep(args.slow_delay)
+
+    async def writer():
+        await websocket.send(json.dumps({"type": "join_session"}))
+        now = time.perf_counter()
+        deadlines = {}
+        if args.ping_interval > 0:
+            deadlines["ping"] = now + rng.uniform(0, args.ping_interval)
+        if plan.driver:
+            deadlines["request_response"] = now + rng.uniform(0, args.request_interval)
+        if not deadlines:
+            await stop.wait()
+            return
+
+        while True:
+            action, deadline = min(deadlines.items(), key=lambda item: item[1])
+            await asyncio.sleep(max(0.0, deadline - time.perf_counter()))
+            if action == "ping":
+                pings.append(time.perf_counter())
+                await websocket.send(json.dumps({"type": "ping"}))
+                interval = args.ping_interval
+            else:
+                await websocket.send(json.dumps({"type": "request_response",
+                                                 "characterId": rng.choice(CHARACTERS)}))
+                stats.requests_sent += 1
+                interval = args.request_interval
+            deadlines[action] = time.perf_counter() + interval * rng.uniform(0.8, 1.2)
+
+    tasks = [asyncio.create_task(reader()), asyncio.create_task(writer()), asyncio.create_task(stop.wait())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        if not stop.is_set():
+            failed = next(iter(done))
+            error = failed.exception() if not failed.cancelled() else None
+            if isinstance(error, ConnectionClosed) or error is None:
+                code = websocket.close_code if websocket.close_code is not None else "none"
+                stats.dropped[f"close {code}"] += 1
+            else:
+                stats.dropped[type(error).__name__] += 1
+    finally:
+        for task in tasks:
+            task.cancel()
+        stats.connected -= 1
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(websocket.close(), timeout=5)
+
+async def probe_client_lag(stats: LoadStats, stop: asyncio.Event, interval: float = 0.1):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        stats.client_lag.observe(max(0.0, loop.time() - started - interval) * 1000)
+
+# Server metrics
+
+def parse_metrics(text: str) -> Dict[Tuple[str, Tuple], float]:
+    from prometheus_client.parser import text_string_to_metric_families
+
+    samples = {}
+    for family in text_string_to_metric_families(text):
+        for sample in family.samples:
+            samples[(sample.name, tuple(sorted(sample.labels.items())))] = sample.value
+    return samples
+
+def metric_total(samples: Dict, name: str) -> float:
+    return sum(value for (sample_name, _), value in samples.items() if sample_name == name)
+
+def lag_buckets(samples: Dict) -> List[Tuple[float, float]]:
+    buckets = [(float(dict(labels)["le"]), value) for (name, labels), value in samples.items()
+               if name == "a2ais_event_loop_lag_seconds_bucket"]
+    return sorted(buckets)
+
+def bucket_quantile(current: List[Tuple[float, float]], previous: List[Tuple[float, float]], q: float) -> Optional[float]:
+    """Upper bucket bound holding the q-quantile of observations made between two scrapes"""
+    before = dict(previous)
+    deltas = [(bound, count - before.get(bound, 0.0)) for bound, count in current]
+    if not deltas or deltas[-1][1] <= 0:
+        return None
+    for bound, cumulative in deltas:
+        if cumulative >= q * deltas[-1][1]:
+            return bound
+    return None
+
+class ServerProbe:
+    """Scrapes /metrics (and /proc for a spawned server) once per report"""
+
+    def __init__(self, http, base_url: str, pid: Optional[int]):
+        self.http = http
+        self.base_url = base_url
+        self.pid = pid
+        self.previous: Dict = {}
+        self.first: Dict = {}
+        self.available = True
+        self.rss_samples: List[float] = []
+        self.lag_max_bound = 0.0
+
+    def _rss_mb(self, samples: Dict) -> Optional[float]:
+        if self.pid:
+            with contextlib.suppress(OSError):
+                with open(f"/proc/{self.pid}/status") as f:
+                    for line in f:
+                        if line.startswith("VmRSS:"):
+                            return int(line.split()[1]) * 1024 / 1e6
+        rss = metric_total(samples, "process_resident_memory_bytes")
+        return rss / 1e6 if rss else None
+
+    async def sample(self) -> Dict:
+        try:
+            response = await self.http.get(f"{self.base_url}/metrics", timeout=10)
+            samples = parse_metrics(response.text)
+        except Exception as e:
+            if self.available:
+                print(f"⚠️ Could not scrape {self.base_url}/metrics: {e}", file=sys.stderr)
+            self.available = False
+            return {}
+
+        self.available = True
+        self.first = self.first or samples
+        previous = self.previous or samples
+        self.previous = samples
+
+        lag_count = metric_total(samples, "a2ais_event_loop_lag_seconds_count") - \
+            metric_total(previous, "a2ais_event_loop_lag_seconds_count")
+        lag_sum = metric_total(samples, "a2ais_event_loop_lag_seconds_sum") - \
+            metric_total(previous, "a2ais_event_loop_lag_seconds_sum")
+        lag_p99 = bucket_quantile(lag_buckets(samples), lag_buckets(previous), 0.99)
+        if lag_p99 is not None and lag_p99 != float("inf"):
+            self.lag_max_bound = max(self.lag_max_bound, lag_p99)
+
+        rss = self._rss_mb(samples)
+        if rss is not None:
+            self.rss_samples.append(rss)
+        return {
+            "rss_mb": round(rss, 1) if rss is not None else None,
+            "loop_lag_mean_ms": round(lag_sum / lag_count * 1000, 2) if lag_count else None,
+            "loop_lag_p99_ms": round(lag_p99 * 1000, 1) if lag_p99 is not None else None,
+            "server_connections": int(metric_total(samples, "a2ais_ws_connections")),
+            "queued_bytes": int(metric_total(samples, "a2ais_ws_queued_bytes")),
+            "overflow_disconnects": int(metric_total(samples, "a2ais_ws_overflow_disconnects_total")),
+            "dropped_bytes": int(metric_total(samples, "a2ais_ws_dropped_bytes_total"))
+        }
+
+    def totals(self) -> Dict:
+        if not self.previous:
+            return {}
+        lag_p99 = bucket_quantile(lag_buckets(self.previous), lag_buckets(self.first), 0.99)
+        return {
+            "rss_start_mb": round(self.rss_samples[0], 1) if self.rss_samples else None,
+            "rss_peak_mb": round(max(self.rss_samples), 1) if self.rss_samples else None,
+            "rss_end_mb": round(self.rss_samples[-1], 1) if self.rss_samples else None,
+            "loop_lag_p99_ms": round(lag_p99 * 1000, 1) if lag_p99 is not None else None,
+            "loop_lag_worst_window_p99_ms": round(self.lag_max_bound * 1000, 1),
+            "overflow_disconnects": int(metric_total(self.previous, "a2ais_ws_overflow_disconnects_total") -
+                                        metric_total(self.first, "a2ais_ws_overflow_disconnects_total")),
+            "dropped_bytes": int(metric_total(self.previous, "a2ais_ws_dropped_bytes_total") -
+                                 metric_total(self.first, "a2ais_ws_dropped_bytes_total"))
+        }
+
+# Runner
+
+def spawn_server(args: argparse.Namespace, port: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_ROOT, env.get("PYTHONPATH")]))
+    command = [sys.executable, os.path.abspath(__file__), "serve", "--host", "127.0.0.1", "--port", str(port),
+               "--silence", str(args.silence), "--llm-latency", str(args.llm_latency),
+               "--tts-latency", str(args.tts_latency), "--audio-seconds", str(args.audio_seconds),
+               "--db-latency", str(args.db_latency)]
+    return subprocess.Popen(command, cwd=REPO_ROOT, env=env)
+
+async def wait_until_up(http, base_url: str, server: Optional[subprocess.Popen], timeout: float = 60.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if server is not None and server.poll() is not None:
+            raise SystemExit(f"❌ Server exited with code {server.returncode}")
+        with contextlib.suppress(Exception):
+            if (await http.get(f"{base_url}/health", timeout=2)).status_code == 200:
+                return
+        await asyncio.sleep(0.25)
+    raise SystemExit(f"❌ {base_url} did not come up within {timeout:.0f}s")
+
+def format_row(elapsed: float, stats: LoadStats, fanout: Dict, pong: Dict, lag: Dict,
+               server: Dict, rate: float) -> str:
+    rss = f"{server['rss_mb']:.0f} MB" if server.get("rss_mb") is not None else "n/a"
+    loop_lag = f"{server['loop_lag_p99_ms']:.0f} ms" if server.get("loop_lag_p99_ms") is not None else "n/a"
+    return (f"t={elapsed:6.0f}s  viewers {stats.connected:>6}  msgs {rate:8.0f}/s  "
+            f"fan-out p50 {fanout['p50_ms']:7.1f} p99 {fanout['p99_ms']:7.1f} ms  "
+            f"pong p99 {pong['p99_ms']:6.1f} ms  server RSS {rss:>8}  loop lag p99 ≤{loop_lag:>7}  "
+            f"client lag p99 {lag['p99_ms']:5.1f} ms  dropped {sum(stats.dropped.values())}")
+
+async def run_load(args: argparse.Namespace) -> Dict:
+    import httpx
+
+    fd_limit = raise_fd_limit()
+    if fd_limit < args.clients + 64:
+        print(f"⚠️ Open-file limit {fd_limit} is below {args.clients} clients; connects will fail", file=sys.stderr)
+
+    base_url = args.url.rstrip("/")
+    server = spawn_server(args, int(base_url.rsplit(":", 1)[1])) if args.spawn else None
+    ws_base = "ws" + base_url[len("http"):]
+    stats = LoadStats()
+    stop = asyncio.Event()
+    timeline = []
+
+    try:
+        async with httpx.AsyncClient() as http:
+            await wait_until_up(http, base_url, server)
+            probe = ServerProbe(http, base_url, server.pid if server else args.server_pid)
+            await probe.sample()
+
+            if args.start_sessions:
+                for index in range(args.sessions):
+                    await http.post(f"{base_url}/api/sessions/{args.session_prefix}-{index}/start-autonomous",
+                                    json={"topic": "viewer scale soak test"}, timeout=30)
+
+            plans = plan_clients(args, ws_base)
+            clients = [asyncio.create_task(run_client(plan, args, stats, stop,
+                                                      args.ramp * index / max(1, len(plans)), args.seed + index))
+                       for index, plan in enumerate(plans)]
+            lag_probe = asyncio.create_task(probe_client_lag(stats, stop))
+
+            started = time.perf_counter()
+            last_messages, last_report = 0, started
+            while time.perf_counter() - started < args.duration:
+                await asyncio.sleep(min(args.report_interval, args.duration - (time.perf_counter() - started)))
+                now = time.perf_counter()
+                rate = (stats.messages - last_messages) / (now - last_report)
+                last_messages, last_report = stats.messages, now
+                fanout, pong, lag = stats.fanout.roll(), stats.pong.roll(), stats.client_lag.roll()
+                slow_fanout = stats.slow_fanout.roll()
+                server_sample = await probe.sample()
+                row = {"elapsed": round(now - started, 1), "viewers": stats.connected, "messages_per_second": round(rate, 1),
+                       "fanout_p50_ms": fanout["p50_ms"], "fanout_p99_ms": fanout["p99_ms"],
+                       "slow_fanout_p99_ms": slow_fanout["p99_ms"],
+                       "pong_p99_ms": pong["p99_ms"], "client_lag_p99_ms": lag["p99_ms"],
+                       "dropped": sum(stats.dropped.values()), **server_sample}
+                timeline.append(row)
+                print(format_row(now - started, stats, fanout, pong, lag, server_sample, rate))
+
+            stop.set()
+            await asyncio.gather(*clients, lag_probe, return_exceptions=True)
+            elapsed = time.perf_counter() - started
+            server_totals = probe.totals()
+    finally:
+        if server is not None:
+            server.send_signal(signal.SIGINT)
+            try:
+                server.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    fanout, pong, lag = stats.fanout.total.summary(), stats.pong.total.summary(), stats.client_lag.total.summary()
+    slow_fanout = stats.slow_fanout.total.summary()
+    return {
+        "config": {key: value for key, value in vars(args).items() if key not in ("command", "json")},
+        "summary": {
+            "seconds": round(elapsed, 1),
+            "clients": args.clients,
+            "opened": stats.opened,
+            "peak_connected": stats.peak_connected,
+            "connect_failures": dict(stats.connect_failures),
+            "dropped": dict(stats.dropped),
+            "messages": stats.messages,
+            "megabytes": round(stats.bytes / 1e6, 1),
+            "new_messages": stats.new_messages,
+            "requests_sent": stats.requests_sent,
+            "fanout_ms": {"p50": fanout["p50_ms"], "p90": fanout["p90_ms"], "p99": fanout["p99_ms"],
+                          "max": round(stats.fanout.max_ms, 1)},
+            "slow_reader_fanout_ms": {"p50": slow_fanout["p50_ms"], "p99": slow_fanout["p99_ms"],
+                                      "max": round(stats.slow_fanout.max_ms, 1)},
+            "pong_ms": {"p50": pong["p50_ms"], "p99": pong["p99_ms"], "max": round(stats.pong.max_ms, 1)},
+            "client_loop_lag_ms": {"p99": lag["p99_ms"], "max": round(stats.client_lag.max_ms, 1)},
+            "server": server_totals
+        },
+        "timeline": timeline
+    }
+
+def print_summary(summary: Dict):
+    server = summary["server"]
+    print(f"\n{summary['opened']}/{summary['clients']} viewers opened (peak {summary['peak_connected']} connected) "
+          f"over {summary['seconds']:.0f}s")
+    print(f"  connect failures: {summary['connect_failures'] or 0}  dropped: {summary['dropped'] or 0}")
+    print(f"  received {summary['messages']} messages ({summary['megabytes']} MB), "
+          f"{summary['new_messages']} new_message, {summary['requests_sent']} request_response sent")
+    print(f"  fan-out ms: p50 {summary['fanout_ms']['p50']}  p90 {summary['fanout_ms']['p90']}  "
+          f"p99 {summary['fanout_ms']['p99']}  max {summary['fanout_ms']['max']}")
+    print(f"  slow-reader fan-out ms: p50 {summary['slow_reader_fanout_ms']['p50']}  "
+          f"p99 {summary['slow_reader_fanout_ms']['p99']}  max {summary['slow_reader_fanout_ms']['max']}")
+    print(f"  pong RTT ms: p50 {summary['pong_ms']['p50']}  p99 {summary['pong_ms']['p99']}  "
+          f"max {summary['pong_ms']['max']}")
+    print(f"  client loop lag ms: p99 {summary['client_loop_lag_ms']['p99']}  max {summary['client_loop_lag_ms']['max']}")
+    if server:
+        print(f"  server RSS MB: start {server['rss_start_mb']}  peak {server['rss_peak_mb']}  end {server['rss_end_mb']}")
+        print(f"  server loop lag p99 ≤ {server['loop_lag_p99_ms']} ms "
+              f"(worst interval ≤ {server['loop_lag_worst_window_p99_ms']} ms)")
+        print(f"  server overflow disconnects: {server['overflow_disconnects']}  "
+              f"dropped bytes: {server['dropped_bytes']}")
+
+def add_fake_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--silence", type=float, default=2.0, help="Seconds between autonomous turns")
+    parser.add_argument("--llm-latency", type=float, default=FakeConfig.llm_latency)
+    parser.add_argument("--tts-latency", type=float, default=FakeConfig.tts_latency)
+    parser.add_argument("--audio-seconds", type=float, default=FakeConfig.audio_seconds)
+    parser.add_argument("--db-latency", type=float, default=FakeConfig.db_latency)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run the app with fake backends")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=3102)
+    serve_parser.add_argument("--backlog", type=int, default=4096)
+    serve_parser.add_argument("--verbose", action="store_true", help="Keep app logging and prints")
+    add_fake_arguments(serve_parser)
+
+    run_parser = commands.add_parser("run", help="Open viewers and soak")
+    run_parser.add_argument("--url", default="http://127.0.0.1:3102")
+    run_parser.add_argument("--spawn", action="store_true", help="Start `serve` on --url's port for this run")
+    run_parser.add_argument("--server-pid", type=int, default=None, help="Read RSS from /proc for this pid")
+    run_parser.add_argument("--clients", type=int, default=1000)
+    run_parser.add_argument("--sessions", type=int, default=10)
+    run_parser.add_argument("--session-prefix", default="load")
+    run_parser.add_argument("--start-sessions", action=argparse.BooleanOptionalAction, default=True,
+                            help="POST start-autonomous for every session before connecting")
+    run_parser.add_argument("--auto-fraction", type=float, default=0.1, help="Share of viewers using /ws")
+    run_parser.add_argument("--slow-fraction", type=float, default=0.05, help="Share of slow-reading viewers")
+    run_parser.add_argument("--slow-delay", type=float, default=1.0, help="Seconds a slow reader sleeps per message")
+    run_parser.add_argument("--ping-interval", type=float, default=10.0, help="Seconds between pings per viewer")
+    run_parser.add_argument("--request-interval", type=float, default=15.0,
+                            help="Seconds between request_response per session (0 disables)")
+    run_parser.add_argument("--ramp", type=float, default=10.0, help="Seconds over which viewers connect")
+    run_parser.add_argument("--duration", type=float, default=60.0, help="Soak length in seconds")
+    run_parser.add_argument("--report-interval", type=float, default=10.0)
+    run_parser.add_argument("--connect-timeout", type=float, default=30.0)
+    run_parser.add_argument("--seed", type=int, default=7)
+    run_parser.add_argument("--json", default=None, metavar="PATH", help="Write summary and timeline as JSON")
+    add_fake_arguments(run_parser)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve_main(args)
+        return
+
+    results = asyncio.run(run_load(args))
+    print_summary(results["summary"])
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"\n📝 Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
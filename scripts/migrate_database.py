@@ -74,6 +74,7 @@ class DatabaseMigrator:
             current_exaggeration FLOAT DEFAULT 0.5,
             current_cfg_weight FLOAT DEFAULT 0.5,
             voice_breakthrough_score FLOAT DEFAULT 0.0,
+            voice_history JSON,  -- Ring buffer of recent experiments
             
             -- Memory Stats
             total_memories INTEGER DEFAULT 0,
@@ -87,6 +88,14 @@ class DatabaseMigrator:
         await self.connection.execute(sql)
         logger.info("✅ Created character_evolution table")
     
+    async def add_voice_history_column(self):
+        """Add voice_history to character_evolution tables created before it existed"""
+        
+        await self.connection.execute(
+            "ALTER TABLE character_evolution ADD COLUMN IF NOT EXISTS voice_history JSON"
+        )
+        logger.info("✅ Ensured character_evolution.voice_history column")
+    
     async def create_character_relationships_table(self):
         """Create character_relationships table"""
         
@@ -426,6 +435,7 @@ class DatabaseMigrator:
             
             # Create tables IN ORDER (dependencies matter)
             await self.create_character_evolution_table()
+            await self.add_voice_history_column()
             await self.create_character_relationships_table() 
             await self.create_autonomous_sessions_table()
             await self.create_session_speeches_table()
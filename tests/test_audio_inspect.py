@@ -0,0 +1,103 @@
+import struct
+
+import pytest
+
+from app.core.media import audio_inspect
+from app.core.media.audio_inspect import inspect_audio_bytes, inspect_audio_file
+
+def wav_bytes(seconds: float, sample_rate: int = 22050, extra_chunk: bytes = b"") -> bytes:
+    data_size = int(seconds * sample_rate) * 2
+    fmt = struct.pack("<4sIHHIIHH", b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+    body = b"WAVE" + fmt + extra_chunk + struct.pack("<4sI", b"data", data_size) + bytes(data_size)
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+# MPEG-1 layer III, 128 kbps, 44.1 kHz, mono, no padding: 417-byte frames of 1152 samples
+MP3_FRAME = b"\xFF\xFB\x90\xC0" + bytes(413)
+
+def xing_frame(frames: int) -> bytes:
+    side_info = 17
+    header = b"\xFF\xFB\x90\xC0" + bytes(side_info) + b"Xing" + struct.pack(">II", 0x01, frames)
+    return header + bytes(len(MP3_FRAME) - len(header))
+
+class ReadSpy:
+    """Wraps open() to record how many bytes a call reads"""
+
+    def __init__(self):
+        self.bytes_read = 0
+
+    def __call__(self, path, mode="r"):
+        spy = self
+        handle = open(path, mode)
+
+        class Handle:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                handle.close()
+
+            def seek(self, offset):
+                return handle.seek(offset)
+
+            def read(self, length=-1):
+                chunk = handle.read(length)
+                spy.bytes_read += len(chunk)
+                return chunk
+
+            def fileno(self):
+                return handle.fileno()
+
+        return Handle()
+
+@pytest.fixture
+def read_spy(monkeypatch):
+    spy = ReadSpy()
+    monkeypatch.setattr(audio_inspect, "open", spy, raising=False)
+    return spy
+
+def test_wav_is_inspected_from_chunk_headers(tmp_path, read_spy):
+    path = tmp_path / "long.wav"
+    path.write_bytes(wav_bytes(60.0, extra_chunk=struct.pack("<4sI", b"LIST", 5) + b"INFO!\x00"))
+
+    info = inspect_audio_file(str(path))
+
+    assert info.format == "wav" and info.duration == pytest.approx(60.0)
+    assert info == inspect_audio_bytes(path.read_bytes())
+    assert read_spy.bytes_read < 100
+
+def test_streamed_wav_size_comes_from_the_file(tmp_path):
+    data = bytearray(wav_bytes(2.0))
+    data[40:44] = struct.pack("<I", 0xFFFFFFFF)
+    path = tmp_path / "streamed.wav"
+    path.write_bytes(bytes(data))
+
+    assert inspect_audio_file(str(path)).duration == pytest.approx(2.0)
+
+def test_vbr_mp3_uses_the_xing_header(tmp_path, read_spy):
+    path = tmp_path / "vbr.mp3"
+    path.write_bytes(b"ID3\x03\x00\x00\x00\x00\x10\x00" + bytes(2048) + xing_frame(1000) + MP3_FRAME * 999)
+
+    info = inspect_audio_file(str(path))
+
+    assert info.exact and info.frame_count == 1000
+    assert info.duration == pytest.approx(1000 * 1152 / 44100)
+    assert read_spy.bytes_read <= audio_inspect.MP3_PREFIX_BYTES + 32
+
+def test_long_cbr_mp3_is_estimated_past_the_prefix(tmp_path, read_spy):
+    path = tmp_path / "cbr.mp3"
+    path.write_bytes(MP3_FRAME * 1000 + b"TAG" + bytes(125))
+
+    info = inspect_audio_file(str(path))
+
+    assert not info.exact and info.frame_count == 1000
+    assert info.duration == pytest.approx(1000 * 1152 / 44100)
+    assert read_spy.bytes_read <= audio_inspect.MP3_PREFIX_BYTES + 32
+
+def test_in_memory_cbr_mp3_is_walked_exactly():
+    info = inspect_audio_bytes(MP3_FRAME * 1000)
+    assert info.exact and info.frame_count == 1000
+
+def test_unreadable_file_returns_none(tmp_path):
+    assert inspect_audio_file(str(tmp_path / "missing.wav")) is None
+    (tmp_path / "noise.bin").write_bytes(b"not audio at all")
+    assert inspect_audio_file(str(tmp_path / "noise.bin")) is None
@@ -0,0 +1,18 @@
+import pytest
+
+from app.core.media.tts.energy_lip_sync import EnergyLipSyncService
+
+@pytest.mark.asyncio
+async def test_text_only_lip_sync_without_fallback():
+    result = await EnergyLipSyncService().generate_lip_sync("Will AI replace doctors", 2.0)
+
+    cues = result["mouthCues"]
+    assert result["metadata"]["duration"] == 2.0
+    assert len(cues) == 8
+    assert cues[0]["start"] == 0.0 and cues[-1]["end"] == 2.0
+    assert all(a["end"] == b["start"] for a, b in zip(cues, cues[1:]))
+
+@pytest.mark.asyncio
+async def test_empty_text_without_fallback_rests():
+    result = await EnergyLipSyncService().generate_lip_sync("", 1.5)
+    assert result["mouthCues"] == [{"start": 0.0, "end": 1.5, "value": "X"}]
@@ -0,0 +1,102 @@
+import asyncio
+import os
+
+import pytest
+
+from app.core.media.tts.lip_sync import RhubarbLipSyncService
+from scripts.benchmarks.bench_lip_sync_pool import _write_fake_rhubarb
+
+def make_service(tmp_path, delay: float, max_workers: int, timeout: float = 10.0) -> RhubarbLipSyncService:
+    rhubarb = _write_fake_rhubarb(str(tmp_path), delay)
+    return RhubarbLipSyncService(rhubarb_path=rhubarb, max_workers=max_workers, timeout=timeout)
+
+def track_concurrency(service: RhubarbLipSyncService) -> dict:
+    """Counts Rhubarb processes in flight, independently of the pool's own counters"""
+    seen = {"running": 0, "peak": 0}
+    run_rhubarb = service._run_rhubarb
+
+    async def tracked(audio_file_path: str):
+        seen["running"] += 1
+        seen["peak"] = max(seen["peak"], seen["running"])
+        try:
+            return await run_rhubarb(audio_file_path)
+        finally:
+            seen["running"] -= 1
+
+    service._run_rhubarb = tracked
+    return seen
+
+@pytest.mark.asyncio
+async def test_parallel_jobs_get_their_own_output(tmp_path):
+    service = make_service(tmp_path, delay=0.05, max_workers=4)
+    assert await service.is_available()
+
+    audio_files = [os.path.join(tmp_path, f"job_{i + 1}.wav") for i in range(16)]
+    results = await asyncio.gather(*[
+        service.generate_lip_sync_from_audio(path, "isolation check") for path in audio_files
+    ])
+
+    assert [result["metadata"]["duration"] for result in results] == [float(i + 1) for i in range(16)]
+    assert service.get_stats()["completed_jobs"] == 16
+
+@pytest.mark.asyncio
+async def test_pool_never_exceeds_max_workers(tmp_path):
+    service = make_service(tmp_path, delay=0.1, max_workers=3)
+    seen = track_concurrency(service)
+
+    await asyncio.gather(*[
+        service.generate_lip_sync_from_audio(os.path.join(tmp_path, f"job_{i + 1}.wav"), "bound check")
+        for i in range(12)
+    ])
+
+    stats = service.get_stats()
+    assert seen["peak"] == 3
+    assert stats["max_queue_depth"] >= 9
+    assert stats["running_jobs"] == 0 and stats["queued_jobs"] == 0
+
+@pytest.mark.asyncio
+async def test_timed_out_job_falls_back_and_frees_its_slot(tmp_path):
+    service = make_service(tmp_path, delay=2.0, max_workers=1, timeout=0.2)
+
+    result = await service.generate_lip_sync_from_audio(os.path.join(tmp_path, "job_7.wav"), "too slow")
+
+    stats = service.get_stats()
+    assert stats["timed_out_jobs"] == 1 and stats["completed_jobs"] == 0
+    assert result["metadata"]["duration"] != 7.0
+    assert [cue["value"] for cue in result["mouthCues"]] != ["B"]
+    assert stats["running_jobs"] == 0
+
+    # The killed process released the only slot
+    service.timeout = 10.0
+    service.rhubarb_path = _write_fake_rhubarb(str(tmp_path), 0.0)
+    result = await asyncio.wait_for(
+        service.generate_lip_sync_from_audio(os.path.join(tmp_path, "job_2.wav"), "next"), 5.0
+    )
+    assert result["metadata"]["duration"] == 2.0
+
+@pytest.mark.asyncio
+async def test_cancelled_job_kills_its_rhubarb_process(tmp_path, monkeypatch):
+    service = make_service(tmp_path, delay=30.0, max_workers=1)
+    assert await service.is_available()
+
+    processes = []
+    create_subprocess_exec = asyncio.create_subprocess_exec
+
+    async def spawn(*args, **kwargs):
+        process = await create_subprocess_exec(*args, **kwargs)
+        processes.append(process)
+        return process
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", spawn)
+    job = asyncio.create_task(service.generate_lip_sync_from_audio(os.path.join(tmp_path, "job_1.wav"), "cancel me"))
+    while not processes:
+        await asyncio.sleep(0.01)
+
+    job.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await job
+
+    assert processes[0].returncode is not None
+    with pytest.raises(ProcessLookupError):
+        os.kill(processes[0].pid, 0)
+    assert service.get_stats()["running_jobs"] == 0
@@ -0,0 +1,64 @@
+import asyncio
+import sys
+import time
+import types
+
+import pytest
+
+from app.core.ai.clients.claude_client import ClaudeAPIClient
+from app.core.ai.clients.gpt_client import GPTAPIClient
+from app.core.ai.clients.grok_client import GrokAPIClient
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("client_class", [ClaudeAPIClient, GPTAPIClient, GrokAPIClient])
+async def test_concurrent_initialize_runs_one_probe(client_class):
+    client = client_class()
+    probes = []
+
+    async def connect():
+        probes.append(1)
+        await asyncio.sleep(0.05)
+        client._initialized = True
+        return True
+
+    client._connect = connect
+    assert await asyncio.gather(*[client.initialize() for _ in range(5)]) == [True] * 5
+    assert len(probes) == 1
+
+@pytest.fixture
+def blocking_xai_sdk(monkeypatch):
+    """xai_sdk whose sample() blocks like the real sync SDK"""
+    class Chat:
+        def sample(self):
+            time.sleep(0.3)
+            return types.SimpleNamespace(content="Hi")
+
+    class Client:
+        def __init__(self, api_key):
+            self.chat = types.SimpleNamespace(create=lambda **kwargs: Chat())
+
+    sdk = types.ModuleType("xai_sdk")
+    sdk.Client = Client
+    chat = types.ModuleType("xai_sdk.chat")
+    chat.user = lambda text: text
+    monkeypatch.setitem(sys.modules, "xai_sdk", sdk)
+    monkeypatch.setitem(sys.modules, "xai_sdk.chat", chat)
+
+@pytest.mark.asyncio
+async def test_grok_probe_does_not_block_the_event_loop(blocking_xai_sdk):
+    client = GrokAPIClient()
+    client.api_key = "test-key"
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    try:
+        assert await client.initialize()
+    finally:
+        ticking.cancel()
+    assert ticks >= 10
@@ -0,0 +1,48 @@
+import pytest
+
+from app.core.content.near_duplicates import NearDuplicateIndex
+
+DISTINCT_DEBATES = [
+    ("Will AI replace doctors?", "Will AI replace programmers?"),
+    ("OpenAI delays GPT-5", "OpenAI releases GPT-5"),
+    ("Should AI have rights?", "Should robots have rights?"),
+]
+
+REPHRASINGS = [
+    ("OpenAI releases GPT-5", "OpenAI releases GPT-5 to the public"),
+    ("Will AI replace doctors soon?", "Will AI replace doctors?"),
+    ("Anthropic announces Claude 4", "Anthropic announced Claude 4"),
+    ("Is AI conscious?", "is ai conscious"),
+]
+
+def make_index(tmp_path=None) -> NearDuplicateIndex:
+    return NearDuplicateIndex(threshold=0.7, max_entries=100,
+                              persist_path=str(tmp_path / "history.json") if tmp_path else None)
+
+@pytest.mark.parametrize("seen,candidate", DISTINCT_DEBATES)
+def test_different_debates_are_not_duplicates(seen, candidate):
+    index = make_index()
+    index.add(seen)
+    assert not index.is_duplicate(candidate)
+
+@pytest.mark.parametrize("seen,candidate", REPHRASINGS)
+def test_rephrasings_are_duplicates(seen, candidate):
+    index = make_index()
+    index.add(seen)
+    assert index.is_duplicate(candidate)
+
+def test_distinct_debates_survive_a_full_history():
+    index = make_index()
+    for seen, _ in DISTINCT_DEBATES:
+        index.add(seen)
+    assert [candidate for _, candidate in DISTINCT_DEBATES if index.is_duplicate(candidate)] == []
+
+def test_history_round_trip(tmp_path):
+    index = make_index(tmp_path)
+    index.add("OpenAI releases GPT-5")
+    index.save()
+
+    restored = make_index(tmp_path)
+    assert restored.load() == 1
+    assert restored.is_duplicate("OpenAI releases GPT-5 to the public")
+    assert not restored.is_duplicate("OpenAI delays GPT-5")
@@ -0,0 +1,190 @@
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+
+from app.core.sessions.session_bus import (
+    _RELEASE_LEASE_SCRIPT,
+    _RENEW_LEASE_SCRIPT,
+    RedisSessionBus,
+    SessionBus,
+    session_events_channel,
+)
+
+class FakeRedisServer:
+    """Keyspace and channels shared by every client of one fake server"""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.subscribers = {}
+
+    def get(self, key):
+        entry = self.values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.values[key]
+            return None
+        return value
+
+    def set(self, key, value, px=None):
+        self.values[key] = (value, time.monotonic() + px / 1000 if px else None)
+
+class FakePubSub:
+    def __init__(self, server: FakeRedisServer):
+        self.server = server
+        self.channels = set()
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.channels.add(channel)
+        self.server.subscribers.setdefault(channel, set()).add(self)
+
+    async def unsubscribe(self, channel):
+        self.channels.discard(channel)
+        self.server.subscribers.get(channel, set()).discard(self)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        for channel in list(self.channels):
+            await self.unsubscribe(channel)
+
+class FakeRedis:
+    """The subset of redis.asyncio.Redis used by RedisSessionBus"""
+
+    def __init__(self, server: FakeRedisServer):
+        self.server = server
+
+    async def ping(self):
+        return True
+
+    def pubsub(self):
+        return FakePubSub(self.server)
+
+    async def publish(self, channel, data):
+        subscribers = self.server.subscribers.get(channel, set())
+        for pubsub in subscribers:
+            pubsub.queue.put_nowait({"type": "message", "channel": channel, "data": data})
+        return len(subscribers)
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and self.server.get(key) is not None:
+            return None
+        self.server.set(key, value, px)
+        return True
+
+    async def get(self, key):
+        return self.server.get(key)
+
+    async def mget(self, keys):
+        return [self.server.get(key) for key in keys]
+
+    async def delete(self, key):
+        return 1 if self.server.values.pop(key, None) else 0
+
+    async def eval(self, script, numkeys, key, owner, *args):
+        if self.server.get(key) != owner:
+            return 0
+        if script == _RENEW_LEASE_SCRIPT:
+            self.server.set(key, owner, int(args[0]))
+        elif script == _RELEASE_LEASE_SCRIPT:
+            del self.server.values[key]
+        return 1
+
+    async def sadd(self, key, *members):
+        self.server.sets.setdefault(key, set()).update(members)
+
+    async def srem(self, key, *members):
+        self.server.sets.get(key, set()).difference_update(members)
+
+    async def smembers(self, key):
+        return set(self.server.sets.get(key, set()))
+
+    async def aclose(self):
+        pass
+
+@pytest_asyncio.fixture
+async def buses():
+    server = FakeRedisServer()
+    workers = [RedisSessionBus("redis://fake", client=FakeRedis(server), worker_id=name)
+               for name in ("worker-a", "worker-b")]
+    for bus in workers:
+        await bus.start()
+    yield workers
+    for bus in workers:
+        await bus.close()
+
+def test_session_bus_is_abstract():
+    with pytest.raises(TypeError):
+        SessionBus()
+
+@pytest.mark.asyncio
+async def test_lease_acquire_renew_release(buses):
+    a, b = buses
+
+    assert await a.acquire_lease("s1", ttl=5)
+    assert not await b.acquire_lease("s1", ttl=5)
+    assert await a.acquire_lease("s1", ttl=5)
+    assert await a.get_lease_owner("s1") == "worker-a"
+
+    assert await a.renew_lease("s1", ttl=5)
+    assert not await b.renew_lease("s1", ttl=5)
+    assert not await b.release_lease("s1")
+
+    assert await a.release_lease("s1")
+    assert await b.get_lease_owner("s1") is None
+    assert await b.acquire_lease("s1", ttl=5)
+
+@pytest.mark.asyncio
+async def test_expired_lease_can_be_taken_over(buses):
+    a, b = buses
+
+    assert await a.acquire_lease("s1", ttl=0.05)
+    await asyncio.sleep(0.1)
+
+    assert not await a.renew_lease("s1", ttl=5)
+    assert await b.acquire_lease("s1", ttl=5)
+    assert await a.get_lease_owner("s1") == "worker-b"
+
+@pytest.mark.asyncio
+async def test_cross_worker_fan_out(buses):
+    a, b = buses
+    channel = session_events_channel("s1")
+    received = {"worker-a": asyncio.Queue(), "worker-b": asyncio.Queue()}
+
+    for bus in buses:
+        await bus.subscribe(channel, received[bus.worker_id].put)
+
+    assert await a.publish(channel, {"type": "message", "text": "hello"}) == 2
+    for queue in received.values():
+        assert await asyncio.wait_for(queue.get(), 2.0) == {"type": "message", "text": "hello"}
+
+    await b.unsubscribe(channel)
+    assert await a.publish(channel, {"type": "message", "text": "bye"}) == 1
+    assert (await asyncio.wait_for(received["worker-a"].get(), 2.0))["text"] == "bye"
+    assert received["worker-b"].empty()
+
+@pytest.mark.asyncio
+async def test_snapshot_round_trip(buses):
+    a, b = buses
+    snapshot = {"session_id": "s1", "topic": "AI rights", "turn_count": 3, "participants": ["claude", "gpt"]}
+
+    await a.save_session_snapshot("s1", snapshot, ttl=60)
+    await a.save_session_snapshot("s2", {"session_id": "s2"}, ttl=0.05)
+    await asyncio.sleep(0.1)
+
+    assert await b.get_session_snapshot("s1") == snapshot
+    assert await b.list_session_snapshots() == [snapshot]
+    assert await b.get_session_snapshot("s2") is None
+
+    await b.delete_session_snapshot("s1")
+    assert await a.get_session_snapshot("s1") is None
+    assert await a.list_session_snapshots() == []
@@ -0,0 +1,52 @@
+import json
+import time
+
+import pytest
+
+from app import main
+from app.api.websocket import manager
+from app.core.sessions.autonomous_manager import SessionLeaseConflict, autonomous_session_manager
+
+@pytest.fixture
+def broadcasts(monkeypatch):
+    sent = []
+
+    async def send_to_session(session_id, message):
+        sent.append(message)
+
+    async def create_session(**kwargs):
+        raise AssertionError("session written to the database")
+
+    monkeypatch.setattr(manager, "send_to_session", send_to_session)
+    monkeypatch.setattr(main.db_service, "create_session", create_session)
+    return sent
+
+@pytest.mark.asyncio
+async def test_start_owned_by_another_worker_is_a_quiet_409(broadcasts):
+    bus = autonomous_session_manager.bus
+    bus._leases["s-owned"] = ("worker-x", time.monotonic() + 60)
+    try:
+        response = await main.start_autonomous_session("s-owned", {})
+    finally:
+        bus._leases.pop("s-owned", None)
+
+    assert response.status_code == 409
+    assert json.loads(response.body)["owner"] == "worker-x"
+    assert broadcasts == []
+
+@pytest.mark.asyncio
+async def test_lease_lost_during_start_is_a_quiet_409(broadcasts, monkeypatch):
+    async def create_session(**kwargs):
+        pass
+
+    async def start(session_id, participants, custom_topic=None):
+        raise SessionLeaseConflict(session_id, "worker-y")
+
+    monkeypatch.setattr(main.db_service, "create_session", create_session)
+    monkeypatch.setattr(autonomous_session_manager, "start_autonomous_session", start)
+
+    response = await main.start_autonomous_session("s-raced", {})
+
+    assert response.status_code == 409
+    assert json.loads(response.body)["owner"] == "worker-y"
+    assert broadcasts == []
@@ -0,0 +1,79 @@
+import pytest
+
+from app.core.sessions.autonomous_manager import AutonomousSession
+from app.core.sessions.session_bus import InMemorySessionBus
+
+class FlakyBus(InMemorySessionBus):
+    """Raises on the next renew_lease calls, then defers to the in-memory bus"""
+
+    def __init__(self, failures: int, renew_result: bool = True):
+        super().__init__("worker-a")
+        self.failures = failures
+        self.renew_result = renew_result
+
+    async def renew_lease(self, session_id: str, ttl: float) -> bool:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("redis unavailable")
+        return self.renew_result
+
+class RecordingScheduler:
+    def __init__(self):
+        self.scheduled = {}
+        self.cancelled = []
+
+    def schedule_in(self, key, delay, callback):
+        self.scheduled[key] = delay
+
+    def schedule(self, key, deadline, callback):
+        self.scheduled[key] = deadline
+
+    def cancel(self, key):
+        self.cancelled.append(key)
+        self.scheduled.pop(key, None)
+
+def make_session(bus) -> AutonomousSession:
+    session = AutonomousSession("s1", ["claude", "gpt"], "timers", bus=bus)
+    session.scheduler = RecordingScheduler()
+    session._running = True
+    return session
+
+@pytest.mark.asyncio
+async def test_lease_timer_retries_after_transient_error():
+    session = make_session(FlakyBus(failures=2))
+
+    await session._on_lease_timer()
+    first_retry = session.scheduler.scheduled[session._lease_timer_key]
+    await session._on_lease_timer()
+    second_retry = session.scheduler.scheduled[session._lease_timer_key]
+
+    assert session._running and session._owns_lease
+    assert first_retry < second_retry < session.lease_ttl / 3
+
+    await session._on_lease_timer()
+    assert session.scheduler.scheduled[session._lease_timer_key] == session.lease_ttl / 3
+    assert session._lease_failures == 0
+
+@pytest.mark.asyncio
+async def test_lease_timer_stops_session_only_when_lease_is_lost():
+    session = make_session(FlakyBus(failures=0, renew_result=False))
+
+    await session._on_lease_timer()
+
+    assert not session._running
+    assert not session._owns_lease
+
+@pytest.mark.asyncio
+async def test_turn_timer_reschedules_after_exception():
+    session = make_session(InMemorySessionBus("worker-a"))
+
+    async def broken_tick():
+        raise RuntimeError("boom")
+
+    session._turn_tick = broken_tick
+    await session._on_turn_timer()
+    await session._on_turn_timer()
+
+    assert session._running
+    assert session._turn_failures == 2
+    assert session.scheduler.scheduled[session._turn_timer_key] == 10.0
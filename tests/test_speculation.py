@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from app.core.sessions.autonomous_manager import AutonomousSession, SpeculativeResponse
+from app.core.sessions.session_bus import InMemorySessionBus
+from app.utils.tracing import tracer
+
+def make_session() -> AutonomousSession:
+    session = AutonomousSession("s1", ["claude", "gpt"], "speculation", bus=InMemorySessionBus("worker-a"))
+    session._running = True
+    return session
+
+async def draft(delay: float):
+    turn = tracer.start_turn("turn", session_id="s1", character_id="gpt")
+    try:
+        await asyncio.sleep(delay)
+    except BaseException as e:
+        tracer.finish_turn(turn, e)
+        raise
+    return {"trace": turn}
+
+@pytest.mark.asyncio
+async def test_finished_draft_that_is_discarded_closes_its_trace():
+    session = make_session()
+    task = asyncio.create_task(draft(0))
+    prepared = await task
+
+    session._speculation = SpeculativeResponse("gpt", session.conversation_version, task)
+    session._discard_speculation(session._speculation, "speaker changed")
+    await asyncio.sleep(0)
+
+    turn = prepared["trace"]
+    assert turn.duration_ms is not None
+    assert turn.error == "discarded"
+    assert turn.attributes["discard_reason"] == "speaker changed"
+
+@pytest.mark.asyncio
+async def test_cancelled_draft_keeps_its_cancellation_error():
+    session = make_session()
+    task = asyncio.create_task(draft(10))
+    await asyncio.sleep(0)
+    turn = tracer.histograms.get("turn")
+    before = turn.count if turn else 0
+
+    session._speculation = SpeculativeResponse("gpt", session.conversation_version, task)
+    session._discard_speculation(session._speculation, "superseded")
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert task.cancelled()
+    # Closed once, by the cancelled prepare, not again as discarded
+    assert tracer.histograms["turn"].count == before + 1
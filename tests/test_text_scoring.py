@@ -0,0 +1,34 @@
+import pytest
+
+from app.core.content.text_scoring import KeywordScorer, get_keyword_scorer
+
+INFLECTED_TITLES = [
+    ("Hospitals are replacing radiologists with AI", "controversy", "replace"),
+    ("My job was replaced by a chatbot last week", "controversy", "replace"),
+    ("Economists debated universal basic income for hours", "controversy", "debate"),
+    ("Warehouses automated half their picking lines", "ai", "automate"),
+    ("Lawmakers keep arguing about deepfake rules", "debate_mid", "argue"),
+    ("Two robots debating each other on live TV", "controversy", "debate"),
+    ("Why do people disagree so much about AI risks?", "controversy", "disagree"),
+]
+
+@pytest.mark.parametrize("title,set_name,keyword", INFLECTED_TITLES)
+def test_inflected_forms_count_for_their_stem(title, set_name, keyword):
+    assert keyword in get_keyword_scorer().match(title).get(set_name, set())
+
+@pytest.mark.parametrize("title", [
+    "The mayor said the detail was certain",
+    "Rainfall raised concerns about the trail",
+    "Air traffic controllers explained the delays",
+])
+def test_words_containing_keywords_do_not_match(title):
+    assert "ai" not in get_keyword_scorer().match(title)
+
+def test_plural_counts_for_singular_and_plural_keywords():
+    scorer = KeywordScorer({"a": ["problem"], "b": ["problems"]})
+    assert scorer.match("So many problems") == {"a": {"problem"}, "b": {"problems"}}
+
+def test_batch_matches_single_scans():
+    scorer = get_keyword_scorer()
+    titles = [title for title, _, _ in INFLECTED_TITLES]
+    assert scorer.match_batch(titles) == [scorer.match(title) for title in titles]
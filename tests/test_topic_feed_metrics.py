@@ -0,0 +1,33 @@
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.content.topic_feed import TopicFeed, topic_feed
+from app.core.content.topic_sources import TopicDetector
+
+def sample(name: str) -> float:
+    return REGISTRY.get_sample_value(name) or 0.0
+
+@pytest.mark.asyncio
+async def test_failed_refresh_is_counted(monkeypatch):
+    detector = TopicDetector()
+
+    async def fetch_reddit_topics(**kwargs):
+        raise ConnectionError("reddit unavailable")
+
+    monkeypatch.setattr(detector.reddit_fetcher, "fetch_reddit_topics", fetch_reddit_topics)
+    feed = TopicFeed(detector=detector, persist_path="")
+    before = sample("a2ais_topic_feed_refresh_failures_total")
+
+    assert not await feed.refresh()
+
+    assert sample("a2ais_topic_feed_refresh_failures_total") == before + 1
+    assert feed.source == "curated"
+
+def test_feed_age_is_exported(monkeypatch):
+    monkeypatch.setattr(topic_feed, "fetched_at", time.time() - 90)
+    assert sample("a2ais_topic_feed_age_seconds") == pytest.approx(90, abs=5)
+
+    monkeypatch.setattr(topic_feed, "fetched_at", 0.0)
+    assert sample("a2ais_topic_feed_age_seconds") == 0.0
@@ -0,0 +1,99 @@
+import asyncio
+import base64
+
+import pytest
+
+from app.core.media.tts import chunking
+from app.core.media.tts.chunking import ChunkedSynthesisError, ChunkingSkipped, _to_wav, synthesize_chunked
+
+TEXT = ("The first sentence is long enough to be its own chunk. "
+        "The second sentence is also long enough to stand alone. "
+        "And a third sentence closes the response for the test.")
+
+def wav_audio(seconds: float = 0.5, rate: int = 22050) -> str:
+    frames = (b"\x00\x20" * int(seconds * rate))
+    return base64.b64encode(_to_wav((1, 2, rate), frames)).decode()
+
+class FakeRouter:
+    def __init__(self, provider="fake", audio=None, fail_first=0):
+        self.provider = provider
+        self.audio = audio or wav_audio()
+        self.fail_first = fail_first
+        self.calls = []
+        self.failover_calls = []
+        self.cleaned = []
+
+    def ranked_providers(self):
+        return [self.provider, "local"]
+
+    async def synthesize_with(self, provider, text, character_id, emotion="neutral", adaptive_metadata=None):
+        self.calls.append(text)
+        attempt = len(self.calls)
+        await asyncio.sleep(0.01 * attempt)
+        if attempt <= self.fail_first:
+            raise RuntimeError("provider hiccup")
+        return {"success": True, "audioBase64": self.audio, "provider": provider, "routedProvider": provider}
+
+    async def synthesize(self, text, character_id, emotion="neutral", adaptive_metadata=None):
+        self.failover_calls.append(text)
+        return {"success": True, "audioBase64": wav_audio(), "provider": "backup", "routedProvider": "backup"}
+
+    def cleanup_temp_file(self, path):
+        self.cleaned.append(path)
+
+class FakeLipSync:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_lip_sync_from_audio(self, audio_file_path, text):
+        self.calls += 1
+        return {"metadata": {"duration": 0.5}, "mouthCues": [{"start": 0.0, "end": 0.5, "value": "C"}]}
+
+@pytest.fixture(autouse=True)
+def forget_providers():
+    chunking._non_pcm_providers.clear()
+    yield
+    chunking._non_pcm_providers.clear()
+
+@pytest.mark.asyncio
+async def test_failed_chunk_fails_over_alone():
+    router, lip_sync = FakeRouter(fail_first=1), FakeLipSync()
+
+    result = await synthesize_chunked(router, lip_sync, TEXT, "claude", max_concurrency=3)
+
+    assert result["chunks"] == 3
+    assert len(router.calls) == 3 and len(router.failover_calls) == 1
+    assert lip_sync.calls == 3
+
+@pytest.mark.asyncio
+async def test_non_wav_provider_stops_at_first_chunk_and_is_skipped_next_time():
+    router = FakeRouter(provider="mp3-only", audio=base64.b64encode(b"\xFF\xFB\x90\xC0" + bytes(413)).decode())
+    lip_sync = FakeLipSync()
+
+    with pytest.raises(ChunkedSynthesisError):
+        await synthesize_chunked(router, lip_sync, TEXT, "claude", max_concurrency=1)
+    assert len(router.calls) == 1 and lip_sync.calls == 0
+
+    with pytest.raises(ChunkingSkipped):
+        await synthesize_chunked(router, lip_sync, TEXT, "claude", max_concurrency=1)
+    assert len(router.calls) == 1
+
+@pytest.mark.asyncio
+async def test_mismatched_chunk_format_cancels_the_rest():
+    router, lip_sync = FakeRouter(), FakeLipSync()
+    formats = iter([wav_audio(rate=22050), wav_audio(rate=24000)])
+
+    async def synthesize_with(provider, text, character_id, emotion="neutral", adaptive_metadata=None):
+        router.calls.append(text)
+        return {"success": True, "audioBase64": next(formats), "routedProvider": provider}
+
+    router.synthesize_with = synthesize_with
+
+    with pytest.raises(ChunkedSynthesisError):
+        await synthesize_chunked(router, lip_sync, TEXT, "claude", max_concurrency=1)
+    assert len(router.calls) == 2 and len(router.cleaned) == 1
+
+@pytest.mark.asyncio
+async def test_single_sentence_is_skipped():
+    with pytest.raises(ChunkingSkipped):
+        await synthesize_chunked(FakeRouter(), FakeLipSync(), "Just one sentence here.", "claude")
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from app.core.media.tts.router import LocalFallbackTTS, TTSRouter
+
+def ok(provider: str, delay: float = 0.0):
+    async def call(text, character_id, emotion, metadata):
+        await asyncio.sleep(delay)
+        return {"success": True, "audioBase64": "", "provider": provider}
+    return call
+
+def hung():
+    async def call(text, character_id, emotion, metadata):
+        await asyncio.Event().wait()
+    return call
+
+def make_router(**providers) -> TTSRouter:
+    return TTSRouter(providers=providers, preferred="slow", latency_budget=0.05, racing=True, min_samples=3)
+
+@pytest.mark.asyncio
+async def test_abandoned_calls_stay_out_of_success_and_latency_windows():
+    router = make_router(slow=hung(), fast=ok("fast", 0.01), local=ok("local"))
+
+    for _ in range(3):
+        result = await router.synthesize("hello", "claude")
+        assert result["routedProvider"] == "fast"
+    await asyncio.sleep(0)  # Let the cancelled losers record themselves
+
+    slow = router.stats["slow"]
+    assert slow.abandoned == 3 and slow.race_losses == 3
+    assert list(slow.outcomes) == [] and list(slow.latencies) == []
+    assert router.stats["fast"].race_wins == 3
+
+    # Censored samples push the hung provider behind the one that answers
+    assert router.ranked_providers()[0] == "fast"
+
+@pytest.mark.asyncio
+async def test_cancellation_outside_a_race_is_not_a_race_loss():
+    router = make_router(slow=hung(), local=ok("local"))
+    router.racing = False
+
+    task = asyncio.create_task(router.synthesize("hello", "claude"))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    slow = router.stats["slow"]
+    assert slow.abandoned == 1 and slow.race_losses == 0
+    assert slow.error_rate == 0.0 and slow.percentile(95) is None
+
+@pytest.mark.asyncio
+async def test_local_fallback_is_flagged_degraded():
+    local = LocalFallbackTTS()
+
+    async def call_local(text, character_id, emotion, metadata):
+        return await local.generate_speech_with_file(text, character_id, emotion)
+
+    router = make_router(local=call_local)
+    result = await router.synthesize("hello", "claude")
+    router.cleanup_temp_file(result["audioFilePath"])
+
+    assert result["success"] and result["degraded"]
+    assert router.get_stats()["providers"]["local"]["degraded"] == 1